@@ -6,15 +6,28 @@ import sys
 import threading
 import time
 import subprocess
-import requests
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_file
 from dotenv import load_dotenv
 import logging
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from utils.mattermost import _get_mattermost_credentials, _create_mattermost_driver
+# [SB] mattermostdriver/aiohttp를 쓰는 utils.mattermost, utils.delivery와 requests는 사용하는 함수에서 import
+#      (첫 요청까지의 시작 시간 단축 - python -m utils.startup으로 확인)
+from utils.outbox import pending_senders, purge_outbox, outbox_stats, abandon_sender
+from utils.latest import load_latest_result, latest_report_path, report_matches, result_age
+from utils.history import query_snapshots, get_snapshot, diff_with_previous, purge_history
+from utils.scheduler import load_schedules, next_run_time
+from utils.tracing import stage_estimates
+from utils.deadline import Deadline
+from utils.breaker import CircuitBreaker, CircuitOpenError, breaker_states, STATE_OPEN
+from utils.metrics import Counter, render_metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils.spool import SpooledReport
+from utils.log import setup_logging, bind_job_id, current_job_id, ProcessLogReader
+from utils.zygote import ZygoteError, shared_zygote, spawn_script, zygote_enabled
 
 # [SB] 환경 변수 로드
 load_dotenv()
@@ -23,21 +36,162 @@ load_dotenv()
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'your-secret-key-change-this')
 
-# [SB] 로깅 설정
-logging.basicConfig(level=logging.INFO)
+# [SB] 로깅 설정 - 큐 기반 JSON 로그 (LOG_LEVEL, LOG_LEVELS, LOG_FORMAT 환경 변수)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # [SB] 전역 진행 상태 저장소
 progress_store = {}
 
+# [SB] .env에 설정된 공용 계정 (run_main_process가 실행 중 환경 변수를 바꾸므로 시작 시점 값을 보관)
+SERVICE_MM_USERNAME = os.getenv('MATTERMOST_USERNAME')
+SERVICE_MM_PASSWORD = os.getenv('MATTERMOST_PASSWORD')
+SERVICE_REPORT_USER_ID = os.getenv('MATTERMOST_REPORT_USER_ID')
+
+# [SB] 정기 점검/즉시 새로고침 실행 상태 - 한 번에 하나만 실행하고, 실행 중에 들어온 요청은 같은 실행을 기다림
+check_run_lock = threading.Lock()
+current_check_run = None
+last_check_run = None
+scheduler_state = {'schedules': [], 'next_run': None}
+
+# [SB] 점검 프로세스(main.py) 강제 종료 시간 (초) - main.py는 이보다 짧은 작업 예산(JOB_DEADLINE_SECONDS) 안에서
+#      단계별 제한 시간을 줄이거나 선택 단계를 건너뛰어 스스로 끝냄 (utils/deadline.py)
+CHECK_TIMEOUT = 300
+
+# [SB] /metrics 카운터 - trigger: login(로그인 점검), schedule/refresh(공용 계정 점검), latest(최신 보고서 전송)
+JOBS_STARTED = Counter('dashboard_check_jobs_started_total', '시작한 점검/보고서 전송 작업 수', ('trigger',))
+JOBS_COMPLETED = Counter('dashboard_check_jobs_completed_total', '완료한 작업 수 (delivery: delivered/delivery_failed/not_sent)', ('trigger', 'delivery'))
+JOBS_FAILED = Counter('dashboard_check_jobs_failed_total', '실패한 작업 수 (reason: error/timeout/breaker_open)', ('trigger', 'reason'))
+JOBS_CANCELLED = Counter('dashboard_check_jobs_cancelled_total', '취소한 작업 수 (reason: logout/abandoned/replaced)', ('trigger', 'reason'))
+
+# [SB] 실행 중인 main.py 프로세스 수 (프로세스마다 헤드리스 브라우저 1개)
+check_process_lock = threading.Lock()
+running_check_processes = 0
+
+@contextmanager
+def check_process_slot():
+    """[SB] main.py 프로세스 실행 구간 - /metrics 브라우저 사용 수 집계"""
+    global running_check_processes
+    with check_process_lock:
+        running_check_processes += 1
+    try:
+        yield
+    finally:
+        with check_process_lock:
+            running_check_processes -= 1
+
+# [SB] 실행 중인 로그인 점검 (사용자 ID → 작업) - 로그아웃/페이지 이탈 시 main.py를 취소해 브라우저와 CPU를 바로 반환
+login_jobs = {}
+login_jobs_lock = threading.Lock()
+
+class JobCancelled(Exception):
+    """[SB] 로그아웃, 진행 페이지 이탈 또는 같은 사용자의 재로그인으로 취소된 로그인 점검"""
+
+def register_login_job(user_id):
+    """[SB] 사용자의 로그인 점검 등록 - 같은 사용자의 이전 작업이 실행 중이면 취소"""
+    job = {'id': current_job_id(), 'cancel': threading.Event(), 'reason': None, 'last_seen': time.time()}
+    with login_jobs_lock:
+        previous = login_jobs.get(user_id)
+        login_jobs[user_id] = job
+    if previous is not None:
+        _request_cancel(previous, 'replaced')
+    return job
+
+def _request_cancel(job, reason):
+    if not job['cancel'].is_set():
+        job['reason'] = reason
+        job['cancel'].set()
+
+def cancel_login_job(user_id, reason):
+    """[SB] 사용자의 실행 중인 로그인 점검 취소 요청 (작업 스레드가 main.py를 종료) - 취소할 작업이 있었는지 반환"""
+    with login_jobs_lock:
+        job = login_jobs.get(user_id)
+        if job is None:
+            return False
+        _request_cancel(job, reason)
+    return True
+
+def touch_login_job(user_id):
+    """[SB] 진행 페이지가 상태를 조회한 시각 기록 (JOB_ABANDON_SECONDS 동안 조회가 없으면 이탈로 보고 취소)"""
+    with login_jobs_lock:
+        job = login_jobs.get(user_id)
+    if job is not None:
+        job['last_seen'] = time.time()
+
+def _check_cancelled(job):
+    """[SB] 취소 요청 또는 진행 페이지 이탈 확인 - 취소해야 하면 JobCancelled"""
+    abandon_seconds = float(os.getenv('JOB_ABANDON_SECONDS', '120'))
+    if abandon_seconds > 0 and time.time() - job['last_seen'] > abandon_seconds:
+        _request_cancel(job, 'abandoned')
+    if job['cancel'].is_set():
+        raise JobCancelled(job['reason'])
+
+def stop_process(process, grace=None):
+    """
+    [SB] main.py 종료 - SIGTERM으로 브라우저/LLM 요청/Mattermost 세션을 정리할 시간을 주고,
+    JOB_CANCEL_GRACE초(기본 10) 안에 끝나지 않으면 SIGKILL
+
+    Returns:
+        int: 종료 코드
+    """
+    if grace is None:
+        grace = float(os.getenv('JOB_CANCEL_GRACE', '10'))
+    process.terminate()
+    try:
+        return process.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        logger.warning("main.py가 %g초 안에 종료되지 않아 강제 종료합니다", grace)
+        process.kill()
+        return process.wait()
+
+# [SB] main.py가 대시보드 차단기가 열려 있어 점검을 건너뛰었을 때 (로그 event: breaker_open)
+DASHBOARD_DOWN_MESSAGE = "대시보드 서버 장애로 점검을 건너뛰었습니다. 잠시 후 다시 시도해주세요."
+
+# [SB] main.py 로그의 event 필드 → 보고서 전송 결과
+_DELIVERY_EVENTS = {'report_delivered': 'delivered', 'report_delivery_failed': 'delivery_failed'}
+
+def with_job_id(job_id, target, *args):
+    """[SB] 작업 스레드 실행 - 이 스레드의 로그와 main.py 로그(JOB_ID 환경 변수)에 같은 작업 ID 연결"""
+    with bind_job_id(job_id):
+        return target(*args)
+
+def _delivery_outcome(stdout, events=()):
+    """[SB] main.py 로그 event(없으면 출력 문구)로 보고서 전송 결과 분류"""
+    for event in reversed(events):
+        if event in _DELIVERY_EVENTS:
+            return _DELIVERY_EVENTS[event]
+    if "성공적으로 전송되었습니다" in stdout:
+        return 'delivered'
+    if "전송 실패" in stdout:
+        return 'delivery_failed'
+    return 'not_sent'
+
 # [SB] Ollama 연결 상태 확인
 def check_ollama_connection():
+    """
+    [SB] Ollama 서버 연결 상태 확인 - 결과를 Ollama 차단기(utils/breaker.py)에 기록
+
+    차단기가 열려 있으면 연결 제한 시간(최대 10 + 15초)을 기다리지 않고 바로 실패를 반환합니다.
+    """
+    breaker = CircuitBreaker('ollama')
+    if not breaker.allow():
+        status = breaker.status()
+        return False, f"Mac Ollama 서버 장애로 연결을 차단 중입니다 ({status['retry_in']:.0f}초 후 재시도). 마지막 오류: {status['last_error']}"
+    ok, message = _probe_ollama_connection()
+    if ok:
+        breaker.record_success()
+    else:
+        breaker.record_failure(message)
+    return ok, message
+
+def _probe_ollama_connection():
     """[SB] Ollama 서버 연결 상태 및 EEVE 모델 확인 (Docker → Mac 호스트)"""
+    import requests
     try:
         # host.docker.internal:11434는 Docker에서 호스트 머신에 접근하는 방법
         ollama_url = 'http://host.docker.internal:11434'
         
-        print(f"[SB] Ollama 연결 시도: {ollama_url}")
+        logger.info("Ollama 연결 시도: %s", ollama_url)
         
         # [SB] 1단계: Ollama 서버 연결 확인
         response = requests.get(f"{ollama_url}/api/tags", timeout=10)
@@ -48,7 +202,7 @@ def check_ollama_connection():
         models_data = response.json()
         available_models = [model['name'] for model in models_data.get('models', [])]
         
-        print(f"[SB] 사용 가능한 모델: {available_models}")
+        logger.info("사용 가능한 모델: %s", available_models)
         
         # [SB] 3단계: EEVE 모델 존재 확인 (대소문자 구분 없이)
         eeve_models = [model for model in available_models if 'EEVE' in model.upper() or 'eeve' in model.lower()]
@@ -57,7 +211,7 @@ def check_ollama_connection():
             return False, f"EEVE 모델이 Local에 설치되지 않았습니다. 사용 가능한 모델: {', '.join(available_models[:3])}..."
         
         # [SB] 4단계: LLM 모델 응답 테스트 (간단한 요청)
-        print(f"[SB] EEVE 모델 테스트: {eeve_models[0]}")
+        logger.info("EEVE 모델 테스트: %s", eeve_models[0])
         test_payload = {
             "model": eeve_models[0],
             "prompt": "안녕하세요",
@@ -79,6 +233,10 @@ def check_ollama_connection():
 
 def run_main_process(user_id, mattermost_username, mattermost_password):
     """[SB] main.py의 크롤링 로직을 별도 스레드에서 실행하는 함수"""
+    JOBS_STARTED.inc(trigger='login')
+    failure_reason = 'error'
+    job = register_login_job(user_id)
+    process = None
     try:
         # [SB] 진행 상태 초기화
         progress_store[user_id] = {
@@ -91,9 +249,12 @@ def run_main_process(user_id, mattermost_username, mattermost_password):
         # [SB] 환경 변수 임시 설정
         original_mm_username = os.environ.get('MATTERMOST_USERNAME')
         original_mm_password = os.environ.get('MATTERMOST_PASSWORD')
+        original_report_user_id = os.environ.get('MATTERMOST_REPORT_USER_ID')
         
         os.environ['MATTERMOST_USERNAME'] = mattermost_username
         os.environ['MATTERMOST_PASSWORD'] = mattermost_password
+        # [SB] MATTERMOST_TOKEN(봇 토큰)으로 전송할 때 보고서를 받을 사용자
+        os.environ['MATTERMOST_REPORT_USER_ID'] = user_id
         
         # [SB] 1단계: 환경 설정 완료 (10%)
         progress_store[user_id].update({
@@ -118,83 +279,105 @@ def run_main_process(user_id, mattermost_username, mattermost_password):
             'message': '대시보드 데이터 수집 중...'
         })
         
+        # [SB] 시작 전에 로그아웃했으면 main.py를 실행하지 않음
+        _check_cancelled(job)
+        
         # [SB] subprocess로 main.py 실행 (환경변수가 자동으로 전달됨)
+        env = os.environ.copy()
+        env['JOB_ID'] = current_job_id() or uuid.uuid4().hex[:8]
+        # [SB] 작업 마감 시각 - 프로세스 시작 대기 시간까지 예산에 포함
+        env.update(Deadline().env())
         try:
             # [SB] 실시간 진행률 업데이트를 위한 Popen 사용
-            process = subprocess.Popen([
-                sys.executable, 'main.py'
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            cwd=os.path.dirname(os.path.abspath(__file__)),
-            env=os.environ.copy()
-            )
+            with check_process_slot():
+                # [SB] 모듈을 미리 로드한 zygote에서 fork (utils/zygote.py, CHECK_ZYGOTE=false면 새 인터프리터)
+                process = spawn_script(['main.py'], env=env, cwd=os.path.dirname(os.path.abspath(__file__)))
+                # [SB] 출력은 실행 중 계속 읽음 (끝에 communicate()로 읽으면 파이프 버퍼가 차서 main.py가 멈출 수 있음)
+                output = ProcessLogReader(process, env['JOB_ID'])
             
-            # [SB] 프로세스 실행 중 진행률 시뮬레이션
-            start_time = time.time()
-            ai_analysis_started = False
+                # [SB] 프로세스 실행 중 진행률 시뮬레이션 - 구간 길이는 이전 실행들의 단계별 중앙값(utils/tracing.py 히스토그램), 기록이 없으면 기본값
+                start_time = time.time()
+                ai_analysis_started = False
+                estimates = stage_estimates(("크롤링/스크린샷", "필드 추출", "LLM 분석", "링크 체크", "Excel 생성", "전송"))
+                crawl_end = estimates.get("크롤링/스크린샷", 10)
+                extract_end = crawl_end + estimates.get("필드 추출", 5)
+                ai_end = extract_end + estimates.get("LLM 분석", 25) + estimates.get("링크 체크", 5)
+                report_seconds = max(1, estimates.get("Excel 생성", 5) + estimates.get("전송", 5))
             
-            while process.poll() is None:  # 프로세스가 실행 중인 동안
-                elapsed = time.time() - start_time
+                while process.poll() is None:  # 프로세스가 실행 중인 동안
+                    elapsed = time.time() - start_time
+                    # [SB] 로그아웃/이탈로 취소되면 main.py 종료 (진행 상태 갱신 전에 확인)
+                    try:
+                        _check_cancelled(job)
+                    except JobCancelled:
+                        returncode = stop_process(process)
+                        output.join()
+                        logger.info("main.py 종료 (종료 코드 %s)", returncode)
+                        raise
                 
-                if elapsed < 10:  # 처음 10초: 크롤링 단계 (30% → 45%)
-                    progress = min(45, 30 + (elapsed / 10) * 15)
-                    message = '대시보드 크롤링 진행 중...'
-                elif elapsed < 15:  # 10-15초: 크롤링 완료 단계 (45% → 50%)
-                    progress = min(50, 45 + ((elapsed - 10) / 5) * 5)
-                    message = '데이터 추출 완료, AI 분석 준비 중...'
-                elif elapsed < 45:  # 15-45초: AI 분석 단계 (50% → 85%)
-                    if not ai_analysis_started:
-                        progress_store[user_id].update({
-                            'progress': 50,
-                            'step': 4,
-                            'message': '🤖 AI 분석 시작...'
-                        })
-                        ai_analysis_started = True
+                    if elapsed < crawl_end:  # 크롤링 단계 (30% → 45%)
+                        progress = min(45, 30 + (elapsed / crawl_end) * 15)
+                        message = '대시보드 크롤링 진행 중...'
+                    elif elapsed < extract_end:  # 크롤링 완료 단계 (45% → 50%)
+                        progress = min(50, 45 + ((elapsed - crawl_end) / (extract_end - crawl_end)) * 5)
+                        message = '데이터 추출 완료, AI 분석 준비 중...'
+                    elif elapsed < ai_end:  # AI 분석 단계 (50% → 85%)
+                        if not ai_analysis_started:
+                            progress_store[user_id].update({
+                                'progress': 50,
+                                'step': 4,
+                                'message': '🤖 AI 분석 시작...'
+                            })
+                            ai_analysis_started = True
                     
-                    # AI 분석 진행률을 세분화
-                    ai_progress = (elapsed - 15) / 30  # 0 → 1 over 30 seconds
-                    progress = 50 + (ai_progress * 35)  # 50% → 85%
+                        # AI 분석 진행률을 세분화
+                        ai_progress = (elapsed - extract_end) / (ai_end - extract_end)  # 0 → 1
+                        progress = 50 + (ai_progress * 35)  # 50% → 85%
                     
-                    if ai_progress < 0.3:
-                        message = '🤖 AI가 대시보드 상태를 분석하고 있습니다...'
-                    elif ai_progress < 0.6:
-                        message = '🤖 예치금 및 서비스 상태를 검증 중...'
-                    elif ai_progress < 0.9:
-                        message = '🤖 링크 상태 및 시스템 점검 중...'
-                    else:
-                        message = '🤖 AI 분석 완료, 보고서 생성 중...'
-                else:  # 45초 이후: 보고서 생성 및 전송 (85% → 95%)
-                    progress = min(95, 85 + ((elapsed - 45) / 10) * 10)
-                    message = '📊 Excel 보고서 생성 중...'
+                        if ai_progress < 0.3:
+                            message = '🤖 AI가 대시보드 상태를 분석하고 있습니다...'
+                        elif ai_progress < 0.6:
+                            message = '🤖 예치금 및 서비스 상태를 검증 중...'
+                        elif ai_progress < 0.9:
+                            message = '🤖 링크 상태 및 시스템 점검 중...'
+                        else:
+                            message = '🤖 AI 분석 완료, 보고서 생성 중...'
+                    else:  # 보고서 생성 및 전송 (85% → 95%)
+                        progress = min(95, 85 + ((elapsed - ai_end) / report_seconds) * 10)
+                        message = '📊 Excel 보고서 생성 중...'
                 
-                progress_store[user_id].update({
-                    'progress': int(progress),
-                    'message': message
-                })
+                    progress_store[user_id].update({
+                        'progress': int(progress),
+                        'message': message
+                    })
                 
-                time.sleep(1)  # 1초마다 업데이트
+                    job['cancel'].wait(1)  # 1초마다 업데이트 (취소 요청 시 바로 깨어남)
                 
-                # [SB] 타임아웃 체크 (5분)
-                if elapsed > 300:
-                    process.terminate()
-                    raise Exception("처리 시간 초과 (5분)")
+                    # [SB] 타임아웃 체크 (작업 예산을 넘겨도 끝나지 않은 경우)
+                    if elapsed > CHECK_TIMEOUT:
+                        process.terminate()
+                        failure_reason = 'timeout'
+                        raise Exception(f"처리 시간 초과 ({CHECK_TIMEOUT // 60}분)")
             
-            # [SB] 프로세스 완료 후 결과 확인
-            stdout, stderr = process.communicate()
+                # [SB] 프로세스 완료 후 결과 확인
+                process.wait()
+                output.join()
+                stdout, stderr = output.stdout, output.stderr
             
             if process.returncode != 0:
                 error_msg = stderr.strip() if stderr else "알 수 없는 오류"
-                logger.error(f"main.py stderr: {error_msg}")
-                logger.error(f"main.py stdout: {stdout}")
+                logger.error("main.py stderr: %s", error_msg)
+                logger.error("main.py stdout: %s", stdout)
                 raise Exception(f"대시보드 처리 실패: {error_msg}")
+            if 'breaker_open' in output.events:
+                raise Exception(DASHBOARD_DOWN_MESSAGE)
             
             # [SB] 실제 결과 기반 최종 메시지 결정
-            if "성공적으로 전송되었습니다" in stdout:
+            outcome = _delivery_outcome(stdout, output.events)
+            if outcome == 'delivered':
                 final_message = '🎉 Mattermost 전송 완료!'
                 final_progress = 100
-            elif "전송 실패" in stdout:
+            elif outcome == 'delivery_failed':
                 final_message = '⚠️ Excel 생성 완료 (Mattermost 전송 실패)'
                 final_progress = 95
             else:
@@ -212,16 +395,35 @@ def run_main_process(user_id, mattermost_username, mattermost_password):
                     'timestamp': datetime.now().isoformat(),
                     'auto_logout': True,
                     'stdout': stdout[-1000:] if stdout else "",
+                    'report_url': '/latest/report' if latest_report_path(load_latest_result()) else None,
                 }
             }
+            JOBS_COMPLETED.inc(trigger='login', delivery=outcome)
             
         except subprocess.TimeoutExpired:
             raise Exception("처리 시간 초과 (5분) - 네트워크나 서버 상태를 확인해주세요")
+        except JobCancelled:
+            raise
         except Exception as e:
             raise Exception(f"대시보드 처리 중 오류: {str(e)}")
             
+    except JobCancelled:
+        reason = job['reason']
+        logger.info("로그인 점검 취소 (%s)", reason, extra={'event': 'job_cancelled', 'data': {'reason': reason}})
+        JOBS_CANCELLED.inc(trigger='login', reason=reason)
+        # [SB] 같은 사용자의 새 작업이 진행 상태를 쓰고 있으면(replaced) 건드리지 않음
+        if reason == 'abandoned':
+            progress_store[user_id] = {
+                'status': 'cancelled',
+                'progress': 0,
+                'step': 0,
+                'message': '⏹️ 진행 페이지를 벗어나 점검을 취소했습니다',
+                'auto_logout': True
+            }
+        
     except Exception as e:
-        logger.error(f"메인 프로세스 실행 오류: {e}")
+        logger.error("메인 프로세스 실행 오류: %s", e)
+        JOBS_FAILED.inc(trigger='login', reason=failure_reason)
         progress_store[user_id] = {
             'status': 'error',
             'progress': 0,
@@ -232,6 +434,17 @@ def run_main_process(user_id, mattermost_username, mattermost_password):
         }
         
     finally:
+        # [SB] 예외로 빠져나온 경우에도 main.py가 남지 않도록 종료
+        if process is not None and process.poll() is None:
+            stop_process(process)
+        with login_jobs_lock:
+            if login_jobs.get(user_id) is job:
+                del login_jobs[user_id]
+        # [SB] 로그아웃한 사용자의 진행 상태는 남기지 않음 (취소 직전에 끝난 작업 포함)
+        if job['reason'] == 'logout':
+            progress_store.pop(user_id, None)
+
+        
         # [SB] 환경 변수 복원
         if original_mm_username:
             os.environ['MATTERMOST_USERNAME'] = original_mm_username
@@ -242,6 +455,301 @@ def run_main_process(user_id, mattermost_username, mattermost_password):
             os.environ['MATTERMOST_PASSWORD'] = original_mm_password
         else:
             os.environ.pop('MATTERMOST_PASSWORD', None)
+            
+        if original_report_user_id:
+            os.environ['MATTERMOST_REPORT_USER_ID'] = original_report_user_id
+        else:
+            os.environ.pop('MATTERMOST_REPORT_USER_ID', None)
+
+def drain_pending_outbox():
+    """
+    [SB] 재전송 대기 항목이 있는 계정마다 아웃박스를 한 번 비우는 함수
+
+    사용자 비밀번호는 보관하지 않으므로 사용자 계정의 항목은 봇 토큰(MATTERMOST_TOKEN) 또는 .env의 공용 계정이
+    대신 보냅니다 (자신(DM) 대상은 그 사용자와의 DM). 둘 다 없으면 재전송할 방법이 없으므로 dead로 처리합니다.
+    """
+    from utils.mattermost import _get_mattermost_token, MattermostSession
+    from utils.delivery import drain_outbox
+    token = _get_mattermost_token()
+    service = SERVICE_MM_USERNAME.lower() if SERVICE_MM_USERNAME and SERVICE_MM_PASSWORD else None
+    url = os.getenv('MATTERMOST_URL')
+    for sender in pending_senders():
+        relay_for = None
+        if sender.startswith('token:'):
+            # [SB] 토큰으로 보낸 항목은 같은 토큰과 수신자로 재전송
+            if not token:
+                continue
+            mm_session = MattermostSession(url, token=token, recipient_id=sender[len('token:'):])
+        elif sender == service:
+            mm_session = MattermostSession(url, SERVICE_MM_USERNAME, SERVICE_MM_PASSWORD)
+        elif token or service:
+            relay_for = sender
+            mm_session = MattermostSession(url, token=token) if token else MattermostSession(url, SERVICE_MM_USERNAME, SERVICE_MM_PASSWORD)
+        else:
+            abandoned = abandon_sender(sender, "재전송할 자격 증명 없음 (MATTERMOST_TOKEN 또는 공용 계정 필요)")
+            if abandoned:
+                logger.warning("재전송할 자격 증명이 없어 아웃박스 항목 %s건을 포기합니다 (%s)", abandoned, sender)
+            continue
+        with mm_session:
+            counts = drain_outbox(session=mm_session, sender=relay_for)
+        if any(counts.values()):
+            logger.info("아웃박스 재전송 결과 (%s): %s", sender, counts)
+
+def outbox_drainer(interval):
+    """[SB] 백그라운드 아웃박스 재전송 루프 (interval초마다 재시도 시각이 된 항목 전송)"""
+    while True:
+        time.sleep(interval)
+        try:
+            drain_pending_outbox()
+            purge_outbox()
+            purge_history()
+        except Exception as e:
+            logger.error("아웃박스 재전송 오류: %s", e)
+
+def start_outbox_drainer():
+    """[SB] 아웃박스 재전송 스레드 시작 (OUTBOX_DRAIN_INTERVAL초 간격, 기본 60초)"""
+    interval = float(os.getenv('OUTBOX_DRAIN_INTERVAL', '60'))
+    thread = threading.Thread(target=outbox_drainer, args=(interval,), name='outbox-drainer')
+    thread.daemon = True
+    thread.start()
+    logger.info("아웃박스 재전송 스레드 시작 (%.0f초 간격)", interval)
+
+def public_run(run):
+    """[SB] API 응답용 실행 정보 (완료 이벤트 객체 제외)"""
+    if run is None:
+        return None
+    return {key: value for key, value in run.items() if key != 'done'}
+
+def start_check_run(trigger):
+    """
+    [SB] 공용 계정으로 점검(main.py)을 시작하는 함수 - 이미 실행 중이면 새로 시작하지 않고 그 실행에 합류
+
+    Args:
+        trigger (str): 실행 계기 ('schedule' 또는 'refresh')
+
+    Returns:
+        tuple: (실행 정보 dict, 기존 실행 합류 여부)
+    """
+    global current_check_run
+    with check_run_lock:
+        if current_check_run is not None:
+            return current_check_run, True
+        run = {
+            'id': uuid.uuid4().hex[:8],
+            'trigger': trigger,
+            'status': 'running',
+            'message': '점검 실행 중...',
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'finished_at': None,
+            'done': threading.Event(),
+        }
+        current_check_run = run
+
+    thread = threading.Thread(target=with_job_id, args=(run['id'], run_check_process, run), name=f"check-{run['id']}")
+    thread.daemon = True
+    thread.start()
+    logger.info("점검 시작 (%s, 실행 ID: %s)", trigger, run['id'])
+    return run, False
+
+def run_check_process(run):
+    """[SB] 로그인 사용자 없이 main.py 실행 - 결과와 보고서는 main.py가 최신 결과 저장소에 보관"""
+    global current_check_run, last_check_run
+    # [SB] 로그인 실행(run_main_process)이 바꾼 환경 변수가 섞이지 않도록 공용 계정 값을 명시적으로 설정
+    env = os.environ.copy()
+    service_env = {
+        'MATTERMOST_USERNAME': SERVICE_MM_USERNAME,
+        'MATTERMOST_PASSWORD': SERVICE_MM_PASSWORD,
+        'MATTERMOST_REPORT_USER_ID': SERVICE_REPORT_USER_ID,
+    }
+    for name, value in service_env.items():
+        if value:
+            env[name] = value
+        else:
+            env.pop(name, None)
+    env['CHECK_TRIGGER'] = run['trigger']
+    # [SB] main.py 로그의 job_id와 실행 추적 파일(logs/traces/)의 실행 ID를 웹 UI의 실행 ID와 맞춤
+    env['JOB_ID'] = run['id']
+    env.update(Deadline().env())
+
+    JOBS_STARTED.inc(trigger=run['trigger'])
+    try:
+        with check_process_slot():
+            process = spawn_script(['main.py'], env=env, cwd=os.path.dirname(os.path.abspath(__file__)))
+            output = ProcessLogReader(process, run['id'])
+            try:
+                process.wait(timeout=CHECK_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                raise
+            finally:
+                output.join()
+        stdout = output.stdout
+        if process.returncode != 0:
+            error_msg = output.stderr.strip() or "알 수 없는 오류"
+            logger.error("점검 실행 실패 (%s): %s", run['id'], error_msg)
+            run.update(status='error', message=f'❌ 점검 실패: {error_msg[-300:]}')
+            JOBS_FAILED.inc(trigger=run['trigger'], reason='error')
+        elif 'breaker_open' in output.events:
+            run.update(status='error', message=f'❌ {DASHBOARD_DOWN_MESSAGE}')
+            JOBS_FAILED.inc(trigger=run['trigger'], reason='breaker_open')
+        else:
+            outcome = _delivery_outcome(stdout, output.events)
+            run.update(status='completed', message={
+                'delivered': '🎉 점검 완료 (Mattermost 전송 완료)',
+                'delivery_failed': '⚠️ 점검 완료 (Mattermost 전송 실패)',
+                'not_sent': '📄 점검 완료',
+            }[outcome])
+            JOBS_COMPLETED.inc(trigger=run['trigger'], delivery=outcome)
+    except subprocess.TimeoutExpired:
+        run.update(status='error', message=f'❌ 처리 시간 초과 ({CHECK_TIMEOUT // 60}분)')
+        JOBS_FAILED.inc(trigger=run['trigger'], reason='timeout')
+    except Exception as e:
+        logger.error("점검 실행 오류 (%s): %s", run['id'], e)
+        run.update(status='error', message=f'❌ 오류 발생: {str(e)}')
+        JOBS_FAILED.inc(trigger=run['trigger'], reason='error')
+    finally:
+        run['finished_at'] = datetime.now().isoformat(timespec='seconds')
+        with check_run_lock:
+            current_check_run = None
+            last_check_run = run
+        run['done'].set()
+        logger.info("점검 종료 (%s, 실행 ID: %s): %s", run['trigger'], run['id'], run['message'])
+
+def check_scheduler(schedules):
+    """[SB] cron 스케줄에 맞춰 점검을 실행하는 루프 (시계 변경에 대비해 최대 30초씩 나눠서 대기)"""
+    while True:
+        fire_at = next_run_time(schedules)
+        scheduler_state['next_run'] = fire_at.isoformat(timespec='seconds')
+        logger.info("다음 정기 점검: %s", fire_at.strftime('%Y-%m-%d %H:%M'))
+        while True:
+            remaining = (fire_at - datetime.now()).total_seconds()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 30))
+        try:
+            run, joined = start_check_run('schedule')
+            if joined:
+                logger.info("이미 실행 중인 점검이 있어 정기 점검을 건너뜁니다 (실행 ID: %s)", run['id'])
+        except Exception as e:
+            logger.error("정기 점검 시작 오류: %s", e)
+
+def start_check_scheduler():
+    """[SB] SCHEDULE_CRON이 설정되어 있으면 정기 점검 스레드 시작"""
+    schedules = load_schedules()
+    if not schedules:
+        return
+    scheduler_state['schedules'] = [schedule.expression for schedule in schedules]
+    thread = threading.Thread(target=check_scheduler, args=(schedules,), name='check-scheduler')
+    thread.daemon = True
+    thread.start()
+    logger.info("정기 점검 스케줄러 시작: %s", '; '.join(scheduler_state['schedules']))
+
+def latest_is_fresh():
+    """[SB] 최신 점검 결과가 LATEST_MAX_AGE초(기본 600초) 이내이고 보고서 파일이 있는지"""
+    max_age = float(os.getenv('LATEST_MAX_AGE', '600'))
+    result = load_latest_result()
+    age = result_age(result)
+    return age is not None and age <= max_age and latest_report_path(result) is not None
+
+def open_latest_report(result, report_path, username):
+    """
+    [SB] 로그인 사용자에게 보낼 최신 보고서 - 같은 담당자용으로 오늘 만든 보고서면 저장된 파일을 그대로,
+    아니면 result.json의 분석 결과로 이 사용자용 보고서를 다시 생성 (스크린샷은 보관하지 않으므로 제외)
+
+    Returns:
+        SpooledReport: 보고서 (사용 후 close 필요)
+    """
+    if report_matches(result, username):
+        with open(report_path, 'rb') as report_file:
+            return SpooledReport.from_stream(result.get('report_name') or report_path.name, report_file)
+    from utils.xlsx import create_dashboard_excel
+    logger.info("최신 보고서를 '%s' 담당자용으로 다시 생성합니다 (저장된 보고서: %s, %s)", username, result.get('username'), result['checked_at'])
+    return create_dashboard_excel(result['llm'], in_memory=True, username=username, checklist=result.get('checklist'),
+                                  forecast_lines=result.get('forecast_lines'))
+
+def deliver_latest_process(user_id, mattermost_username, mattermost_password):
+    """[SB] 새로 점검하지 않고 최신 점검 보고서를 로그인 사용자에게 전송 (진행 중인 정기 점검이 있으면 완료 후 전송)"""
+    started = False
+    try:
+        progress_store[user_id] = {
+            'status': 'running',
+            'progress': 10,
+            'step': 1,
+            'message': '최신 점검 결과 확인 중...'
+        }
+
+        with check_run_lock:
+            run = current_check_run
+        if run is not None:
+            progress_store[user_id].update({
+                'progress': 50,
+                'step': 3,
+                'message': '진행 중인 점검이 끝나기를 기다리는 중...'
+            })
+            run['done'].wait(CHECK_TIMEOUT + 30)
+
+        result = load_latest_result()
+        report_path = latest_report_path(result)
+        if report_path is None or 'llm' not in result:
+            # [SB] 합류한 점검이 보고서를 만들지 못했으면(또는 분석 결과가 없는 이전 형식이면) 직접 점검
+            run_main_process(user_id, mattermost_username, mattermost_password)
+            return
+
+        JOBS_STARTED.inc(trigger='latest')
+        started = True
+        progress_store[user_id].update({
+            'progress': 85,
+            'step': 4,
+            'message': '📨 최신 점검 보고서 전송 중...'
+        })
+
+        from utils.mattermost import _get_mattermost_token, _display_name, MattermostSession
+        from utils.delivery import build_destinations, deliver_report
+        token = _get_mattermost_token()
+        if token:
+            mm_session = MattermostSession(os.getenv('MATTERMOST_URL'), token=token, recipient_id=user_id)
+        else:
+            mm_session = MattermostSession(os.getenv('MATTERMOST_URL'), mattermost_username, mattermost_password)
+        with mm_session:
+            username = _display_name(mm_session.recipient) if mm_session.recipient else None
+            report = open_latest_report(result, report_path, username)
+            try:
+                # [SB] 로그인한 사용자 자신(DM)에게만 전송 (팀 채널에는 정기 점검 때 이미 전송됨)
+                results = deliver_report(build_destinations()[:1], file_bytes=report, file_name=report.name, session=mm_session)
+            finally:
+                report.close()
+
+        success = bool(results) and results[0]['success']
+        JOBS_COMPLETED.inc(trigger='latest', delivery='delivered' if success else 'delivery_failed')
+        checked_at = datetime.fromisoformat(result['checked_at'])
+        progress_store[user_id] = {
+            'status': 'completed',
+            'progress': 100 if success else 95,
+            'step': 5,
+            'message': (f"🎉 {checked_at:%H:%M} 점검 보고서 전송 완료!" if success
+                        else f"⚠️ {checked_at:%H:%M} 점검 보고서 (Mattermost 전송 실패)"),
+            'result': {
+                'success': success,
+                'timestamp': datetime.now().isoformat(),
+                'auto_logout': True,
+                'cached': True,
+                'checked_at': result['checked_at'],
+                'report_url': '/latest/report',
+            }
+        }
+    except Exception as e:
+        logger.error("최신 보고서 전송 오류: %s", e)
+        if started:
+            JOBS_FAILED.inc(trigger='latest', reason='error')
+        progress_store[user_id] = {
+            'status': 'error',
+            'progress': 0,
+            'step': 0,
+            'message': f'❌ 오류 발생: {str(e)}',
+            'error': str(e),
+            'auto_logout': True
+        }
 
 def check_main_py_status():
     """[SB] main.py 파일 상태 및 필수 환경변수 확인"""
@@ -305,20 +813,28 @@ def login():
         ollama_ok, ollama_message = check_ollama_connection()
         if not ollama_ok:
             flash(f'❌ AI 연결을 확인해주세요: {ollama_message}', 'error')
-            logger.error(f"Ollama 연결 실패: {ollama_message}")
+            logger.error("Ollama 연결 실패: %s", ollama_message)
             return render_template('login.html')
         else:
-            logger.info(f"Ollama 연결 성공: {ollama_message}")
+            logger.info("Ollama 연결 성공: %s", ollama_message)
         
         # [SB] Mattermost 인증 시도 (사용자가 입력한 정보로)
         try:
+            from utils.mattermost import _create_mattermost_driver, _is_outage, mattermost_breaker
             mattermost_url = os.getenv('MATTERMOST_URL')
             driver, success = _create_mattermost_driver(mattermost_url, username, password)
             if not success:
                 flash('로그인 실패: Mattermost 서버 연결 오류', 'error')
                 return render_template('login.html')
             
-            driver.login()
+            # [SB] Mattermost 차단기가 열려 있으면 연결 제한 시간(60초)을 기다리지 않고 바로 안내
+            try:
+                with mattermost_breaker().guard(_is_outage):
+                    driver.login()
+            except CircuitOpenError as e:
+                logger.warning("Mattermost 로그인 차단: %s", e)
+                flash(f'❌ Mattermost 서버에 연결할 수 없습니다. {e.retry_in:.0f}초 후 다시 시도해주세요.', 'error')
+                return render_template('login.html')
             user = driver.users.get_user('me')
             driver.logout()
             
@@ -327,10 +843,17 @@ def login():
             session['username'] = user.get('username', username)
             session['display_name'] = user.get('nickname') or f"{user.get('first_name', '')} {user.get('last_name', '')}".strip() or username
             
+            # [SB] 최근 점검 결과가 있거나 정기 점검이 진행 중이면 새로 점검하지 않고 그 보고서를 전송
+            #      대시보드 차단기가 열려 있으면(대시보드 장애) 오래된 결과라도 마지막 보고서를 전송
+            with check_run_lock:
+                check_running = current_check_run is not None
+            dashboard_down = CircuitBreaker('dashboard').is_open() and latest_report_path(load_latest_result()) is not None
+            target = deliver_latest_process if (check_running or dashboard_down or latest_is_fresh()) else run_main_process
+            
             # [SB] 백그라운드에서 main.py 실행 시작 (사용자 입력 정보 전달)
             thread = threading.Thread(
-                target=run_main_process,
-                args=(user['id'], username, password)
+                target=with_job_id,
+                args=(uuid.uuid4().hex[:8], target, user['id'], username, password)
             )
             thread.daemon = True
             thread.start()
@@ -339,7 +862,7 @@ def login():
             return redirect(url_for('progress'))
             
         except Exception as e:
-            logger.error(f"로그인 오류: {e}")
+            logger.error("로그인 오류: %s", e)
             flash('❌ 로그인 실패: 사용자명 또는 비밀번호를 확인해주세요.', 'error')
     
     return render_template('login.html')
@@ -357,8 +880,10 @@ def progress():
 def logout():
     """[SB] 로그아웃 처리"""
     user_id = session.get('user_id')
-    if user_id and user_id in progress_store:
-        del progress_store[user_id]  # 진행 상태 정리
+    if user_id:
+        # [SB] 실행 중인 점검은 취소 - 진행 상태는 작업 스레드가 main.py 종료 후 정리
+        if not cancel_login_job(user_id, 'logout'):
+            progress_store.pop(user_id, None)  # 진행 상태 정리
     
     session.clear()
     flash('로그아웃되었습니다.', 'info')
@@ -371,13 +896,14 @@ def api_progress():
         return jsonify({'error': '인증 필요', 'redirect': '/login'}), 401
     
     user_id = session['user_id']
+    touch_login_job(user_id)
     
     # [SB] 진행 상태 반환
     if user_id in progress_store:
         progress_data = progress_store[user_id]
         
         # [SB] 완료 또는 오류 시 자동 로그아웃 처리
-        if progress_data.get('auto_logout') and progress_data['status'] in ['completed', 'error']:
+        if progress_data.get('auto_logout') and progress_data['status'] in ['completed', 'error', 'cancelled']:
             # [SB] 5초 후 자동 로그아웃 설정
             progress_data['logout_countdown'] = 5
             
@@ -395,12 +921,143 @@ def api_progress():
 def api_logout():
     """[SB] API를 통한 로그아웃 처리"""
     user_id = session.get('user_id')
-    if user_id and user_id in progress_store:
-        del progress_store[user_id]  # 진행 상태 정리
+    if user_id:
+        if not cancel_login_job(user_id, 'logout'):
+            progress_store.pop(user_id, None)  # 진행 상태 정리
     
     session.clear()
     return jsonify({'success': True, 'redirect': '/login'})
 
+@app.route('/api/latest')
+def api_latest():
+    """[SB] 최신 점검 결과 API - 점검을 기다리지 않고 마지막 결과를 바로 반환"""
+    if 'user_id' not in session:
+        return jsonify({'error': '인증 필요', 'redirect': '/login'}), 401
+    
+    result = load_latest_result()
+    with check_run_lock:
+        run = public_run(current_check_run)
+        last_run = public_run(last_check_run)
+    
+    return jsonify({
+        'result': result,
+        'age_seconds': result_age(result),
+        'report_url': '/latest/report' if latest_report_path(result) else None,
+        'running': run,
+        'last_run': last_run,
+        'schedules': scheduler_state['schedules'],
+        'next_scheduled_run': scheduler_state['next_run'],
+    })
+
+@app.route('/latest/report')
+def latest_report():
+    """[SB] 최신 점검 보고서(xlsx) 다운로드"""
+    if 'user_id' not in session:
+        flash('로그인이 필요합니다.', 'warning')
+        return redirect(url_for('login'))
+    
+    result = load_latest_result()
+    report_path = latest_report_path(result)
+    if report_path is None:
+        return jsonify({'error': '저장된 보고서가 없습니다'}), 404
+    
+    return send_file(
+        report_path.resolve(),
+        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        as_attachment=True,
+        download_name=result.get('report_name') or report_path.name,
+    )
+
+@app.route('/api/refresh', methods=['POST'])
+def api_refresh():
+    """[SB] 즉시 점검 API - 이미 실행 중인 점검이 있으면 그 실행에 합류 (?wait=1이면 완료까지 대기)"""
+    if 'user_id' not in session:
+        return jsonify({'error': '인증 필요', 'redirect': '/login'}), 401
+    
+    run, joined = start_check_run('refresh')
+    if request.args.get('wait', '').lower() in ('1', 'true', 'yes'):
+        run['done'].wait(CHECK_TIMEOUT + 30)
+    
+    finished = run['done'].is_set()
+    return jsonify({
+        'run': public_run(run),
+        'joined': joined,
+        'result': load_latest_result() if finished else None,
+    }), 200 if finished else 202
+
+def _parse_time_arg(name):
+    """[SB] 쿼리 문자열의 ISO 시각(예: 2025-01-31T09:00)을 epoch 초로 변환 (없으면 None)"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    return datetime.fromisoformat(value).timestamp()
+
+@app.route('/api/history')
+def api_history():
+    """[SB] 점검 이력 조회 API - ?start=&end=(ISO 시각)&limit= 기간 내 스냅샷 요약 (최신순)"""
+    if 'user_id' not in session:
+        return jsonify({'error': '인증 필요', 'redirect': '/login'}), 401
+    
+    try:
+        start = _parse_time_arg('start')
+        end = _parse_time_arg('end')
+        limit = min(int(request.args.get('limit', '100')), 1000)
+    except ValueError as e:
+        return jsonify({'error': f'잘못된 조회 조건: {e}'}), 400
+    
+    return jsonify({'snapshots': query_snapshots(start=start, end=end, limit=limit)})
+
+@app.route('/api/history/<int:snapshot_id>')
+def api_history_snapshot(snapshot_id):
+    """[SB] 스냅샷 상세와 바로 이전 스냅샷 대비 변경 사항"""
+    if 'user_id' not in session:
+        return jsonify({'error': '인증 필요', 'redirect': '/login'}), 401
+    
+    snapshot = get_snapshot(snapshot_id)
+    if snapshot is None:
+        return jsonify({'error': '스냅샷이 없습니다'}), 404
+    previous, changes = diff_with_previous(snapshot_id)
+    
+    return jsonify({
+        'snapshot': snapshot,
+        'previous': previous,
+        'changes': changes,
+    })
+
+def metrics_gauges():
+    """[SB] /metrics 요청 시점의 게이지 (메모리 상태 + 아웃박스 항목 수)"""
+    running_logins = sum(1 for progress in list(progress_store.values()) if progress.get('status') == 'running')
+    with check_run_lock:
+        check_running = current_check_run is not None
+    with check_process_lock:
+        browsers = running_check_processes
+    gauges = [
+        ('dashboard_check_jobs_running', '실행 중인 작업 수 (kind: login=로그인 사용자 점검/전송, check=공용 계정 점검)',
+         [({'kind': 'login'}, running_logins), ({'kind': 'check'}, int(check_running))]),
+        ('dashboard_browser_sessions_active', '실행 중인 점검 프로세스(헤드리스 브라우저) 수', [({}, browsers)]),
+        ('dashboard_active_sessions', '진행 상태가 있는 로그인 세션 수', [({}, len(progress_store))]),
+    ]
+    try:
+        stats = outbox_stats()
+        gauges.append(('dashboard_outbox_items', '아웃박스 항목 수 (pending=재전송 대기열)',
+                       [({'status': status}, stats.get(status, 0)) for status in ('pending', 'sent', 'dead')]))
+    except Exception as e:
+        logger.error("아웃박스 상태 조회 오류: %s", e)
+    breakers = breaker_states()
+    if breakers:
+        gauges.append(('dashboard_breaker_open', '의존 서비스 차단기 열림 여부 (breaker: ollama/mattermost/dashboard, 1=open)',
+                       [({'breaker': name}, int(status['state'] == STATE_OPEN)) for name, status in breakers.items()]))
+    age = result_age(load_latest_result())
+    if age is not None:
+        gauges.append(('dashboard_latest_result_age_seconds', '최신 점검 결과가 만들어진 후 지난 시간(초)', [({}, round(age, 3))]))
+    return gauges
+
+@app.route('/metrics')
+def metrics():
+    """[SB] Prometheus 스크레이프용 메트릭 (텍스트 형식) - 작업 수, 대기열, 단계/LLM/Mattermost 소요 시간, 캐시 적중"""
+    body = render_metrics((JOBS_STARTED, JOBS_COMPLETED, JOBS_FAILED, JOBS_CANCELLED), metrics_gauges())
+    return app.response_class(body, content_type=METRICS_CONTENT_TYPE)
+
 @app.route('/health')
 def health():
     """[SB] 헬스체크 엔드포인트 - Docker 컨테이너 상태 확인용"""
@@ -431,6 +1088,8 @@ def api_status():
         'ollama_ok': ollama_ok,
         'ollama_message': ollama_message,
         'active_sessions': len(progress_store),
+        # [SB] 의존 서비스 차단기 상태 (closed/open/half_open, 열린 경우 재시도까지 남은 시간과 마지막 오류)
+        'breakers': breaker_states(),
         'env_check': {
             'dashboard_configured': bool(os.getenv('DASHBOARD_URL')),
             'mattermost_configured': bool(os.getenv('MATTERMOST_URL')),
@@ -443,20 +1102,39 @@ def api_status():
         }
     })
 
-if __name__ == '__main__':
-    # [SB] 시작 시 상태 체크
+def start_zygote():
+    """[SB] 점검 작업용 zygote 미리 시작 - 첫 점검이 모듈 로드를 기다리지 않도록"""
+    if not zygote_enabled():
+        return
+    try:
+        shared_zygote()
+    except ZygoteError as e:
+        logger.warning("zygote 시작 실패 (점검은 새 프로세스로 실행): %s", e)
+
+def startup_checks():
+    """[SB] 시작 시 상태 체크 (main.py/환경 변수, Ollama 연결) - 결과는 로그로만 남김"""
     status_ok, status_message = check_main_py_status()
     if status_ok:
-        logger.info(f"✅ 시작 시 검사 통과: {status_message}")
+        logger.info("✅ 시작 시 검사 통과: %s", status_message)
     else:
-        logger.error(f"❌ 시작 시 검사 실패: {status_message}")
+        logger.error("❌ 시작 시 검사 실패: %s", status_message)
     
     # [SB] Ollama 연결 상태 체크
     ollama_ok, ollama_message = check_ollama_connection()
     if ollama_ok:
-        logger.info(f"✅ Ollama 연결 확인: {ollama_message}")
+        logger.info("✅ Ollama 연결 확인: %s", ollama_message)
     else:
-        logger.warning(f"⚠️ Ollama 연결 문제: {ollama_message}")
+        logger.warning("⚠️ Ollama 연결 문제: %s", ollama_message)
+
+if __name__ == '__main__':
+    # [SB] 시작 시 상태 체크 - Ollama 응답(최대 25초)을 기다리지 않고 바로 요청을 받도록 백그라운드에서 실행
+    threading.Thread(target=startup_checks, name='startup-checks', daemon=True).start()
+        
+    # [SB] 아웃박스 재전송 스레드 - debug 리로더는 이 블록을 두 번 실행하므로 실제 서버 프로세스에서만 시작
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        threading.Thread(target=start_zygote, name='zygote-start', daemon=True).start()
+        start_outbox_drainer()
+        start_check_scheduler()
         
     # [SB] 개발 서버 실행 - 프로덕션에서는 gunicorn 등 사용
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5000, debug=True)
@@ -3,21 +3,130 @@
 import asyncio
 import json
 import os
+import signal
 import sys
 import stat
+import time
+from contextlib import AsyncExitStack
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
-from utils.xlsx import create_dashboard_excel
-from utils.fields import extract_fields
-from utils.llm import analyze_with_ollama
-from utils.mattermost import send_excel_to_self, send_excel_to_team_channel, verify_mattermost_env, get_mattermost_username
+# [SB] 무거운 모듈(crawl4ai, bs4, ollama, openpyxl, pandas, mattermostdriver/aiohttp)은 사용하는 단계에서 import
+#      (브라우저 실행까지의 시작 시간 단축 - python -m utils.startup으로 확인)
+from utils.checklist import evaluate_checklist
+from utils.report_text import render_checklist_markdown, render_changes_markdown, render_no_change_message
+from utils.workers import run_blocking
+from utils.memory import StageMemory
+from utils.tracing import RunTrace, span, tracing_enabled, stage_estimates
+from utils.deadline import Deadline
+from utils.breaker import CircuitBreaker
+from utils.log import setup_logging
+from utils.latest import save_latest_result
+from utils.history import history_enabled, record_snapshot, finish_snapshot, diff_with_previous, last_full_report, verdict_digest, DELIVERY_FULL, DELIVERY_NO_CHANGE
 import io
+import logging
 
 # 환경 변수 로드
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+def _latest_result(llm_json, checklist, username, delivered, forecast_lines=None):
+    """[SB] 최신 결과 저장소(utils/latest.py)에 보관할 점검 결과 (웹 서버가 다른 사용자용 보고서를 다시 만들 수 있도록 분석 결과 포함)"""
+    return {
+        "checked_at": datetime.now().isoformat(timespec="seconds"),
+        "trigger": os.getenv("CHECK_TRIGGER", "login"),
+        "username": username,
+        "all_ok": all(row["정상"] for row in checklist),
+        "delivered": delivered,
+        "llm": llm_json,
+        "checklist": checklist,
+        "forecast_lines": forecast_lines or [],
+    }
+
+async def _save_latest(result, report, report_name, keep_report=False):
+    """[SB] 최신 결과 저장 - 실패해도 보고서 전송 결과에는 영향 없음"""
+    try:
+        await run_blocking(save_latest_result, result, report, report_name, keep_report=keep_report)
+    except Exception as e:
+        logger.warning("최신 결과 저장 실패: %s", e)
+
+async def _record_history(extracted, llm_json, checklist):
+    """
+    [SB] 이번 점검을 이력 DB(utils/history.py)에 저장하고 이전 점검과 비교
+
+    Returns:
+        tuple: (스냅샷 ID 또는 None, 이전 스냅샷 요약 또는 None, 변경 목록) - 이력 저장을 쓰지 않거나 실패하면 (None, None, [])
+    """
+    if not history_enabled():
+        return None, None, []
+    try:
+        snapshot_id = await run_blocking(record_snapshot, extracted, llm_json, checklist, trigger=os.getenv("CHECK_TRIGGER", "login"))
+        previous, changes = await run_blocking(diff_with_previous, snapshot_id)
+        return snapshot_id, previous, changes
+    except Exception as e:
+        logger.warning("점검 이력 저장 실패: %s", e)
+        return None, None, []
+
+async def _deposit_forecast():
+    """[SB] 예치금 소진 예측 문장 (utils/forecast.py, 하루 한 번 계산) - 이력을 쓰지 않거나 실패하면 빈 리스트"""
+    if not history_enabled():
+        return []
+    try:
+        from utils.forecast import get_deposit_forecast, format_forecast_lines
+        return format_forecast_lines(await run_blocking(get_deposit_forecast))
+    except Exception as e:
+        logger.warning("예치금 소진 예측 실패: %s", e)
+        return []
+
+async def _finish_history(snapshot_id, timings, delivered, username, delivery=None):
+    """[SB] 이력 스냅샷에 단계별 소요 시간/전송 결과 기록 - 실패해도 보고서 전송 결과에는 영향 없음"""
+    if snapshot_id is None:
+        return
+    try:
+        await run_blocking(finish_snapshot, snapshot_id, timings=timings, delivered=delivered, username=username, delivery=delivery)
+    except Exception as e:
+        logger.warning("점검 이력 저장 실패: %s", e)
+
+async def _choose_delivery(snapshot_id, llm_json, checklist):
+    """
+    [SB] 보고서 전송 정책(REPORT_DELIVERY_MODE) 적용
+
+    Returns:
+        tuple: (전체 보고서 전송 여부, 마지막 전체 보고서 스냅샷 요약 또는 None)
+    """
+    from utils.delivery import report_delivery_mode, should_send_full_report
+    # [SB] 이력이 없으면 비교할 수 없으므로 항상 전체 보고서
+    if report_delivery_mode() != "on_change" or snapshot_id is None:
+        return True, None
+    try:
+        last_full = await run_blocking(last_full_report, before_id=snapshot_id)
+    except Exception as e:
+        logger.warning("점검 이력 조회 실패: %s", e)
+        return True, None
+    send_full, reason = should_send_full_report(verdict_digest(checklist, llm_json), last_full)
+    logger.info("보고서 전송 정책(on_change): %s - %s", '전체 보고서' if send_full else '변경 없음 메시지', reason)
+    return send_full, last_full
+
+# [SB] 대시보드 크롤링(로그인 훅 포함) 자체의 제한 시간(초) - 이 시간을 넘기면 대시보드 장애로 봄
+DASHBOARD_CRAWL_LIMIT = 120
+
+def _is_dashboard_outage(error, status_code=None, budget_limited=False):
+    """
+    [SB] 대시보드 장애로 볼 크롤링 오류 - 연결 실패(ConnectionError, 브라우저 net::ERR_*), 5xx, 고정 제한 시간 초과
+    (스크립트/선택자 오류와 작업 예산이 부족해 줄인 제한 시간의 초과는 제외 - 차단기는 모든 작업이 공유)
+    """
+    if status_code is not None and status_code >= 500:
+        return True
+    if isinstance(error, TimeoutError) or "Timeout" in str(error):
+        return not budget_limited
+    return isinstance(error, ConnectionError) or "net::ERR_" in str(error)
+
+def _load_crawler():
+    """[SB] crawl4ai 로드 (브라우저 실행 직전) - utils/startup.py가 브라우저 실행까지의 시간 측정에 사용"""
+    from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+    return AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+
 async def main():
     # 로그인 정보
     login_config = {
@@ -31,8 +140,17 @@ async def main():
     }
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
+    # [SB] 작업 전체 예산 - 각 단계의 제한 시간은 남은 예산에서 계산하고, 예산이 부족한 선택 단계(LLM, 링크 체크,
+    #      아웃박스 재전송)는 건너뜀. 단계별 예상 시간은 이전 실행들의 중앙값(기록이 없으면 기본값)
+    deadline = Deadline.from_env()
+    estimates = {"LLM 분석": 25, "링크 체크": 5, "Excel 생성": 5, "전송": 5}
+    estimates.update(stage_estimates(estimates))
+    # [SB] Excel 생성과 전송(필수 단계)에 남겨 둘 시간
+    report_reserve = estimates["Excel 생성"] + estimates["전송"]
+    logger.info("작업 예산 %.0f초 (보고서 생성/전송 예비 %.1f초)", deadline.remaining(), report_reserve)
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 
+    AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode = _load_crawler()
     browser_config = BrowserConfig(
         browser_type="chromium",
         headless=True,
@@ -50,11 +168,28 @@ async def main():
     )
     run_config = CrawlerRunConfig(
         cache_mode=CacheMode.BYPASS,
-        delay_before_return_html=3.0,
+        delay_before_return_html=deadline.timeout(3.0),
+        page_timeout=deadline.ms(60),
         wait_until="networkidle",
         exclude_external_images=True,  # [SB] 외부 이미지 제외로 속도 향상
     )
     state = {"login_success": False, "dashboard_url": None, "login_processed": False}
+    memory = StageMemory()  # [SB] 단계별 최대 RSS 기록 (REPORT_MEMORY_LOG)
+    timings = {}  # [SB] 단계별 소요 시간(초) - 점검 이력에 저장
+    # [SB] 실행 추적: 단계와 그 안의 세부 구간(브라우저, 링크 체크, Mattermost API 호출 등)을 logs/traces/에 기록
+    trace = RunTrace().activate() if tracing_enabled() else None
+    stage_started = time.perf_counter()
+
+    def end_stage(stage):
+        """[SB] 단계 종료 - 소요 시간과 메모리 사용량 기록"""
+        nonlocal stage_started
+        now = time.perf_counter()
+        timings[stage] = round(now - stage_started, 3)
+        if trace is not None:
+            trace.add_span(stage, stage_started, now)
+        stage_started = now
+        memory.mark(stage)
+
     dashboard_screenshot_data = None  # [SB] 대시보드 스크린샷 메모리 저장용
 
     async def after_goto_hook(page, context, **kwargs):
@@ -65,29 +200,32 @@ async def main():
         if "hydra2.uxcloud.net" in page.url and "/page/" not in page.url:
             try:
                 state["login_processed"] = True
-                await page.wait_for_selector('#htxtId', timeout=10000)
-                await page.fill('#htxtId', login_config["username"])
-                await page.fill('#htxtPwd', login_config["password"])
-                navigation_promise = page.wait_for_url("**/page/*/main", timeout=15000)
-                await page.click('.btn_login')
-                await navigation_promise
+                with span("dashboard.login", "browser"):
+                    await page.wait_for_selector('#htxtId', timeout=deadline.ms(10))
+                    await page.fill('#htxtId', login_config["username"])
+                    await page.fill('#htxtPwd', login_config["password"])
+                    navigation_promise = page.wait_for_url("**/page/*/main", timeout=deadline.ms(15))
+                    await page.click('.btn_login')
+                    await navigation_promise
                 state["dashboard_url"] = page.url
                 state["login_success"] = True
-                await page.wait_for_load_state('networkidle', timeout=10000)
-                await page.wait_for_timeout(1000)
+                with span("dashboard.render_wait", "browser"):
+                    await page.wait_for_load_state('networkidle', timeout=deadline.ms(10))
+                    await page.wait_for_timeout(deadline.ms(1))
                 
                 # [SB] 대시보드 스크린샷 원본 캡처 (축소 없음)
-                print("[SB] 대시보드 스크린샷 캡처 중...")
-                screenshot_bytes = await page.screenshot(type='png', full_page=True)
+                logger.info("대시보드 스크린샷 캡처 중...")
+                with span("dashboard.screenshot", "browser"):
+                    screenshot_bytes = await page.screenshot(type='png', full_page=True)
                 
                 # [SB] 원본 이미지를 메모리 버퍼에 직접 저장
                 dashboard_screenshot_data = io.BytesIO(screenshot_bytes)
                 dashboard_screenshot_data.seek(0)  # 포인터를 시작으로 리셋
                 
-                print(f"[SB] 대시보드 스크린샷 캡처 완료 (원본 크기, {len(screenshot_bytes):,} bytes)")
+                logger.info("대시보드 스크린샷 캡처 완료 (원본 크기, %s bytes)", f"{len(screenshot_bytes):,}")
                 
             except Exception as e:
-                print(f"[SB] 로그인 오류: {e}")
+                logger.error("로그인 오류: %s", e)
                 state["login_success"] = False
         else:
             if "/page/" in page.url and "main" in page.url:
@@ -95,123 +233,292 @@ async def main():
                 state["login_success"] = True
                 state["login_processed"] = True
                 try:
-                    await page.wait_for_load_state('networkidle', timeout=10000)
-                    await page.wait_for_timeout(1000)
+                    with span("dashboard.render_wait", "browser"):
+                        await page.wait_for_load_state('networkidle', timeout=deadline.ms(10))
+                        await page.wait_for_timeout(deadline.ms(1))
                     
                     # [SB] 이미 로그인된 경우에도 스크린샷 캡처 (축소 없음)
-                    print("[SB] 대시보드 스크린샷 캡처 중...")
-                    screenshot_bytes = await page.screenshot(type='png', full_page=True)
+                    logger.info("대시보드 스크린샷 캡처 중...")
+                    with span("dashboard.screenshot", "browser"):
+                        screenshot_bytes = await page.screenshot(type='png', full_page=True)
                     
                     # [SB] 원본 이미지를 메모리 버퍼에 직접 저장
                     dashboard_screenshot_data = io.BytesIO(screenshot_bytes)
                     dashboard_screenshot_data.seek(0)  # 포인터를 시작으로 리셋
                     
-                    print(f"[SB] 대시보드 스크린샷 캡처 완료 (원본 크기, {len(screenshot_bytes):,} bytes)")
+                    logger.info("대시보드 스크린샷 캡처 완료 (원본 크기, %s bytes)", f"{len(screenshot_bytes):,}")
                     
                 except Exception as e:
-                    print(f"[SB] 페이지 로딩 오류: {e}")
+                    logger.error("페이지 로딩 오류: %s", e)
 
-    async with AsyncWebCrawler(config=browser_config) as crawler:
+    async def check_link(name, url):
+        """[SB] 링크 체크 - 예산이 부족하면 건너뛰고, 남은 예산 안에 끝나지 않으면 중단 (둘 다 "미확인")"""
+        if deadline.skip(f"link_check.{name}", estimates["링크 체크"], reserve=report_reserve):
+            return "미확인"
+        link_config = run_config.clone(delay_before_return_html=deadline.timeout(3.0, reserve=report_reserve),
+                                       page_timeout=deadline.ms(60, reserve=report_reserve))
+        with span(f"link_check.{name}", "link") as link_attrs:
+            try:
+                checked = await asyncio.wait_for(crawler.arun(url, config=link_config),
+                                                 deadline.timeout(reserve=report_reserve, minimum=1))
+            except asyncio.TimeoutError:
+                link_attrs["status"] = "timeout"
+                logger.warning("%s 링크 체크가 남은 예산 안에 끝나지 않았습니다", name)
+                return "미확인"
+            link_attrs["status"] = checked.status_code
+        return "정상" if checked.status_code == 200 else "비정상"
+
+    # [SB] 대시보드 차단기 - 최근 점검들이 대시보드에 연결하지 못했으면 브라우저를 띄우지 않고 바로 종료
+    #      (웹 서버는 차단기가 열려 있으면 로그인 사용자에게 마지막 보고서를 전송)
+    dashboard_breaker = CircuitBreaker("dashboard")
+    if not dashboard_breaker.allow():
+        logger.error("대시보드 장애로 차단기가 열려 있어 점검을 건너뜁니다", extra={"event": "breaker_open", "data": {"breaker": "dashboard"}})
+        if trace is not None:
+            trace.finish()
+        return
+
+    async with AsyncExitStack() as stack:
+        # [SB] 어느 단계에서 끝나든(로그인 실패, 예외 포함) 브라우저 종료 후 실행 추적 저장
+        if trace is not None:
+            stack.callback(trace.finish)
+        with span("browser.launch", "browser"):
+            crawler = await stack.enter_async_context(AsyncWebCrawler(config=browser_config))
         crawler.crawler_strategy.set_hook("after_goto", after_goto_hook)
-        result = await crawler.arun(login_config["d_url"], config=run_config)
+        with span("crawl.dashboard", "browser"):
+            # [SB] 남은 예산이 고정 제한 시간보다 짧으면 시간 초과는 이 작업이 늦은 것이므로 차단기에 기록하지 않음
+            budget_limited = deadline.remaining() < DASHBOARD_CRAWL_LIMIT
+            try:
+                result = await asyncio.wait_for(crawler.arun(login_config["d_url"], config=run_config),
+                                                deadline.timeout(DASHBOARD_CRAWL_LIMIT, minimum=1))
+            except asyncio.TimeoutError:
+                if not budget_limited:
+                    dashboard_breaker.record_failure(f"크롤링이 {DASHBOARD_CRAWL_LIMIT}초 안에 끝나지 않음")
+                logger.error("대시보드 크롤링이 제한 시간 안에 끝나지 않았습니다", extra={"event": "deadline_exceeded"})
+                return
+            except Exception as e:
+                if _is_dashboard_outage(e, budget_limited=budget_limited):
+                    dashboard_breaker.record_failure(e)
+                raise
+        # [SB] 페이지를 열지 못한 경우만 대시보드 장애로 기록 (로그인 실패는 대시보드가 응답한 것)
+        if getattr(result, "success", True):
+            dashboard_breaker.record_success()
+        else:
+            error = getattr(result, "error_message", None) or "크롤링 실패"
+            if _is_dashboard_outage(error, getattr(result, "status_code", None), budget_limited):
+                dashboard_breaker.record_failure(error)
         if not state["login_success"] or not state["dashboard_url"]:
-            print("[SB] 로그인 또는 대시보드 진입 실패")
+            logger.warning("로그인 또는 대시보드 진입 실패")
             return
-        print(f"[SB] 대시보드 URL: {state['dashboard_url']}")
+        logger.info("대시보드 URL: %s", state['dashboard_url'])
+        end_stage("크롤링/스크린샷")
         
         # HTML 추출 및 필드 추출
         html = result.html
-        extracted = extract_fields(html, login_status="정상")
-        print(f"[SB] 필드 추출 결과:")
-        print(json.dumps(extracted, indent=2, ensure_ascii=False))
+        from utils.fields import extract_fields
+        with span("extract_fields", "parse"):
+            extracted = extract_fields(html, login_status="정상")
+        # [SB] 필드 추출 후에는 크롤링 결과(HTML 전체)가 필요 없으므로 바로 해제
+        del html, result
+        end_stage("필드 추출")
+        logger.info("필드 추출 결과", extra={"event": "fields_extracted", "data": extracted})
         
         # LLM에 질문
-        llm_answer = analyze_with_ollama(extracted)
+        from utils.llm import analyze_with_ollama_async, rule_based_answer, ollama_timeout
+        with span("llm.analyze", "llm") as llm_attrs:
+            # [SB] 예산이 부족하면 LLM 감사를 건너뛰고 규칙 기반 결과 사용 (링크 체크 1회 + 보고서 시간은 남김)
+            llm_reserve = estimates["링크 체크"] + report_reserve
+            if deadline.skip("llm.analyze", estimates["LLM 분석"], reserve=llm_reserve):
+                llm_attrs["skipped"] = True
+                llm_answer = rule_based_answer(extracted)
+            else:
+                # [SB] 비동기 호출 - 작업이 취소되면 진행 중인 Ollama 요청도 끊음
+                #      (예산 때문에 줄어든 제한 시간의 초과는 Ollama 차단기에 기록하지 않음)
+                llm_answer = await analyze_with_ollama_async(extracted, timeout=ollama_timeout(),
+                                                             budget=deadline.timeout(reserve=llm_reserve, minimum=1))
+        end_stage("LLM 분석")
+        mm_client = None
+        login_task = None
         try:
             llm_json = json.loads(llm_answer)
 
+            # Mattermost 환경 변수 확인
+            from utils.mattermost import verify_mattermost_env, _display_name
+            from utils.mattermost_async import AsyncMattermostClient
+            env_status = verify_mattermost_env()
+            
+            # [SB] Mattermost 로그인(사용자 정보 조회)은 링크 체크와 겹쳐서 이벤트 루프에서 실행
+            if env_status["status"]:
+                # [SB] 이번 실행 전체에서 공유하는 비동기 Mattermost 클라이언트 (로그인 1회, 커넥션 풀 공유)
+                mm_client = AsyncMattermostClient(deadline=deadline)
+                login_task = asyncio.ensure_future(mm_client.login())
+
             # [SB] FrontEnd 링크 체크, Parking 링크 체크, URL 링크 체크, FURL 링크 체크
             frontend = llm_json.get("FrontEnd", {})
             if frontend.get("상태") != "예" or frontend.get("도메인 검색") != "예":
-                front_success = await crawler.arun(login_config["frontend"], config=run_config)
-                f_status = "비정상"
-                if front_success.status_code == 200:
-                    f_status = "정상"
+                f_status = await check_link("frontend", login_config["frontend"])
                 llm_json["FrontEnd"]["link"] = f_status  # [SB] 쉼표 없음
-                print(f"[SB] FrontEnd link url : {f_status}")
+                logger.info("FrontEnd link url : %s", f_status)
 
             using_services = llm_json.get("운영중인서비스", {})
             if using_services.get("parking") != "예":
-                parking_success = await crawler.arun(login_config["parking"], config=run_config)
-                p_status = "비정상"
-                if parking_success.status_code == 200:
-                    p_status = "정상"
+                p_status = await check_link("parking", login_config["parking"])
                 llm_json["운영중인서비스"]["parking_link"] = p_status
-                print(f"[SB] Parking link url : {p_status}")
+                logger.info("Parking link url : %s", p_status)
 
             if using_services.get("url") != "예":
-                url_success = await crawler.arun(login_config["url"], config=run_config)
-                u_status = "비정상"
-                if url_success.status_code == 200:
-                    u_status = "정상"
+                u_status = await check_link("url", login_config["url"])
                 llm_json["운영중인서비스"]["url_link"] = u_status
-                print(f"[SB] url link url : {u_status}")
+                logger.info("url link url : %s", u_status)
 
             if using_services.get("furl") != "예":
-                furl_success = await crawler.arun(login_config["furl"], config=run_config)
-                f_status = "비정상"
-                if furl_success.status_code == 200:
-                    f_status = "정상"
+                f_status = await check_link("furl", login_config["furl"])
                 llm_json["운영중인서비스"]["furl_link"] = f_status
-                print(f"[SB] furl link url : {f_status}")
+                logger.info("furl link url : %s", f_status)
 
-            print(f"[SB] LLM 분석 결과:")
-            print(json.dumps(llm_json, indent=2, ensure_ascii=False))
+            end_stage("링크 체크")
+            logger.info("LLM 분석 결과", extra={"event": "llm_analyzed", "data": llm_json})
             
-            # Mattermost 환경 변수 확인
-            env_status = verify_mattermost_env()
+            # [SB] 체크리스트 판정 (행별 1회 계산, 이후 출력물은 이 결과를 공유)
+            checklist = evaluate_checklist(llm_json)
+            
+            # [SB] 점검 이력 저장 및 이전 점검 대비 변경 사항 (보고서 메시지에 포함)
+            snapshot_id, previous_snapshot, changes = await _record_history(extracted, llm_json, checklist)
+            changes_text = render_changes_markdown(previous_snapshot, changes)
+            if changes_text:
+                logger.info("%s", changes_text)
+            # [SB] 예치금 소진 예측은 보고서에만 표시 (체크리스트 판정/이력 다이제스트에는 넣지 않음)
+            forecast_lines = await _deposit_forecast()
+            for line in forecast_lines:
+                logger.info("예치금 소진 예측: %s", line)
             
+            from utils.xlsx import create_dashboard_excel
             if not env_status["status"]:
-                print(f"[SB] Mattermost 필수 환경 변수가 설정되지 않았습니다: {', '.join(env_status['missing_required'])}")
+                logger.warning("Mattermost 필수 환경 변수가 설정되지 않았습니다: %s", ', '.join(env_status['missing_required']))
                 # 사용자 이름 없이 Excel 생성 (스크린샷 포함)
-                excel_file = create_dashboard_excel(llm_json, in_memory=True, dashboard_screenshot=dashboard_screenshot_data)
+                with span("excel.build", "excel"):
+                    excel_file = await run_blocking(create_dashboard_excel, llm_json, in_memory=True, dashboard_screenshot=dashboard_screenshot_data, checklist=checklist, forecast_lines=forecast_lines)
+                await _save_latest(_latest_result(llm_json, checklist, None, None, forecast_lines), excel_file, excel_file.name)
+                excel_file.close()
+                end_stage("Excel 생성")
+                await _finish_history(snapshot_id, timings, None, None)
             else:
-                # Mattermost에서 사용자 이름 가져오기
-                mm_success, username, user_id = get_mattermost_username()
+                # [SB] 보고서 형식: xlsx(기본), markdown(메시지만), both(둘 다)
+                report_format = os.getenv("REPORT_FORMAT", "xlsx").strip().lower()
+                send_markdown = report_format in ("markdown", "both")
+                send_xlsx = report_format != "markdown"
+                
+                # Mattermost에서 사용자 이름 가져오기 (링크 체크 동안 미리 시작한 로그인 결과)
+                mm_success = await login_task
+                # [SB] 봇 토큰으로 로그인한 경우에도 보고서 담당자는 수신자(사람)
+                username = _display_name(mm_client.recipient) if mm_success else None
                 
                 if mm_success and username:
-                    print(f"[SB] Mattermost에서 사용자 이름 '{username}'를 가져왔습니다.")
-                    # 사용자 이름을 포함하여 Excel 대시보드 생성 (스크린샷 포함)
-                    excel_file = create_dashboard_excel(llm_json, in_memory=True, username=username, dashboard_screenshot=dashboard_screenshot_data)
+                    logger.info("Mattermost에서 사용자 이름 '%s'를 가져왔습니다.", username)
                 else:
-                    print(f"[SB] Mattermost에서 사용자 이름을 가져오지 못했습니다. 기본 이름으로 Excel을 생성합니다.")
-                    # 사용자 이름 없이 Excel 생성 (스크린샷 포함)
-                    excel_file = create_dashboard_excel(llm_json, in_memory=True, dashboard_screenshot=dashboard_screenshot_data)
+                    logger.warning("Mattermost에서 사용자 이름을 가져오지 못했습니다. 기본 이름으로 보고서를 생성합니다.")
+                    username = None
                 
-                # 자신에게 Excel 보고서 전송
-                success = send_excel_to_self(excel_file)
-                # 팀 당직채널에도 Excel 보고서 전송
-                # 팀 채널 전송 가능한지 확인
-                if "MATTERMOST_TEAM_INNOGS" in env_status["available"] and "MATTERMOST_CHANNEL" in env_status["available"]:
-                    # 팀 채널에도 보고서 전송
-                    team_success = send_excel_to_team_channel(
-                        excel_file,
-                        team_key="INNOGS",
-                    )  
+                # [SB] on_change 정책: 마지막 전체 보고 이후 판정이 같으면 Excel을 만들지 않고 한 줄 메시지만 전송
+                send_full, last_full = await _choose_delivery(snapshot_id, llm_json, checklist)
+                if send_full:
+                    # [SB] Markdown 보고서는 파일 업로드 없이 메시지 1건으로 전송
+                    report_message = render_checklist_markdown(checklist, username=username, forecast_lines=forecast_lines) if send_markdown else None
+                    # [SB] 이전 점검 대비 변경 사항: Markdown 보고서에는 항상, Excel만 보낼 때는 판정/링크가 바뀐 경우에만 메시지로 함께 전송
+                    if changes_text and send_markdown:
+                        report_message = f"{report_message}\n\n{changes_text}"
+                    elif changes_text and any(change["kind"] in ("verdict", "link") for change in changes):
+                        report_message = changes_text
+                else:
+                    report_message = render_no_change_message(checklist, last_full)
+                    send_xlsx = False
                 
-                if success:
-                    print(f"[SB] 대시보드 보고서가 Mattermost를 통해 성공적으로 전송되었습니다.")
+                # [SB] Excel은 xlsx 형식이 필요할 때만 한 번 생성하고, 모든 대상이 같은 파일을 스트리밍으로 공유
+                #      (크면 임시 파일로 옮겨지므로 bytes로 복사하지 않고 SpooledReport를 그대로 전달)
+                excel_file = None
+                excel_name = None
+                if send_xlsx:
+                    # 사용자 이름을 포함하여 Excel 대시보드 생성 (스크린샷 포함)
+                    with span("excel.build", "excel"):
+                        excel_file = await run_blocking(create_dashboard_excel, llm_json, in_memory=True, username=username, dashboard_screenshot=dashboard_screenshot_data, checklist=checklist, forecast_lines=forecast_lines)
+                    excel_name = excel_file.name
+                # [SB] 스크린샷은 Excel에 들어간 뒤에는 필요 없음
+                dashboard_screenshot_data = None
+                end_stage("Excel 생성")
+                
+                # [SB] 자신(DM), MATTERMOST_REPORT_TEAMS 팀 채널, MATTERMOST_REPORT_USERS 사용자에게 동시에 전송
+                #      (자신에게 보내는 전송만 성공 여부에 반영)
+                #      이전 실행에서 전송에 실패해 아웃박스에 남은 보고서도 같은 클라이언트로 함께 재전송
+                from utils.delivery import build_destinations, deliver_report_async, drain_outbox_async
+                destinations = build_destinations()
+                deliveries = [deliver_report_async(destinations, file_bytes=excel_file, file_name=excel_name, message=report_message, client=mm_client)]
+                # [SB] 아웃박스 재전송은 다음 실행에서도 할 수 있으므로 예산이 부족하면 이번 보고서 전송만
+                if not deadline.skip("outbox.drain", estimates["전송"]):
+                    deliveries.append(drain_outbox_async(client=mm_client))
+                # [SB] 재전송 실패가 이번 보고서 전송 결과를 가리지 않도록 결과를 각각 받음
+                results, *drained = await asyncio.gather(*deliveries, return_exceptions=True)
+                for error in drained:
+                    if isinstance(error, BaseException):
+                        logger.warning("아웃박스 재전송 오류: %s", error)
+                if isinstance(results, BaseException):
+                    logger.error("보고서 전송 오류: %s", results)
+                    success = False
                 else:
-                    print(f"[SB] 대시보드 보고서 전송 실패")
+                    success = all(result["success"] for result in results if result["destination"]["kind"] == "self")
+                # [SB] 웹 UI/다음 로그인 사용자에게 바로 제공할 최신 결과로 저장 (변경 없음이면 이전 보고서 파일 유지)
+                await _save_latest(_latest_result(llm_json, checklist, username, success, forecast_lines), excel_file, excel_name, keep_report=not send_full)
+                # 파일 객체 정리 (임시 파일이면 삭제)
+                if excel_file is not None:
+                    excel_file.close()
+                end_stage("전송")
+                await _finish_history(snapshot_id, timings, success, username, DELIVERY_FULL if send_full else DELIVERY_NO_CHANGE)
                 
-                # 메모리 객체 정리
-                excel_file.close()
-                del excel_file
+                if success:
+                    # [SB] app.py는 event 필드로 전송 결과를 판단 (메시지 문구는 이전 버전 호환용)
+                    logger.info("대시보드 보고서가 Mattermost를 통해 성공적으로 전송되었습니다.", extra={"event": "report_delivered"})
+                else:
+                    logger.error("대시보드 보고서 전송 실패", extra={"event": "report_delivery_failed"})
             
+        except json.JSONDecodeError as e:
+            logger.error("LLM 응답 JSON 파싱 오류: %s", e, extra={"data": {"llm_answer": llm_answer}})
         except Exception as e:
-            print(f"[SB] LLM 응답 JSON 파싱 오류: {e}")
-            print("[SB] 원본 LLM 응답:")
-            print(llm_answer)
+            logger.error("보고서 생성/전송 중 오류: %s", e)
+        finally:
+            # [SB] 로그인 결과를 쓰기 전에 빠져나왔으면 로그인 작업을 취소하고 끝날 때까지 대기 (결과를 받지 않은 작업 경고 방지)
+            if login_task is not None:
+                login_task.cancel()
+                await asyncio.gather(login_task, return_exceptions=True)
+            # [SB] 실행 종료 시 Mattermost 로그아웃 및 커넥션 풀 정리
+            if mm_client is not None:
+                await mm_client.close()
+            memory.summary()
+
+# [SB] 취소로 종료할 때의 종료 코드 (SIGTERM으로 종료된 셸 명령과 같은 값)
+EXIT_CANCELLED = 128 + signal.SIGTERM
+
+async def run_cancellable():
+    """
+    [SB] main() 실행 - SIGTERM(웹 앱의 작업 취소)을 받으면 main()을 취소
+
+    취소는 진행 중인 await 지점에서 전달되어 브라우저 종료, Ollama 요청 중단, Mattermost 로그아웃과
+    실행 추적 저장이 각 단계의 정리 코드로 처리되고, 아직 하지 않은 전송은 건너뜁니다.
+
+    Returns:
+        int: 종료 코드 (취소되면 EXIT_CANCELLED)
+    """
+    loop = asyncio.get_running_loop()
+    job = asyncio.ensure_future(main())
+    loop.add_signal_handler(signal.SIGTERM, job.cancel)
+    try:
+        await job
+    except asyncio.CancelledError:
+        if not job.cancelled():
+            raise
+        logger.warning("작업이 취소되었습니다", extra={"event": "job_cancelled"})
+        return EXIT_CANCELLED
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+    return 0
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    setup_logging()
+    sys.exit(asyncio.run(run_cancellable()))
\ No newline at end of file
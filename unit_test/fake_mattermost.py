@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# fake_mattermost.py - 실제 Mattermost 서버 없이 전송 코드를 검증/측정하기 위한 로컬 /api/v4 대역 서버
+#
+# 단독 실행:
+#   python unit_test/fake_mattermost.py [포트] [--latency 0.05] [--failure-rate 0.1]
+#   → 출력되는 환경 변수로 test_send_excel.py, test_mattermost_teams.py 등을 그대로 실행할 수 있습니다.
+#
+# 코드에서 사용:
+#   with FakeMattermostServer(latency=0.05) as server:
+#       with server.env():   # MATTERMOST_URL/USERNAME/PASSWORD/TEAM/CHANNEL 설정
+#           send_excel_to_self(...)
+#       print(server.posts)
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_USERNAME = "tester"
+DEFAULT_PASSWORD = "tester-password"
+DEFAULT_TEAM = "innogs"
+DEFAULT_CHANNEL = "당직"
+BOT_TOKEN = "fake-bot-token"
+
+def _new_id():
+    """[SB] Mattermost ID와 같은 26자 소문자 ID"""
+    return uuid.uuid4().hex[:26]
+
+class FakeMattermostServer:
+    """
+    [SB] Mattermost REST API(v4) 중 이 프로젝트가 사용하는 엔드포인트만 구현한 스레드 HTTP 서버
+
+    Args:
+        port (int): 0이면 빈 포트 자동 선택
+        latency (float): 모든 요청에 더할 지연(초)
+        failure_rate (float): 로그인을 제외한 요청을 503으로 실패시킬 확률 (0~1)
+        seed (int, optional): 실패 주입 난수 시드
+
+    실패를 정확히 재현하려면 fail_next("/posts", 2)처럼 다음 N번 요청을 실패시킵니다.
+    """
+
+    def __init__(self, port=0, latency=0.0, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._scripted_failures = []
+
+        self.users = {}
+        self.passwords = {}
+        self.tokens = {}
+        self.teams = {}
+        self.channels = {}
+        self.files = {}
+        self.posts = []
+        self.request_log = []
+
+        self.user = self.add_user(DEFAULT_USERNAME, DEFAULT_PASSWORD, nickname="테스트 당직자")
+        self.bot = self.add_user("report-bot", None, token=BOT_TOKEN)
+        self.team = self.add_team(DEFAULT_TEAM, "INNOGS", members=[self.user["id"], self.bot["id"]])
+        self.channel = self.add_channel(self.team["id"], DEFAULT_CHANNEL, members=[self.user["id"], self.bot["id"]])
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    # ---- 데이터 준비 ----
+    def add_user(self, username, password, nickname="", token=None):
+        user = {"id": _new_id(), "username": username, "nickname": nickname, "first_name": "", "last_name": ""}
+        self.users[user["id"]] = user
+        if password:
+            self.passwords[username] = password
+        if token:
+            self.tokens[token] = user["id"]
+        return user
+
+    def add_team(self, name, display_name, members=()):
+        team = {"id": _new_id(), "name": name, "display_name": display_name, "members": set(members)}
+        self.teams[team["id"]] = team
+        return team
+
+    def add_channel(self, team_id, name, display_name=None, members=(), channel_type="O"):
+        channel = {"id": _new_id(), "team_id": team_id, "name": name, "display_name": display_name or name,
+                   "type": channel_type, "members": set(members)}
+        self.channels[channel["id"]] = channel
+        return channel
+
+    def delete_channel(self, channel_id):
+        """[SB] 채널 삭제 (캐시된 채널 ID 무효화 테스트용)"""
+        self.channels.pop(channel_id, None)
+
+    # ---- 장애 주입 ----
+    def fail_next(self, path_prefix, count=1, status=503):
+        """[SB] path_prefix로 시작하는 다음 count번 요청을 status로 실패시킴"""
+        with self._lock:
+            self._scripted_failures.append([path_prefix, count, status])
+
+    def _injected_failure(self, path):
+        with self._lock:
+            for failure in self._scripted_failures:
+                if path.startswith(failure[0]) and failure[1] > 0:
+                    failure[1] -= 1
+                    return failure[2]
+            if self.failure_rate and not path.startswith("/users/login") and self._random.random() < self.failure_rate:
+                return 503
+        return None
+
+    # ---- 실행 ----
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-mattermost", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    @contextmanager
+    def env(self, token=False, **overrides):
+        """[SB] 이 서버를 가리키는 Mattermost 환경 변수를 설정했다가 원래대로 복원"""
+        values = {
+            "MATTERMOST_URL": self.url,
+            "MATTERMOST_USERNAME": DEFAULT_USERNAME,
+            "MATTERMOST_PASSWORD": DEFAULT_PASSWORD,
+            "MATTERMOST_TEAM_INNOGS": DEFAULT_TEAM,
+            "MATTERMOST_CHANNEL": DEFAULT_CHANNEL,
+            "MATTERMOST_TOKEN": BOT_TOKEN if token else None,
+            "MATTERMOST_REPORT_USER_ID": self.user["id"] if token else None,
+        }
+        values.update(overrides)
+        original = {name: os.environ.get(name) for name in values}
+        try:
+            for name, value in values.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            yield values
+        finally:
+            for name, value in original.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+    def posts_in(self, channel_id):
+        return [post for post in self.posts if post["channel_id"] == channel_id]
+
+    def dm_channel_id(self, user_a, user_b):
+        """[SB] 두 사용자의 DM 채널 ID (Mattermost와 같이 ID를 정렬해 '__'로 연결한 이름 사용)"""
+        name = "__".join(sorted([user_a, user_b]))
+        for channel in self.channels.values():
+            if channel["type"] == "D" and channel["name"] == name:
+                return channel["id"]
+        return None
+
+    # ---- API 처리 ----
+    def handle(self, method, path, query, headers, body):
+        """[SB] (상태 코드, 응답 객체, 추가 헤더) 반환"""
+        status = self._injected_failure(path)
+        if status:
+            return status, {"message": f"injected failure ({status})"}, {}
+
+        if method == "POST" and path == "/users/login":
+            payload = json.loads(body or b"{}")
+            login_id = payload.get("login_id")
+            if self.passwords.get(login_id) != payload.get("password") or login_id not in self.passwords:
+                return 401, {"message": "Invalid login credentials"}, {}
+            user = next(user for user in self.users.values() if user["username"] == login_id)
+            token = _new_id()
+            self.tokens[token] = user["id"]
+            return 200, user, {"Token": token}
+
+        auth = headers.get("Authorization", "")
+        me_id = self.tokens.get(auth[len("Bearer "):]) if auth.startswith("Bearer ") else None
+        if not me_id:
+            return 401, {"message": "Invalid or expired session"}, {}
+
+        if method == "POST" and path == "/users/logout":
+            self.tokens.pop(auth[len("Bearer "):], None)
+            return 200, {"status": "OK"}, {}
+
+        match = re.fullmatch(r"/users/username/([^/]+)", path)
+        if method == "GET" and match:
+            user = next((user for user in self.users.values() if user["username"] == match.group(1)), None)
+            return (200, user, {}) if user else (404, {"message": "user not found"}, {})
+
+        match = re.fullmatch(r"/users/([^/]+)/teams", path)
+        if method == "GET" and match:
+            user_id = me_id if match.group(1) == "me" else match.group(1)
+            teams = [{key: value for key, value in team.items() if key != "members"}
+                     for team in self.teams.values() if user_id in team["members"]]
+            return 200, teams, {}
+
+        match = re.fullmatch(r"/users/([^/]+)/teams/([^/]+)/channels", path)
+        if method == "GET" and match:
+            user_id = me_id if match.group(1) == "me" else match.group(1)
+            channels = [{key: value for key, value in channel.items() if key != "members"}
+                        for channel in self.channels.values()
+                        if channel["team_id"] == match.group(2) and user_id in channel["members"]]
+            return 200, channels, {}
+
+        match = re.fullmatch(r"/users/([^/]+)", path)
+        if method == "GET" and match:
+            user = self.users.get(me_id if match.group(1) == "me" else match.group(1))
+            return (200, user, {}) if user else (404, {"message": "user not found"}, {})
+
+        if method == "POST" and path == "/channels/direct":
+            user_ids = json.loads(body)
+            if len(user_ids) != 2 or any(user_id not in self.users for user_id in user_ids):
+                return 400, {"message": "invalid user ids"}, {}
+            with self._lock:
+                channel_id = self.dm_channel_id(*user_ids)
+                if not channel_id:
+                    channel_id = self.add_channel("", "__".join(sorted(user_ids)), members=user_ids, channel_type="D")["id"]
+            channel = self.channels[channel_id]
+            return 201, {key: value for key, value in channel.items() if key != "members"}, {}
+
+        if method == "POST" and path == "/files":
+            uploads = self._parse_upload(headers, query, body)
+            if uploads is None:
+                return 400, {"message": "invalid upload"}, {}
+            channel_id, parts = uploads
+            channel = self.channels.get(channel_id)
+            if not channel:
+                return 404, {"message": "channel not found"}, {}
+            if me_id not in channel["members"]:
+                return 403, {"message": "no permission"}, {}
+            file_infos = []
+            for file_name, data in parts:
+                info = {"id": _new_id(), "name": file_name, "size": len(data), "channel_id": channel_id}
+                self.files[info["id"]] = dict(info, data=data)
+                file_infos.append(info)
+            return 201, {"file_infos": file_infos, "client_ids": []}, {}
+
+        if method == "POST" and path == "/posts":
+            payload = json.loads(body)
+            channel = self.channels.get(payload.get("channel_id"))
+            if not channel:
+                return 404, {"message": "channel not found"}, {}
+            if me_id not in channel["members"]:
+                return 403, {"message": "no permission"}, {}
+            if any(file_id not in self.files for file_id in payload.get("file_ids", [])):
+                return 400, {"message": "invalid file id"}, {}
+            with self._lock:
+                # [SB] 실제 서버처럼 같은 pending_post_id 재요청은 새 게시물을 만들지 않고 기존 게시물 반환
+                pending_post_id = payload.get("pending_post_id")
+                if pending_post_id:
+                    existing = next((post for post in self.posts if post.get("pending_post_id") == pending_post_id), None)
+                    if existing:
+                        return 201, existing, {}
+                post = {"id": _new_id(), "user_id": me_id, "channel_id": channel["id"],
+                        "message": payload.get("message", ""), "file_ids": payload.get("file_ids", []),
+                        "pending_post_id": pending_post_id, "create_at": int(time.time() * 1000)}
+                self.posts.append(post)
+            return 201, post, {}
+
+        return 404, {"message": f"not implemented: {method} {path}"}, {}
+
+    @staticmethod
+    def _parse_upload(headers, query, body):
+        """[SB] multipart/form-data 업로드와 원시 본문(?channel_id=&filename=) 업로드 모두 지원"""
+        content_type = headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body)
+            channel_id = None
+            parts = []
+            for part in message.iter_parts():
+                name = part.get_param("name", header="content-disposition")
+                if name == "channel_id":
+                    channel_id = part.get_payload(decode=True).decode("utf-8")
+                elif name == "files":
+                    parts.append((part.get_filename(), part.get_payload(decode=True)))
+            return (channel_id, parts) if channel_id and parts else None
+        channel_id = query.get("channel_id", [None])[0]
+        file_name = query.get("filename", [None])[0]
+        if not channel_id or not file_name:
+            return None
+        return channel_id, [(file_name, body)]
+
+def _make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self):
+            start = time.perf_counter()
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            parsed = urlparse(self.path)
+            path = parsed.path
+            if not path.startswith("/api/v4"):
+                status, payload, extra_headers = 404, {"message": "not found"}, {}
+            else:
+                if server.latency:
+                    time.sleep(server.latency)
+                try:
+                    status, payload, extra_headers = server.handle(
+                        self.command, path[len("/api/v4"):], parse_qs(parsed.query), self.headers, body)
+                except (ValueError, KeyError) as e:
+                    status, payload, extra_headers = 400, {"message": str(e)}, {}
+
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            # [SB] mattermostdriver는 Content-Type이 정확히 'application/json'일 때만 JSON으로 변환
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in extra_headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+            with server._lock:
+                server.request_log.append((self.command, path, status, time.perf_counter() - start))
+
+        do_GET = _dispatch
+        do_POST = _dispatch
+        do_PUT = _dispatch
+        do_DELETE = _dispatch
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def main():
+    args = sys.argv[1:]
+    latency = 0.0
+    failure_rate = 0.0
+    port = 8065
+    while args:
+        arg = args.pop(0)
+        if arg == "--latency":
+            latency = float(args.pop(0))
+        elif arg == "--failure-rate":
+            failure_rate = float(args.pop(0))
+        else:
+            port = int(arg)
+
+    with FakeMattermostServer(port=port, latency=latency, failure_rate=failure_rate) as server:
+        print(f"[가짜 Mattermost] {server.url} 에서 실행 중 (지연 {latency}s, 실패율 {failure_rate:.0%})")
+        print(f"  MATTERMOST_URL={server.url}")
+        print(f"  MATTERMOST_USERNAME={DEFAULT_USERNAME}")
+        print(f"  MATTERMOST_PASSWORD={DEFAULT_PASSWORD}")
+        print(f"  MATTERMOST_TEAM_INNOGS={DEFAULT_TEAM}")
+        print(f"  MATTERMOST_CHANNEL={DEFAULT_CHANNEL}")
+        print(f"  (봇 토큰 모드) MATTERMOST_TOKEN={BOT_TOKEN} MATTERMOST_REPORT_USER_ID={server.user['id']}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            print(f"\n[가짜 Mattermost] 종료 - 게시물 {len(server.posts)}건, 파일 {len(server.files)}건")
+
+if __name__ == "__main__":
+    main()
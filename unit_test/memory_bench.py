@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# memory_bench.py - 큰 스크린샷으로 보고서를 만들어 전송할 때 단계별 최대 RSS 비교 (메모리 bytes 복사 vs 임시 파일 스트리밍)
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# [SB] LLM 분석 결과 모의 데이터 (main.py에서 넘어오는 형태와 동일)
+MOCK_LLM_RESULT = {
+    "로그인상태": "예",
+    "whois_usd": "1,072.88 USD",
+    "gabia_krw": "442,400 KRW",
+    "스케줄러상태": "예",
+    "1:1문의": "예",
+    "이메일문의": "예",
+    "에러리포트": "예",
+    "Region활성": "예",
+    "장비미보고": "예",
+    "DB_Sync": {"일시중지": "예", "오류": "예"},
+    "FrontEnd": {"상태": "예", "도메인 검색": "예"},
+    "운영중인서비스": {"parking": "예", "url": "예", "furl": "예"}
+}
+
+def make_screenshot(height):
+    """[SB] 압축이 잘 되지 않는(노이즈) 전체 페이지 스크린샷 PNG 생성"""
+    from PIL import Image
+    image = Image.frombytes("RGB", (1024, height), os.urandom(1024 * height * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=1)
+    del image
+    buffer.seek(0)
+    return buffer
+
+def run_mode(mode, height):
+    """[SB] 한 가지 방식으로 생성→전송 (단계 최대값이 섞이지 않도록 별도 프로세스에서 실행, 서버는 부모 프로세스)"""
+    from utils.delivery import build_destinations, deliver_report
+    from utils.mattermost import MattermostSession
+    from utils.memory import StageMemory
+    from utils.xlsx import create_dashboard_excel
+
+    os.chdir(tempfile.mkdtemp(prefix="memory_bench_"))
+    # [SB] memory: 이전 방식처럼 전체를 메모리에 두고 bytes로 복사해 전송
+    if mode == "memory":
+        os.environ["REPORT_SPOOL_THRESHOLD"] = str(1 << 40)
+    os.environ["REPORT_CACHE"] = "false"
+    os.environ["OUTBOX_ENABLED"] = "false"
+
+    memory = StageMemory(enabled=True)
+    start = time.perf_counter()
+    screenshot = make_screenshot(height)
+    print(f"[벤치] 스크린샷 {screenshot.getbuffer().nbytes / 1024 / 1024:.1f} MiB")
+    memory.mark("스크린샷")
+
+    excel_file = create_dashboard_excel(MOCK_LLM_RESULT, in_memory=True, username="벤치마크", dashboard_screenshot=screenshot)
+    screenshot = None
+    payload = excel_file.getvalue() if mode == "memory" else excel_file
+    memory.mark("Excel 생성")
+
+    with MattermostSession() as session:
+        report = deliver_report(build_destinations(), file_bytes=payload, file_name=excel_file.name, session=session)
+    excel_file.close()
+    memory.mark("전송")
+    memory.summary()
+
+    print(f"[벤치] 전송 {'성공' if report[0]['success'] else '실패'}, {(time.perf_counter() - start) * 1000:.0f} ms")
+    return report[0]["success"]
+
+def main():
+    from fake_mattermost import FakeMattermostServer
+
+    height = int(os.getenv("BENCH_SCREENSHOT_HEIGHT", "6000"))
+    success = True
+    with FakeMattermostServer() as server, server.env():
+        for mode, label in (("memory", "메모리(bytes 복사)"), ("spool", "임시 파일 스트리밍")):
+            print(f"\n[벤치] ===== {label} =====")
+            completed = subprocess.run([sys.executable, os.path.abspath(__file__), "--mode", mode, str(height)])
+            success = success and completed.returncode == 0
+        uploaded = [len(info["data"]) for info in server.files.values()]
+    # [SB] 두 방식 모두 파일 전체가 서버에 도착해야 함 (xlsx 내부 타임스탬프 때문에 몇 바이트 차이는 있음)
+    print(f"\n[벤치] 업로드된 파일: {', '.join(f'{size / 1024 / 1024:.1f} MiB' for size in uploaded)}")
+    return success and len(uploaded) == 2 and abs(uploaded[0] - uploaded[1]) < 1024
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        sys.exit(0 if run_mode(sys.argv[2], int(sys.argv[3])) else 1)
+
+    print("보고서 메모리 벤치마크 시작...")
+    success = main()
+
+    if success:
+        print("\n✅ 벤치마크 완료!")
+        sys.exit(0)
+    else:
+        print("\n❌ 벤치마크 실패!")
+        sys.exit(1)
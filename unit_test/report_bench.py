@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# report_bench.py - Markdown 메시지 보고서와 Excel 보고서 생성 비용 비교
+
+import os
+import sys
+import time
+import tracemalloc
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.checklist import evaluate_checklist
+from utils.report_text import render_checklist_markdown
+from utils.xlsx import create_dashboard_excel
+
+# [SB] 일부 항목이 비정상인 LLM 분석 결과 모의 데이터
+MOCK_LLM_RESULT = {
+    "로그인상태": "예",
+    "whois_usd": "199.99 USD",
+    "gabia_krw": "442,400 KRW",
+    "스케줄러상태": "예",
+    "1:1문의": "아니요",
+    "이메일문의": "예",
+    "에러리포트": "예",
+    "Region활성": "예",
+    "장비미보고": "예",
+    "DB_Sync": {"일시중지": "예", "오류": "예"},
+    "FrontEnd": {"상태": "예", "도메인 검색": "예"},
+    "운영중인서비스": {"parking": "예", "url": "아니요", "furl": "예", "url_link": "정상"}
+}
+
+def measure(label, func, runs):
+    """[SB] func를 runs회 실행하여 중앙값 시간, 최대 메모리, 결과 크기 출력"""
+    timings = []
+    peak_max = 0
+    size = 0
+    for _ in range(runs):
+        tracemalloc.start()
+        start = time.perf_counter()
+        size = func()
+        timings.append(time.perf_counter() - start)
+        peak_max = max(peak_max, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    print(f"[벤치] {label}: 중앙값 {median * 1000:.3f} ms, 최대 메모리 {peak_max / 1024:.0f} KiB, 결과 크기 {size:,} bytes ({runs}회)")
+    return median
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    checklist = evaluate_checklist(MOCK_LLM_RESULT)
+
+    def render_markdown():
+        return len(render_checklist_markdown(checklist, username="벤치마크").encode("utf-8"))
+
+    def render_xlsx():
+        excel_file = create_dashboard_excel(MOCK_LLM_RESULT, in_memory=True, username="벤치마크",
+                                            checklist=checklist, use_cache=False)
+        size = len(excel_file.getvalue())
+        excel_file.close()
+        return size
+
+    markdown = measure("Markdown 메시지", render_markdown, runs)
+    xlsx = measure("Excel (xlsx)", render_xlsx, runs)
+    print(f"[벤치] Markdown 렌더링이 {xlsx / markdown:,.0f}배 빠름 (업로드 API 호출 1회 절약)")
+    print()
+    print(render_checklist_markdown(checklist, username="벤치마크"))
+
+if __name__ == "__main__":
+    main()
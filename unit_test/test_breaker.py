@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_breaker.py - 의존 서비스 차단기 상태 전이(closed → open → half_open), 프로세스 간 공유, 열린 차단기의 빠른 실패/대체 경로 검증
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_DIR)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fake_mattermost import FakeMattermostServer
+import app
+import main as job
+import httpx
+import ollama
+from utils import tracing
+from utils.breaker import BREAKER_PATH, CircuitBreaker, CircuitOpenError, breaker_states, STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
+from utils.llm import analyze_with_ollama_async, _is_outage as ollama_outage
+from utils.mattermost_async import AsyncMattermostClient
+
+results = []
+
+class FakeClock:
+    """[SB] 시간을 직접 움직이는 시계"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def open_breaker(name):
+    breaker = CircuitBreaker(name, failure_threshold=1)
+    breaker.record_failure(ConnectionError("연결 거부"))
+    return breaker
+
+def test_transitions():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60, clock=clock)
+    for _ in range(2):
+        breaker.record_failure("연결 거부")
+    check("기준 미만의 연속 실패는 닫힌 상태 유지", breaker.allow() and breaker.status()["state"] == STATE_CLOSED)
+    breaker.record_failure("연결 거부")
+    status = breaker.status()
+    check("연속 실패 3회면 열림", status["state"] == STATE_OPEN and not breaker.allow() and status["retry_in"] == 60,
+          str(status))
+
+    clock.now += 61
+    first, second = breaker.allow(), breaker.allow()
+    check("재시도 시간이 지나면 시험 호출 하나만 허용", first and not second and breaker.status()["state"] == STATE_HALF_OPEN)
+    breaker.record_failure("연결 거부")
+    check("시험 호출이 실패하면 다시 열림", breaker.status()["state"] == STATE_OPEN and not breaker.allow())
+
+    clock.now += 61
+    breaker.allow()
+    breaker.record_success()
+    status = breaker.status()
+    check("시험 호출이 성공하면 닫힘", status["state"] == STATE_CLOSED and status["failures"] == 0 and breaker.allow())
+
+def test_guard():
+    breaker = CircuitBreaker("guard", failure_threshold=2)
+    for _ in range(3):
+        try:
+            with breaker.guard(lambda e: not isinstance(e, PermissionError)):
+                raise PermissionError("인증 실패")
+        except PermissionError:
+            pass
+    check("장애가 아닌 오류(인증 실패 등)는 실패로 세지 않음", breaker.status()["failures"] == 0)
+    for _ in range(2):
+        try:
+            with breaker.guard():
+                raise ConnectionError("연결 거부")
+        except ConnectionError:
+            pass
+    try:
+        with breaker.guard():
+            called = True
+        error = None
+    except CircuitOpenError as e:
+        called, error = False, e
+    check("열린 차단기는 호출하지 않고 CircuitOpenError", not called and error is not None and error.name == "guard" and
+          "연결 거부" in str(error.last_error))
+
+async def ticks_while_locked(breaker):
+    """[SB] 상태 DB가 잠긴 동안 guard_async가 실패를 기록하는 사이 이벤트 루프가 다른 작업을 계속 실행한 횟수"""
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.02)
+            ticks += 1
+
+    async def failing_call():
+        try:
+            async with breaker.guard_async():
+                raise ConnectionError("연결 거부")
+        except ConnectionError:
+            pass
+
+    task = asyncio.ensure_future(ticker())
+    await failing_call()
+    task.cancel()
+    return ticks
+
+def test_guard_async():
+    breaker = CircuitBreaker("guard_async")
+    breaker.status()
+    lock = sqlite3.connect(str(BREAKER_PATH), isolation_level=None, check_same_thread=False)
+    lock.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.5, lambda: lock.execute("COMMIT")).start()
+    ticks = asyncio.run(ticks_while_locked(breaker))
+    lock.close()
+    check("비동기 구간은 상태 DB가 잠겨도 이벤트 루프를 막지 않음", ticks >= 10 and breaker.status()["failures"] == 1, f"{ticks}회")
+
+def test_shared():
+    open_breaker("dashboard")
+    probe = "from utils.breaker import CircuitBreaker; print(CircuitBreaker('dashboard').is_open())"
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, cwd=os.getcwd(),
+                            env=dict(os.environ, PYTHONPATH=PROJECT_DIR)).stdout.strip()
+    check("다른 프로세스(점검 작업)와 상태 공유", output == "True", output)
+    CircuitBreaker("dashboard").record_success()
+
+def test_ollama_fallback():
+    open_breaker("ollama")
+    started = time.perf_counter()
+    ok, message = app.check_ollama_connection()
+    elapsed = time.perf_counter() - started
+    check("열린 Ollama 차단기는 연결 확인을 바로 실패", not ok and elapsed < 0.5 and "차단" in message, f"{elapsed:.3f}초")
+
+    trace = tracing.RunTrace(run_id="breaker").activate()
+    try:
+        answer = json.loads(asyncio.run(analyze_with_ollama_async({"로그인상태": "정상"})))
+    finally:
+        tracing._current_trace.set(None)
+    counters = {(name, labels): value for (name, labels), value in trace.counters.items()}
+    check("LLM 분석은 규칙 기반 결과로 대체", answer["로그인상태"] == "예" and
+          counters.get(("llm_answers", '{"result": "circuit_open"}')) == 1)
+
+    client = app.app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = "user-a"
+    breakers = client.get("/api/status").get_json()["breakers"]
+    check("/api/status에 차단기 상태 표시", breakers["ollama"]["state"] == STATE_OPEN and
+          breakers["mattermost"]["state"] == STATE_CLOSED and breakers["ollama"]["retry_in"] > 0, str(breakers["ollama"]))
+    CircuitBreaker("ollama").record_success()
+
+def test_classifiers():
+    check("Ollama 장애는 연결 실패, 5xx, 고정 제한 시간 초과만",
+          ollama_outage(ConnectionError("연결 거부")) and ollama_outage(ollama.ResponseError("오류", 503)) and
+          ollama_outage(httpx.ReadTimeout("시간 초과")) and not ollama_outage(ollama.ResponseError("model not found", 404)))
+    check("작업 예산 때문에 줄인 제한 시간의 초과는 Ollama 장애 아님", not ollama_outage(httpx.ReadTimeout("시간 초과"), budget_limited=True))
+    check("대시보드 장애 분류", job._is_dashboard_outage("net::ERR_CONNECTION_REFUSED") and job._is_dashboard_outage("오류", 502) and
+          not job._is_dashboard_outage("선택자 오류", 200) and
+          job._is_dashboard_outage("Timeout 60000ms exceeded") and not job._is_dashboard_outage("Timeout 60000ms exceeded", budget_limited=True))
+
+    # [SB] 예산이 부족한 작업의 시간 초과는 공유 차단기에 기록하지 않음 (연결만 받고 응답하지 않는 서버)
+    silent = socket.socket()
+    silent.bind(("127.0.0.1", 0))
+    silent.listen(8)
+    os.environ["OLLAMA_HOST"] = f"http://127.0.0.1:{silent.getsockname()[1]}"
+    try:
+        for _ in range(3):
+            asyncio.run(analyze_with_ollama_async({"로그인상태": "정상"}, timeout=30, budget=0.2))
+    finally:
+        del os.environ["OLLAMA_HOST"]
+        silent.close()
+    check("예산 부족으로 끝난 LLM 분석은 차단기를 열지 않음", breaker_states(["ollama"])["ollama"]["failures"] == 0)
+
+async def login(server):
+    client = AsyncMattermostClient()
+    try:
+        started = time.perf_counter()
+        logged_in = await client.login()
+        return logged_in, time.perf_counter() - started
+    finally:
+        await client.close()
+
+def test_mattermost():
+    with FakeMattermostServer() as server, server.env(OUTBOX_ENABLED="false"):
+        server.fail_next("/users/login", count=3, status=401)
+        for _ in range(3):
+            asyncio.run(login(server))
+        check("인증 실패(4xx)는 차단기를 열지 않음", breaker_states(["mattermost"])["mattermost"]["failures"] == 0)
+
+        server.fail_next("/users/login", count=3, status=503)
+        for _ in range(3):
+            asyncio.run(login(server))
+        server.latency = 1
+        logged_in, elapsed = asyncio.run(login(server))
+        server.latency = 0
+    check("5xx가 이어지면 열리고 이후 로그인은 바로 실패", not logged_in and elapsed < 0.5 and
+          breaker_states(["mattermost"])["mattermost"]["state"] == STATE_OPEN, f"{elapsed:.3f}초")
+
+def main():
+    # [SB] 차단기 DB(logs/breakers.sqlite3)를 임시 디렉터리에 만들어 실제 상태와 분리
+    os.chdir(tempfile.mkdtemp(prefix="breaker_"))
+    test_transitions()
+    test_guard()
+    test_guard_async()
+    test_shared()
+    test_ollama_fallback()
+    test_classifiers()
+    test_mattermost()
+    return all(results)
+
+if __name__ == "__main__":
+    print("차단기 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_cancel.py - 로그아웃/페이지 이탈 시 점검 작업 취소 검증 (SIGTERM → main() 취소, 제한 시간 후 강제 종료, LLM 요청 중단)
+
+import asyncio
+import json
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app
+import main
+from utils import zygote
+from utils.llm import analyze_with_ollama_async
+
+results = []
+
+# [SB] main()을 오래 걸리는 작업으로 바꿔 run_cancellable()로 실행하는 작업 스크립트
+JOB_SCRIPT = """
+import asyncio, sys
+import main
+
+async def long_job():
+    try:
+        print("ready", flush=True)
+        await asyncio.sleep(60)
+    finally:
+        print("cleanup", flush=True)
+
+main.main = long_job
+sys.exit(asyncio.run(main.run_cancellable()))
+"""
+
+STUBBORN_SCRIPT = """
+import signal, time
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+print("ready", flush=True)
+time.sleep(60)
+"""
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def write_script(directory, name, body):
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as script:
+        script.write(body)
+    return path
+
+def check_stop_process(workdir):
+    env = dict(os.environ, PYTHONPATH=str(zygote.PROJECT_DIR), LOG_LEVEL="WARNING")
+    process = zygote.spawn_script([write_script(workdir, "job.py", JOB_SCRIPT)], env=env, cwd=zygote.PROJECT_DIR)
+    ready = process.stdout.readline().strip()
+    started = time.perf_counter()
+    returncode = app.stop_process(process, grace=5)
+    elapsed = time.perf_counter() - started
+    check("SIGTERM이면 main()을 취소하고 정리 코드 실행", ready == "ready" and "cleanup" in process.stdout.read(),
+          f"{elapsed:.2f}초")
+    check("취소 종료 코드", returncode == main.EXIT_CANCELLED and "작업이 취소되었습니다" in process.stderr.read(), str(returncode))
+
+    process = zygote.spawn_script([write_script(workdir, "stubborn.py", STUBBORN_SCRIPT)], env=env, cwd=workdir)
+    process.stdout.readline()
+    started = time.perf_counter()
+    returncode = app.stop_process(process, grace=0.5)
+    elapsed = time.perf_counter() - started
+    check("제한 시간 안에 끝나지 않으면 강제 종료", returncode == -signal.SIGKILL and elapsed < 3, f"{elapsed:.2f}초")
+
+def test_login_jobs():
+    client = app.app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = "user-a"
+    job = app.register_login_job("user-a")
+    app.progress_store["user-a"] = {"status": "running", "progress": 30}
+    client.get("/api/progress")
+    response = client.get("/api/logout").get_json()
+    check("로그아웃하면 실행 중인 작업 취소 요청", response["success"] and job["cancel"].is_set() and job["reason"] == "logout")
+    check("진행 상태는 작업 스레드가 정리할 때까지 유지", "user-a" in app.progress_store)
+    app.progress_store.pop("user-a", None)
+
+    first = app.register_login_job("user-b")
+    second = app.register_login_job("user-b")
+    check("같은 사용자가 다시 로그인하면 이전 작업 취소", first["reason"] == "replaced" and not second["cancel"].is_set())
+    os.environ["JOB_ABANDON_SECONDS"] = "30"
+    try:
+        second["last_seen"] = time.time() - 31
+        try:
+            app._check_cancelled(second)
+            cancelled = None
+        except app.JobCancelled as e:
+            cancelled = str(e)
+    finally:
+        del os.environ["JOB_ABANDON_SECONDS"]
+    check("진행 상태 조회가 끊기면 이탈로 취소", cancelled == "abandoned")
+    app.login_jobs.clear()
+    check("실행 중인 작업이 없으면 취소할 것 없음", app.cancel_login_job("user-b", "logout") is False)
+
+class SlowOllamaHandler(BaseHTTPRequestHandler):
+    """[SB] 응답하지 않는 Ollama /api/chat - 요청 연결이 끊기면 closed 이벤트 설정"""
+    closed = threading.Event()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.connection.settimeout(0.05)
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            try:
+                if self.connection.recv(1) == b"":
+                    break
+            except OSError:
+                continue
+        SlowOllamaHandler.closed.set()
+
+    def log_message(self, format, *args):
+        pass
+
+async def cancel_llm_after(delay):
+    task = asyncio.ensure_future(analyze_with_ollama_async({"로그인상태": "정상"}))
+    await asyncio.sleep(delay)
+    task.cancel()
+    started = time.perf_counter()
+    try:
+        await task
+        return False, time.perf_counter() - started
+    except asyncio.CancelledError:
+        return True, time.perf_counter() - started
+
+def test_llm_cancel():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowOllamaHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OLLAMA_HOST"] = f"http://127.0.0.1:{server.server_address[1]}"
+    # [SB] 시간 초과가 반복 실행에서 Ollama 차단기를 열지 않도록 (차단기는 test_breaker.py에서 검증)
+    os.environ["BREAKER_ENABLED"] = "false"
+    try:
+        cancelled, elapsed = asyncio.run(cancel_llm_after(0.3))
+        check("취소는 규칙 기반 결과로 바꾸지 않고 그대로 전달", cancelled and elapsed < 1, f"{elapsed:.2f}초")
+        check("진행 중인 Ollama 요청 연결을 끊음", SlowOllamaHandler.closed.wait(3))
+        answer = json.loads(asyncio.run(analyze_with_ollama_async({"로그인상태": "정상"}, timeout=0.3)))
+        check("제한 시간 초과는 규칙 기반 결과", answer["로그인상태"] == "예")
+    finally:
+        del os.environ["OLLAMA_HOST"]
+        del os.environ["BREAKER_ENABLED"]
+        server.shutdown()
+
+def main_test():
+    workdir = tempfile.mkdtemp(prefix="cancel_")
+    os.environ["CHECK_ZYGOTE"] = "false"
+    try:
+        check_stop_process(workdir)
+    finally:
+        del os.environ["CHECK_ZYGOTE"]
+    test_login_jobs()
+    test_llm_cancel()
+    return all(results)
+
+if __name__ == "__main__":
+    print("작업 취소 테스트 시작...")
+    success = main_test()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
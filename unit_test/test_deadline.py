@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_deadline.py - 작업 예산(마감 시각) 계산, 단계 건너뛰기, LLM/Mattermost 제한 시간 적용 검증
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fake_mattermost import FakeMattermostServer
+from utils import tracing
+from utils.deadline import Deadline
+from utils.llm import rule_based_answer
+from utils.mattermost_async import AsyncMattermostClient
+
+results = []
+
+class FakeClock:
+    """[SB] 시간을 직접 움직이는 시계"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def test_budget():
+    clock = FakeClock()
+    deadline = Deadline(30, clock=clock)
+    check("단계 제한 시간은 고정값과 남은 예산 중 작은 값", deadline.timeout(10) == 10 and deadline.timeout(60) == 30)
+    check("이후 단계 예비 시간 제외", deadline.timeout(reserve=12) == 18 and deadline.ms(60, reserve=12) == 18000)
+    clock.now += 25
+    check("시간이 지나면 제한 시간도 줄어듦", deadline.remaining() == 5 and deadline.ms(10) == 5000)
+    check("예상 시간이 남은 예산보다 길면 허용 안 함", deadline.allows(4) and not deadline.allows(4, reserve=2))
+    clock.now += 10
+    check("마감 후에는 0 (Playwright용 ms는 최소 1)", deadline.expired and deadline.timeout(10) == 0 and deadline.ms(10) == 1)
+    check("최소 제한 시간", deadline.timeout(10, minimum=1) == 1)
+
+def test_env():
+    clock = FakeClock()
+    parent = Deadline(100, clock=clock)
+    os.environ.update(parent.env())
+    try:
+        clock.now += 7
+        child = Deadline.from_env(clock=clock)
+        check("자식 프로세스는 같은 마감 시각을 이어받음", child.expires_at == parent.expires_at and child.remaining() == 93)
+        os.environ["JOB_DEADLINE"] = "잘못된 값"
+        os.environ["JOB_DEADLINE_SECONDS"] = "40"
+        check("마감 시각이 잘못되면 JOB_DEADLINE_SECONDS부터", Deadline.from_env(clock=clock).remaining() == 40)
+    finally:
+        os.environ.pop("JOB_DEADLINE", None)
+        os.environ.pop("JOB_DEADLINE_SECONDS", None)
+
+def test_skip():
+    clock = FakeClock()
+    deadline = Deadline(20, clock=clock)
+    trace = tracing.RunTrace(run_id="deadline").activate()
+    try:
+        ran = not deadline.skip("link_check.url", 5, reserve=10)
+        skipped = deadline.skip("llm.analyze", 25, reserve=10)
+        answer = json.loads(rule_based_answer({"로그인상태": "정상", "whois_usd": "1,000.00 USD", "운영중인서비스": {"url": "정상"}}))
+    finally:
+        tracing._current_trace.set(None)
+    check("예산 안이면 실행, 부족하면 건너뜀", ran and skipped)
+    counters = {(name, labels): value for (name, labels), value in trace.counters.items()}
+    check("건너뛴 단계와 규칙 기반 결과 카운터 기록",
+          counters.get(("deadline_skips", '{"stage": "llm.analyze"}')) == 1 and
+          counters.get(("llm_answers", '{"result": "skipped"}')) == 1 and
+          ("deadline_skips", '{"stage": "link_check.url"}') not in counters)
+    check("LLM 생략 시 규칙 기반 결과", answer["로그인상태"] == "예" and answer["whois_usd"] == "1,000.00 USD" and
+          answer["운영중인서비스"]["url"] == "예" and answer["운영중인서비스"]["parking"] == "아니요")
+
+async def timed_request(server, deadline):
+    # [SB] 의도한 시간 초과가 Mattermost 차단기에 기록되지 않도록 (차단기는 test_breaker.py에서 검증)
+    with server.env(OUTBOX_ENABLED="false", BREAKER_ENABLED="false"):
+        client = AsyncMattermostClient(deadline=deadline)
+        try:
+            logged_in = await client.login()
+            server.latency = 3
+            started = time.perf_counter()
+            try:
+                await client.get_user_teams(client.user_id)
+                error = None
+            except asyncio.TimeoutError as e:
+                error = e
+            return logged_in, error, time.perf_counter() - started
+        finally:
+            server.latency = 0
+            await client.close()
+
+def test_mattermost_timeout():
+    with FakeMattermostServer() as server:
+        logged_in, error, elapsed = asyncio.run(timed_request(server, Deadline(1.5)))
+    check("Mattermost 요청은 남은 예산 안에서 중단", logged_in and isinstance(error, asyncio.TimeoutError) and elapsed < 2.5,
+          f"{elapsed:.2f}초")
+
+def main():
+    test_budget()
+    test_env()
+    test_skip()
+    test_mattermost_timeout()
+    return all(results)
+
+if __name__ == "__main__":
+    print("작업 예산 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
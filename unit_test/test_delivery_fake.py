@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_delivery_fake.py - 가짜 Mattermost 서버(fake_mattermost.py)로 보고서 전송/재전송/동시 전송 검증 및 처리량 측정
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fake_mattermost import FakeMattermostServer
+from utils import outbox
+from utils.channel_cache import get_cached_channel_id, team_channel_key
+from utils.delivery import build_destinations, deliver_report, deliver_report_async, drain_outbox
+from utils.mattermost import MattermostSession, send_excel_to_self
+from utils.mattermost_async import AsyncMattermostClient
+
+EXCEL_BYTES = b"PK\x03\x04fake-xlsx" + bytes(range(256)) * 64
+
+results = []
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def check_send_excel_to_self(server):
+    """기존 send_excel_to_self가 자신(DM)에 파일과 메시지를 게시하는지"""
+    import io
+    excel_file = io.BytesIO(EXCEL_BYTES)
+    excel_file.name = "report_test.xlsx"
+    with server.env():
+        success = send_excel_to_self(excel_file)
+    dm_id = server.dm_channel_id(server.user["id"], server.user["id"])
+    posts = server.posts_in(dm_id)
+    check("send_excel_to_self", success and len(posts) == 1 and len(posts[0]["file_ids"]) == 1)
+    file_info = server.files[posts[0]["file_ids"][0]] if posts else {}
+    check("업로드 파일 내용 일치", file_info.get("data") == EXCEL_BYTES and file_info.get("name") == "report_test.xlsx")
+
+def check_multi_destination(server):
+    """자신/팀/추가 사용자에게 같은 보고서를 동시에 전송"""
+    colleague = server.add_user("colleague", "pw")
+    server.team["members"].add(colleague["id"])
+    with server.env(MATTERMOST_REPORT_TEAMS="INNOGS", MATTERMOST_REPORT_USERS="colleague"):
+        destinations = build_destinations()
+        before = len(server.posts)
+        with MattermostSession() as session:
+            report = deliver_report(destinations, file_bytes=EXCEL_BYTES, file_name="multi.xlsx", message="요약", session=session)
+    check("대상 3곳 모두 성공", [r["success"] for r in report] == [True, True, True])
+    # [SB] 대상마다 메시지 1건 + 파일 게시물 1건
+    check("게시물 6건 생성", len(server.posts) - before == 6, f"{len(server.posts) - before}건")
+    check("팀 채널에 게시", len(server.posts_in(server.channel["id"])) == 2)
+
+def check_channel_cache_invalidation(server):
+    """캐시된 팀 채널이 삭제되면 캐시를 무효화하고 다음 전송에서 다시 조회"""
+    with server.env(MATTERMOST_REPORT_TEAMS="INNOGS", OUTBOX_ENABLED="false"):
+        cache_key = team_channel_key("INNOGS", server.channel["name"])
+        check("팀 채널 ID 캐시됨", get_cached_channel_id(cache_key) == server.channel["id"])
+
+        server.delete_channel(server.channel["id"])
+        server.channel = server.add_channel(server.team["id"], server.channel["name"], members=[server.user["id"], server.bot["id"]])
+        team_destination = [d for d in build_destinations() if d["kind"] == "team"]
+        with MattermostSession() as session:
+            first = deliver_report(team_destination, message="첫 시도", session=session)
+            second = deliver_report(team_destination, message="두 번째 시도", session=session)
+    check("삭제된 채널로 전송 실패 후 캐시 무효화", not first[0]["success"] and get_cached_channel_id(cache_key) in (None, server.channel["id"]))
+    check("다음 전송에서 새 채널로 성공", second[0]["success"] and len(server.posts_in(server.channel["id"])) == 1)
+
+def check_outbox_retry(server):
+    """게시 실패 시 아웃박스에 저장되고, 재전송에서 실패한 부분만 보냄"""
+    with server.env(OUTBOX_BASE_DELAY="0"):
+        server.fail_next("/posts", 1)
+        before = len(server.posts)
+        with MattermostSession() as session:
+            report = deliver_report(build_destinations(), file_bytes=EXCEL_BYTES, file_name="retry.xlsx", session=session)
+            check("첫 전송 실패 → 아웃박스 저장", not report[0]["success"] and report[0]["queued"])
+            check("아웃박스 대기 1건", outbox.outbox_stats().get("pending") == 1)
+
+            server.fail_next("/files", 1)
+            counts = drain_outbox(session=session)
+            check("재전송 실패 시 재시도 예약", counts == {"sent": 0, "retry": 1, "dead": 0}, str(counts))
+
+            counts = drain_outbox(session=session)
+            check("재전송 성공", counts == {"sent": 1, "retry": 0, "dead": 0}, str(counts))
+            counts = drain_outbox(session=session)
+            check("완료 후 재전송 없음", counts == {"sent": 0, "retry": 0, "dead": 0})
+    new_posts = server.posts[before:]
+    check("게시물은 정확히 1건", len(new_posts) == 1 and new_posts[0]["pending_post_id"] == report[0]["idem_key"] + "f")
+
+def check_outbox_relay(server):
+    """사용자 비밀번호 없이 봇 토큰이 사용자 계정의 항목을 그 사용자에게 DM으로 재전송, 자격 증명이 없으면 포기"""
+    member = server.add_user("member", "pw")
+    with server.env(token=True, OUTBOX_BASE_DELAY="0"):
+        outbox.enqueue("member", {"kind": "self", "target": "me", "label": "자신(DM)"}, "relay-key", message="대신 전송")
+        with MattermostSession() as session:
+            counts = drain_outbox(session=session, sender="member")
+    dm_id = server.dm_channel_id(server.bot["id"], member["id"])
+    check("봇 토큰으로 사용자에게 DM 재전송", counts["sent"] == 1 and dm_id and len(server.posts_in(dm_id)) == 1, str(counts))
+
+    outbox.enqueue("member", {"kind": "self", "target": "me", "label": "자신(DM)"}, "dead-key", message="보낼 수 없음")
+    check("자격 증명이 없으면 포기(dead)", outbox.abandon_sender("member", "자격 증명 없음") == 1 and "member" not in outbox.pending_senders())
+
+def check_idempotent_post(server):
+    """같은 pending_post_id 재요청은 새 게시물을 만들지 않음"""
+    with server.env():
+        with MattermostSession() as session:
+            from utils.mattermost import _send_message_to_mattermost, _get_self_dm_channel_id
+            channel_id = _get_self_dm_channel_id(session)
+            before = len(server.posts)
+            _send_message_to_mattermost("중복 확인", channel_id, session=session, pending_post_id="same-key")
+            _send_message_to_mattermost("중복 확인", channel_id, session=session, pending_post_id="same-key")
+    check("pending_post_id 중복 제거", len(server.posts) - before == 1)
+
+def check_token_mode(server):
+    """봇 토큰 인증: 로그인/로그아웃 없이 봇 → 사용자 DM"""
+    with server.env(token=True):
+        log_start = len(server.request_log)
+        with MattermostSession() as session:
+            report = deliver_report(build_destinations(), message="봇 전송", session=session)
+        paths = [path for _, path, _, _ in server.request_log[log_start:]]
+    dm_id = server.dm_channel_id(server.bot["id"], server.user["id"])
+    check("봇 → 사용자 DM 전송", report[0]["success"] and dm_id and len(server.posts_in(dm_id)) == 1)
+    check("비밀번호 로그인/로그아웃 없음", "/api/v4/users/login" not in paths and "/api/v4/users/logout" not in paths)
+
+def check_token_login_outage(server):
+    """토큰 인증 로그인이 장애로 실패해도 보고서를 아웃박스에 저장 (수신자는 로그인 전에 MATTERMOST_REPORT_USER_ID로 결정)"""
+    with server.env(token=True):
+        before = outbox.outbox_stats().get("pending", 0)
+        server.fail_next("/users/me", 1)
+        report = deliver_report(build_destinations(), message="장애 중 전송")
+    queued = outbox.outbox_stats().get("pending", 0) - before
+    check("토큰 로그인 실패 시 아웃박스 저장", not report[0]["success"] and report[0]["queued"] and queued == 1 and
+          f"token:{server.user['id']}" in outbox.pending_senders(), str(report[0]["error"]))
+
+def check_async_delivery(server):
+    """비동기 클라이언트로 자신/팀에 전송"""
+    async def run():
+        async with AsyncMattermostClient() as client:
+            return await deliver_report_async(build_destinations(), file_bytes=EXCEL_BYTES, file_name="async.xlsx", message="비동기", client=client)
+    with server.env(MATTERMOST_REPORT_TEAMS="INNOGS"):
+        before = len(server.posts)
+        report = asyncio.run(run())
+    check("비동기 전송 성공", all(r["success"] for r in report) and len(server.posts) - before == 4)
+    # [SB] 대상마다 요약 메시지가 첨부 파일보다 먼저 게시
+    orders = [[bool(post.get("file_ids")) for post in server.posts[before:] if post["channel_id"] == channel_id]
+              for channel_id in {post["channel_id"] for post in server.posts[before:]}]
+    check("대상마다 메시지 → 파일 순서", orders and all(order == [False, True] for order in orders), str(orders))
+
+def bench_throughput(latency=0.05, users=8):
+    """[SB] 요청당 지연이 있을 때 순차/스레드 풀/비동기 전송 시간 비교"""
+    with FakeMattermostServer(latency=latency) as server:
+        usernames = []
+        for index in range(users):
+            user = server.add_user(f"member{index}", "pw")
+            usernames.append(user["username"])
+        with server.env(MATTERMOST_REPORT_USERS=",".join(usernames), OUTBOX_ENABLED="false"):
+            destinations = build_destinations()
+            timings = {}
+            with MattermostSession() as session:
+                # [SB] 첫 실행에서 DM 채널 ID가 캐시되므로 예열 후 측정
+                deliver_report(destinations, message="예열", session=session)
+                for label, workers in (("순차(1)", 1), ("스레드 풀(4)", 4), (f"스레드 풀({len(destinations)})", len(destinations))):
+                    start = time.perf_counter()
+                    deliver_report(destinations, file_bytes=EXCEL_BYTES, file_name="bench.xlsx", session=session, max_workers=workers)
+                    timings[label] = time.perf_counter() - start
+
+            async def run_async():
+                async with AsyncMattermostClient() as client:
+                    start = time.perf_counter()
+                    await deliver_report_async(destinations, file_bytes=EXCEL_BYTES, file_name="bench.xlsx", client=client,
+                                               max_concurrency=len(destinations))
+                    return time.perf_counter() - start
+            timings[f"비동기({len(destinations)})"] = asyncio.run(run_async())
+
+    print(f"\n[벤치] 대상 {len(destinations)}곳, 요청 지연 {latency * 1000:.0f} ms (대상당 업로드+게시 2회)")
+    for label, elapsed in timings.items():
+        print(f"[벤치] {label}: {elapsed * 1000:.0f} ms")
+
+def main():
+    # [SB] 채널 캐시/아웃박스는 현재 디렉터리의 logs/를 사용하므로 임시 디렉터리에서 실행
+    os.chdir(tempfile.mkdtemp(prefix="fake_mm_"))
+    with FakeMattermostServer() as server:
+        print(f"[테스트] 가짜 Mattermost 서버: {server.url}")
+        check_send_excel_to_self(server)
+        check_multi_destination(server)
+        check_channel_cache_invalidation(server)
+        check_outbox_retry(server)
+        check_outbox_relay(server)
+        check_idempotent_post(server)
+        check_token_mode(server)
+        check_token_login_outage(server)
+        check_async_delivery(server)
+
+    bench_throughput()
+    return all(results)
+
+if __name__ == "__main__":
+    print("Mattermost 전송 테스트 (가짜 서버) 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_forecast.py - 점검 이력 기반 예치금 소진 속도/기준값 도달 예상일 계산 검증
+
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import forecast, history
+from utils.report_text import render_checklist_markdown
+
+results = []
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def daily_frame(whois, gabia, end=date(2026, 10, 19)):
+    """[SB] 일 단위 예치금 표 (None은 점검이 없던 날)"""
+    index = pd.date_range(end=pd.Timestamp(end), periods=len(whois), freq="D")
+    return pd.DataFrame({"whois_usd": whois, "gabia_krw": gabia}, index=index, dtype=float)
+
+def test_compute():
+    thresholds = {"whois_usd": 500.0, "gabia_krw": 100000.0}
+    today = date(2026, 10, 19)
+
+    # [SB] Whois는 하루 10 USD씩 감소, Gabia는 5일째 충전(+300,000) 외에는 하루 20,000 KRW씩 감소
+    frame = daily_frame([700, 690, 680, 670, 660, 650], [300000, 280000, 260000, 240000, 520000, 500000])
+    result = forecast.compute_forecast(frame, thresholds, window_days=14, today=today)
+    whois = result["whois_usd"]
+    check("하루 평균 사용량", abs(whois["burn_per_day"] - 10) < 1e-9, str(whois["burn_per_day"]))
+    check("기준값 도달 예상일", whois["projected_date"] == (today + timedelta(days=15)).isoformat() and whois["status"] == "ok")
+    check("충전한 날은 사용량에서 제외", abs(result["gabia_krw"]["burn_per_day"] - 20000) < 1e-9, str(result["gabia_krw"]["burn_per_day"]))
+
+    # [SB] 점검이 없던 날(NaN)은 직전 값으로 채워, 이틀 치 감소가 평균에 그대로 반영
+    gap = daily_frame([700, 690, None, 670, 660], [None] * 5)
+    result = forecast.compute_forecast(gap, thresholds, window_days=14, today=today)
+    check("점검이 없던 날 보정", abs(result["whois_usd"]["burn_per_day"] - 10) < 1e-9 and result["gabia_krw"]["status"] == "no_data")
+
+    warning = forecast.compute_forecast(daily_frame([560, 540, 520], [150000] * 3), thresholds, window_days=14, today=today)
+    check("경고 기간 이내", warning["whois_usd"]["status"] == "warning" and warning["gabia_krw"]["status"] == "no_burn")
+    below = forecast.compute_forecast(daily_frame([520, 510, 490], [150000] * 3), thresholds, window_days=14, today=today)
+    check("이미 기준 미만", below["whois_usd"]["status"] == "below")
+
+    lines = forecast.format_forecast_lines(warning)
+    check("예측 문장", len(lines) == 2 and "충전 필요" in lines[0] and "도달 예상 없음" in lines[1], " / ".join(lines))
+    markdown = render_checklist_markdown([], forecast_lines=lines)
+    check("Markdown 보고서에 예측 표시", "**예치금 소진 예측**" in markdown and f"- {lines[0]}" in markdown)
+
+def test_history_forecast():
+    # [SB] 이력 DB/예측 캐시는 현재 디렉터리의 logs/를 사용하므로 임시 디렉터리에서 실행
+    os.chdir(tempfile.mkdtemp(prefix="forecast_"))
+    noon = datetime.combine(date.today(), datetime.min.time()).timestamp() + 12 * 3600
+    for days_ago, whois in ((4, "1,040.00 USD"), (3, "1,030.00 USD"), (2, "1,020.00 USD"), (1, "1,010.00 USD"), (0, "1,000.00 USD")):
+        fields = {"whois_usd": whois, "gabia_krw": "442,400 KRW"}
+        history.record_snapshot(fields, dict(fields), [], checked_at=noon - days_ago * 86400)
+
+    daily = forecast.load_deposit_frame(7)
+    check("이력에서 일 단위 표 생성", list(daily["whois_usd"].dropna()) == [1040, 1030, 1020, 1010, 1000], str(list(daily["whois_usd"])))
+
+    first = forecast.get_deposit_forecast()
+    check("이력 기반 예측", abs(first["whois_usd"]["burn_per_day"] - 10) < 1e-9 and first["gabia_krw"]["status"] == "no_burn")
+
+    # [SB] 같은 날 다시 점검해도 캐시된 예측을 사용
+    fields = {"whois_usd": "100.00 USD", "gabia_krw": "442,400 KRW"}
+    history.record_snapshot(fields, dict(fields), [], checked_at=noon + 60)
+    check("같은 날은 캐시 사용", forecast.get_deposit_forecast() == first)
+    os.environ["FORECAST_WINDOW_DAYS"] = "3"
+    try:
+        check("설정이 바뀌면 다시 계산", forecast.get_deposit_forecast()["whois_usd"]["status"] == "below")
+    finally:
+        del os.environ["FORECAST_WINDOW_DAYS"]
+
+def main():
+    test_compute()
+    test_history_forecast()
+    return all(results)
+
+if __name__ == "__main__":
+    print("예치금 소진 예측 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
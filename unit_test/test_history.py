@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_history.py - 점검 이력(SQLite) 저장, 기간 조회, 이전 점검 대비 변경 사항 검증
+
+import copy
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import history
+from utils.checklist import evaluate_checklist
+from utils.delivery import should_send_full_report
+from utils.report_text import render_changes_markdown, render_no_change_message
+
+# [SB] LLM 분석 결과 모의 데이터 (main.py에서 넘어오는 형태와 동일, 링크 체크 결과 포함)
+MOCK_LLM_RESULT = {
+    "로그인상태": "예",
+    "whois_usd": "1,072.88 USD",
+    "gabia_krw": "442,400 KRW",
+    "스케줄러상태": "예",
+    "1:1문의": "예",
+    "이메일문의": "아니요",
+    "에러리포트": "예",
+    "Region활성": "예",
+    "장비미보고": "예",
+    "DB_Sync": {"일시중지": "예", "오류": "예"},
+    "FrontEnd": {"상태": "예", "도메인 검색": "예"},
+    "운영중인서비스": {"parking": "예", "url": "아니요", "furl": "예", "url_link": "비정상"}
+}
+MOCK_FIELDS = {"로그인상태": "정상", "whois_usd": "1,072.88 USD", "gabia_krw": "442,400 KRW"}
+
+results = []
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def check_delivery_policy(now):
+    """on_change 정책: 마지막 전체 보고와 판정이 같으면 한 줄 메시지, 다르거나 heartbeat가 지나면 전체 보고서"""
+    checklist = evaluate_checklist(MOCK_LLM_RESULT)
+    digest = history.verdict_digest(checklist, MOCK_LLM_RESULT)
+    check("전체 보고 이력이 없으면 전체 보고서", should_send_full_report(digest, history.last_full_report())[0])
+
+    sent = history.record_snapshot(MOCK_FIELDS, MOCK_LLM_RESULT, checklist, checked_at=now - 600)
+    history.finish_snapshot(sent, delivered=True, delivery=history.DELIVERY_FULL)
+    failed = history.record_snapshot(MOCK_FIELDS, MOCK_LLM_RESULT, checklist, checked_at=now - 300)
+    history.finish_snapshot(failed, delivered=False, delivery=history.DELIVERY_FULL)
+    last_full = history.last_full_report()
+    check("전송에 실패한 보고는 기준에서 제외", last_full["id"] == sent)
+
+    send_full, reason = should_send_full_report(digest, last_full, now=now)
+    check("판정이 같으면 변경 없음", not send_full, reason)
+    other = copy.deepcopy(MOCK_LLM_RESULT)
+    other["스케줄러상태"] = "아니요"
+    send_full, reason = should_send_full_report(history.verdict_digest(evaluate_checklist(other), other), last_full, now=now)
+    check("판정이 바뀌면 전체 보고서", send_full, reason)
+    balance = dict(MOCK_LLM_RESULT, whois_usd="1,050.12 USD", gabia_krw="440,000 KRW")
+    send_full, reason = should_send_full_report(history.verdict_digest(evaluate_checklist(balance), balance), last_full, now=now)
+    check("잔액만 바뀌면 변경 없음", not send_full, reason)
+    send_full, reason = should_send_full_report(digest, last_full, now=now + 13 * 3600)
+    check("heartbeat 경과 시 전체 보고서", send_full, reason)
+    check("변경 없음 한 줄 메시지", "변경 없음" in render_no_change_message(checklist, last_full) and "\n" not in render_no_change_message(checklist, last_full))
+
+def main():
+    # [SB] 이력 DB는 현재 디렉터리의 logs/를 사용하므로 임시 디렉터리에서 실행
+    os.chdir(tempfile.mkdtemp(prefix="history_"))
+    now = time.time()
+
+    first = history.record_snapshot(MOCK_FIELDS, MOCK_LLM_RESULT, evaluate_checklist(MOCK_LLM_RESULT),
+                                    trigger="schedule", checked_at=now - 3600)
+    previous, changes = history.diff_with_previous(first)
+    check("첫 스냅샷은 비교 대상 없음", previous is None and changes == [])
+
+    same = history.record_snapshot(MOCK_FIELDS, MOCK_LLM_RESULT, evaluate_checklist(MOCK_LLM_RESULT), checked_at=now - 1800)
+    previous, changes = history.diff_with_previous(same)
+    check("같은 결과는 변경 없음", previous["id"] == first and changes == [])
+    check("같은 판정은 같은 다이제스트", previous["verdict_digest"] == history.get_snapshot(same)["verdict_digest"])
+    check("변경 없음 메시지", "변경 없음" in render_changes_markdown(previous, changes))
+
+    llm = copy.deepcopy(MOCK_LLM_RESULT)
+    llm["이메일문의"] = "예"
+    llm["운영중인서비스"]["url_link"] = "정상"
+    fields = dict(MOCK_FIELDS, whois_usd="1,000.00 USD")
+    fields.pop("gabia_krw")
+    latest = history.record_snapshot(fields, llm, evaluate_checklist(llm), checked_at=now)
+    history.finish_snapshot(latest, timings={"전송": 1.5}, delivered=True, username="홍길동")
+
+    previous, changes = history.diff_with_previous(latest)
+    by_key = {(change["kind"], change["key"]): change for change in changes}
+    check("이전 스냅샷은 바로 앞 점검", previous["id"] == same)
+    check("추출 필드 변경", by_key[("field", "whois_usd")]["after"] == "1,000.00 USD")
+    check("사라진 필드", by_key[("field", "gabia_krw")]["after"] is None)
+    check("링크 체크 변경", by_key[("link", "운영중인서비스.url_link")]["before"] == "비정상")
+    email = by_key.get(("verdict", "05 고객문의"), {})
+    check("판정 변경", email.get("ok_before") is False and email.get("ok_after") is True)
+    check("판정 변경만 조회", all(change["kind"] == "verdict" for change in history.diff_snapshots(same, latest, kinds=["verdict"])))
+    check("변경 메시지", "변경 3건" in render_changes_markdown(previous, changes), render_changes_markdown(previous, changes).split('\n')[0])
+
+    recent = history.query_snapshots(start=now - 2000)
+    check("기간 조회 (최신순)", [snapshot["id"] for snapshot in recent] == [latest, same])
+    check("소요 시간/담당자 기록", recent[0]["timings"] == {"전송": 1.5} and recent[0]["username"] == "홍길동")
+
+    check_delivery_policy(now)
+
+    check("보관 기간이 지난 스냅샷 삭제", history.purge_history(days=2000 / 86400) == 1 and history.latest_snapshot(before_id=same) is None)
+    return all(results)
+
+if __name__ == "__main__":
+    print("점검 이력 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
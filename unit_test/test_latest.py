@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_latest.py - 최신 점검 결과/보고서 보관, 변경 없음 실행의 보고서 유지, 다른 담당자용 보고서 재생성 검증
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app
+from utils.checklist import evaluate_checklist
+from utils.latest import save_latest_result, load_latest_result, latest_report_path, report_matches
+
+MOCK_LLM_RESULT = {
+    "로그인상태": "예",
+    "whois_usd": "1,072.88 USD",
+    "gabia_krw": "442,400 KRW",
+    "스케줄러상태": "예",
+    "1:1문의": "예",
+    "이메일문의": "아니요",
+}
+
+results = []
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def latest_result(username, checked_at):
+    return {"checked_at": checked_at.isoformat(timespec="seconds"), "username": username,
+            "llm": MOCK_LLM_RESULT, "checklist": evaluate_checklist(MOCK_LLM_RESULT), "forecast_lines": []}
+
+def main():
+    # [SB] 최신 결과는 현재 디렉터리의 logs/latest/를 사용하므로 임시 디렉터리에서 실행
+    os.chdir(tempfile.mkdtemp(prefix="latest_"))
+    now = datetime.now()
+    first = save_latest_result(latest_result("홍길동", now - timedelta(minutes=20)), b"PK-first", "first.xlsx")
+    kept = save_latest_result(latest_result("김철수", now), None, None, keep_report=True)
+    check("보고서를 다시 만들지 않으면 점검 시각/담당자 유지", kept["checked_at"] == first["checked_at"] and
+          kept["username"] == "홍길동" and load_latest_result()["report_file"] == first["report_file"])
+
+    check("같은 담당자의 오늘 보고서만 그대로 사용", report_matches(kept, "홍길동") and not report_matches(kept, "김철수") and
+          not report_matches(kept, "홍길동", now=now + timedelta(days=1)))
+
+    result = load_latest_result()
+    report = app.open_latest_report(result, latest_report_path(result), "홍길동")
+    try:
+        check("저장된 보고서 전송", report.getvalue() == b"PK-first")
+    finally:
+        report.close()
+    report = app.open_latest_report(result, latest_report_path(result), "김철수")
+    try:
+        check("다른 담당자면 분석 결과로 다시 생성", "김철수" in report.name and report.getvalue()[:2] == b"PK", report.name)
+    finally:
+        report.close()
+    return all(results)
+
+if __name__ == "__main__":
+    print("최신 결과 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_log.py - 구조화 로그(JSON 출력, 작업 ID 연결, 레벨 필터, 자식 프로세스 출력 읽기) 검증
+
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.log import setup_logging, shutdown_logging, bind_job_id, ProcessLogReader
+
+results = []
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+class CountingArg:
+    """[SB] 문자열로 변환된 횟수를 세는 로그 인자"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "값"
+
+def capture(fmt="json", level="INFO", job_id=None):
+    stream = io.StringIO()
+    setup_logging(job_id=job_id, level=level, fmt=fmt, stream=stream)
+    return stream
+
+def flushed(stream):
+    shutdown_logging()
+    return [line for line in stream.getvalue().splitlines() if line]
+
+def test_json():
+    stream = capture(job_id="proc0001")
+    logger = logging.getLogger("utils.test")
+    data = {"항목": ["정상"]}
+    logger.info("필드 추출 결과", extra={"event": "fields_extracted", "data": data})
+    # [SB] 기록 후 바뀐 값은 출력에 반영되지 않아야 함 (큐에 넣을 때 직렬화)
+    data["항목"].append("변경")
+    with bind_job_id("job00002"):
+        logger.warning("전송 실패: %s", "timeout")
+    try:
+        raise ValueError("잘못된 응답")
+    except ValueError:
+        logger.exception("LLM 분석 중 오류 발생")
+    lines = [json.loads(line) for line in flushed(stream)]
+
+    check("한 줄에 JSON 하나", len(lines) == 3 and lines[0]["logger"] == "utils.test" and lines[0]["level"] == "INFO")
+    check("event/data 필드", lines[0].get("event") == "fields_extracted" and lines[0]["data"] == {"항목": ["정상"]})
+    check("프로세스 작업 ID", lines[0]["job_id"] == "proc0001")
+    check("컨텍스트 작업 ID 우선", lines[1]["job_id"] == "job00002" and lines[1]["msg"] == "전송 실패: timeout")
+    check("예외 traceback", "ValueError: 잘못된 응답" in lines[2].get("exc", ""))
+
+def test_levels():
+    os.environ["LOG_LEVELS"] = "utils.quiet=ERROR"
+    stream = capture(level="INFO")
+    del os.environ["LOG_LEVELS"]
+    arg = CountingArg()
+    logging.getLogger("utils.test").debug("이미지 위치: %s", arg)
+    logging.getLogger("utils.quiet").warning("경고: %s", arg)
+    check("걸러진 기록은 메시지를 만들지 않음", arg.calls == 0, f"{arg.calls}회 변환")
+    logging.getLogger("utils.test").info("결과: %s", arg)
+    lines = flushed(stream)
+    check("통과한 기록은 한 번만 변환", arg.calls == 1 and len(lines) == 1)
+
+def test_text():
+    stream = capture(fmt="text")
+    with bind_job_id("job00003"):
+        logging.getLogger("utils.test").info("Excel 파일 생성", extra={"data": {"size": 1}})
+    lines = flushed(stream)
+    check("텍스트 형식", "INFO [utils.test] (job00003) Excel 파일 생성" in lines[0] and lines[1] == '{"size": 1}')
+
+def test_non_blocking():
+    # [SB] 출력 대상이 느려도 로그를 남기는 쪽은 기다리지 않음
+    class SlowStream(io.StringIO):
+        def write(self, text):
+            time.sleep(0.01)
+            return super().write(text)
+
+    stream = SlowStream()
+    setup_logging(level="INFO", stream=stream)
+    started = time.perf_counter()
+    for index in range(100):
+        logging.getLogger("utils.test").info("링크 체크 %d", index)
+    elapsed = time.perf_counter() - started
+    lines = flushed(stream)
+    check("큐 기반 비동기 출력", elapsed < 0.5 and len(lines) == 100, f"{elapsed * 1000:.1f} ms")
+
+def test_process_reader():
+    # [SB] 파이프 버퍼(보통 64KB)보다 훨씬 많이 출력하는 자식 프로세스 - 끝까지 읽지 않으면 멈춤
+    child = (
+        "import json, sys\n"
+        "for i in range(20000):\n"
+        "    print(json.dumps({'level': 'DEBUG', 'logger': 'utils.xlsx', 'job_id': 'job00004', 'msg': 'x' * 40}))\n"
+        "print(json.dumps({'level': 'INFO', 'logger': '__main__', 'job_id': 'job00004', 'msg': '대시보드 보고서 전송 완료', 'event': 'report_delivered'}, ensure_ascii=False))\n"
+        "print('plain text line')\n"
+        "print('stderr line', file=sys.stderr)\n"
+    )
+    stream = capture(level="INFO")
+    process = subprocess.Popen([sys.executable, "-c", child], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, encoding="utf-8")
+    reader = ProcessLogReader(process, "job00004", tail_lines=50)
+    done = threading.Event()
+    threading.Thread(target=lambda: (process.wait(), done.set()), daemon=True).start()
+    finished = done.wait(30)
+    reader.join()
+    check("많은 출력에도 멈추지 않음", finished and process.returncode == 0)
+    check("최근 줄만 보관", len(reader.stdout.splitlines()) == 50 and reader.stdout.endswith("plain text line\n"))
+    check("event 수집", reader.events == ["report_delivered"] and reader.stderr == "stderr line\n")
+    lines = [json.loads(line) for line in flushed(stream)]
+    forwarded = [line for line in lines if line["logger"] == "job.__main__"]
+    check("자식 로그를 같은 작업 ID로 다시 기록 (레벨 필터 적용)",
+          len(lines) == 1 and len(forwarded) == 1 and forwarded[0]["job_id"] == "job00004")
+
+def main():
+    test_json()
+    test_levels()
+    test_text()
+    test_non_blocking()
+    test_process_reader()
+    return all(results)
+
+if __name__ == "__main__":
+    print("구조화 로그 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_metrics.py - /metrics Prometheus 텍스트 형식 출력 검증 (작업 카운터, 단계 히스토그램, 캐시/LLM 카운터)
+
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import metrics, tracing
+
+results = []
+
+# [SB] 샘플 줄: 메트릭 이름{레이블} 값
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="([^"\\]|\\.)*",?)*\})? (-?[0-9.e+]+|\+Inf|NaN)$')
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def sample(text, line_prefix):
+    """[SB] line_prefix로 시작하는 샘플의 값"""
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+def record_run(llm_seconds, upload_fails=False):
+    """[SB] main.py 한 번 실행과 같은 방식으로 구간/카운터 기록"""
+    trace = tracing.RunTrace()
+    now = time.perf_counter()
+    trace.add_span("LLM 분석", now - llm_seconds, now)
+    trace.add_span("llm.analyze", now - llm_seconds, now, category="llm")
+    trace.add_span("mattermost.upload_file", now - 0.2, now, category="mattermost", status="error" if upload_fails else "ok")
+    trace.add_span("link_check.url", now - 1.5, now, category="link")
+    trace.count("cache", cache="report", result="hit")
+    trace.count("cache", cache="channel", result="miss")
+    trace.count("llm_answers", result="mismatch")
+    trace.count("llm_mismatched_fields", 2)
+    trace.finish()
+
+def main():
+    # [SB] 누적 DB는 현재 디렉터리의 logs/를 사용하므로 임시 디렉터리에서 실행
+    os.chdir(tempfile.mkdtemp(prefix="metrics_"))
+    check("기록이 없으면 빈 출력", metrics.render_metrics() == "\n")
+
+    record_run(12.0)
+    record_run(40.0, upload_fails=True)
+
+    jobs = metrics.Counter("dashboard_check_jobs_started_total", "시작한 작업 수", ("trigger",))
+    jobs.inc(trigger="login")
+    jobs.inc(trigger="login")
+    jobs.inc(trigger='sched"ule')
+    gauges = [("dashboard_check_jobs_running", "실행 중인 작업 수", [({"kind": "login"}, 1)])]
+    text = metrics.render_metrics([jobs], gauges)
+    lines = [line for line in text.splitlines() if line and not line.startswith("#")]
+    bad = [line for line in lines if not SAMPLE_LINE.match(line)]
+    check("모든 샘플 줄이 텍스트 형식", not bad, bad[0] if bad else f"{len(lines)}줄")
+    check("작업 카운터", sample(text, 'dashboard_check_jobs_started_total{trigger="login"}') == 2)
+    check("레이블 값 이스케이프", 'trigger="sched\\"ule"' in text)
+    check("게이지", sample(text, 'dashboard_check_jobs_running{kind="login"}') == 1)
+
+    stage = 'dashboard_check_stage_duration_seconds'
+    buckets = [float(line.rsplit(" ", 1)[1]) for line in lines if line.startswith(stage + '_bucket{stage="LLM 분석"')]
+    check("단계 히스토그램 누적 버킷", buckets == sorted(buckets) and buckets[-1] == 2 and len(buckets) == len(tracing.HISTOGRAM_BUCKETS) + 1)
+    check("단계 히스토그램 합계/횟수", sample(text, stage + '_sum{stage="LLM 분석"}') == 52 and sample(text, stage + '_count{stage="LLM 분석"}') == 2)
+    check("LLM 지연 시간", sample(text, "dashboard_llm_request_duration_seconds_count") == 2)
+    check("Mattermost 호출 지연/오류", sample(text, 'dashboard_mattermost_request_duration_seconds_count{op="upload_file"}') == 2
+          and sample(text, 'dashboard_mattermost_request_errors_total{op="upload_file"}') == 1)
+    check("세부 구간", sample(text, 'dashboard_check_span_duration_seconds_count{span="link_check.url",category="link"}') == 2)
+    check("캐시 적중/실패", sample(text, 'dashboard_cache_requests_total{cache="report",result="hit"}') == 2
+          and sample(text, 'dashboard_cache_requests_total{cache="channel",result="miss"}') == 2)
+    check("규칙/LLM 불일치", sample(text, 'dashboard_llm_answers_total{result="mismatch"}') == 2
+          and sample(text, "dashboard_llm_mismatched_fields_total") == 4)
+    check("TYPE 선언은 메트릭마다 한 번", len([line for line in text.splitlines() if line.startswith("# TYPE")])
+          == len({line.split()[2] for line in text.splitlines() if line.startswith("# TYPE")}))
+
+    # [SB] 누적 DB가 바뀌지 않았으면 다시 읽지 않음
+    cached = metrics.run_metrics_lines()
+    check("DB 변경 없으면 캐시 사용", metrics.run_metrics_lines() is cached)
+    record_run(5.0)
+    check("DB 변경 시 다시 읽음", sample(metrics.render_metrics(), stage + '_count{stage="LLM 분석"}') == 3)
+
+    started = time.perf_counter()
+    for _ in range(200):
+        metrics.render_metrics([jobs], gauges)
+    per_request = (time.perf_counter() - started) / 200 * 1000
+    check("요청당 처리 시간", per_request < 5, f"{per_request:.3f} ms")
+    return all(results)
+
+if __name__ == "__main__":
+    print("메트릭 출력 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_report_cache.py - 보고서 캐시 적중/미스 검증 (스크린샷만 바뀌어도 새 스크린샷으로 다시 생성)
+
+import io
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+from PIL import Image as PILImage
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import tracing
+from utils.xlsx import create_dashboard_excel
+
+MOCK_LLM_RESULT = {
+    "로그인상태": "예",
+    "whois_usd": "1,072.88 USD",
+    "gabia_krw": "442,400 KRW",
+}
+
+results = []
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def png_bytes(color):
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (40, 30), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+def build(screenshot):
+    """[SB] 보고서를 만들고 (캐시 결과, 보고서에 들어간 이미지 바이트 목록) 반환"""
+    trace = tracing.RunTrace(run_id="report_cache").activate()
+    try:
+        report = create_dashboard_excel(MOCK_LLM_RESULT, in_memory=True, username="홍길동",
+                                        dashboard_screenshot=io.BytesIO(screenshot), use_cache=True)
+    finally:
+        tracing._current_trace.set(None)
+    try:
+        with zipfile.ZipFile(io.BytesIO(report.getvalue())) as archive:
+            images = [archive.read(name) for name in sorted(archive.namelist()) if name.startswith("xl/media/")]
+    finally:
+        report.close()
+    return trace.counters.get(("cache", '{"cache": "report", "result": "hit"}')) == 1, images
+
+def main():
+    # [SB] 보고서 캐시(logs/report_cache)와 페이지 스크린샷(screenshot/)은 현재 디렉터리 기준이므로 임시 디렉터리에서 실행
+    os.chdir(tempfile.mkdtemp(prefix="report_cache_"))
+    red, blue = png_bytes("red"), png_bytes("blue")
+
+    hit, _ = build(red)
+    check("처음 만든 보고서는 캐시 미스", not hit)
+    hit, images = build(red)
+    check("같은 스크린샷이면 캐시 적중", hit and red in images)
+
+    hit, images = build(blue)
+    check("스크린샷만 바뀌면 캐시 미스, 새 스크린샷 포함", not hit and blue in images and red not in images)
+
+    Path("screenshot").mkdir()
+    PILImage.new("RGB", (40, 30), "green").save("screenshot/1.jpg")
+    hit, _ = build(blue)
+    check("페이지 스크린샷 파일이 바뀌어도 캐시 미스", not hit)
+    return all(results)
+
+if __name__ == "__main__":
+    print("보고서 캐시 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
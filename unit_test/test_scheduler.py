@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_scheduler.py - 정기 점검 cron 표현식 해석 및 다음 실행 시각 계산 검증
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.scheduler import CronSchedule, next_run_time
+
+results = []
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def main():
+    # [SB] 2026-10-16은 금요일
+    shift = CronSchedule("50 8,17 * * 1-5")
+    friday_evening = datetime(2026, 10, 16, 17, 50)
+    check("같은 시각은 제외하고 다음 평일로", shift.next_after(friday_evening) == datetime(2026, 10, 19, 8, 50))
+    check("당일 남은 시각", shift.next_after(datetime(2026, 10, 19, 9, 0)) == datetime(2026, 10, 19, 17, 50))
+
+    every_quarter = CronSchedule("*/15 * * * *")
+    check("간격(*/15)", every_quarter.next_after(datetime(2026, 1, 1, 10, 7, 30)) == datetime(2026, 1, 1, 10, 15))
+    check("시간 넘김", every_quarter.next_after(datetime(2026, 1, 1, 10, 59)) == datetime(2026, 1, 1, 11, 0))
+
+    check("윤년 2월 29일", CronSchedule("0 0 29 2 *").next_after(datetime(2026, 3, 1)) == datetime(2028, 2, 29))
+    check("일요일은 0과 7 모두 허용", CronSchedule("0 12 * * 7").weekdays == CronSchedule("0 12 * * 0").weekdays)
+    # [SB] 일과 요일이 모두 지정되면 둘 중 하나만 맞아도 실행 (표준 cron)
+    check("일/요일 OR 조건", CronSchedule("0 12 1 * 0").next_after(datetime(2026, 10, 19)) == datetime(2026, 10, 25, 12, 0))
+
+    schedules = [CronSchedule("0 18 * * *"), CronSchedule("30 9 * * *")]
+    check("여러 스케줄 중 가장 빠른 시각", next_run_time(schedules, datetime(2026, 10, 19, 9, 0)) == datetime(2026, 10, 19, 9, 30))
+    check("스케줄 없음", next_run_time([]) is None)
+
+    for expression in ("* * *", "60 * * * *", "*/0 * * * *", "a * * * *", "5-1 * * * *", "0 0 31 2 *"):
+        try:
+            CronSchedule(expression).next_after(datetime(2026, 1, 1))
+            check(f"잘못된 표현식 거부: {expression}", False)
+        except ValueError as e:
+            check(f"잘못된 표현식 거부: {expression}", True, str(e))
+
+    return all(results)
+
+if __name__ == "__main__":
+    print("정기 점검 스케줄 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
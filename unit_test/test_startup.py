@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_startup.py - 시작 시 import 지연(app.py, main.py)과 시작 시간 프로파일/예산 확인 검증
+
+import io
+import os
+import subprocess
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import startup
+
+results = []
+
+# [SB] 진입점 import 시점에는 로드되지 않아야 하는 무거운 모듈 (사용하는 단계에서 import)
+HEAVY_MODULES = ("crawl4ai", "openpyxl", "ollama", "bs4", "pandas", "mattermostdriver", "aiohttp", "requests")
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def loaded_heavy_modules(module):
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                               cwd=startup.PROJECT_DIR, env=dict(os.environ, LOG_LEVEL="WARNING"))
+    return completed.stdout.strip().splitlines()[-1] if completed.returncode == 0 and completed.stdout.strip() else completed.stderr.strip()[-200:]
+
+def test_lazy_imports():
+    loaded = loaded_heavy_modules("app")
+    check("app.py import 시 무거운 모듈 미로드", loaded == "", loaded)
+    loaded = loaded_heavy_modules("main")
+    check("main.py import 시 무거운 모듈 미로드", loaded == "", loaded)
+
+def test_parse_importtime():
+    sample = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       500 |        500 |     openpyxl.cell\n"
+        "import time:      1500 |       2000 |   openpyxl\n"
+        "import time:      3000 |       3000 | pandas\n"
+        "Traceback (most recent call last):\n"
+    )
+    check("importtime 출력 패키지별 합계", startup.parse_importtime(sample) == [("pandas", 0.003), ("openpyxl", 0.002)])
+    check("상위 N개만", startup.parse_importtime(sample, top=1) == [("pandas", 0.003)])
+
+def test_measure_app():
+    result = startup.measure("app", runs=1, top=5)
+    check("웹 앱 첫 요청 측정", result["error"] is None and result["details"]["status"] == 200 and result["seconds"] > 0,
+          f"{result['seconds']:.3f}초" if result["seconds"] else result["error"])
+    check("import 시간 상위 패키지", 0 < len(result["imports"]) <= 5)
+
+    failed = {"name": "pipeline", "seconds": None, "error": "ModuleNotFoundError", "details": None, "imports": []}
+    check("예산 초과/측정 실패 감지", startup.check_budgets([result, failed], {"app": 0.0001}) == ["app", "pipeline"])
+    check("예산 이내", startup.check_budgets([result], {"app": 60}) == [])
+    out = io.StringIO()
+    startup.print_report([result, failed], {"app": 60, "pipeline": 3}, out=out)
+    check("보고서 출력", "통과" in out.getvalue() and "측정 실패" in out.getvalue())
+
+def main():
+    test_lazy_imports()
+    test_parse_importtime()
+    test_measure_app()
+    return all(results)
+
+if __name__ == "__main__":
+    print("시작 시간 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
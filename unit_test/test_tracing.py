@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_tracing.py - 실행 추적(구간 기록, JSON Lines/Chrome trace 파일, 단계별 히스토그램) 검증
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fake_mattermost import FakeMattermostServer
+from utils import tracing
+from utils.delivery import build_destinations, deliver_report_async
+from utils.mattermost_async import AsyncMattermostClient
+from utils.workers import run_blocking
+
+results = []
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def blocking_step():
+    """[SB] 스레드 풀에서 실행되는 작업 (Excel 생성 대신)"""
+    with tracing.span("excel.build", "excel"):
+        time.sleep(0.02)
+
+async def link_check(name, delay):
+    with tracing.span(f"link_check.{name}", "link") as attrs:
+        await asyncio.sleep(delay)
+        attrs["status"] = 200
+
+async def traced_run(server):
+    """[SB] main.py와 같은 흐름의 실행: 세부 구간 + 단계 구간 + Mattermost 전송"""
+    trace = tracing.RunTrace(run_id="test").activate()
+    stage_started = time.perf_counter()
+    await asyncio.gather(link_check("parking", 0.03), link_check("url", 0.03))
+    try:
+        with tracing.span("llm.analyze", "llm"):
+            raise ValueError("응답 없음")
+    except ValueError:
+        pass
+    await run_blocking(blocking_step)
+    now = time.perf_counter()
+    trace.add_span("링크 체크", stage_started, now)
+
+    stage_started = now
+    with server.env(OUTBOX_ENABLED="false"):
+        async with AsyncMattermostClient() as client:
+            await deliver_report_async(build_destinations(), file_bytes=b"PK\x03\x04xlsx", file_name="trace.xlsx",
+                                       message="요약", client=client)
+    trace.add_span("전송", stage_started, time.perf_counter())
+    return trace
+
+def check_trace(trace):
+    by_name = {}
+    for span in trace.spans:
+        by_name.setdefault(span["name"], []).append(span)
+    stage = by_name["링크 체크"][0]
+    parking, url = by_name["link_check.parking"][0], by_name["link_check.url"][0]
+    check("동시 구간이 겹쳐서 기록", parking["start"] < url["start"] + url["duration"] and url["start"] < parking["start"] + parking["duration"])
+    check("동시 구간은 다른 줄(lane)", parking["lane"] != url["lane"])
+    check("단계 구간의 하위로 연결", parking["parent_id"] == stage["span_id"] and by_name["excel.build"][0]["parent_id"] == stage["span_id"])
+    check("예외 구간은 error", by_name["llm.analyze"][0]["status"] == "error" and "응답 없음" in by_name["llm.analyze"][0]["attrs"]["error"])
+    check("스레드 풀 작업도 기록", by_name["excel.build"][0]["duration"] >= 0.02)
+
+    delivery = by_name["delivery.self"][0]
+    calls = [span for span in trace.spans if span["cat"] == "mattermost"]
+    check("Mattermost API 호출 구간", {"mattermost.login", "mattermost.upload_file", "mattermost.create_post"} <= {span["name"] for span in calls})
+    check("API 호출은 전송 대상 구간의 하위", all(span["parent_id"] == delivery["span_id"] for span in calls if span["name"] == "mattermost.upload_file"))
+    check("전송 결과 기록", delivery["attrs"].get("success") is True and delivery["attrs"]["target"] == "자신(DM)")
+
+    paths = trace.write(chrome=True)
+    with open(paths[0], encoding="utf-8") as trace_file:
+        lines = [json.loads(line) for line in trace_file]
+    check("JSON Lines 파일", lines[0]["type"] == "run" and lines[0]["run_id"] == "test" and len(lines) == len(trace.spans) + 1)
+    with open(paths[1], encoding="utf-8") as trace_file:
+        events = json.load(trace_file)["traceEvents"]
+    complete = [event for event in events if event["ph"] == "X"]
+    check("Chrome trace event 파일", len(complete) == len(trace.spans) and all(event["dur"] >= 0 for event in complete))
+
+def test_histograms():
+    def stage(name, duration):
+        return {"name": name, "cat": tracing.CATEGORY_STAGE, "duration": duration}
+
+    tracing.record_histograms([stage("LLM 분석", 20.0) for _ in range(9)] + [stage("LLM 분석", 40.0)])
+    histogram = tracing.load_histograms()["LLM 분석"]
+    check("히스토그램 누적", histogram["count"] == 10 and histogram["buckets"][-1] == (float("inf"), 10) and histogram["max"] == 40.0)
+    check("분위수 추정 (버킷 내 보간)", 10 < tracing.histogram_quantile(histogram, 0.5) <= 20 and 30 < tracing.histogram_quantile(histogram, 0.95) <= 60)
+
+    histograms = tracing.load_histograms()
+    slow = tracing.find_regressions([stage("LLM 분석", 90.0)], histograms, min_count=10)
+    check("p95보다 느린 단계 감지", [item["name"] for item in slow] == ["LLM 분석"])
+    check("기록이 적으면 비교하지 않음", tracing.find_regressions([stage("LLM 분석", 90.0)], histograms, min_count=11) == [])
+    check("진행률용 단계 예상 시간", set(tracing.stage_estimates(["LLM 분석", "전송"])) == {"LLM 분석"})
+
+def main():
+    # [SB] 추적 파일/히스토그램은 현재 디렉터리의 logs/를 사용하므로 임시 디렉터리에서 실행
+    os.chdir(tempfile.mkdtemp(prefix="tracing_"))
+    with FakeMattermostServer() as server:
+        trace = asyncio.run(traced_run(server))
+    check_trace(trace)
+    test_histograms()
+    return all(results)
+
+if __name__ == "__main__":
+    print("실행 추적 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_zygote.py - zygote 프로세스(모듈 미리 로드 후 fork)로 작업 실행 검증 (환경 변수/출력/종료 코드/시간 초과/재시작)
+
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import zygote
+from utils.log import ProcessLogReader
+
+results = []
+
+JOB_SCRIPT = """
+import json, os, sys
+print(json.dumps({"level": "INFO", "logger": "__main__", "msg": "전송 완료", "event": "report_delivered"}))
+print("warm", "openpyxl" in sys.modules, os.environ.get("JOB_ID"), os.getcwd())
+print("stderr 출력", file=sys.stderr)
+sys.exit(int(os.environ.get("EXIT_CODE", "0")))
+"""
+
+def check(name, condition, detail=""):
+    """[SB] 검증 결과 기록 및 출력"""
+    results.append(condition)
+    mark = "✅" if condition else "❌"
+    print(f"[테스트] {mark} {name}" + (f" - {detail}" if detail else ""))
+
+def write_script(directory, name, body):
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as script:
+        script.write(body)
+    return path
+
+def check_jobs(pool, workdir):
+    job = write_script(workdir, "job.py", JOB_SCRIPT)
+    env = dict(os.environ, JOB_ID="job00001", MATTERMOST_PASSWORD="secret")
+    started = time.perf_counter()
+    process = pool.spawn([job], env=env, cwd=workdir)
+    reader = ProcessLogReader(process, "job00001")
+    returncode = process.wait(10)
+    reader.join()
+    elapsed = time.perf_counter() - started
+    check("미리 로드된 모듈로 시작", f"warm True job00001 {os.path.realpath(workdir)}" in reader.stdout, reader.stdout.strip().splitlines()[-1])
+    check("stdout/stderr 분리, event 수집", reader.stderr == "stderr 출력\n" and reader.events == ["report_delivered"])
+    check("종료 코드 0", returncode == 0 and process.poll() == 0, f"{elapsed * 1000:.1f} ms")
+
+    process = pool.spawn([job], env=dict(env, EXIT_CODE="3"), cwd=workdir)
+    process.stdout.read()
+    check("종료 코드 전달", process.wait(10) == 3)
+
+    failing = write_script(workdir, "fail.py", "raise RuntimeError('작업 실패')\n")
+    process = pool.spawn([failing], cwd=workdir)
+    stderr = process.stderr.read()
+    check("예외는 stderr traceback + 종료 코드 1", process.wait(10) == 1 and "RuntimeError: 작업 실패" in stderr)
+
+    sleeper = write_script(workdir, "sleep.py", "import time\ntime.sleep(60)\n")
+    process = pool.spawn([sleeper], cwd=workdir)
+    try:
+        process.wait(0.3)
+        timed_out = False
+    except subprocess.TimeoutExpired:
+        timed_out = True
+    check("실행 중에는 poll() None, wait 시간 초과", timed_out and process.poll() is None)
+    process.terminate()
+    check("terminate 후 종료 코드", process.wait(10) == -signal.SIGTERM)
+
+    check("zygote 환경 변수에 자격 증명 없음", "MATTERMOST_PASSWORD" not in open(f"/proc/{pool._process.pid}/environ", "rb").read().decode(errors="replace"))
+
+def check_concurrent(pool, workdir):
+    sleeper = write_script(workdir, "short.py", "import sys, time\ntime.sleep(0.3)\nprint(sys.argv[1])\n")
+    started = time.perf_counter()
+    processes = [pool.spawn([sleeper, str(index)], cwd=workdir) for index in range(4)]
+    outputs = [process.stdout.read().strip() for process in processes]
+    codes = [process.wait(10) for process in processes]
+    elapsed = time.perf_counter() - started
+    check("동시 작업은 각자 격리된 프로세스", outputs == ["0", "1", "2", "3"] and codes == [0] * 4 and elapsed < 1.0,
+          f"{elapsed:.2f}초")
+
+def check_fallback(workdir):
+    job = write_script(workdir, "job.py", JOB_SCRIPT)
+    os.environ["CHECK_ZYGOTE"] = "false"
+    try:
+        process = zygote.spawn_script([job], cwd=workdir)
+    finally:
+        del os.environ["CHECK_ZYGOTE"]
+    stdout, _ = process.communicate(timeout=30)
+    check("CHECK_ZYGOTE=false면 새 인터프리터", isinstance(process, subprocess.Popen) and "warm False" in stdout)
+
+    shared = zygote.shared_zygote()
+    shared._process.kill()
+    shared._process.wait()
+    restarted = zygote.shared_zygote()
+    check("종료된 공용 zygote는 다시 시작", restarted is not shared and restarted.alive())
+    restarted.close()
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="zygote_")
+    pool = zygote.Zygote(preload=["openpyxl"]).start()
+    try:
+        check_jobs(pool, workdir)
+        check_concurrent(pool, workdir)
+    finally:
+        pool.close()
+    check("zygote 종료", not pool.alive())
+    check_fallback(workdir)
+    return all(results)
+
+if __name__ == "__main__":
+    print("zygote 작업 실행 테스트 시작...")
+    success = main()
+
+    if success:
+        print(f"\n✅ 테스트 완료! ({len(results)}개 통과)")
+        sys.exit(0)
+    else:
+        print(f"\n❌ 테스트 실패! ({results.count(False)}/{len(results)}개 실패)")
+        sys.exit(1)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# xlsx_bench.py - Excel 빌더 모드와 템플릿 모드의 생성 시간/메모리 비교
+
+import os
+import sys
+import time
+import tracemalloc
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.xlsx import create_dashboard_excel, _get_template_bytes
+
+# [SB] LLM 분석 결과 모의 데이터 (main.py에서 넘어오는 형태와 동일)
+MOCK_LLM_RESULT = {
+    "로그인상태": "예",
+    "whois_usd": "1,072.88 USD",
+    "gabia_krw": "442,400 KRW",
+    "스케줄러상태": "예",
+    "1:1문의": "예",
+    "이메일문의": "예",
+    "에러리포트": "예",
+    "Region활성": "예",
+    "장비미보고": "예",
+    "DB_Sync": {"일시중지": "예", "오류": "예"},
+    "FrontEnd": {"상태": "예", "도메인 검색": "예"},
+    "운영중인서비스": {"parking": "예", "url": "예", "furl": "예"}
+}
+
+def bench(label, use_template, runs):
+    """[SB] 지정 모드로 runs회 생성하여 평균/중앙값 시간과 최대 메모리 측정"""
+    timings = []
+    peaks = []
+    for _ in range(runs):
+        tracemalloc.start()
+        start = time.perf_counter()
+        excel_file = create_dashboard_excel(MOCK_LLM_RESULT, in_memory=True, username="벤치마크", use_template=use_template)
+        timings.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+        excel_file.close()
+
+    print(f"[벤치] {label}: 평균 {statistics.mean(timings) * 1000:.1f} ms, "
+          f"중앙값 {statistics.median(timings) * 1000:.1f} ms, "
+          f"최대 메모리 {max(peaks) / 1024:.0f} KiB ({runs}회)")
+    return statistics.median(timings)
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    # [SB] 템플릿 생성 비용은 프로세스당 1회이므로 별도로 측정
+    start = time.perf_counter()
+    _get_template_bytes()
+    print(f"[벤치] 템플릿 최초 생성: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    builder = bench("빌더 모드", False, runs)
+    template = bench("템플릿 모드", True, runs)
+    print(f"[벤치] 템플릿 모드 속도 비율: {builder / template:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# zygote_bench.py - 점검 작업 시작 지연 비교 (로그인마다 새 인터프리터로 main.py 실행 vs zygote에서 fork)
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import zygote
+
+# [SB] main.py가 브라우저 실행 직전까지, 그리고 이후 단계에서 import하는 모듈을 모두 로드한 시점을 "작업 시작"으로 봄
+PROBE_SCRIPT = """
+import main
+try:
+    main._load_crawler()
+except ImportError:
+    pass
+from utils import fields, llm, xlsx, mattermost, mattermost_async, delivery, forecast
+print("ready", flush=True)
+"""
+
+def time_to_ready(start_process):
+    """[SB] 작업 요청부터 준비 완료 출력까지 걸린 시간(초)"""
+    started = time.perf_counter()
+    process = start_process()
+    line = process.stdout.readline()
+    elapsed = time.perf_counter() - started
+    process.stdout.read()
+    process.wait()
+    if line.strip() != "ready":
+        raise RuntimeError(f"작업 시작 실패: {process.stderr.read()[-300:]}")
+    return elapsed
+
+def bench(label, start_process, runs):
+    times = [time_to_ready(start_process) for _ in range(runs)]
+    median = statistics.median(times)
+    print(f"[벤치] {label}: 중앙값 {median * 1000:.1f} ms, 최소 {min(times) * 1000:.1f} ms, 최대 {max(times) * 1000:.1f} ms ({runs}회)")
+    return median
+
+def main(runs=5):
+    probe_dir = tempfile.mkdtemp(prefix="zygote_bench_")
+    probe = os.path.join(probe_dir, "probe.py")
+    with open(probe, "w", encoding="utf-8") as script:
+        script.write(PROBE_SCRIPT)
+    env = dict(os.environ, LOG_LEVEL="WARNING", PYTHONPATH=str(zygote.PROJECT_DIR))
+
+    # [SB] 기존 방식: subprocess.Popen([sys.executable, 'main.py'])
+    spawn = bench("새 인터프리터 (spawn)", lambda: subprocess.Popen(
+        [sys.executable, probe], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        cwd=zygote.PROJECT_DIR, env=env), runs)
+
+    started = time.perf_counter()
+    pool = zygote.Zygote().start()
+    print(f"[벤치] zygote 시작 (모듈 미리 로드, 서버 시작 시 1회): {(time.perf_counter() - started) * 1000:.1f} ms")
+    try:
+        forked = bench("zygote fork", lambda: pool.spawn([probe], env=env, cwd=zygote.PROJECT_DIR), runs)
+    finally:
+        pool.close()
+    print(f"[벤치] 작업 시작이 {spawn / forked:,.1f}배 빠름 ({(spawn - forked) * 1000:.0f} ms 단축)")
+
+if __name__ == "__main__":
+    main()
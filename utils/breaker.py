@@ -0,0 +1,250 @@
+# [SB] utils/breaker.py - 외부 의존 서비스(Ollama, Mattermost, 대시보드)별 차단기 (closed → open → half_open)
+import logging
+import os
+import sqlite3
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+
+from utils.workers import run_blocking
+
+# [SB] 차단기 상태는 웹 서버와 모든 점검 프로세스(main.py)가 공유 - 한 작업이 장애를 확인하면
+#      다른 작업과 상태 확인 API는 연결 제한 시간을 다시 기다리지 않고 바로 실패하거나 대체 경로를 사용
+BREAKER_PATH = Path("logs") / "breakers.sqlite3"
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# [SB] /api/status에 표시하는 차단기
+BREAKER_NAMES = ("ollama", "mattermost", "dashboard")
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS breakers (
+    name TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT 'closed',
+    failures INTEGER NOT NULL DEFAULT 0,
+    opened_at REAL,
+    retry_at REAL,
+    probe_until REAL,
+    last_error TEXT,
+    updated_at REAL
+);
+"""
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+def breaker_enabled():
+    """[SB] 차단기 사용 여부 (BREAKER_ENABLED, 기본 true) - false면 항상 호출"""
+    return os.getenv("BREAKER_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+def _connect():
+    BREAKER_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # [SB] 웹 서버와 여러 main.py가 동시에 접근하므로 WAL 모드 + 잠금 대기 시간 설정
+    conn = sqlite3.connect(str(BREAKER_PATH), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+class CircuitOpenError(ConnectionError):
+    """[SB] 차단기가 열려 있어 호출하지 않은 경우"""
+
+    def __init__(self, name, retry_in, last_error=None):
+        self.name = name
+        self.retry_in = retry_in
+        self.last_error = last_error
+        super().__init__(f"{name} 차단기 열림 ({retry_in:.0f}초 후 재시도, 마지막 오류: {last_error})")
+
+class CircuitBreaker:
+    """
+    [SB] 의존 서비스 하나의 차단기
+
+    연속 실패가 BREAKER_FAILURES회(기본 3)에 이르면 열리고(open), 열려 있는 동안 allow()는 False를 반환합니다.
+    BREAKER_RESET_SECONDS초(기본 60)가 지나면 반열림(half_open) 상태에서 호출 하나만 시험으로 허용하고,
+    그 결과가 성공이면 닫히고(closed) 실패면 다시 열립니다. 시험 호출이 결과를 남기지 못하면
+    (프로세스 종료 등) 같은 시간이 지난 뒤 다음 호출을 시험으로 허용합니다.
+
+    사용 예:
+        breaker = CircuitBreaker("ollama")
+        if not breaker.allow():
+            return fallback()
+        try:
+            response = call()
+        except Exception as e:
+            breaker.record_failure(e)
+            raise
+        breaker.record_success()
+
+        with breaker.guard():    # 열려 있으면 CircuitOpenError, 예외가 나면 실패로 기록
+            call()
+    """
+
+    def __init__(self, name, failure_threshold=None, reset_timeout=None, clock=time.time):
+        self.name = name
+        self.failure_threshold = failure_threshold or max(1, int(_env_float("BREAKER_FAILURES", 3)))
+        self.reset_timeout = reset_timeout if reset_timeout is not None else _env_float("BREAKER_RESET_SECONDS", 60)
+        self.clock = clock
+
+    def _row(self, conn):
+        row = conn.execute("SELECT * FROM breakers WHERE name = ?", (self.name,)).fetchone()
+        return dict(row) if row else {"name": self.name, "state": STATE_CLOSED, "failures": 0, "opened_at": None,
+                                      "retry_at": None, "probe_until": None, "last_error": None, "updated_at": None}
+
+    def _write(self, conn, row):
+        conn.execute(
+            "INSERT INTO breakers (name, state, failures, opened_at, retry_at, probe_until, last_error, updated_at) "
+            "VALUES (:name, :state, :failures, :opened_at, :retry_at, :probe_until, :last_error, :updated_at) "
+            "ON CONFLICT (name) DO UPDATE SET state = excluded.state, failures = excluded.failures, "
+            "opened_at = excluded.opened_at, retry_at = excluded.retry_at, probe_until = excluded.probe_until, "
+            "last_error = excluded.last_error, updated_at = excluded.updated_at",
+            row,
+        )
+
+    def allow(self):
+        """
+        [SB] 호출해도 되는지 확인 - 재시도 시간이 지난 열린 차단기는 반열림으로 바꾸고 이 호출을 시험 호출로 허용
+
+        Returns:
+            bool: 호출해도 되면 True
+        """
+        if not breaker_enabled():
+            return True
+        now = self.clock()
+        conn = _connect()
+        try:
+            # [SB] 닫힌 상태(대부분의 호출)는 읽기만 함
+            row = self._row(conn)
+            if row["state"] == STATE_CLOSED:
+                return True
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._row(conn)
+                allowed = row["state"] == STATE_CLOSED
+                if not allowed:
+                    due = row["probe_until"] if row["state"] == STATE_HALF_OPEN else row["retry_at"]
+                    if due is None or now >= due:
+                        # [SB] 시험 호출 하나만 허용 - 결과가 기록될 때까지 다른 호출은 계속 차단
+                        row.update(state=STATE_HALF_OPEN, probe_until=now + self.reset_timeout, updated_at=now)
+                        self._write(conn, row)
+                        allowed = True
+                        logger.info("%s 차단기 반열림 - 시험 호출 허용", self.name)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return allowed
+        finally:
+            conn.close()
+
+    def record_success(self):
+        """[SB] 호출 성공 - 차단기 닫기 (이미 닫혀 있고 실패 기록이 없으면 쓰지 않음)"""
+        if not breaker_enabled():
+            return
+        conn = _connect()
+        try:
+            row = self._row(conn)
+            if row["state"] == STATE_CLOSED and not row["failures"]:
+                return
+            if row["state"] != STATE_CLOSED:
+                logger.info("%s 차단기 닫힘 - 서비스 응답 확인", self.name)
+            row.update(state=STATE_CLOSED, failures=0, opened_at=None, retry_at=None, probe_until=None, updated_at=self.clock())
+            self._write(conn, row)
+        finally:
+            conn.close()
+
+    def record_failure(self, error=None):
+        """[SB] 호출 실패(연결 실패, 시간 초과 등) - 연속 실패가 기준에 이르거나 시험 호출이 실패하면 차단기 열기"""
+        if not breaker_enabled():
+            return
+        now = self.clock()
+        conn = _connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._row(conn)
+                row.update(failures=row["failures"] + 1, last_error=str(error)[:300] if error is not None else None, updated_at=now)
+                if row["state"] == STATE_HALF_OPEN or row["failures"] >= self.failure_threshold:
+                    if row["state"] != STATE_OPEN:
+                        logger.warning("%s 차단기 열림 (연속 실패 %s회, %.0f초 동안 호출 차단): %s",
+                                       self.name, row["failures"], self.reset_timeout, error,
+                                       extra={"event": "breaker_opened", "data": {"breaker": self.name, "failures": row["failures"]}})
+                    row.update(state=STATE_OPEN, opened_at=now, retry_at=now + self.reset_timeout, probe_until=None)
+                self._write(conn, row)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def status(self):
+        """[SB] 현재 상태 (/api/status용) - {"state", "failures", "retry_in", "last_error", ...}"""
+        conn = _connect()
+        try:
+            row = self._row(conn)
+        finally:
+            conn.close()
+        now = self.clock()
+        retry_in = max(0.0, row["retry_at"] - now) if row["state"] == STATE_OPEN and row["retry_at"] else 0.0
+        return {"name": self.name, "state": row["state"], "failures": row["failures"], "retry_in": round(retry_in, 1),
+                "last_error": row["last_error"], "opened_at": row["opened_at"]}
+
+    def is_open(self):
+        """[SB] 열려 있고 아직 재시도 시간 전인지 (시험 호출을 소모하지 않고 확인만)"""
+        if not breaker_enabled():
+            return False
+        status = self.status()
+        return status["state"] == STATE_OPEN and status["retry_in"] > 0
+
+    @contextmanager
+    def guard(self, is_failure=None):
+        """
+        [SB] 호출 구간 - 열려 있으면 CircuitOpenError, 구간의 예외는 실패로 기록 후 그대로 전달
+
+        Args:
+            is_failure (callable, optional): 예외 → 장애로 볼지 여부 (기본: 모든 예외).
+                인증 실패처럼 서비스가 정상 응답한 오류는 False를 반환해 성공으로 기록
+        """
+        if not self.allow():
+            status = self.status()
+            raise CircuitOpenError(self.name, status["retry_in"], status["last_error"])
+        try:
+            yield self
+        except Exception as e:
+            if is_failure is None or is_failure(e):
+                self.record_failure(e)
+            else:
+                self.record_success()
+            raise
+        self.record_success()
+
+    @asynccontextmanager
+    async def guard_async(self, is_failure=None):
+        """[SB] guard()의 비동기 버전 - 상태 DB 접근(잠금 대기 최대 30초)이 이벤트 루프를 막지 않도록 작업 스레드에서 실행"""
+        if not await run_blocking(self.allow):
+            status = await run_blocking(self.status)
+            raise CircuitOpenError(self.name, status["retry_in"], status["last_error"])
+        try:
+            yield self
+        except Exception as e:
+            if is_failure is None or is_failure(e):
+                await run_blocking(self.record_failure, e)
+            else:
+                await run_blocking(self.record_success)
+            raise
+        await run_blocking(self.record_success)
+
+def breaker_states(names=BREAKER_NAMES):
+    """[SB] 차단기 상태 목록 - 상태 DB를 읽지 못하면 빈 dict"""
+    try:
+        return {name: CircuitBreaker(name).status() for name in names}
+    except sqlite3.Error as e:
+        logger.warning("차단기 상태 조회 실패: %s", e)
+        return {}
@@ -0,0 +1,82 @@
+# [SB] utils/channel_cache.py - Mattermost 팀 채널/DM 채널 ID 캐시 (디스크 저장, TTL)
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from utils.tracing import count_event
+
+# [SB] main.py는 실행마다 새 프로세스이므로 디스크(JSON)에 저장해 다음 실행에서도 재사용
+CHANNEL_CACHE_PATH = Path("logs") / "mattermost_channels.json"
+_cache_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+def _cache_ttl():
+    """[SB] 캐시 유효 시간(초) - MATTERMOST_CHANNEL_CACHE_TTL (기본 7일)"""
+    try:
+        return int(os.getenv("MATTERMOST_CHANNEL_CACHE_TTL", str(7 * 24 * 3600)))
+    except ValueError:
+        return 7 * 24 * 3600
+
+def _server_prefix():
+    """[SB] 서버가 바뀌면 다른 캐시를 쓰도록 MATTERMOST_URL을 키 접두어로 사용"""
+    return os.getenv("MATTERMOST_URL", "").rstrip('/')
+
+def team_channel_key(team_key, channel_name):
+    """[SB] (팀 키, 채널 이름) 캐시 키"""
+    return f"{_server_prefix()}|team|{team_key.upper()}|{channel_name.lower()}"
+
+def dm_channel_key(user_id, other_user_id):
+    """[SB] (사용자 ID, DM 상대 ID) 캐시 키"""
+    return f"{_server_prefix()}|dm|{user_id}|{other_user_id}"
+
+def _load():
+    try:
+        return json.loads(CHANNEL_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _save(entries):
+    try:
+        CHANNEL_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = CHANNEL_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entries, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, CHANNEL_CACHE_PATH)
+    except OSError as e:
+        logger.warning("채널 캐시 저장 실패: %s", e)
+
+def get_cached_channel_id(key):
+    """
+    [SB] 캐시된 채널 ID 조회
+
+    Returns:
+        str or None: 유효 기간 내의 채널 ID, 없거나 만료되었으면 None
+    """
+    with _cache_lock:
+        entry = _load().get(key)
+    if not entry or time.time() - entry.get("cached_at", 0) > _cache_ttl():
+        count_event("cache", cache="channel", result="miss")
+        return None
+    count_event("cache", cache="channel", result="hit")
+    return entry.get("channel_id")
+
+def cache_channel_id(key, channel_id, **extra):
+    """[SB] 채널 ID를 캐시에 저장 (extra는 팀 이름 등 참고 정보)"""
+    with _cache_lock:
+        entries = _load()
+        entries[key] = {"channel_id": channel_id, "cached_at": time.time(), **extra}
+        _save(entries)
+
+def invalidate_channel(channel_id):
+    """[SB] 전송이 403/404로 실패한 채널 ID를 캐시에서 제거"""
+    with _cache_lock:
+        entries = _load()
+        stale_keys = [key for key, entry in entries.items() if entry.get("channel_id") == channel_id]
+        if not stale_keys:
+            return
+        for key in stale_keys:
+            del entries[key]
+        _save(entries)
+    logger.info("채널 캐시 무효화: %s", channel_id)
@@ -0,0 +1,200 @@
+# [SB] utils/checklist.py - 당직 체크리스트 규칙 정의 및 판정
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# [SB] 예치금 기준값 기본값 (환경 변수 WHOIS_USD_THRESHOLD, GABIA_KRW_THRESHOLD로 변경 가능)
+DEFAULT_THRESHOLDS = {
+    "whois_usd": 200.00,
+    "gabia_krw": 200000,
+}
+
+def load_thresholds():
+    """
+    [SB] 예치금 기준값을 환경 변수에서 읽어오는 함수
+
+    Returns:
+        dict: {"whois_usd": float, "gabia_krw": float}
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for key, env_var in (("whois_usd", "WHOIS_USD_THRESHOLD"), ("gabia_krw", "GABIA_KRW_THRESHOLD")):
+        value = os.getenv(env_var)
+        if not value:
+            continue
+        try:
+            thresholds[key] = float(value.replace(',', '').strip())
+        except ValueError:
+            logger.warning("%s 값이 올바르지 않아 기본값을 사용합니다: %s", env_var, value)
+    return thresholds
+
+def parse_amount(value, currency):
+    """[SB] "1,072.88 USD" 형태의 금액 문자열을 숫자로 변환 (실패 시 None)"""
+    if value is None:
+        return None
+    try:
+        return float(str(value).replace(currency, '').replace(',', '').strip())
+    except ValueError:
+        return None
+
+def _yes(llm_data, *keys):
+    """[SB] 중첩 키 경로의 값이 "예"인지 확인"""
+    value = llm_data
+    for key in keys:
+        value = value.get(key, {}) if isinstance(value, dict) else {}
+    return value == "예"
+
+def _link_lines(section, labels):
+    """[SB] 링크 체크 결과가 있는 항목만 "라벨 링크 : 상태" 줄로 변환"""
+    return "".join(f"\n{label} 링크 : {section.get(key)}" for key, label in labels if key in section)
+
+def _deposit_check_text(thresholds):
+    return (f"Whois {thresholds['whois_usd']:,.2f} USD 이상\n"
+            f"Gabia {thresholds['gabia_krw']:,.0f} KRW 이상\n"
+            f"예치금이 남았는 지 확인")
+
+def _deposit_ok(llm_data, thresholds):
+    usd_value = parse_amount(llm_data.get("whois_usd"), "USD")
+    krw_value = parse_amount(llm_data.get("gabia_krw"), "KRW")
+    return (usd_value is not None and usd_value >= thresholds["whois_usd"] and
+            krw_value is not None and krw_value >= thresholds["gabia_krw"])
+
+def _services_ok(llm_data):
+    services = llm_data.get("운영중인서비스", {})
+    all_yes = all(services.get(key) == "예" for key in ("parking", "url", "furl"))
+    links_ok = all(services.get(key) != "비정상" for key in ("parking_link", "url_link", "furl_link"))
+    return all_yes and links_ok
+
+# [SB] 체크리스트 규칙 테이블 - 행 순서가 Excel 행 순서
+#   결과: llm_data -> 결과 셀 텍스트
+#   판정: (llm_data, thresholds) -> 정상 여부 (True/False)
+CHECKLIST_RULES = [
+    # 1. 로그인
+    {
+        "카테고리": "backOffice",
+        "메뉴": "로그인",
+        "체크사항": "https://hydra2.uxcloud.net 접속\nID: bomanager",
+        "페이지스크린샷": "1.jpg",
+        "결과": lambda d: "정상" if _yes(d, "로그인상태") else "오류",
+        "판정": lambda d, t: _yes(d, "로그인상태"),
+    },
+    # 2. 예치금
+    {
+        "카테고리": "backOffice",
+        "메뉴": "예치금",
+        "체크사항": _deposit_check_text,
+        "페이지스크린샷": "2.jpg",
+        "결과": lambda d: f"{d.get('whois_usd')}\n{d.get('gabia_krw')}",
+        "판정": _deposit_ok,
+    },
+    # 3. 스케줄러
+    {
+        "카테고리": "backOffice",
+        "메뉴": "스케줄러",
+        "체크사항": "스케쥴러 상태가 적용중 인지 확인",
+        "페이지스크린샷": "3.jpg",
+        "결과": lambda d: "적용됨" if _yes(d, "스케줄러상태") else "미적용 상태",
+        "판정": lambda d, t: _yes(d, "스케줄러상태"),
+    },
+    # 4. 고객문의 - 1:1 문의
+    {
+        "카테고리": "backOffice",
+        "메뉴": "고객문의",
+        "체크사항": "1:1 문의 답변 준비중이 있는지 확인",
+        "페이지스크린샷": "4.jpg",
+        "결과": lambda d: "0개 확인" if _yes(d, "1:1문의") else "1:1 답변준비중 있음",
+        "판정": lambda d, t: _yes(d, "1:1문의"),
+    },
+    # 5. 고객문의 - 이메일 문의
+    {
+        "카테고리": "backOffice",
+        "메뉴": "고객문의",
+        "체크사항": "이메일 문의 답변 준비중이 있는지 확인",
+        "페이지스크린샷": "5.jpg",
+        "결과": lambda d: "0개 확인" if _yes(d, "이메일문의") else "이메일 답변준비중 있음",
+        "판정": lambda d, t: _yes(d, "이메일문의"),
+    },
+    # 6. 고객문의 - 에러리포트
+    {
+        "카테고리": "backOffice",
+        "메뉴": "고객문의",
+        "체크사항": "에러리포트 신규 등록 된 이슈가 있는지 확인",
+        "페이지스크린샷": "6.jpg",
+        "결과": lambda d: "0개 확인" if _yes(d, "에러리포트") else "신규 에러 있음",
+        "판정": lambda d, t: _yes(d, "에러리포트"),
+    },
+    # 7. Region
+    {
+        "카테고리": "backOffice",
+        "메뉴": "Region",
+        "체크사항": "Region 상태가 2개 활성화 인지 확인",
+        "페이지스크린샷": "7.jpg",
+        "결과": lambda d: "2개 확인" if _yes(d, "Region활성") else "활성화 개수 확인 필요",
+        "판정": lambda d, t: _yes(d, "Region활성"),
+    },
+    # 8. 시스템 - 장비 미보고
+    {
+        "카테고리": "backOffice",
+        "메뉴": "시스템",
+        "체크사항": "장비의 미보고가 있는지 확인",
+        "페이지스크린샷": "8.jpg",
+        "결과": lambda d: "미보고 0개 확인" if _yes(d, "장비미보고") else "미보고 장비 있음",
+        "판정": lambda d, t: _yes(d, "장비미보고"),
+    },
+    # 9. 시스템 - DBSync
+    {
+        "카테고리": "backOffice",
+        "메뉴": "시스템",
+        "체크사항": "DBSync 일시중지 및 오류가 있는지 확인",
+        "페이지스크린샷": "9.jpg",
+        "결과": lambda d: "0개 확인" if (_yes(d, "DB_Sync", "일시중지") and _yes(d, "DB_Sync", "오류")) else "일시중지 또는 오류 있음",
+        "판정": lambda d, t: _yes(d, "DB_Sync", "일시중지") and _yes(d, "DB_Sync", "오류"),
+    },
+    # 10. 시스템 - FrontEnd
+    {
+        "카테고리": "backOffice",
+        "메뉴": "시스템",
+        "체크사항": "1. FrontEnd 서버 상태가 정상인지 확인\n※ 정상이 아닐경우 열기를 통해서 사이트 이동이 되는지 확인\n\n2. FrontEnd 도메인 검색이 정상적으로 가능한지 확인",
+        "페이지스크린샷": "10.jpg",
+        "결과": lambda d: ("정상" if (_yes(d, "FrontEnd", "상태") and _yes(d, "FrontEnd", "도메인 검색")) else "비정상") +
+                         _link_lines(d.get("FrontEnd", {}), [("link", "더보기")]),
+        "판정": lambda d, t: _yes(d, "FrontEnd", "상태") and _yes(d, "FrontEnd", "도메인 검색"),
+    },
+    # 11. 운영중인 서비스
+    {
+        "카테고리": "backOffice",
+        "메뉴": "운영중인 서비스",
+        "체크사항": "Parking, URL, FURL 모두 정상인지 확인\n※ 정상이 아닐경우 해당 상태를 클릭하여 페이지 이동이 정상적으로 되는지 확인",
+        "페이지스크린샷": "11.jpg",
+        "결과": lambda d: ("정상" if all(_yes(d, "운영중인서비스", key) for key in ("parking", "url", "furl")) else "비정상") +
+                         _link_lines(d.get("운영중인서비스", {}), [("parking_link", "Parking"), ("url_link", "URL"), ("furl_link", "FURL")]),
+        "판정": lambda d, t: _services_ok(d),
+    },
+]
+
+def evaluate_checklist(llm_data, thresholds=None):
+    """
+    [SB] LLM 분석 결과로 체크리스트 각 행의 결과 텍스트와 판정을 한 번만 계산하는 함수
+
+    Args:
+        llm_data (dict): analyze_with_ollama 결과 (링크 체크 결과 포함)
+        thresholds (dict, optional): 예치금 기준값. None이면 환경 변수/기본값 사용
+
+    Returns:
+        list: 행별 dict (카테고리, 메뉴, 체크사항, 페이지스크린샷, 결과, 정상)
+    """
+    if thresholds is None:
+        thresholds = load_thresholds()
+
+    rows = []
+    for rule in CHECKLIST_RULES:
+        check_text = rule["체크사항"]
+        rows.append({
+            "카테고리": rule["카테고리"],
+            "메뉴": rule["메뉴"],
+            "체크사항": check_text(thresholds) if callable(check_text) else check_text,
+            "페이지스크린샷": rule["페이지스크린샷"],
+            "결과": rule["결과"](llm_data),
+            "정상": bool(rule["판정"](llm_data, thresholds)),
+        })
+    return rows
@@ -0,0 +1,103 @@
+# [SB] utils/deadline.py - 점검 작업 1회의 전체 마감 시간(예산)과 단계별 제한 시간 계산
+import logging
+import os
+import time
+
+from utils.tracing import count_event
+
+logger = logging.getLogger(__name__)
+
+# [SB] 기본 예산(초) - app.py의 강제 종료 시간(CHECK_TIMEOUT 300초)보다 짧게 잡아 보고서 전송까지 마칠 여유를 둠
+DEFAULT_DEADLINE_SECONDS = 270
+
+def deadline_seconds():
+    """[SB] 작업 1회 예산(초) - JOB_DEADLINE_SECONDS (기본 270)"""
+    try:
+        return float(os.getenv("JOB_DEADLINE_SECONDS", str(DEFAULT_DEADLINE_SECONDS)))
+    except ValueError:
+        return float(DEFAULT_DEADLINE_SECONDS)
+
+class Deadline:
+    """
+    [SB] 작업 마감 시각 - 각 단계는 고정 제한 시간 대신 남은 예산에서 제한 시간을 계산
+
+    마감 시각은 벽시계(time.time) 기준이라 프로세스 간에 JOB_DEADLINE 환경 변수로 전달할 수 있습니다.
+    app.py가 작업을 시작할 때 정한 마감 시각을 main.py가 그대로 이어받으므로, zygote/인터프리터
+    시작에 걸린 시간도 예산에 포함됩니다.
+
+    사용 예:
+        deadline = Deadline.from_env()
+        await page.wait_for_selector('#id', timeout=deadline.ms(10))    # 최대 10초, 남은 예산이 적으면 그만큼만
+        if deadline.allows(25, reserve=10):                             # 25초 걸리는 단계 + 이후 단계용 10초
+            ...
+    """
+
+    def __init__(self, seconds=None, expires_at=None, clock=time.time):
+        self.clock = clock
+        if expires_at is None:
+            expires_at = clock() + (deadline_seconds() if seconds is None else seconds)
+        self.expires_at = float(expires_at)
+
+    @classmethod
+    def from_env(cls, clock=time.time):
+        """[SB] app.py가 넘겨준 마감 시각(JOB_DEADLINE, epoch 초) - 없거나 잘못된 값이면 지금부터 JOB_DEADLINE_SECONDS"""
+        value = os.getenv("JOB_DEADLINE")
+        if value:
+            try:
+                return cls(expires_at=float(value), clock=clock)
+            except ValueError:
+                logger.warning("JOB_DEADLINE 값이 올바르지 않습니다: %s", value)
+        return cls(clock=clock)
+
+    def env(self):
+        """[SB] 자식 프로세스에 마감 시각을 넘길 환경 변수"""
+        return {"JOB_DEADLINE": f"{self.expires_at:.3f}"}
+
+    def remaining(self):
+        """[SB] 남은 예산(초, 0 이상)"""
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout(self, limit=None, reserve=0.0, minimum=0.0):
+        """
+        [SB] 단계 제한 시간(초) = min(limit, 남은 예산 - reserve)
+
+        Args:
+            limit (float, optional): 단계 자체의 최대 제한 시간 (None이면 남은 예산 전체)
+            reserve (float): 이후 단계를 위해 남겨 둘 시간
+            minimum (float): 최소 제한 시간 (0이면 제한 없음으로 해석하는 라이브러리에 넘길 때 사용)
+        """
+        available = self.remaining() - reserve
+        if limit is not None:
+            available = min(limit, available)
+        return max(minimum, available)
+
+    def ms(self, limit=None, reserve=0.0):
+        """[SB] timeout()을 밀리초 정수로 (Playwright timeout 인자용, 0은 무제한이므로 최소 1 ms)"""
+        return max(1, int(self.timeout(limit, reserve) * 1000))
+
+    def allows(self, estimate, reserve=0.0):
+        """[SB] 예상 시간이 estimate초인 단계를 실행해도 이후 단계용 reserve초가 남는지"""
+        return self.remaining() - reserve >= estimate
+
+    def skip(self, stage, estimate, reserve=0.0):
+        """
+        [SB] 예산이 부족한 단계 건너뛰기 판단 - 건너뛰면 로그(event: stage_skipped)와 /metrics 카운터 기록
+
+        Returns:
+            bool: 건너뛰어야 하면 True
+        """
+        if self.allows(estimate, reserve):
+            return False
+        remaining = self.remaining()
+        logger.warning("남은 예산 %.1f초로 '%s' 단계를 건너뜁니다 (예상 %.1f초, 이후 단계 예비 %.1f초)",
+                       remaining, stage, estimate, reserve,
+                       extra={"event": "stage_skipped", "data": {"stage": stage, "remaining": round(remaining, 3), "estimate": estimate, "reserve": reserve}})
+        count_event("deadline_skips", stage=stage)
+        return True
+
+    def __repr__(self):
+        return f"Deadline(remaining={self.remaining():.1f}s)"
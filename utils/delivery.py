@@ -0,0 +1,440 @@
+# [SB] utils/delivery.py - 보고서를 여러 Mattermost 대상(자신 DM, 팀 채널, 추가 사용자)에 동시에 전송
+import asyncio
+import io
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import mattermost_async
+from utils import outbox
+from utils.tracing import span
+from utils.workers import run_blocking
+from utils.mattermost import (
+    MattermostSession,
+    _default_file_message,
+    _get_self_dm_channel_id,
+    _get_team_channel_id,
+    _get_user_dm_channel_id,
+    _send_excel_to_mattermost,
+    _send_message_to_mattermost,
+)
+
+logger = logging.getLogger(__name__)
+
+def _split_env_list(name):
+    """[SB] 쉼표로 구분된 환경 변수 값을 리스트로 변환"""
+    return [item.strip() for item in os.getenv(name, "").split(',') if item.strip()]
+
+def build_destinations():
+    """
+    [SB] 환경 변수로부터 보고서 전송 대상 목록을 구성하는 함수
+
+    - 자신(DM): 항상 포함
+    - 팀 채널: MATTERMOST_REPORT_TEAMS (예: "INNOGS,SECURITYNET") - 각 팀의 MATTERMOST_CHANNEL 채널
+    - 추가 사용자(DM): MATTERMOST_REPORT_USERS (예: "user1,user2")
+
+    Returns:
+        list: [{"kind": "self"|"team"|"user", "target": str, "label": str}, ...]
+    """
+    destinations = [{"kind": "self", "target": "me", "label": "자신(DM)"}]
+
+    channel_name = os.getenv("MATTERMOST_CHANNEL")
+    for team_key in _split_env_list("MATTERMOST_REPORT_TEAMS"):
+        team_name = os.getenv(f"MATTERMOST_TEAM_{team_key.upper()}")
+        if not team_name or not channel_name:
+            logger.warning("MATTERMOST_TEAM_%s 또는 MATTERMOST_CHANNEL이 없어 팀 전송 대상에서 제외합니다.", team_key.upper())
+            continue
+        destinations.append({"kind": "team", "target": team_key, "label": f"팀 {team_name}/{channel_name}"})
+
+    for username in _split_env_list("MATTERMOST_REPORT_USERS"):
+        destinations.append({"kind": "user", "target": username, "label": f"@{username}(DM)"})
+
+    return destinations
+
+def report_delivery_mode():
+    """[SB] 보고서 전송 정책 (REPORT_DELIVERY_MODE) - always(기본, 매번 전체 보고서) 또는 on_change(판정이 바뀔 때만)"""
+    mode = os.getenv("REPORT_DELIVERY_MODE", "always").strip().lower()
+    return mode if mode in ("always", "on_change") else "always"
+
+def should_send_full_report(current_digest, last_full, now=None):
+    """
+    [SB] on_change 정책에서 전체 보고서(Excel)를 보낼지 결정하는 함수
+
+    마지막으로 전체 보고서를 보낸 점검과 판정 다이제스트가 다르거나, 그 뒤로
+    REPORT_HEARTBEAT_HOURS(기본 12시간)가 지났으면 전체 보고서를 보냅니다.
+
+    Args:
+        current_digest (str): 이번 점검의 판정 다이제스트 (utils/history.py verdict_digest)
+        last_full (dict): 마지막 전체 보고서 스냅샷 요약 (utils/history.py last_full_report, 없으면 None)
+        now (float, optional): 현재 시각 (epoch 초)
+
+    Returns:
+        tuple: (전체 보고서 전송 여부, 사유)
+    """
+    if last_full is None:
+        return True, "이전에 전송한 전체 보고서 없음"
+    if current_digest != last_full["verdict_digest"]:
+        return True, "판정 변경"
+    heartbeat = float(os.getenv("REPORT_HEARTBEAT_HOURS", "12")) * 3600
+    elapsed = (now or time.time()) - last_full["checked_at"]
+    if elapsed >= heartbeat:
+        return True, f"마지막 전체 보고 후 {elapsed / 3600:.1f}시간 경과 (heartbeat)"
+    return False, "판정 변경 없음"
+
+def _team_args(destination):
+    """[SB] 팀 채널 대상의 (팀 키, 팀 이름, 채널 이름)"""
+    team_key = destination["target"]
+    return team_key, os.getenv(f"MATTERMOST_TEAM_{team_key.upper()}"), os.getenv("MATTERMOST_CHANNEL")
+
+def _resolve_channel_id(session, destination):
+    """[SB] 전송 대상의 채널 ID 조회 (채널 캐시 사용)"""
+    kind = destination["kind"]
+    if kind == "self":
+        return _get_self_dm_channel_id(session)
+    if kind == "team":
+        channel_id, _ = _get_team_channel_id(session, *_team_args(destination))
+        return channel_id
+    if kind == "user":
+        return _get_user_dm_channel_id(session, destination["target"])
+    raise ValueError(f"알 수 없는 전송 대상 종류: {kind}")
+
+def _session_sender(session):
+    """
+    [SB] 아웃박스 항목의 보낸 계정 식별자
+
+    비밀번호 인증은 로그인 ID, 토큰 인증은 "token:<수신자 ID>" (토큰은 공용이므로 수신자로 구분)
+    """
+    if session.token:
+        return f"token:{session.recipient_id}" if session.recipient_id else ""
+    return (session.login_id or (session.me or {}).get('username') or '').lower()
+
+def _open_reader(file_bytes):
+    """[SB] 보고서 내용(bytes 또는 SpooledReport)에 대한 독립된 읽기 스트림"""
+    if isinstance(file_bytes, (bytes, bytearray)):
+        return io.BytesIO(file_bytes)
+    return file_bytes.open_reader()
+
+def _open_payload(file_bytes, file_name):
+    """[SB] _open_reader와 같지만 업로드 파일 이름을 name 속성으로 제공 (동기 전송 함수용)"""
+    return _NamedReader(_open_reader(file_bytes), file_name)
+
+class _NamedReader:
+    """[SB] 업로드 파일 이름을 name 속성으로 제공하는 읽기 스트림 래퍼 (디스크 파일 핸들의 name은 임시 경로이므로)"""
+
+    def __init__(self, stream, name):
+        self._stream = stream
+        self.name = name
+
+    def __getattr__(self, attribute):
+        return getattr(self._stream, attribute)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stream.close()
+        return False
+
+def _payload_bytes(file_bytes):
+    """[SB] 아웃박스 저장용 bytes (SpooledReport는 이때만 전체를 읽음)"""
+    if file_bytes is None or isinstance(file_bytes, (bytes, bytearray)):
+        return file_bytes
+    return file_bytes.getvalue()
+
+def _new_result(destination, file_bytes, message, idem_key, error=None):
+    """[SB] 대상별 전송 결과 기본값 (보낼 것이 없는 부분은 전송된 것으로 취급)"""
+    return {"destination": destination, "success": False, "latency": 0.0, "error": error,
+            "idem_key": idem_key, "message_sent": not message, "file_sent": file_bytes is None}
+
+def _deliver_one(session, destination, file_bytes, file_name, message, idem_key=None):
+    """[SB] 한 대상에 메시지/파일 전송 후 결과(성공 여부, 소요 시간, 부분 전송 여부) 반환"""
+    start = time.perf_counter()
+    result = _new_result(destination, file_bytes, message, idem_key)
+    try:
+        channel_id = _resolve_channel_id(session, destination)
+        if not channel_id:
+            result["error"] = "채널을 찾을 수 없습니다"
+            return result
+
+        # [SB] 메시지와 파일은 별도 게시물이므로 멱등성 키도 구분
+        if message:
+            result["message_sent"] = _send_message_to_mattermost(
+                message, channel_id, session=session, pending_post_id=idem_key and f"{idem_key}m")
+        if file_bytes is not None:
+            # [SB] 보고서는 한 번만 만들고, 대상마다 독립된 읽기 스트림만 열어 스트리밍 업로드
+            with _open_payload(file_bytes, file_name) as excel_file:
+                sent, _ = _send_excel_to_mattermost(excel_file, channel_id, session=session,
+                                                    pending_post_id=idem_key and f"{idem_key}f")
+            result["file_sent"] = sent
+        result["success"] = result["message_sent"] and result["file_sent"]
+        if not result["success"]:
+            result["error"] = "전송 실패"
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        result["latency"] = time.perf_counter() - start
+    return result
+
+def _run_parallel(session, jobs, max_workers):
+    """[SB] (destination, file_bytes, file_name, message, idem_key) 작업들을 제한된 스레드 풀에서 동시에 실행"""
+    if max_workers is None:
+        max_workers = int(os.getenv("MATTERMOST_DELIVERY_WORKERS", "4"))
+    max_workers = max(1, min(max_workers, len(jobs)))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mm-delivery") as executor:
+        futures = [executor.submit(_deliver_one, session, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+def deliver_report(destinations, file_bytes=None, file_name=None, message=None, session=None, max_workers=None):
+    """
+    [SB] 준비된 보고서(파일 바이트 및/또는 메시지)를 여러 대상에 동시에 전송하는 함수
+
+    실패한 대상은 아웃박스(utils/outbox.py)에 저장되어 나중에 재전송됩니다.
+    이 경우 결과의 "queued"가 True입니다.
+
+    Args:
+        destinations (list): build_destinations() 결과
+        file_bytes (bytes or SpooledReport, optional): 첨부할 Excel 파일 내용 (대상마다 스트리밍 업로드)
+        file_name (str, optional): 첨부 파일 이름
+        message (str, optional): 파일 없이 게시할 메시지 (Markdown 보고서)
+        session (MattermostSession, optional): 공유 세션. 없으면 임시로 로그인/로그아웃합니다.
+        max_workers (int, optional): 동시 전송 수 상한 (기본: MATTERMOST_DELIVERY_WORKERS 또는 4)
+
+    Returns:
+        list: 대상별 결과 [{"destination", "success", "latency", "error", "queued", ...}, ...] (destinations 순서 유지)
+    """
+    if not destinations:
+        return []
+
+    owned = session is None
+    if owned:
+        session = MattermostSession()
+
+    try:
+        jobs = _make_jobs(destinations, file_bytes, file_name, message)
+        if session.login():
+            results = _run_parallel(session, jobs, max_workers)
+        else:
+            results = [_new_result(destination, file_bytes, message, idem_key, error="Mattermost 로그인 실패")
+                       for destination, _, _, _, idem_key in jobs]
+    finally:
+        if owned:
+            session.close()
+
+    _queue_failures(results, _session_sender(session), file_bytes, file_name, message)
+    _print_results(results)
+    return results
+
+def _make_jobs(destinations, file_bytes, file_name, message):
+    """[SB] 이번 실행의 대상별 작업 목록 - 첫 전송과 재전송이 같은 pending_post_id를 쓰도록 멱등성 키 부여"""
+    run_key = uuid.uuid4().hex[:24]
+    return [(destination, file_bytes, file_name, message, f"{run_key}{index:02d}")
+            for index, destination in enumerate(destinations)]
+
+def _queue_failures(results, sender, file_bytes, file_name, message):
+    """[SB] 실패한 대상을 아웃박스에 저장 (결과의 "queued"에 저장 여부 기록)"""
+    for result in results:
+        result["queued"] = False
+        if not result["success"] and sender and outbox.outbox_enabled():
+            # [SB] 이미 전송된 부분(메시지 또는 파일)은 빼고 저장
+            result["queued"] = outbox.enqueue(
+                sender, result["destination"], result["idem_key"],
+                file_bytes=None if result["file_sent"] else _payload_bytes(file_bytes),
+                file_name=None if result["file_sent"] else file_name,
+                message=None if result["message_sent"] else message,
+                error=result["error"],
+            )
+
+def _print_results(results):
+    """[SB] 대상별 전송 결과와 소요 시간 기록"""
+    for result in results:
+        status = "성공" if result["success"] else f"실패 ({result['error']})"
+        if result["queued"]:
+            status += ", 아웃박스에 저장되어 재전송 예정"
+        logger.info("전송 %s: %s, %.0f ms", result['destination']['label'], status, result['latency'] * 1000)
+
+def drain_outbox(session=None, limit=20, max_workers=None, sender=None):
+    """
+    [SB] 아웃박스에서 재시도 시각이 된 항목을 세션 계정으로 다시 전송하는 함수
+
+    자신(DM) 대상이 올바른 사용자에게 가도록, 항목을 저장한 계정과 같은 계정의 항목만 처리합니다.
+    sender를 주면 그 계정의 항목을 세션 계정(봇 토큰 또는 공용 계정)이 대신 보내며,
+    자신(DM) 대상은 세션 계정과 그 계정 사이의 DM으로 보냅니다.
+
+    Args:
+        session (MattermostSession, optional): 공유 세션. 없으면 임시로 로그인/로그아웃합니다.
+        limit (int): 한 번에 처리할 최대 항목 수
+        max_workers (int, optional): 동시 전송 수 상한
+        sender (str, optional): 대신 보낼 항목의 보낸 계정 (로그인 ID)
+
+    Returns:
+        dict: {"sent": int, "retry": int, "dead": int}
+    """
+    counts = {"sent": 0, "retry": 0, "dead": 0}
+    if not outbox.outbox_enabled():
+        return counts
+
+    owned = session is None
+    if owned:
+        session = MattermostSession()
+    try:
+        if not session.login():
+            return counts
+        entries = outbox.claim_due(sender or _session_sender(session), limit=limit)
+        if not entries:
+            return counts
+
+        results = _run_parallel(session, _entry_jobs(entries, relay_for=sender), max_workers)
+    finally:
+        if owned:
+            session.close()
+
+    return _record_drain_results(entries, results)
+
+def _relay_destination(destination, sender):
+    """[SB] 다른 계정이 대신 보낼 때 자신(DM) 대상 → 원래 계정과의 DM"""
+    if destination["kind"] != "self":
+        return destination
+    return {"kind": "user", "target": sender, "label": f"@{sender}(DM)"}
+
+def _entry_jobs(entries, relay_for=None):
+    """[SB] 아웃박스 항목을 전송 작업으로 변환 (저장된 멱등성 키 재사용)"""
+    return [(_relay_destination(entry["destination"], relay_for) if relay_for else entry["destination"],
+             entry["file_bytes"], entry["file_name"], entry["message"], entry["idem_key"])
+            for entry in entries]
+
+def _record_drain_results(entries, results):
+    """[SB] 재전송 결과를 아웃박스에 반영하고 {"sent", "retry", "dead"} 건수 반환"""
+    counts = {"sent": 0, "retry": 0, "dead": 0}
+    for entry, result in zip(entries, results):
+        label = entry["destination"]["label"]
+        if result["success"]:
+            outbox.mark_sent(entry["id"])
+            counts["sent"] += 1
+            logger.info("아웃박스 재전송 성공: %s (%d번째 시도)", label, entry['attempts'] + 1)
+            continue
+        status = outbox.mark_failed(entry["id"], entry["attempts"] + 1, result["error"],
+                                    file_sent=result["file_sent"], message_sent=result["message_sent"])
+        counts["dead" if status == outbox.STATUS_DEAD else "retry"] += 1
+        logger.warning("아웃박스 재전송 실패: %s (%s, %d번째 시도, 상태: %s)", label, result['error'], entry['attempts'] + 1, status)
+    return counts
+
+async def _resolve_channel_id_async(client, destination):
+    """[SB] 전송 대상의 채널 ID 조회 (비동기 클라이언트, 채널 캐시 사용)"""
+    kind = destination["kind"]
+    if kind == "self":
+        return await mattermost_async.get_self_dm_channel_id(client)
+    if kind == "team":
+        channel_id, _ = await mattermost_async.get_team_channel_id(client, *_team_args(destination))
+        return channel_id
+    if kind == "user":
+        return await mattermost_async.get_user_dm_channel_id(client, destination["target"])
+    raise ValueError(f"알 수 없는 전송 대상 종류: {kind}")
+
+async def _deliver_one_async(client, semaphore, destination, file_bytes, file_name, message, idem_key=None):
+    """[SB] _deliver_one의 비동기 버전 - 세마포어로 동시 전송 수 제한"""
+    async with semaphore:
+        # [SB] 실행 추적: 대상별 전송 구간 (채널 조회, 메시지/파일 전송 API 호출이 하위 구간)
+        with span(f"delivery.{destination['kind']}", "delivery", target=destination["label"]) as attrs:
+            start = time.perf_counter()
+            result = _new_result(destination, file_bytes, message, idem_key)
+            try:
+                channel_id = await _resolve_channel_id_async(client, destination)
+                if not channel_id:
+                    result["error"] = "채널을 찾을 수 없습니다"
+                    return result
+
+                # [SB] 한 대상 안에서는 동기 전송과 같이 메시지 → 파일 순서로 게시 (대상끼리만 동시에 진행)
+                if message:
+                    result["message_sent"] = await mattermost_async.send_message(
+                        client, channel_id, message, pending_post_id=idem_key and f"{idem_key}m")
+                if file_bytes is not None:
+                    with _open_reader(file_bytes) as excel_file:
+                        result["file_sent"] = await mattermost_async.send_file(
+                            client, channel_id, excel_file, file_name, _default_file_message(),
+                            pending_post_id=idem_key and f"{idem_key}f")
+                result["success"] = result["message_sent"] and result["file_sent"]
+                if not result["success"]:
+                    result["error"] = "전송 실패"
+            except Exception as e:
+                result["error"] = str(e)
+            finally:
+                result["latency"] = time.perf_counter() - start
+                attrs["success"] = result["success"]
+            return result
+
+async def _run_concurrent(client, jobs, max_concurrency):
+    """[SB] 작업들을 이벤트 루프에서 동시에 실행 (MATTERMOST_DELIVERY_WORKERS로 동시 전송 수 제한)"""
+    if max_concurrency is None:
+        max_concurrency = int(os.getenv("MATTERMOST_DELIVERY_WORKERS", "4"))
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    return await asyncio.gather(*(_deliver_one_async(client, semaphore, *job) for job in jobs))
+
+async def deliver_report_async(destinations, file_bytes=None, file_name=None, message=None, client=None, max_concurrency=None):
+    """
+    [SB] deliver_report의 비동기 버전 - AsyncMattermostClient로 이벤트 루프 안에서 동시에 전송
+
+    Args:
+        destinations (list): build_destinations() 결과
+        file_bytes (bytes or SpooledReport, optional): 첨부할 Excel 파일 내용 (대상마다 스트리밍 업로드)
+        file_name (str, optional): 첨부 파일 이름
+        message (str, optional): 파일 없이 게시할 메시지 (Markdown 보고서)
+        client (AsyncMattermostClient, optional): 공유 클라이언트. 없으면 임시로 로그인/로그아웃합니다.
+        max_concurrency (int, optional): 동시 전송 수 상한 (기본: MATTERMOST_DELIVERY_WORKERS 또는 4)
+
+    Returns:
+        list: deliver_report와 같은 형식의 대상별 결과
+    """
+    if not destinations:
+        return []
+
+    owned = client is None
+    if owned:
+        client = mattermost_async.AsyncMattermostClient()
+
+    try:
+        jobs = _make_jobs(destinations, file_bytes, file_name, message)
+        if await client.login():
+            results = await _run_concurrent(client, jobs, max_concurrency)
+        else:
+            results = [_new_result(destination, file_bytes, message, idem_key, error="Mattermost 로그인 실패")
+                       for destination, _, _, _, idem_key in jobs]
+    finally:
+        if owned:
+            await client.close()
+
+    # [SB] 아웃박스 저장은 SQLite 쓰기이므로 이벤트 루프 밖(공용 스레드 풀)에서 실행
+    await run_blocking(_queue_failures, results, _session_sender(client), file_bytes, file_name, message)
+    _print_results(results)
+    return results
+
+async def drain_outbox_async(client=None, limit=20, max_concurrency=None):
+    """
+    [SB] drain_outbox의 비동기 버전
+
+    Returns:
+        dict: {"sent": int, "retry": int, "dead": int}
+    """
+    if not outbox.outbox_enabled():
+        return {"sent": 0, "retry": 0, "dead": 0}
+
+    owned = client is None
+    if owned:
+        client = mattermost_async.AsyncMattermostClient()
+    try:
+        if not await client.login():
+            return {"sent": 0, "retry": 0, "dead": 0}
+        entries = await run_blocking(outbox.claim_due, _session_sender(client), limit)
+        if not entries:
+            return {"sent": 0, "retry": 0, "dead": 0}
+
+        results = await _run_concurrent(client, _entry_jobs(entries), max_concurrency)
+    finally:
+        if owned:
+            await client.close()
+
+    return await run_blocking(_record_drain_results, entries, results)
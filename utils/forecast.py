@@ -0,0 +1,183 @@
+# [SB] utils/forecast.py - 점검 이력의 예치금(Whois USD, Gabia KRW) 추이로 소진 속도와 기준값 도달 예상일 계산
+import json
+import math
+import os
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.checklist import load_thresholds
+from utils.history import KIND_FIELD, load_value_series
+from utils.tracing import count_event
+
+# [SB] 예측은 하루에 한 번만 계산 (같은 날의 이후 실행은 캐시 파일 재사용)
+FORECAST_CACHE_DIR = Path("logs") / "forecast"
+_cache_lock = threading.Lock()
+
+# [SB] 추출 필드 키 → (표시 이름, 통화)
+DEPOSITS = {
+    "whois_usd": ("Whois", "USD"),
+    "gabia_krw": ("Gabia", "KRW"),
+}
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+def forecast_window_days():
+    """[SB] 소진 속도를 평균할 기간(일) - FORECAST_WINDOW_DAYS (기본 14일)"""
+    return _env_int("FORECAST_WINDOW_DAYS", 14)
+
+def forecast_warn_days():
+    """[SB] 기준값 도달 예상이 이 일수 이내면 경고 - FORECAST_WARN_DAYS (기본 7일)"""
+    return _env_int("FORECAST_WARN_DAYS", 7)
+
+def load_deposit_frame(days):
+    """
+    [SB] 최근 days일 동안의 예치금 시계열을 일 단위 표로 변환
+
+    Returns:
+        pandas.DataFrame: 날짜(로컬, 일 단위) 인덱스, 열은 whois_usd/gabia_krw (그날 마지막 점검 값, 점검이 없던 날은 NaN)
+    """
+    rows = load_value_series(KIND_FIELD, DEPOSITS, start=time.time() - (days + 1) * 86400)
+    if not rows:
+        return pd.DataFrame(columns=list(DEPOSITS), dtype=float)
+
+    frame = pd.DataFrame(rows, columns=["checked_at", "key", "value"])
+    # [SB] "1,072.88 USD" → 1072.88 (숫자/소수점/부호 외 문자 제거 후 한 번에 변환)
+    frame["amount"] = pd.to_numeric(frame["value"].astype(str).str.replace(r"[^0-9.\-]", "", regex=True), errors="coerce")
+    wide = frame.pivot_table(index="checked_at", columns="key", values="amount", aggfunc="last")
+    # [SB] epoch 초 → 로컬 시각 (서버 시간대 기준으로 날짜를 나눔)
+    wide.index = pd.to_datetime(wide.index + time.localtime().tm_gmtoff, unit="s")
+    return wide.reindex(columns=list(DEPOSITS)).resample("D").last()
+
+def compute_forecast(daily, thresholds, window_days, today=None):
+    """
+    [SB] 일 단위 예치금 표로 소진 속도와 기준값 도달 예상일 계산 (모든 예치금 열을 한 번에 계산)
+
+    - 점검이 없던 날은 직전 값으로 채우므로 며칠 뒤 한꺼번에 줄어든 양도 기간 평균에 그대로 반영됩니다.
+    - 값이 늘어난 날(충전)은 사용량에서 제외합니다.
+
+    Args:
+        daily (pandas.DataFrame): load_deposit_frame 결과
+        thresholds (dict): {"whois_usd": float, "gabia_krw": float}
+        window_days (int): 평균 기간(일)
+        today (date, optional): 기준 날짜
+
+    Returns:
+        dict: 키별 {"current", "threshold", "burn_per_day", "days_left", "projected_date", "status"}
+              status: below(이미 기준 미만), warning(경고 기간 이내), ok, no_burn(줄어드는 추세 없음), no_data
+    """
+    today = today or date.today()
+    result = {}
+    if daily.empty:
+        return {key: {"status": "no_data"} for key in DEPOSITS}
+
+    filled = daily.ffill()
+    change = filled.diff()
+    usage = (-change).where(change <= 0)
+    # [SB] 변화량이 2일 이상 있어야 평균을 냄 (하루치 변화만으로는 예측하지 않음)
+    burn = usage.rolling(window_days, min_periods=min(2, window_days)).mean().iloc[-1]
+    current = filled.iloc[-1]
+    limit = pd.Series(thresholds).reindex(filled.columns).astype(float)
+    days_left = ((current - limit) / burn).where(burn > 0)
+
+    warn_days = forecast_warn_days()
+    for key in DEPOSITS:
+        if pd.isna(current[key]):
+            result[key] = {"status": "no_data"}
+            continue
+        entry = {
+            "current": float(current[key]),
+            "threshold": float(limit[key]),
+            "burn_per_day": None if pd.isna(burn[key]) else float(burn[key]),
+            "days_left": None,
+            "projected_date": None,
+        }
+        if current[key] < limit[key]:
+            entry["status"] = "below"
+        elif pd.isna(days_left[key]) or not np.isfinite(days_left[key]):
+            entry["status"] = "no_burn"
+        else:
+            entry["days_left"] = float(days_left[key])
+            entry["projected_date"] = (today + timedelta(days=math.floor(days_left[key]))).isoformat()
+            entry["status"] = "warning" if days_left[key] <= warn_days else "ok"
+        result[key] = entry
+    return result
+
+def get_deposit_forecast(today=None):
+    """
+    [SB] 오늘의 예치금 소진 예측 (하루 한 번 계산 후 logs/forecast/에 캐시)
+
+    기준값(WHOIS_USD_THRESHOLD, GABIA_KRW_THRESHOLD)이나 평균 기간이 바뀌면 같은 날이라도 다시 계산합니다.
+
+    Returns:
+        dict: compute_forecast 결과
+    """
+    today = today or date.today()
+    thresholds = load_thresholds()
+    window_days = forecast_window_days()
+    cache_path = FORECAST_CACHE_DIR / f"forecast_{today:%Y%m%d}.json"
+    settings = {"thresholds": thresholds, "window_days": window_days}
+
+    with _cache_lock:
+        try:
+            with open(cache_path, encoding="utf-8") as cache_file:
+                cached = json.load(cache_file)
+            if cached.get("settings") == settings:
+                count_event("cache", cache="forecast", result="hit")
+                return cached["forecast"]
+        except (OSError, ValueError):
+            pass
+        count_event("cache", cache="forecast", result="miss")
+
+        forecast = compute_forecast(load_deposit_frame(window_days), thresholds, window_days, today=today)
+        FORECAST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump({"settings": settings, "forecast": forecast}, cache_file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, cache_path)
+        # [SB] 이전 날짜의 캐시 파일 정리
+        for old_path in FORECAST_CACHE_DIR.glob("forecast_*.json"):
+            if old_path != cache_path:
+                try:
+                    old_path.unlink()
+                except OSError:
+                    pass
+        return forecast
+
+def _format_amount(value, currency):
+    return f"{value:,.2f} {currency}" if currency == "USD" else f"{value:,.0f} {currency}"
+
+def format_forecast_lines(forecast):
+    """
+    [SB] 보고서(Excel 메모, Markdown)에 표시할 예측 문장 목록
+
+    Returns:
+        list: 예치금별 한 줄 설명 (표시할 내용이 없으면 빈 리스트)
+    """
+    lines = []
+    for key, (label, currency) in DEPOSITS.items():
+        entry = (forecast or {}).get(key) or {"status": "no_data"}
+        status = entry["status"]
+        if status == "no_data":
+            continue
+        threshold = _format_amount(entry["threshold"], currency)
+        burn = entry["burn_per_day"]
+        burn_text = f"하루 평균 {_format_amount(burn, currency)} 사용" if burn else "최근 사용량 없음"
+        if status == "below":
+            lines.append(f"{label}: 기준({threshold}) 미만 - 즉시 충전 필요 ({burn_text})")
+        elif status == "no_burn":
+            lines.append(f"{label}: {burn_text} - 기준({threshold}) 도달 예상 없음")
+        else:
+            projected = date.fromisoformat(entry["projected_date"])
+            warning = " ⚠️ 충전 필요" if status == "warning" else ""
+            lines.append(f"{label}: {burn_text} → {projected:%m/%d} 기준({threshold}) 도달 예상 "
+                         f"({math.floor(entry['days_left'])}일 후){warning}")
+    return lines
@@ -0,0 +1,350 @@
+# [SB] utils/history.py - 점검 결과 이력(스냅샷)을 SQLite에 저장하고 이전 점검과 비교
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+# [SB] 실행마다 추출 필드, LLM 분석 결과, 링크 체크, 체크리스트 판정, 단계별 소요 시간을 보관
+#      값은 (종류, 키) 단위 행으로도 저장하므로 두 스냅샷 비교는 인덱스를 이용한 SQL 조인 한 번으로 끝남
+HISTORY_PATH = Path("logs") / "history.sqlite3"
+
+KIND_FIELD = "field"
+KIND_LLM = "llm"
+KIND_LINK = "link"
+KIND_VERDICT = "verdict"
+
+# [SB] 스냅샷의 보고서 전송 방식 - 전체 보고서(full) 또는 "변경 없음" 한 줄 메시지(no_change)
+DELIVERY_FULL = "full"
+DELIVERY_NO_CHANGE = "no_change"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    checked_at REAL NOT NULL,
+    trigger TEXT,
+    username TEXT,
+    all_ok INTEGER NOT NULL,
+    verdict_digest TEXT NOT NULL,
+    delivered INTEGER,
+    delivery TEXT,
+    fields TEXT NOT NULL,
+    llm TEXT NOT NULL,
+    timings TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS snapshots_checked_at ON snapshots (checked_at);
+CREATE TABLE IF NOT EXISTS snapshot_values (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    ok INTEGER,
+    PRIMARY KEY (snapshot_id, kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS snapshot_values_key ON snapshot_values (kind, key);
+"""
+
+def history_enabled():
+    """[SB] 이력 저장 사용 여부 (HISTORY_ENABLED, 기본 true)"""
+    return os.getenv("HISTORY_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+def _connect():
+    HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # [SB] main.py(기록)와 app.py(조회)가 동시에 접근하므로 WAL 모드 + 잠금 대기 시간 설정
+    conn = sqlite3.connect(str(HISTORY_PATH), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(_SCHEMA)
+    # [SB] 이전 버전에서 만든 DB에는 delivery 컬럼이 없으므로 추가
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(snapshots)")}
+    if "delivery" not in columns:
+        conn.execute("ALTER TABLE snapshots ADD COLUMN delivery TEXT")
+    return conn
+
+def _flatten(data, prefix=""):
+    """[SB] 중첩 dict를 "상위.하위" 키의 평탄한 dict로 변환"""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+def _verdict_key(index, row):
+    """[SB] 체크리스트 행 키 - 메뉴 이름이 겹치므로(고객문의 등) 행 번호를 앞에 붙임"""
+    return f"{index + 1:02d} {row['메뉴']}"
+
+def split_links(llm_json):
+    """
+    [SB] LLM 분석 결과를 링크 체크 결과와 나머지로 분리
+
+    Returns:
+        tuple: (링크 제외 평탄화 dict, 링크 체크 평탄화 dict) - 링크 키는 "link"로 끝나는 항목
+    """
+    flat = _flatten(llm_json)
+    links = {key: value for key, value in flat.items() if key.endswith("link")}
+    others = {key: value for key, value in flat.items() if key not in links}
+    return others, links
+
+def verdict_digest(checklist, llm_json):
+    """
+    [SB] 판정 집합의 다이제스트 - 체크리스트 행별 정상 여부와 링크 체크 결과가 같으면 같은 값
+
+    잔액(whois_usd, gabia_krw)처럼 실행마다 바뀌는 값은 LLM 결과와 체크리스트 결과 문구에 들어 있으므로
+    넣지 않습니다 (잔액 부족은 해당 행의 정상 여부로 반영됨).
+
+    Returns:
+        str: SHA-256 hex
+    """
+    _, links = split_links(llm_json)
+    payload = json.dumps({
+        "links": links,
+        "verdicts": {_verdict_key(index, row): bool(row["정상"]) for index, row in enumerate(checklist)},
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _value_rows(fields, llm_json, checklist):
+    others, links = split_links(llm_json)
+    rows = []
+    for kind, values in ((KIND_FIELD, _flatten(fields)), (KIND_LLM, others), (KIND_LINK, links)):
+        for key, value in values.items():
+            rows.append((kind, key, json.dumps(value, ensure_ascii=False), None))
+    for index, row in enumerate(checklist):
+        rows.append((KIND_VERDICT, _verdict_key(index, row), json.dumps(row["결과"], ensure_ascii=False), int(bool(row["정상"]))))
+    return rows
+
+def record_snapshot(fields, llm_json, checklist, trigger=None, username=None, checked_at=None):
+    """
+    [SB] 이번 점검 결과를 스냅샷으로 저장하는 함수
+
+    Args:
+        fields (dict): extract_fields 결과
+        llm_json (dict): LLM 분석 결과 (링크 체크 결과 포함)
+        checklist (list): evaluate_checklist 결과
+        trigger (str, optional): 실행 계기 (login, schedule, refresh)
+        username (str, optional): 담당자 이름
+        checked_at (float, optional): 점검 시각 (epoch 초). 기본값은 현재 시각
+
+    Returns:
+        int: 스냅샷 ID
+    """
+    checked_at = time.time() if checked_at is None else checked_at
+    all_ok = int(all(row["정상"] for row in checklist))
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.execute(
+            "INSERT INTO snapshots (checked_at, trigger, username, all_ok, verdict_digest, fields, llm) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (checked_at, trigger, username, all_ok, verdict_digest(checklist, llm_json),
+             json.dumps(fields, ensure_ascii=False), json.dumps(llm_json, ensure_ascii=False)),
+        )
+        snapshot_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO snapshot_values (snapshot_id, kind, key, value, ok) VALUES (?, ?, ?, ?, ?)",
+            [(snapshot_id, *row) for row in _value_rows(fields, llm_json, checklist)],
+        )
+        conn.execute("COMMIT")
+        return snapshot_id
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def finish_snapshot(snapshot_id, timings=None, delivered=None, username=None, delivery=None):
+    """[SB] 보고서 생성/전송이 끝난 뒤 단계별 소요 시간(초), 전송 결과, 담당자, 전송 방식(full/no_change) 기록"""
+    conn = _connect()
+    try:
+        conn.execute(
+            "UPDATE snapshots SET timings = ?, delivered = ?, username = COALESCE(?, username), delivery = ? WHERE id = ?",
+            (json.dumps(timings or {}, ensure_ascii=False), None if delivered is None else int(bool(delivered)),
+             username, delivery, snapshot_id),
+        )
+    finally:
+        conn.close()
+
+def _summary(row):
+    return {
+        "id": row["id"],
+        "checked_at": row["checked_at"],
+        "trigger": row["trigger"],
+        "username": row["username"],
+        "all_ok": bool(row["all_ok"]),
+        "verdict_digest": row["verdict_digest"],
+        "delivered": None if row["delivered"] is None else bool(row["delivered"]),
+        "delivery": row["delivery"],
+        "timings": json.loads(row["timings"]),
+    }
+
+def get_snapshot(snapshot_id):
+    """[SB] 스냅샷 전체 (추출 필드, LLM 결과, 판정 포함) - 없으면 None"""
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT * FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+        if row is None:
+            return None
+        snapshot = _summary(row)
+        snapshot["fields"] = json.loads(row["fields"])
+        snapshot["llm"] = json.loads(row["llm"])
+        snapshot["verdicts"] = {
+            value["key"]: {"결과": json.loads(value["value"]), "정상": bool(value["ok"])}
+            for value in conn.execute(
+                "SELECT key, value, ok FROM snapshot_values WHERE snapshot_id = ? AND kind = ? ORDER BY key",
+                (snapshot_id, KIND_VERDICT))
+        }
+        return snapshot
+    finally:
+        conn.close()
+
+def latest_snapshot(before_id=None):
+    """[SB] 가장 최근 스냅샷 요약 (before_id가 있으면 그보다 이전 것) - 없으면 None"""
+    conn = _connect()
+    try:
+        if before_id is None:
+            row = conn.execute("SELECT * FROM snapshots ORDER BY checked_at DESC, id DESC LIMIT 1").fetchone()
+        else:
+            row = conn.execute(
+                "SELECT * FROM snapshots WHERE (checked_at, id) < "
+                "(SELECT checked_at, id FROM snapshots WHERE id = ?) "
+                "ORDER BY checked_at DESC, id DESC LIMIT 1", (before_id,)).fetchone()
+        return _summary(row) if row else None
+    finally:
+        conn.close()
+
+def last_full_report(before_id=None):
+    """
+    [SB] 전체 보고서가 전송된 가장 최근 스냅샷 요약 (변경 감지/heartbeat 기준) - 없으면 None
+
+    Args:
+        before_id (int, optional): 이 스냅샷(이번 실행)은 제외
+    """
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT * FROM snapshots WHERE delivery = ? AND delivered = 1 AND id != ? "
+            "ORDER BY checked_at DESC, id DESC LIMIT 1",
+            (DELIVERY_FULL, before_id if before_id is not None else -1),
+        ).fetchone()
+        return _summary(row) if row else None
+    finally:
+        conn.close()
+
+def query_snapshots(start=None, end=None, limit=100):
+    """
+    [SB] 기간 내 스냅샷 요약 목록 (최신순)
+
+    Args:
+        start (float, optional): 시작 시각 (epoch 초, 포함)
+        end (float, optional): 끝 시각 (epoch 초, 미포함)
+        limit (int): 최대 개수
+
+    Returns:
+        list: 스냅샷 요약 dict 목록
+    """
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT * FROM snapshots WHERE checked_at >= ? AND checked_at < ? "
+            "ORDER BY checked_at DESC, id DESC LIMIT ?",
+            (start if start is not None else 0, end if end is not None else float("inf"), limit),
+        ).fetchall()
+        return [_summary(row) for row in rows]
+    finally:
+        conn.close()
+
+def diff_snapshots(old_id, new_id, kinds=None):
+    """
+    [SB] 두 스냅샷의 값 차이 (한쪽에만 있는 키 포함)
+
+    Args:
+        old_id (int): 이전 스냅샷 ID
+        new_id (int): 새 스냅샷 ID
+        kinds (iterable, optional): 비교할 종류 (기본: 전체 - field, llm, link, verdict)
+
+    Returns:
+        list: [{"kind", "key", "before", "after", "ok_before", "ok_after"}, ...] (종류, 키 순)
+    """
+    kinds = tuple(kinds or (KIND_FIELD, KIND_LLM, KIND_LINK, KIND_VERDICT))
+    placeholders = ",".join("?" * len(kinds))
+    # [SB] 기본 키(snapshot_id, kind, key) 인덱스로 두 스냅샷 행을 바로 조인 (FULL OUTER JOIN은 SQLite 3.39+라 LEFT JOIN 두 번)
+    query = f"""
+        SELECT new.kind AS kind, new.key AS key, old.value AS before, new.value AS after, old.ok AS ok_before, new.ok AS ok_after
+        FROM snapshot_values AS new
+        LEFT JOIN snapshot_values AS old ON old.snapshot_id = ? AND old.kind = new.kind AND old.key = new.key
+        WHERE new.snapshot_id = ? AND new.kind IN ({placeholders})
+          AND (old.key IS NULL OR old.value IS NOT new.value OR old.ok IS NOT new.ok)
+        UNION ALL
+        SELECT old.kind, old.key, old.value, NULL, old.ok, NULL
+        FROM snapshot_values AS old
+        LEFT JOIN snapshot_values AS new ON new.snapshot_id = ? AND new.kind = old.kind AND new.key = old.key
+        WHERE old.snapshot_id = ? AND old.kind IN ({placeholders}) AND new.key IS NULL
+        ORDER BY kind, key
+    """
+    conn = _connect()
+    try:
+        rows = conn.execute(query, (old_id, new_id, *kinds, new_id, old_id, *kinds)).fetchall()
+    finally:
+        conn.close()
+    return [{
+        "kind": row["kind"],
+        "key": row["key"],
+        "before": json.loads(row["before"]) if row["before"] is not None else None,
+        "after": json.loads(row["after"]) if row["after"] is not None else None,
+        "ok_before": None if row["ok_before"] is None else bool(row["ok_before"]),
+        "ok_after": None if row["ok_after"] is None else bool(row["ok_after"]),
+    } for row in rows]
+
+def diff_with_previous(snapshot_id, kinds=None):
+    """
+    [SB] 스냅샷과 바로 이전 스냅샷의 차이
+
+    Returns:
+        tuple: (이전 스냅샷 요약 또는 None, 변경 목록)
+    """
+    previous = latest_snapshot(before_id=snapshot_id)
+    if previous is None:
+        return None, []
+    return previous, diff_snapshots(previous["id"], snapshot_id, kinds=kinds)
+
+def load_value_series(kind, keys, start=None):
+    """
+    [SB] 여러 스냅샷에 걸친 값 시계열 (예: 추출 필드 whois_usd, gabia_krw)
+
+    Args:
+        kind (str): 값 종류 (KIND_FIELD 등)
+        keys (iterable): 조회할 키 목록
+        start (float, optional): 시작 시각 (epoch 초, 포함)
+
+    Returns:
+        list: [(checked_at, key, value), ...] 시각순 - value는 저장된 원래 값(JSON 디코딩)
+    """
+    keys = tuple(keys)
+    placeholders = ",".join("?" * len(keys))
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            f"SELECT s.checked_at, v.key, v.value FROM snapshot_values AS v "
+            f"JOIN snapshots AS s ON s.id = v.snapshot_id "
+            f"WHERE v.kind = ? AND v.key IN ({placeholders}) AND s.checked_at >= ? "
+            f"ORDER BY s.checked_at, s.id",
+            (kind, *keys, start if start is not None else 0),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [(row["checked_at"], row["key"], json.loads(row["value"])) for row in rows]
+
+def purge_history(days=None):
+    """[SB] 보관 기간(HISTORY_RETENTION_DAYS, 기본 90일)이 지난 스냅샷 삭제"""
+    if days is None:
+        days = float(os.getenv("HISTORY_RETENTION_DAYS", "90"))
+    conn = _connect()
+    try:
+        cursor = conn.execute("DELETE FROM snapshots WHERE checked_at < ?", (time.time() - days * 86400,))
+        return cursor.rowcount
+    finally:
+        conn.close()
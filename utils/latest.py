@@ -0,0 +1,118 @@
+# [SB] utils/latest.py - 가장 최근 점검 결과와 보고서 파일 보관 (웹 UI/로그인 사용자에게 바로 제공)
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# [SB] main.py(점검 프로세스)가 쓰고 app.py(웹 서버)가 읽으므로 디스크에 보관
+LATEST_DIR = Path("logs") / "latest"
+LATEST_RESULT_FILE = LATEST_DIR / "result.json"
+
+def _atomic_write(path, write):
+    """[SB] 임시 파일에 쓴 뒤 교체 - 읽는 쪽이 쓰다 만 파일을 보지 않도록"""
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            write(temp_file)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+def save_latest_result(result, report=None, report_name=None, keep_report=False):
+    """
+    [SB] 이번 점검 결과(와 보고서 파일)를 최신 결과로 저장하는 함수
+
+    보고서는 실행마다 새 파일 이름으로 저장한 뒤 결과 JSON을 교체하므로,
+    읽는 쪽은 항상 결과와 짝이 맞는 보고서 파일을 보게 됩니다.
+
+    Args:
+        result (dict): JSON으로 저장할 점검 결과 (checked_at 등)
+        report (SpooledReport or bytes, optional): 보고서 파일 내용
+        report_name (str, optional): 다운로드 시 사용할 보고서 파일 이름
+        keep_report (bool): report가 없을 때 이전 결과를 보고서 파일과 함께 계속 사용 (판정 변경이 없어 Excel을 만들지 않은 경우)
+
+    Returns:
+        dict: 저장된 결과 (report_file, report_name 포함)
+    """
+    LATEST_DIR.mkdir(parents=True, exist_ok=True)
+    previous = load_latest_result() if keep_report and report is None else None
+    if previous and latest_report_path(previous):
+        # [SB] 보고서를 다시 만들지 않았으므로 점검 시각/담당자도 보고서를 만든 이전 결과 그대로 유지
+        #      (checked_at을 갱신하면 오래된 보고서가 계속 최신(LATEST_MAX_AGE 이내)으로 취급됨)
+        return previous
+
+    result = dict(result)
+    result.setdefault("checked_at", datetime.now().isoformat(timespec="seconds"))
+    result["report_file"] = None
+    result["report_name"] = report_name
+    if report is not None:
+        report_file = f"report_{uuid.uuid4().hex[:12]}.xlsx"
+        if isinstance(report, bytes):
+            _atomic_write(LATEST_DIR / report_file, lambda out: out.write(report))
+        else:
+            def copy_report(out):
+                with report.open_reader() as reader:
+                    shutil.copyfileobj(reader, out, 1024 * 1024)
+            _atomic_write(LATEST_DIR / report_file, copy_report)
+        result["report_file"] = report_file
+
+    payload = json.dumps(result, ensure_ascii=False, indent=2).encode("utf-8")
+    _atomic_write(LATEST_RESULT_FILE, lambda out: out.write(payload))
+    _remove_old_reports(keep=result["report_file"])
+    return result
+
+def _remove_old_reports(keep):
+    """[SB] 최신 결과가 가리키지 않는 이전 보고서 파일 삭제"""
+    for path in LATEST_DIR.glob("report_*.xlsx"):
+        if path.name != keep:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+def load_latest_result():
+    """[SB] 최신 점검 결과 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(LATEST_RESULT_FILE, encoding="utf-8") as result_file:
+            return json.load(result_file)
+    except (OSError, ValueError):
+        return None
+
+def latest_report_path(result):
+    """[SB] 최신 결과의 보고서 파일 경로 (보고서가 없으면 None)"""
+    if not result or not result.get("report_file"):
+        return None
+    path = LATEST_DIR / result["report_file"]
+    return path if path.exists() else None
+
+def report_matches(result, username, now=None):
+    """
+    [SB] 저장된 보고서를 그대로 보내도 되는지 - 같은 담당자(username)용으로 오늘 만든 보고서인지
+
+    보고서 파일에는 담당자 이름과 날짜가 들어가므로, 다른 사용자나 이전 날짜의 보고서는
+    result.json의 분석 결과로 다시 만들어야 합니다.
+    """
+    if not result or not result.get("checked_at") or (result.get("username") or None) != (username or None):
+        return False
+    try:
+        checked_at = datetime.fromisoformat(result["checked_at"])
+    except ValueError:
+        return False
+    return checked_at.date() == (now or datetime.now()).date()
+
+def result_age(result, now=None):
+    """[SB] 점검 후 지난 시간(초) - 결과가 없으면 None"""
+    if not result or not result.get("checked_at"):
+        return None
+    try:
+        checked_at = datetime.fromisoformat(result["checked_at"])
+    except ValueError:
+        return None
+    return ((now or datetime.now()) - checked_at).total_seconds()
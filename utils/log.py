@@ -0,0 +1,218 @@
+# [SB] utils/log.py - 구조화 로그 설정 (큐 기반 비동기 출력, JSON Lines, 작업 ID 연결, 레벨 제어)
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+# [SB] 로그 줄마다 붙는 작업 ID - app.py가 작업마다 만들고 main.py에는 JOB_ID 환경 변수로 전달
+_job_id = ContextVar("job_id", default=None)
+_process_job_id = None
+
+_listener = None
+_setup_lock = threading.Lock()
+
+def current_job_id():
+    """[SB] 현재 컨텍스트의 작업 ID (없으면 프로세스 작업 ID, 그것도 없으면 None)"""
+    return _job_id.get() or _process_job_id
+
+@contextmanager
+def bind_job_id(job_id):
+    """[SB] with 블록 동안 이 스레드/태스크의 로그에 작업 ID 연결"""
+    token = _job_id.set(job_id)
+    try:
+        yield job_id
+    finally:
+        _job_id.reset(token)
+
+class _JobQueueHandler(QueueHandler):
+    """
+    [SB] 로그 기록을 큐에 넣기만 하는 핸들러 - 출력(JSON 직렬화, 쓰기)은 리스너 스레드에서 처리
+
+    메시지 인자(%s)와 data는 나중에 바뀔 수 있으므로(예: 링크 체크 결과가 추가되는 LLM 결과 dict)
+    레벨 필터를 통과한 기록만 호출한 스레드에서 문자열로 확정합니다.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.stack_info = None
+        record.job_id = current_job_id()
+        data = getattr(record, "data", None)
+        if data is not None:
+            record.data_json = json.dumps(data, ensure_ascii=False, default=str)
+            record.data = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    """[SB] 한 줄에 JSON 객체 하나 (ts, level, logger, job_id, msg, event, data, exc)"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "job_id": getattr(record, "job_id", None),
+            "msg": record.getMessage() if record.args else record.msg,
+        }
+        event = getattr(record, "event", None)
+        if event:
+            entry["event"] = event
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        data_json = getattr(record, "data_json", None)
+        if data_json is not None:
+            # [SB] data는 큐에 넣을 때 이미 직렬화했으므로 다시 변환하지 않고 그대로 붙임
+            line = f'{line[:-1]}, "data": {data_json}}}'
+        return line
+
+class TextFormatter(logging.Formatter):
+    """[SB] 사람이 읽는 한 줄 형식 (LOG_FORMAT=text) - data는 메시지 뒤에 JSON으로 붙임"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(name)s]%(job_text)s %(message)s", "%H:%M:%S")
+
+    def format(self, record):
+        job_id = getattr(record, "job_id", None)
+        record.job_text = f" ({job_id})" if job_id else ""
+        line = super().format(record)
+        data_json = getattr(record, "data_json", None)
+        return f"{line}\n{data_json}" if data_json is not None else line
+
+def _parse_levels(spec):
+    """[SB] "utils.xlsx=DEBUG,utils.llm=WARNING" → {"utils.xlsx": 10, "utils.llm": 30}"""
+    levels = {}
+    for item in (spec or "").split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return {name: level for name, level in levels.items() if isinstance(level, int)}
+
+def setup_logging(job_id=None, level=None, fmt=None, stream=None):
+    """
+    [SB] 루트 로거를 큐 기반 비동기 출력으로 설정 (프로세스마다 한 번, 다시 호출하면 설정 교체)
+
+    Args:
+        job_id (str, optional): 이 프로세스의 작업 ID (기본: JOB_ID 환경 변수)
+        level (str, optional): 루트 로그 레벨 (기본: LOG_LEVEL 환경 변수, INFO)
+        fmt (str, optional): json(기본) 또는 text (LOG_FORMAT 환경 변수)
+        stream (file, optional): 출력 대상 (기본: sys.stdout)
+
+    모듈별 레벨은 LOG_LEVELS 환경 변수로 지정합니다 (예: "utils.xlsx=DEBUG,crawl4ai=WARNING").
+    레벨에 걸러지는 기록은 메시지를 만들지 않으므로, 호출하는 쪽은 f-string 대신 %s 인자를 사용합니다.
+    """
+    global _listener, _process_job_id
+    with _setup_lock:
+        _process_job_id = job_id or os.getenv("JOB_ID") or None
+        fmt = (fmt or os.getenv("LOG_FORMAT", "json")).strip().lower()
+        handler = logging.StreamHandler(stream or sys.stdout)
+        handler.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+
+        if _listener is not None:
+            _listener.stop()
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+
+        root = logging.getLogger()
+        for old_handler in list(root.handlers):
+            root.removeHandler(old_handler)
+        root.addHandler(_JobQueueHandler(log_queue))
+        root_level = logging.getLevelName((level or os.getenv("LOG_LEVEL", "INFO")).strip().upper())
+        root.setLevel(root_level if isinstance(root_level, int) else logging.INFO)
+        for name, module_level in _parse_levels(os.getenv("LOG_LEVELS")).items():
+            logging.getLogger(name).setLevel(module_level)
+    return _listener
+
+def shutdown_logging():
+    """[SB] 큐에 남은 기록을 모두 출력하고 리스너 스레드 종료 (프로세스 종료 시 자동 호출)"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+atexit.register(shutdown_logging)
+
+def parse_log_line(line):
+    """[SB] JSON 로그 한 줄 → dict (JsonFormatter 형식이 아니면 None)"""
+    line = line.strip()
+    if not line.startswith("{"):
+        return None
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) and "level" in entry and "msg" in entry else None
+
+class ProcessLogReader:
+    """
+    [SB] 자식 프로세스(main.py)의 stdout/stderr를 실행 중 계속 읽는 리더
+
+    communicate()로 끝에 한 번에 읽으면 출력이 많은 실행에서 파이프 버퍼가 차서 자식 프로세스가 멈출 수 있으므로
+    줄 단위로 바로 읽고, 최근 줄만 보관합니다. JSON 로그 줄은 같은 작업 ID로 이 프로세스의 로거에 다시 기록하고
+    event 필드(예: report_delivered)는 events에 모읍니다.
+
+    사용 예:
+        process = subprocess.Popen([...], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        reader = ProcessLogReader(process, job_id)
+        process.wait()
+        reader.join()
+    """
+
+    def __init__(self, process, job_id=None, tail_lines=200, logger_name="job"):
+        self.job_id = job_id
+        self.events = []
+        self._logger_name = logger_name
+        self._stdout_tail = deque(maxlen=tail_lines)
+        self._stderr_tail = deque(maxlen=tail_lines)
+        self._threads = [
+            threading.Thread(target=self._drain, args=(pipe, tail), name=f"{logger_name}-{name}", daemon=True)
+            for name, pipe, tail in (("stdout", process.stdout, self._stdout_tail), ("stderr", process.stderr, self._stderr_tail))
+            if pipe is not None
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _drain(self, pipe, tail):
+        with bind_job_id(self.job_id):
+            for line in pipe:
+                tail.append(line)
+                entry = parse_log_line(line)
+                if entry is None:
+                    continue
+                if entry.get("event"):
+                    self.events.append(entry["event"])
+                level = logging.getLevelName(entry["level"])
+                child_logger = logging.getLogger(f"{self._logger_name}.{entry.get('logger') or 'main'}")
+                if isinstance(level, int) and child_logger.isEnabledFor(level):
+                    child_logger.log(level, "%s", entry["msg"], extra={"event": entry.get("event")})
+            pipe.close()
+
+    def join(self, timeout=None):
+        for thread in self._threads:
+            thread.join(timeout)
+
+    @property
+    def stdout(self):
+        """[SB] 최근 stdout 줄 (최대 tail_lines줄)"""
+        return "".join(self._stdout_tail)
+
+    @property
+    def stderr(self):
+        """[SB] 최근 stderr 줄 (최대 tail_lines줄)"""
+        return "".join(self._stderr_tail)
@@ -1,16 +1,29 @@
 # utils/mattermost.py
 from mattermostdriver import Driver
+from mattermostdriver.exceptions import NotEnoughPermissions, ResourceNotFound
 from pathlib import Path
 import os
 import logging
+import threading
 from dotenv import load_dotenv
 from datetime import datetime
 import io
+import requests
+from utils.breaker import CircuitBreaker
+from utils.channel_cache import team_channel_key, dm_channel_key, get_cached_channel_id, cache_channel_id, invalidate_channel
 
 logger = logging.getLogger(__name__)
 
-# .env 파일 로드
-load_dotenv()
+# [SB] .env 파일은 import 시점이 아니라 처음 Mattermost 설정을 읽을 때 한 번 로드
+#      (app.py/main.py는 시작 시 직접 로드하므로, 이 모듈을 import만 해도 파일을 읽지 않도록)
+_env_loaded = False
+
+def _load_env():
+    """[SB] .env 파일 로드 (프로세스당 한 번, 이미 설정된 환경 변수는 덮어쓰지 않음)"""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
 
 def _parse_mattermost_url(url):
     """
@@ -45,14 +58,14 @@ def _parse_mattermost_url(url):
                 try:
                     port = int(port_str)
                 except ValueError:
-                    print(f"[Mattermost] 포트 번호 변환 실패. 기본값 443 사용: {port_str}")
+                    logger.warning("포트 번호 변환 실패. 기본값 443 사용: %s", port_str)
                     port = 443
     
     # 도메인에서 추가 경로 제거
     if '/' in domain:
         domain = domain.split('/', 1)[0]
     
-    logger.debug(f"파싱된 URL 정보 - Scheme: {scheme}, Domain: {domain}, Port: {port}")
+    logger.debug("파싱된 URL 정보 - Scheme: %s, Domain: %s, Port: %s", scheme, domain, port)
     
     return scheme, domain, port
 
@@ -63,18 +76,32 @@ def _get_mattermost_credentials():
     Returns:
         tuple: (url, login_id, password, 성공 여부)
     """
+    _load_env()
     url = os.getenv("MATTERMOST_URL")
     login_id = os.getenv("MATTERMOST_USERNAME")
     password = os.getenv("MATTERMOST_PASSWORD")
     
     # 환경 변수 확인
     if not all([url, login_id, password]):
-        print("[Mattermost] 환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
+        logger.warning("환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
         return None, None, None, False
     
     return url, login_id, password, True
 
-def _create_mattermost_driver(url, login_id, password):
+def _get_mattermost_token():
+    """
+    [SB] 봇 토큰 또는 개인 액세스 토큰(MATTERMOST_TOKEN)을 반환하는 헬퍼 함수
+    
+    토큰이 있으면 전송은 비밀번호 로그인 없이 토큰으로 인증하고,
+    사용자 비밀번호는 app.py /login의 본인 확인에만 사용합니다.
+    
+    Returns:
+        str or None: 토큰 (설정되지 않았으면 None)
+    """
+    _load_env()
+    return os.getenv("MATTERMOST_TOKEN") or None
+
+def _create_mattermost_driver(url, login_id, password, token=None):
     """
     Mattermost 드라이버를 생성하고 반환하는 헬퍼 함수
     
@@ -82,6 +109,7 @@ def _create_mattermost_driver(url, login_id, password):
         url (str): Mattermost 서버 URL
         login_id (str): 로그인 ID
         password (str): 비밀번호
+        token (str, optional): 봇/개인 액세스 토큰. 지정하면 login()이 비밀번호 대신 토큰으로 인증합니다.
     
     Returns:
         tuple: (driver, 성공 여부)
@@ -98,154 +126,469 @@ def _create_mattermost_driver(url, login_id, password):
             'basepath': '/api/v4',
             'login_id': login_id,
             'password': password,
+            'token': token,
             'timeout': 60,
             'verify': False,
         })
         
         return driver, True
     except Exception as e:
-        print(f"[Mattermost] 드라이버 생성 실패: {str(e)}")
+        logger.warning("드라이버 생성 실패: %s", e)
         return None, False
 
-def _send_excel_to_mattermost(excel_file, channel_id, message=None):
+def _is_outage(error):
+    """[SB] Mattermost 장애로 볼 오류 - 연결 실패, 시간 초과, 5xx (mattermostdriver의 4xx 예외는 응답이 없으므로 제외)"""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, 'response', None)
+    return isinstance(error, requests.exceptions.HTTPError) and response is not None and response.status_code >= 500
+
+def mattermost_breaker():
+    """[SB] 모든 작업이 공유하는 Mattermost 차단기 (utils/breaker.py)"""
+    return CircuitBreaker("mattermost")
+
+class MattermostSession:
+    """
+    [SB] 작업(실행) 단위로 한 번만 로그인하고 모든 전송 함수가 공유하는 Mattermost 세션
+    
+    로그인 응답으로 받은 'me' 사용자 정보를 캐시하므로 get_user('me') 호출도 반복하지 않습니다.
+    드라이버 호출은 요청마다 독립적인 HTTP 요청이므로 여러 스레드에서 동시에 사용해도 됩니다.
+    
+    [SB] 인증 방식
+        - 토큰: token 인자 또는 MATTERMOST_TOKEN (아이디/비밀번호를 직접 넘기지 않은 경우).
+          비밀번호 로그인 없이 인증하고, 종료할 때 로그아웃하지 않습니다.
+        - 비밀번호: 인자 또는 MATTERMOST_USERNAME/MATTERMOST_PASSWORD
+    
+    보고서를 받을 사람(recipient)은 recipient_id 또는 (토큰 인증일 때) MATTERMOST_REPORT_USER_ID로 지정합니다.
+    없으면 로그인한 사용자 자신입니다. 봇 토큰으로 보내면 '자신(DM)'이 봇과 이 사용자의 DM이 됩니다.
+    
+    사용 예:
+        with MattermostSession() as session:
+            send_excel_to_self(excel_file, session=session)
+    """
+    
+    def __init__(self, url=None, login_id=None, password=None, token=None, recipient_id=None):
+        self.url = url
+        self.login_id = login_id
+        self.password = password
+        # [SB] 아이디/비밀번호를 직접 받지 않았으면 토큰 우선
+        self.token = token if token or (login_id and password) else _get_mattermost_token()
+        # [SB] 토큰 인증의 보고서 수신자는 로그인 전에 정함 (로그인이 실패해도 아웃박스에 보낸 계정으로 저장되도록)
+        self.recipient_id = recipient_id or (self.token and os.getenv("MATTERMOST_REPORT_USER_ID")) or None
+        self.driver = None
+        self.me = None
+        self.recipient = None
+        self._lock = threading.Lock()
+    
+    @property
+    def user_id(self):
+        return self.me['id'] if self.me else None
+    
+    def login(self):
+        """
+        세션이 아직 로그인되지 않았으면 로그인하고 'me' 사용자 정보를 캐시하는 함수
+        
+        Returns:
+            bool: 로그인 성공 여부
+        """
+        with self._lock:
+            if self.driver is not None and self.me is not None:
+                return True
+            
+            if self.token:
+                self.url = self.url or os.getenv("MATTERMOST_URL")
+                if not self.url:
+                    logger.warning("환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
+                    return False
+            elif not all([self.url, self.login_id, self.password]):
+                url, login_id, password, success = _get_mattermost_credentials()
+                if not success:
+                    return False
+                self.url = self.url or url
+                self.login_id = self.login_id or login_id
+                self.password = self.password or password
+            
+            driver, success = _create_mattermost_driver(self.url, self.login_id, self.password, token=self.token)
+            if not success:
+                return False
+            
+            try:
+                # [SB] 차단기가 열려 있으면 연결 제한 시간(60초)을 기다리지 않고 바로 실패
+                with mattermost_breaker().guard(_is_outage):
+                    result = driver.login()
+                # [SB] 로그인 응답 본문이 사용자 정보이므로 그대로 캐시 (토큰 인증은 get_user('me') 1회)
+                me = result if isinstance(result, dict) and 'id' in result else driver.users.get_user('me')
+                
+                # [SB] 보고서 수신자가 로그인 사용자와 다를 때만(봇 토큰 등) 수신자 정보 추가 조회
+                recipient_id = self.recipient_id or me['id']
+                recipient = me if recipient_id == me['id'] else driver.users.get_user(recipient_id)
+            except Exception as e:
+                logger.warning("로그인 실패: %s", e)
+                return False
+            
+            self.driver = driver
+            self.me = me
+            self.recipient = recipient
+            self.recipient_id = recipient['id']
+            auth_mode = "토큰" if self.token else "비밀번호"
+            logger.info("%s에 연결되었습니다. 사용자: %s (%s 인증)", self.url, me.get('username', ''), auth_mode)
+            return True
+    
+    def close(self):
+        """세션 로그아웃 (여러 번 호출해도 안전)"""
+        with self._lock:
+            if self.driver is None:
+                return
+            try:
+                # [SB] 토큰 인증은 로그아웃하지 않음 (토큰 세션이 만료되어 다음 실행에서 사용할 수 없게 됨)
+                if not self.token:
+                    self.driver.logout()
+            except Exception as e:
+                logger.warning("로그아웃 실패: %s", e)
+            finally:
+                self.driver = None
+                self.me = None
+                self.recipient = None
+    
+    def __enter__(self):
+        self.login()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+def _acquire_session(session):
+    """
+    [SB] 전달받은 세션을 사용하거나, 없으면 이 호출 전용 임시 세션을 만들어 로그인하는 헬퍼 함수
+    
+    Returns:
+        tuple: (세션 또는 None, 호출 측에서 닫아야 하는지 여부)
+    """
+    owned = session is None
+    if owned:
+        session = MattermostSession()
+    if not session.login():
+        if owned:
+            session.close()
+        return None, False
+    return session, owned
+
+def _default_file_message():
+    """[SB] 보고서 파일과 함께 게시하는 통일된 메시지"""
+    today = datetime.now().strftime("%Y년 %m월 %d일")
+    return f"{today} 당직체크리스트입니다"
+
+def _upload_file_stream(driver, channel_id, file_name, stream):
+    """
+    [SB] 파일을 요청 본문으로 스트리밍 업로드 (POST /files?channel_id=&filename=)
+    
+    multipart 업로드는 requests가 본문 전체를 메모리에서 다시 만들기 때문에,
+    파일 객체를 그대로 본문으로 넘겨 청크 단위로 전송합니다 (Content-Length는 파일 크기).
+    """
+    return driver.client.post('/files', params={'channel_id': channel_id, 'filename': file_name}, data=stream)
+
+def _send_excel_to_mattermost(excel_file, channel_id, message=None, session=None, pending_post_id=None):
     """
     Mattermost의 특정 채널에 엑셀 파일을 전송하는 내부 함수
     
     Args:
-        excel_file (str or BytesIO): 보낼 엑셀 파일 경로 또는 메모리 객체
+        excel_file (str or 파일 객체): 보낼 엑셀 파일 경로 또는 파일 객체(BytesIO, SpooledReport 등 name 속성 권장)
         channel_id (str): 메시지를 보낼 채널 ID
         message (str, optional): 파일과 함께 보낼 메시지 (사용되지 않음)
+        session (MattermostSession, optional): 공유 세션. 없으면 임시로 로그인/로그아웃합니다.
+        pending_post_id (str, optional): 재전송 시 중복 게시를 막는 멱등성 키
         
     Returns:
         tuple: (성공 여부, 파일 이름)
     """
-    # 환경 변수 가져오기
-    url, login_id, password, success = _get_mattermost_credentials()
-    if not success:
-        return False, None
-    
-    # 파일이 문자열(경로)인지 메모리 객체인지 확인
-    is_memory_file = isinstance(excel_file, io.BytesIO)
+    # 파일이 문자열(경로)인지 파일 객체인지 확인
+    is_memory_file = hasattr(excel_file, 'read')
     
     # 파일 경로인 경우 파일 존재 여부 확인
     if not is_memory_file:
         excel_path = Path(excel_file)
         if not excel_path.exists():
-            print(f"[Mattermost] 엑셀 파일을 찾을 수 없습니다: {excel_path}")
+            logger.warning("엑셀 파일을 찾을 수 없습니다: %s", excel_path)
             return False, None
     elif not hasattr(excel_file, 'name'):
         # 메모리 객체지만 이름이 없는 경우 이름 설정
         excel_file.name = f"report_{datetime.now().strftime('%Y%m%d')}.xlsx"
     
+    session, owned = _acquire_session(session)
+    if session is None:
+        return False, None
+    
     try:
-        # Mattermost 드라이버 생성
-        driver, success = _create_mattermost_driver(url, login_id, password)
-        if not success:
-            return False, None
-        
-        # 로그인
-        driver.login()
+        driver = session.driver
         
         # 파일 업로드
         if is_memory_file:
             # 메모리 객체인 경우
             excel_file.seek(0)  # 파일 포인터를 시작으로 되돌림
-            files = {
-                'files': (getattr(excel_file, 'name', 'report.xlsx'), excel_file, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-            }
             file_name = getattr(excel_file, 'name', 'report.xlsx')
+            file_upload = _upload_file_stream(driver, channel_id, file_name, excel_file)
         else:
             # 파일 경로인 경우
-            files = {
-                'files': (excel_path.name, open(excel_path, 'rb'), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-            }
             file_name = excel_path.name
+            with open(excel_path, 'rb') as f:
+                file_upload = _upload_file_stream(driver, channel_id, file_name, f)
         
-        file_upload = driver.files.upload_file(channel_id=channel_id, files=files)
         file_ids = [file_info['id'] for file_info in file_upload['file_infos']]
         
         # 현재 날짜를 가져와서 메시지 생성 (통일된 메시지 사용)
-        today = datetime.now().strftime("%Y년 %m월 %d일")
-        default_message = f"{today} 당직체크리스트입니다"
         post_data = {
             'channel_id': channel_id,
-            'message': default_message,
+            'message': _default_file_message(),
             'file_ids': file_ids
         }
+        if pending_post_id:
+            post_data['pending_post_id'] = pending_post_id
         
         driver.posts.create_post(post_data)
-        
-        # 로그아웃
-        driver.logout()
         return True, file_name
         
+    except (NotEnoughPermissions, ResourceNotFound) as e:
+        # [SB] 채널이 삭제되었거나 권한이 없으면 캐시된 채널 ID를 무효화 (다음 실행에서 다시 조회)
+        logger.error("채널 접근 오류: %s", e)
+        invalidate_channel(channel_id)
+        return False, None
     except Exception as e:
-        print(f"[Mattermost] 오류 발생: {str(e)}")
+        logger.error("오류 발생: %s", e)
         return False, None
+    finally:
+        if owned:
+            session.close()
 
-def send_excel_to_self(excel_file):
+def _get_self_dm_channel_id(session):
+    """[SB] 세션 사용자 자신(봇 토큰이면 보고서 수신자)과의 DM 채널 ID 조회/생성 (캐시 우선)"""
+    user_id = session.user_id
+    recipient_id = session.recipient_id or user_id
+    cache_key = dm_channel_key(user_id, recipient_id)
+    channel_id = get_cached_channel_id(cache_key)
+    if channel_id:
+        return channel_id
+    
+    dm_channel = session.driver.channels.create_direct_message_channel([user_id, recipient_id])
+    cache_channel_id(cache_key, dm_channel['id'])
+    return dm_channel['id']
+
+def send_excel_to_self(excel_file, session=None):
     """
     자신에게 엑셀 파일을 보내는 함수
     
     Args:
         excel_file (str or BytesIO): 보낼 엑셀 파일 경로 또는 메모리 객체
+        session (MattermostSession, optional): 공유 세션. 없으면 임시로 로그인/로그아웃합니다.
         
     Returns:
         bool: 성공 여부
     """
-    # 환경 변수 가져오기
-    url, login_id, password, success = _get_mattermost_credentials()
-    if not success:
+    session, owned = _acquire_session(session)
+    if session is None:
         return False
     
     try:
-        # Mattermost 드라이버 생성
-        driver, success = _create_mattermost_driver(url, login_id, password)
-        if not success:
-            return False
+        # 자신과의 DM 채널 생성/조회
+        channel_id = _get_self_dm_channel_id(session)
         
-        # 로그인
-        driver.login()
-        user_id = driver.users.get_user('me')['id']
-        my_username = driver.users.get_user('me')['username']
+        # 공통 함수를 통해 파일 전송 (같은 세션 재사용)
+        success, file_name = _send_excel_to_mattermost(excel_file, channel_id, session=session)
         
-        print(f"[Mattermost] {url}에 연결되었습니다. 사용자: {my_username}")
+        if success:
+            logger.info("파일이 성공적으로 전송되었습니다: %s", file_name)
+            return True
+        return False
         
-        # 자신과의 DM 채널 생성/조회
-        dm_channel = driver.channels.create_direct_message_channel([user_id, user_id])
-        channel_id = dm_channel['id']
+    except Exception as e:
+        logger.error("오류 발생: %s", e)
+        return False
+    finally:
+        if owned:
+            session.close()
+
+def _send_message_to_mattermost(message, channel_id, session=None, pending_post_id=None):
+    """
+    Mattermost의 특정 채널에 파일 없이 메시지만 전송하는 내부 함수
+    
+    Args:
+        message (str): 보낼 메시지 (Markdown)
+        channel_id (str): 메시지를 보낼 채널 ID
+        session (MattermostSession, optional): 공유 세션. 없으면 임시로 로그인/로그아웃합니다.
+        pending_post_id (str, optional): 재전송 시 중복 게시를 막는 멱등성 키
         
-        # 로그아웃
-        driver.logout()
+    Returns:
+        bool: 성공 여부
+    """
+    session, owned = _acquire_session(session)
+    if session is None:
+        return False
+    
+    try:
+        # 파일 업로드 없이 게시물 1건 생성
+        post_data = {
+            'channel_id': channel_id,
+            'message': message,
+        }
+        if pending_post_id:
+            post_data['pending_post_id'] = pending_post_id
+        session.driver.posts.create_post(post_data)
+        return True
         
-        # 공통 함수를 통해 파일 전송
-        success, file_name = _send_excel_to_mattermost(excel_file, channel_id)
+    except (NotEnoughPermissions, ResourceNotFound) as e:
+        # [SB] 채널이 삭제되었거나 권한이 없으면 캐시된 채널 ID를 무효화 (다음 실행에서 다시 조회)
+        logger.error("채널 접근 오류: %s", e)
+        invalidate_channel(channel_id)
+        return False
+    except Exception as e:
+        logger.error("오류 발생: %s", e)
+        return False
+    finally:
+        if owned:
+            session.close()
+
+def send_message_to_self(message, session=None):
+    """
+    자신에게 메시지(Markdown 보고서 등)를 보내는 함수
+    
+    Args:
+        message (str): 보낼 메시지
+        session (MattermostSession, optional): 공유 세션. 없으면 임시로 로그인/로그아웃합니다.
         
-        if success:
-            print(f"[Mattermost] 파일이 성공적으로 전송되었습니다: {file_name}")
+    Returns:
+        bool: 성공 여부
+    """
+    session, owned = _acquire_session(session)
+    if session is None:
+        return False
+    
+    try:
+        # 자신과의 DM 채널 생성/조회
+        channel_id = _get_self_dm_channel_id(session)
+        
+        if _send_message_to_mattermost(message, channel_id, session=session):
+            logger.info("메시지가 성공적으로 전송되었습니다.")
             return True
         return False
         
     except Exception as e:
-        print(f"[Mattermost] 오류 발생: {str(e)}")
+        logger.error("오류 발생: %s", e)
         return False
+    finally:
+        if owned:
+            session.close()
 
-def send_excel_to_team_channel(excel_file, team_key="INNOGS"):
+def _match_team(my_teams, team_name):
+    """[SB] 사용자의 팀 목록에서 팀 찾기 (정확히 일치 > 부분 일치 > 첫 번째 팀) - 동기/비동기 클라이언트 공용"""
+    # 팀 이름 일치 확인 (정확히 일치)
+    for team in my_teams:
+        if team['name'].lower() == team_name.lower() or team['display_name'].lower() == team_name.lower():
+            logger.info("팀을 찾았습니다: %s (ID: %s)", team_name, team['id'])
+            return team
+    
+    # 부분 일치로 다시 시도
+    for team in my_teams:
+        if team_name.lower() in team['name'].lower() or team_name.lower() in team['display_name'].lower():
+            logger.info("팀을 부분 일치로 찾았습니다: %s -> %s (ID: %s)", team_name, team['name'], team['id'])
+            return team
+    
+    # 팀이 여전히 없으면 첫 번째 팀 사용 (사용자가 최소 하나의 팀에 속해 있을 경우)
+    if len(my_teams) > 0:
+        logger.warning("팀을 찾을 수 없어 첫 번째 팀을 사용합니다: %s (ID: %s)", my_teams[0]['name'], my_teams[0]['id'])
+        return my_teams[0]
+    
+    logger.warning("팀을 찾을 수 없습니다: %s", team_name)
+    return None
+
+def _match_channel(channels, channel_name):
+    """[SB] 팀의 채널 목록에서 채널 ID 찾기 (이름/표시명 정확히 일치 > 부분 일치) - 동기/비동기 클라이언트 공용"""
+    # 정확한 이름 또는 표시명으로 채널 찾기
+    for channel in channels:
+        if channel['name'].lower() == channel_name.lower():
+            logger.info("채널을 찾았습니다: %s (ID: %s)", channel_name, channel['id'])
+            return channel['id']
+        if 'display_name' in channel and channel['display_name'].lower() == channel_name.lower():
+            logger.info("채널을 표시명으로 찾았습니다: %s (ID: %s)", channel_name, channel['id'])
+            return channel['id']
+    
+    # 부분 일치로 다시 시도
+    for channel in channels:
+        if channel_name.lower() in channel['name'].lower():
+            logger.info("채널을 부분 일치로 찾았습니다: %s -> %s (ID: %s)", channel_name, channel['name'], channel['id'])
+            return channel['id']
+        if 'display_name' in channel and channel_name.lower() in channel['display_name'].lower():
+            logger.info("채널을 표시명 부분 일치로 찾았습니다: %s -> %s (ID: %s)", channel_name, channel['display_name'], channel['id'])
+            return channel['id']
+    
+    logger.warning("채널을 찾을 수 없습니다: %s", channel_name)
+    return None
+
+def _resolve_team_channel(session, team_name, channel_name):
+    """
+    [SB] 사용자의 팀/채널 목록을 조회하여 채널 ID를 찾는 헬퍼 함수 (정확히 일치 → 부분 일치 순)
+    
+    Returns:
+        tuple: (채널 ID 또는 None, 팀 표시명)
+    """
+    driver = session.driver
+    user_id = session.user_id
+    
+    # 사용자의 팀 목록에서 팀 찾기
+    found_team = _match_team(driver.teams.get_user_teams(user_id), team_name)
+    if not found_team:
+        return None, None
+    
+    # 팀의 채널 목록에서 채널 찾기
+    channel_id = _match_channel(driver.channels.get_channels_for_user(user_id, found_team['id']), channel_name)
+    if not channel_id:
+        return None, None
+    
+    team_display = found_team.get('display_name', found_team['name'])
+    return channel_id, team_display
+
+def _get_team_channel_id(session, team_key, team_name, channel_name):
+    """
+    [SB] 팀 채널 ID 조회 - 캐시된 채널 ID가 있으면 팀/채널 목록 조회 생략
+    
+    Returns:
+        tuple: (채널 ID 또는 None, 팀 표시명)
+    """
+    cache_key = team_channel_key(team_key, channel_name)
+    channel_id = get_cached_channel_id(cache_key)
+    if channel_id:
+        logger.info("캐시된 채널 ID를 사용합니다: %s (ID: %s)", channel_name, channel_id)
+        return channel_id, team_name
+    
+    channel_id, team_display = _resolve_team_channel(session, team_name, channel_name)
+    if channel_id:
+        cache_channel_id(cache_key, channel_id, team=team_display, channel=channel_name)
+    return channel_id, team_display
+
+def _get_user_dm_channel_id(session, username):
+    """[SB] 세션 사용자와 다른 사용자(username) 사이의 DM 채널 ID 조회/생성 (캐시 우선)"""
+    cache_key = dm_channel_key(session.user_id, f"@{username.lower()}")
+    channel_id = get_cached_channel_id(cache_key)
+    if channel_id:
+        return channel_id
+    
+    other_user = session.driver.users.get_user_by_username(username)
+    dm_channel = session.driver.channels.create_direct_message_channel([session.user_id, other_user['id']])
+    cache_channel_id(cache_key, dm_channel['id'], username=username)
+    return dm_channel['id']
+
+def send_excel_to_team_channel(excel_file, team_key="INNOGS", session=None):
     """
     특정 팀의 특정 채널에 엑셀 파일을 보내는 함수
     
     Args:
         excel_file (str or BytesIO): 보낼 엑셀 파일 경로 또는 메모리 객체
         team_key (str): 사용할 팀 키 ("INNOGS" 또는 "SECURITYNET")
+        session (MattermostSession, optional): 공유 세션. 없으면 임시로 로그인/로그아웃합니다.
         
     Returns:
         bool: 성공 여부
     """
-    # 환경 변수 가져오기
-    url, login_id, password, success = _get_mattermost_credentials()
-    if not success:
-        return False
-    
+    _load_env()
     channel_name = os.getenv("MATTERMOST_CHANNEL")
     
     # 팀 이름 결정
@@ -254,103 +597,32 @@ def send_excel_to_team_channel(excel_file, team_key="INNOGS"):
     
     # 환경 변수 확인
     if not all([team_name, channel_name]):
-        print(f"[Mattermost] 환경 변수가 설정되지 않았습니다. .env 파일에서 {team_env_var} 또는 MATTERMOST_CHANNEL을 확인하세요.")
+        logger.warning("환경 변수가 설정되지 않았습니다. .env 파일에서 %s 또는 MATTERMOST_CHANNEL을 확인하세요.", team_env_var)
+        return False
+    
+    session, owned = _acquire_session(session)
+    if session is None:
         return False
     
     try:
-        # Mattermost 드라이버 생성
-        driver, success = _create_mattermost_driver(url, login_id, password)
-        if not success:
-            return False
-        
-        # 로그인
-        driver.login()
-        user_id = driver.users.get_user('me')['id']
-        
-        print(f"[Mattermost] {url}에 연결되었습니다.")
-        
-        # 사용자의 팀 목록 가져오기
-        my_teams = driver.teams.get_user_teams(user_id)
-        
-        # 팀 ID 찾기
-        team_id = None
-        found_team = None
-        
-        # 팀 이름 일치 확인 (정확히 일치)
-        for team in my_teams:
-            if team['name'].lower() == team_name.lower() or team['display_name'].lower() == team_name.lower():
-                team_id = team['id']
-                found_team = team
-                print(f"[Mattermost] 팀을 찾았습니다: {team_name} (ID: {team_id})")
-                break
-        
-        # 부분 일치로 다시 시도
-        if not team_id:
-            for team in my_teams:
-                if team_name.lower() in team['name'].lower() or team_name.lower() in team['display_name'].lower():
-                    team_id = team['id']
-                    found_team = team
-                    print(f"[Mattermost] 팀을 부분 일치로 찾았습니다: {team_name} -> {team['name']} (ID: {team_id})")
-                    break
-        
-        # 팀이 여전히 없으면 첫 번째 팀 사용 (사용자가 최소 하나의 팀에 속해 있을 경우)
-        if not team_id and len(my_teams) > 0:
-            team_id = my_teams[0]['id']
-            found_team = my_teams[0]
-            print(f"[Mattermost] 팀을 찾을 수 없어 첫 번째 팀을 사용합니다: {found_team['name']} (ID: {team_id})")
-        
-        if not team_id:
-            print(f"[Mattermost] 팀을 찾을 수 없습니다: {team_name}")
-            driver.logout()
-            return False
-        
-        # 채널 ID 찾기
-        channels = driver.channels.get_channels_for_user(user_id, team_id)
-        channel_id = None
-        
-        # 정확한 이름 또는 표시명으로 채널 찾기
-        for channel in channels:
-            if channel['name'].lower() == channel_name.lower():
-                channel_id = channel['id']
-                print(f"[Mattermost] 채널을 찾았습니다: {channel_name} (ID: {channel_id})")
-                break
-            if 'display_name' in channel and channel['display_name'].lower() == channel_name.lower():
-                channel_id = channel['id']
-                print(f"[Mattermost] 채널을 표시명으로 찾았습니다: {channel_name} (ID: {channel_id})")
-                break
-        
-        # 부분 일치로 다시 시도
+        channel_id, team_display = _get_team_channel_id(session, team_key, team_name, channel_name)
         if not channel_id:
-            for channel in channels:
-                if channel_name.lower() in channel['name'].lower():
-                    channel_id = channel['id']
-                    print(f"[Mattermost] 채널을 부분 일치로 찾았습니다: {channel_name} -> {channel['name']} (ID: {channel_id})")
-                    break
-                if 'display_name' in channel and channel_name.lower() in channel['display_name'].lower():
-                    channel_id = channel['id']
-                    print(f"[Mattermost] 채널을 표시명 부분 일치로 찾았습니다: {channel_name} -> {channel['display_name']} (ID: {channel_id})")
-                    break
-        
-        if not channel_id:
-            print(f"[Mattermost] 채널을 찾을 수 없습니다: {channel_name}")
-            driver.logout()
             return False
         
-        # 로그아웃
-        driver.logout()
-        
         # 공통 함수를 통해 파일 전송 (주석 처리)
-        # success, file_name = _send_excel_to_mattermost(excel_file, channel_id)
+        # success, file_name = _send_excel_to_mattermost(excel_file, channel_id, session=session)
         
         # 파일 전송 없이 팀과 채널을 찾았음을 성공으로 처리
-        team_display = found_team.get('display_name', found_team['name']) if found_team else team_name
-        print(f"[Mattermost] 팀 '{team_display}'의 채널 '{channel_name}'을 성공적으로 찾았습니다.")
-        print(f"[Mattermost] 실제 파일 전송은 수행되지 않았습니다. (테스트 모드)")
+        logger.info("팀 '%s'의 채널 '%s'을 성공적으로 찾았습니다.", team_display, channel_name)
+        logger.info("실제 파일 전송은 수행되지 않았습니다. (테스트 모드)")
         return True
         
     except Exception as e:
-        print(f"[Mattermost] 오류 발생: {str(e)}")
+        logger.error("오류 발생: %s", e)
         return False
+    finally:
+        if owned:
+            session.close()
 
 def verify_mattermost_env():
     """
@@ -359,12 +631,14 @@ def verify_mattermost_env():
     Returns:
         dict: 환경 변수 상태를 담은 딕셔너리
     """
+    _load_env()
     # [SB] MATTERMOST_USERNAME, MATTERMOST_PASSWORD는 더 이상 필수가 아님 (웹에서 입력받음)
     required_vars = ["MATTERMOST_URL"]
     optional_vars = [
         "MATTERMOST_TEAM_INNOGS", 
         "MATTERMOST_TEAM_SECURITYNET", 
         "MATTERMOST_CHANNEL",
+        "MATTERMOST_TOKEN",
         # "MATTERMOST_USERNAME",  # [SB] 선택사항으로 이동
         # "MATTERMOST_PASSWORD"   # [SB] 선택사항으로 이동
     ]
@@ -393,50 +667,43 @@ def verify_mattermost_env():
     
     return result
 
-def get_mattermost_username():
+def _display_name(user):
+    """[SB] 표시할 이름 결정 (우선순위: 별명 > 실명 > 사용자명)"""
+    display_name = user.get('username', '')
+    first_name = user.get('first_name', '')
+    last_name = user.get('last_name', '')
+    if first_name or last_name:
+        display_name = f"{first_name} {last_name}".strip()
+    if user.get('nickname', ''):
+        display_name = user['nickname']
+    return display_name
+
+def get_mattermost_username(session=None):
     """
     Mattermost에 로그인하여 현재 사용자의 이름을 가져오는 함수
     
+    Args:
+        session (MattermostSession, optional): 공유 세션. 캐시된 'me' 정보를 사용하므로 추가 API 호출이 없습니다.
+    
     Returns:
         tuple: (성공 여부, 사용자 이름, 사용자 ID)
     """
-    # 환경 변수 가져오기
-    url, login_id, password, success = _get_mattermost_credentials()
-    if not success:
+    session, owned = _acquire_session(session)
+    if session is None:
         return False, None, None
     
     try:
-        # Mattermost 드라이버 생성
-        driver, success = _create_mattermost_driver(url, login_id, password)
-        if not success:
-            return False, None, None
-        
-        # 로그인
-        driver.login()
-        
-        # 사용자 정보 가져오기
-        user = driver.users.get_user('me')
+        # [SB] 봇 토큰으로 로그인한 경우에도 보고서 담당자는 수신자(사람)
+        user = session.recipient or session.me
         user_id = user['id']
-        username = user.get('username', '')
+        display_name = _display_name(user)
         
-        # 추가 정보 가져오기 (별명, 실명 등)
-        nickname = user.get('nickname', '')
-        first_name = user.get('first_name', '')
-        last_name = user.get('last_name', '')
-        
-        # 로그아웃
-        driver.logout()
-        
-        # 표시할 이름 결정 (우선순위: 별명 > 실명 > 사용자명)
-        display_name = username
-        if first_name or last_name:
-            display_name = f"{first_name} {last_name}".strip()
-        if nickname:
-            display_name = nickname
-        
-        print(f"[Mattermost] 사용자 이름을 가져왔습니다: {display_name} (ID: {user_id})")
+        logger.info("사용자 이름을 가져왔습니다: %s (ID: %s)", display_name, user_id)
         return True, display_name, user_id
         
     except Exception as e:
-        print(f"[Mattermost] 오류 발생: {str(e)}")
-        return False, None, None 
\ No newline at end of file
+        logger.error("오류 발생: %s", e)
+        return False, None, None
+    finally:
+        if owned:
+            session.close()
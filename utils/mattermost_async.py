@@ -0,0 +1,319 @@
+# [SB] utils/mattermost_async.py - asyncio 이벤트 루프에서 직접 사용하는 Mattermost REST(v4) 클라이언트
+import asyncio
+import logging
+import os
+
+import aiohttp
+from mattermostdriver.exceptions import (
+    ContentTooLarge,
+    FeatureDisabled,
+    InvalidOrMissingParameters,
+    MethodNotAllowed,
+    NoAccessTokenProvided,
+    NotEnoughPermissions,
+    ResourceNotFound,
+)
+
+from utils.breaker import CircuitBreaker
+from utils.channel_cache import team_channel_key, dm_channel_key, get_cached_channel_id, cache_channel_id, invalidate_channel
+from utils.tracing import span
+from utils.workers import run_blocking
+from utils.mattermost import _get_mattermost_credentials, _get_mattermost_token, _parse_mattermost_url, _match_team, _match_channel
+
+logger = logging.getLogger(__name__)
+
+# [SB] 상태 코드별 예외는 mattermostdriver와 같은 클래스를 사용 (동기 코드와 같은 방식으로 처리)
+_STATUS_EXCEPTIONS = {
+    400: InvalidOrMissingParameters,
+    401: NoAccessTokenProvided,
+    403: NotEnoughPermissions,
+    404: ResourceNotFound,
+    405: MethodNotAllowed,
+    413: ContentTooLarge,
+    501: FeatureDisabled,
+}
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+def _is_outage(error):
+    """[SB] Mattermost 장애로 볼 오류 - 연결 실패, 시간 초과, 5xx (4xx 요청/인증 오류는 서버가 응답한 것이므로 제외)"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+class AsyncMattermostClient:
+    """
+    [SB] aiohttp 기반 비동기 Mattermost 클라이언트
+
+    하나의 커넥션 풀(TCPConnector)을 모든 요청이 공유하므로, 여러 전송을 asyncio.gather로
+    동시에 실행해도 연결을 재사용합니다. 동기 MattermostSession과 마찬가지로 로그인 응답의
+    사용자 정보를 'me'로 캐시하고, 인증 방식(토큰 우선)과 보고서 수신자(recipient) 규칙도 같습니다.
+
+    사용 예:
+        async with AsyncMattermostClient() as client:
+            channel_id = await get_self_dm_channel_id(client)
+            await send_message(client, channel_id, "보고서")
+    """
+
+    def __init__(self, url=None, login_id=None, password=None, token=None, recipient_id=None, timeout=60, pool_size=None, deadline=None):
+        self.url = url
+        self.login_id = login_id
+        self.password = password
+        # [SB] 아이디/비밀번호를 직접 받지 않았으면 토큰 우선
+        self.token = token if token or (login_id and password) else _get_mattermost_token()
+        # [SB] 토큰 인증의 보고서 수신자는 로그인 전에 정함 (로그인이 실패해도 아웃박스에 보낸 계정으로 저장되도록)
+        self.recipient_id = recipient_id or (self.token and os.getenv("MATTERMOST_REPORT_USER_ID")) or None
+        self.recipient = None
+        self.timeout = timeout
+        # [SB] 작업 마감 시각(utils/deadline.py) - 있으면 요청마다 min(timeout, 남은 예산)으로 제한
+        self.deadline = deadline
+        self.pool_size = pool_size or int(os.getenv("MATTERMOST_POOL_SIZE", "10"))
+        self.me = None
+        self._http = None
+        self._base_url = None
+        self._auth_token = None
+        self._lock = asyncio.Lock()
+        # [SB] 모든 작업이 공유하는 Mattermost 차단기 - 열려 있으면 요청하지 않고 바로 실패 (전송은 아웃박스로)
+        self._breaker = CircuitBreaker("mattermost")
+
+    @property
+    def user_id(self):
+        return self.me['id'] if self.me else None
+
+    async def login(self):
+        """
+        세션이 아직 로그인되지 않았으면 로그인하고 'me' 사용자 정보를 캐시하는 함수
+
+        Returns:
+            bool: 로그인 성공 여부
+        """
+        async with self._lock:
+            if self.me is not None:
+                return True
+
+            if self.token:
+                self.url = self.url or os.getenv("MATTERMOST_URL")
+                if not self.url:
+                    logger.warning("환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
+                    return False
+            elif not all([self.url, self.login_id, self.password]):
+                url, login_id, password, success = _get_mattermost_credentials()
+                if not success:
+                    return False
+                self.url = self.url or url
+                self.login_id = self.login_id or login_id
+                self.password = self.password or password
+
+            scheme, domain, port = _parse_mattermost_url(self.url)
+            self._base_url = f"{scheme}://{domain}:{port}/api/v4"
+            if self._http is None:
+                # [SB] 동기 드라이버와 같이 인증서 검증은 하지 않음 (verify: False)
+                connector = aiohttp.TCPConnector(limit=self.pool_size, ssl=False)
+                self._http = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+            try:
+                if self.token:
+                    self._auth_token = self.token
+                    me = await self._request('GET', '/users/me', op='get_me')
+                else:
+                    with span("mattermost.login", "mattermost") as attrs:
+                        async with self._breaker.guard_async(_is_outage), \
+                                self._http.post(f"{self._base_url}/users/login",
+                                                json={'login_id': self.login_id, 'password': self.password},
+                                                **self._deadline_timeout()) as response:
+                            attrs["status"] = response.status
+                            await self._raise_for_status(response)
+                            self._auth_token = response.headers.get('Token')
+                            me = await response.json()
+
+                # [SB] 보고서 수신자가 로그인 사용자와 다를 때만(봇 토큰 등) 수신자 정보 추가 조회
+                recipient_id = self.recipient_id or me['id']
+                recipient = me if recipient_id == me['id'] else await self._request('GET', f"/users/{recipient_id}", op='get_user')
+            except Exception as e:
+                logger.warning("로그인 실패: %s", e)
+                self._auth_token = None
+                return False
+
+            self.me = me
+            self.recipient = recipient
+            self.recipient_id = recipient['id']
+            auth_mode = "토큰" if self.token else "비밀번호"
+            logger.info("%s에 연결되었습니다. 사용자: %s (%s 인증, 비동기)", self.url, me.get('username', ''), auth_mode)
+            return True
+
+    async def close(self):
+        """세션 로그아웃 및 커넥션 풀 정리 (여러 번 호출해도 안전)"""
+        async with self._lock:
+            if self._http is None:
+                return
+            try:
+                # [SB] 토큰 인증은 로그아웃하지 않음 (토큰 세션이 만료되어 다음 실행에서 사용할 수 없게 됨)
+                if self.me is not None and not self.token:
+                    await self._request('POST', '/users/logout', op='logout')
+            except Exception as e:
+                logger.warning("로그아웃 실패: %s", e)
+            finally:
+                await self._http.close()
+                self._http = None
+                self.me = None
+                self.recipient = None
+                self._auth_token = None
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+    @staticmethod
+    async def _raise_for_status(response):
+        if response.status < 400:
+            return
+        try:
+            message = (await response.json()).get('message', response.reason)
+        except (aiohttp.ContentTypeError, ValueError):
+            message = await response.text()
+        exception = _STATUS_EXCEPTIONS.get(response.status)
+        if exception:
+            raise exception(message)
+        raise aiohttp.ClientResponseError(response.request_info, response.history,
+                                          status=response.status, message=message)
+
+    def _deadline_timeout(self):
+        """[SB] 작업 마감 시각이 있으면 요청 제한 시간 인자 (aiohttp는 total=0을 제한 없음으로 해석하므로 최소 1초)"""
+        if self.deadline is None:
+            return {}
+        return {'timeout': aiohttp.ClientTimeout(total=self.deadline.timeout(self.timeout, minimum=1))}
+
+    async def _request(self, method, path, op=None, **kwargs):
+        # [SB] op: 실행 추적 구간 이름 (경로에는 ID가 들어가므로 API 이름으로 집계)
+        headers = kwargs.pop('headers', {})
+        if 'timeout' not in kwargs:
+            kwargs.update(self._deadline_timeout())
+        if self._auth_token:
+            headers['Authorization'] = f"Bearer {self._auth_token}"
+        # [SB] 차단기 상태 DB 접근은 작업 스레드에서 (잠긴 DB가 동시에 진행 중인 다른 전송을 막지 않도록)
+        with span(f"mattermost.{op or method.lower()}", "mattermost") as attrs:
+            async with self._breaker.guard_async(_is_outage), \
+                    self._http.request(method, f"{self._base_url}{path}", headers=headers, **kwargs) as response:
+                attrs["status"] = response.status
+                await self._raise_for_status(response)
+                if response.content_type == 'application/json':
+                    return await response.json()
+                return await response.text()
+
+    # [SB] 사용 중인 API만 구현 (mattermostdriver의 같은 이름 엔드포인트와 대응)
+    async def get_user_by_username(self, username):
+        return await self._request('GET', f"/users/username/{username}", op='get_user_by_username')
+
+    async def get_user_teams(self, user_id):
+        return await self._request('GET', f"/users/{user_id}/teams", op='get_user_teams')
+
+    async def get_channels_for_user(self, user_id, team_id):
+        return await self._request('GET', f"/users/{user_id}/teams/{team_id}/channels", op='get_channels_for_user')
+
+    async def create_direct_message_channel(self, user_ids):
+        return await self._request('POST', '/channels/direct', op='create_direct_message_channel', json=user_ids)
+
+    async def upload_file(self, channel_id, file_name, data, content_type=XLSX_CONTENT_TYPE):
+        # [SB] multipart 대신 파일 내용을 본문으로 스트리밍 (data가 파일 객체면 청크 단위로 읽어 전송)
+        return await self._request('POST', '/files', op='upload_file', params={'channel_id': channel_id, 'filename': file_name},
+                                   data=data, headers={'Content-Type': content_type})
+
+    async def create_post(self, post_data):
+        return await self._request('POST', '/posts', op='create_post', json=post_data)
+
+async def get_self_dm_channel_id(client):
+    """[SB] 클라이언트 사용자 자신(봇 토큰이면 보고서 수신자)과의 DM 채널 ID 조회/생성 (캐시 우선)"""
+    user_id = client.user_id
+    recipient_id = client.recipient_id or user_id
+    cache_key = dm_channel_key(user_id, recipient_id)
+    channel_id = await run_blocking(get_cached_channel_id, cache_key)
+    if channel_id:
+        return channel_id
+
+    dm_channel = await client.create_direct_message_channel([user_id, recipient_id])
+    await run_blocking(cache_channel_id, cache_key, dm_channel['id'])
+    return dm_channel['id']
+
+async def get_team_channel_id(client, team_key, team_name, channel_name):
+    """
+    [SB] 팀 채널 ID 조회 - 캐시된 채널 ID가 있으면 팀/채널 목록 조회 생략
+
+    Returns:
+        tuple: (채널 ID 또는 None, 팀 표시명)
+    """
+    cache_key = team_channel_key(team_key, channel_name)
+    channel_id = await run_blocking(get_cached_channel_id, cache_key)
+    if channel_id:
+        logger.info("캐시된 채널 ID를 사용합니다: %s (ID: %s)", channel_name, channel_id)
+        return channel_id, team_name
+
+    found_team = _match_team(await client.get_user_teams(client.user_id), team_name)
+    if not found_team:
+        return None, None
+    channel_id = _match_channel(await client.get_channels_for_user(client.user_id, found_team['id']), channel_name)
+    if not channel_id:
+        return None, None
+
+    team_display = found_team.get('display_name', found_team['name'])
+    await run_blocking(cache_channel_id, cache_key, channel_id, team=team_display, channel=channel_name)
+    return channel_id, team_display
+
+async def get_user_dm_channel_id(client, username):
+    """[SB] 클라이언트 사용자와 다른 사용자(username) 사이의 DM 채널 ID 조회/생성 (캐시 우선)"""
+    cache_key = dm_channel_key(client.user_id, f"@{username.lower()}")
+    channel_id = await run_blocking(get_cached_channel_id, cache_key)
+    if channel_id:
+        return channel_id
+
+    other_user = await client.get_user_by_username(username)
+    dm_channel = await client.create_direct_message_channel([client.user_id, other_user['id']])
+    await run_blocking(cache_channel_id, cache_key, dm_channel['id'], username=username)
+    return dm_channel['id']
+
+async def send_message(client, channel_id, message, file_ids=None, pending_post_id=None):
+    """
+    [SB] 채널에 게시물 생성 (첨부 파일 ID 선택)
+
+    Returns:
+        bool: 성공 여부
+    """
+    post_data = {'channel_id': channel_id, 'message': message}
+    if file_ids:
+        post_data['file_ids'] = file_ids
+    if pending_post_id:
+        post_data['pending_post_id'] = pending_post_id
+    try:
+        await client.create_post(post_data)
+        return True
+    except (NotEnoughPermissions, ResourceNotFound) as e:
+        # [SB] 채널이 삭제되었거나 권한이 없으면 캐시된 채널 ID를 무효화 (다음 실행에서 다시 조회)
+        logger.error("채널 접근 오류: %s", e)
+        await run_blocking(invalidate_channel, channel_id)
+        return False
+    except Exception as e:
+        logger.error("오류 발생: %s", e)
+        return False
+
+async def send_file(client, channel_id, file_bytes, file_name, message, pending_post_id=None):
+    """
+    [SB] 파일을 업로드하고 메시지와 함께 게시
+
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        file_upload = await client.upload_file(channel_id, file_name, file_bytes)
+    except (NotEnoughPermissions, ResourceNotFound) as e:
+        logger.error("채널 접근 오류: %s", e)
+        await run_blocking(invalidate_channel, channel_id)
+        return False
+    except Exception as e:
+        logger.error("오류 발생: %s", e)
+        return False
+
+    file_ids = [file_info['id'] for file_info in file_upload['file_infos']]
+    return await send_message(client, channel_id, message, file_ids=file_ids, pending_post_id=pending_post_id)
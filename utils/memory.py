@@ -0,0 +1,85 @@
+# [SB] utils/memory.py - 단계별 메모리(RSS) 측정 - 컨테이너 메모리 한도(2G) 대비 사용량 확인용
+import logging
+import os
+import resource
+import sys
+
+logger = logging.getLogger(__name__)
+
+_STATUS_PATH = "/proc/self/status"
+_CLEAR_REFS_PATH = "/proc/self/clear_refs"
+
+def _read_status_kib(field):
+    try:
+        with open(_STATUS_PATH, encoding="ascii") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def rss_mib():
+    """[SB] 현재 RSS(MiB) - /proc가 없으면 None"""
+    kib = _read_status_kib("VmRSS")
+    return kib / 1024 if kib is not None else None
+
+def peak_rss_mib():
+    """[SB] 최대 RSS(MiB) - reset_peak_rss() 이후의 최대값 (지원되지 않으면 프로세스 전체 최대값)"""
+    kib = _read_status_kib("VmHWM")
+    if kib is None:
+        # [SB] macOS는 바이트, Linux는 KiB 단위
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+    return kib / 1024
+
+def reset_peak_rss():
+    """
+    [SB] 최대 RSS 기준점 초기화 (Linux 4.0+ /proc/self/clear_refs에 "5" 기록)
+
+    Returns:
+        bool: 초기화 성공 여부 (실패하면 이후 최대값은 프로세스 전체 기준)
+    """
+    try:
+        with open(_CLEAR_REFS_PATH, "w", encoding="ascii") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+class StageMemory:
+    """
+    [SB] 파이프라인 단계별 최대 RSS를 기록하는 도우미
+
+    사용 예:
+        memory = StageMemory()
+        ... 크롤링 ...
+        memory.mark("크롤링")     # 직전 mark 이후 이 단계의 최대 RSS 출력 후 기준점 초기화
+        memory.summary()
+    """
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = os.getenv("REPORT_MEMORY_LOG", "true").strip().lower() in ("1", "true", "yes", "on")
+        self.enabled = enabled
+        self.stages = []
+        self._resettable = enabled and reset_peak_rss()
+
+    def mark(self, stage):
+        """[SB] 단계 종료 시점의 RSS와 단계 중 최대 RSS 기록"""
+        if not self.enabled:
+            return
+        current, peak = rss_mib(), peak_rss_mib()
+        self.stages.append((stage, current, peak))
+        current_text = f"{current:.0f} MiB" if current is not None else "알 수 없음"
+        scope = "단계 최대" if self._resettable else "프로세스 최대"
+        logger.info("메모리 - %s: RSS %s, %s %.0f MiB", stage, current_text, scope, peak)
+        if self._resettable:
+            reset_peak_rss()
+
+    def summary(self):
+        """[SB] 가장 메모리를 많이 쓴 단계 출력"""
+        if not self.enabled or not self.stages:
+            return
+        stage, _, peak = max(self.stages, key=lambda item: item[2])
+        logger.info("메모리 - 최대 사용 단계: %s (%.0f MiB)", stage, peak)
@@ -0,0 +1,169 @@
+# [SB] utils/metrics.py - /metrics 엔드포인트용 Prometheus 텍스트 형식 출력
+import math
+import threading
+
+from utils import tracing
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# [SB] 실행 추적(utils/tracing.py) 누적 카운터 이름 → (메트릭 이름, 설명)
+_COUNTER_FAMILIES = {
+    "cache": ("dashboard_cache_requests_total", "캐시 조회 수 (cache: report/channel/forecast, result: hit/miss)"),
+    "llm_answers": ("dashboard_llm_answers_total", "LLM 응답 수 (result: match=규칙과 일치, mismatch=불일치 항목 대체, error=호출 실패, skipped=예산 부족으로 생략, circuit_open=Ollama 차단기 열림)"),
+    "llm_mismatched_fields": ("dashboard_llm_mismatched_fields_total", "규칙(예상 결과)과 다른 LLM 응답 항목 수"),
+    "deadline_skips": ("dashboard_check_deadline_skips_total", "작업 예산(JOB_DEADLINE_SECONDS) 부족으로 건너뛴 단계 수 (stage)"),
+}
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+def _header(lines, name, help_text, metric_type):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {metric_type}")
+
+class Counter:
+    """
+    [SB] 웹 서버 프로세스 안에서 증가하는 레이블별 카운터 (스레드 안전)
+
+    사용 예:
+        JOBS_STARTED = Counter("dashboard_check_jobs_started_total", "시작한 점검 수", ("trigger",))
+        JOBS_STARTED.inc(trigger="login")
+    """
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def render(self, lines):
+        _header(lines, self.name, self.help_text, "counter")
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_labels(dict(zip(self.labelnames, key)))} {_number(value)}")
+
+def render_gauges(lines, gauges):
+    """
+    [SB] 요청 시점에 계산한 게이지 출력
+
+    Args:
+        gauges (list): [(메트릭 이름, 설명, [(레이블 dict, 값), ...]), ...]
+    """
+    for name, help_text, samples in gauges:
+        _header(lines, name, help_text, "gauge")
+        for labels, value in samples:
+            lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+def _histogram_family(span_name, histogram):
+    """[SB] 구간 이름 → (메트릭 이름, 레이블) - 단계, LLM, Mattermost API는 별도 메트릭으로 분리"""
+    category = histogram["category"]
+    if category == tracing.CATEGORY_STAGE:
+        return "dashboard_check_stage_duration_seconds", {"stage": span_name}
+    if span_name == "llm.analyze":
+        return "dashboard_llm_request_duration_seconds", {}
+    if category == "mattermost":
+        return "dashboard_mattermost_request_duration_seconds", {"op": span_name.split(".", 1)[-1]}
+    return "dashboard_check_span_duration_seconds", {"span": span_name, "category": category}
+
+_HISTOGRAM_HELP = {
+    "dashboard_check_stage_duration_seconds": "점검 단계별 소요 시간(초)",
+    "dashboard_llm_request_duration_seconds": "LLM(Ollama) 분석 소요 시간(초)",
+    "dashboard_mattermost_request_duration_seconds": "Mattermost API 호출 소요 시간(초)",
+    "dashboard_check_span_duration_seconds": "점검 세부 구간(브라우저, 링크 체크, Excel 생성, 전송 대상 등) 소요 시간(초)",
+}
+
+def _render_run_metrics():
+    """[SB] 점검 프로세스(main.py)들이 누적한 히스토그램/카운터 출력"""
+    lines = []
+    families = {}
+    for span_name, histogram in tracing.load_histograms().items():
+        name, labels = _histogram_family(span_name, histogram)
+        families.setdefault(name, []).append((labels, histogram))
+    for name in _HISTOGRAM_HELP:
+        if name not in families:
+            continue
+        _header(lines, name, _HISTOGRAM_HELP[name], "histogram")
+        for labels, histogram in sorted(families[name], key=lambda item: sorted(item[0].items())):
+            for le, cumulative in histogram["buckets"]:
+                lines.append(f"{name}_bucket{_labels(dict(labels, le=_number(float(le))))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(histogram['sum'])}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram['count']}")
+
+    counters = {}
+    for counter_name, labels, value in tracing.load_counters():
+        counters.setdefault(counter_name, []).append((labels, value))
+    errors = counters.pop("span_errors", [])
+    mattermost_errors = [({"op": labels["span"].split(".", 1)[-1]}, value) for labels, value in errors if labels.get("category") == "mattermost"]
+    other_errors = [(labels, value) for labels, value in errors if labels.get("category") != "mattermost"]
+    for name, help_text, samples in (
+        ("dashboard_mattermost_request_errors_total", "실패한 Mattermost API 호출 수", mattermost_errors),
+        ("dashboard_check_span_errors_total", "실패한 점검 구간 수 (Mattermost API 제외)", other_errors),
+    ):
+        if samples:
+            _header(lines, name, help_text, "counter")
+            lines.extend(f"{name}{_labels(labels)} {_number(value)}" for labels, value in samples)
+    for counter_name, (name, help_text) in _COUNTER_FAMILIES.items():
+        if counter_name in counters:
+            _header(lines, name, help_text, "counter")
+            lines.extend(f"{name}{_labels(labels)} {_number(value)}" for labels, value in counters[counter_name])
+    return lines
+
+# [SB] 누적 DB가 바뀌지 않았으면 이전에 만든 텍스트를 그대로 사용 (스크레이프마다 파일 상태 확인 2회만)
+_run_metrics_cache = {"key": None, "lines": []}
+_run_metrics_lock = threading.Lock()
+
+def _db_state():
+    state = []
+    for path in (tracing.HISTOGRAM_PATH, tracing.HISTOGRAM_PATH.with_name(tracing.HISTOGRAM_PATH.name + "-wal")):
+        try:
+            stat = path.stat()
+            state.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            state.append(None)
+    return tuple(state)
+
+def run_metrics_lines():
+    """[SB] 점검 실행 누적 메트릭 (DB 변경 시에만 다시 읽음)"""
+    key = _db_state()
+    with _run_metrics_lock:
+        if key != _run_metrics_cache["key"]:
+            _run_metrics_cache["lines"] = _render_run_metrics() if key[0] is not None else []
+            _run_metrics_cache["key"] = key
+        return _run_metrics_cache["lines"]
+
+def render_metrics(counters=(), gauges=()):
+    """
+    [SB] /metrics 응답 본문 생성
+
+    Args:
+        counters (iterable): 웹 서버 프로세스의 Counter 목록
+        gauges (list): render_gauges 형식의 게이지 목록
+
+    Returns:
+        str: Prometheus 텍스트 형식 (마지막 줄바꿈 포함)
+    """
+    lines = []
+    for counter in counters:
+        counter.render(lines)
+    render_gauges(lines, gauges)
+    lines.extend(run_metrics_lines())
+    return "\n".join(lines) + "\n"
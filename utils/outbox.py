@@ -0,0 +1,234 @@
+# [SB] utils/outbox.py - 전송에 실패한 보고서를 디스크(SQLite)에 보관하고 재시도 일정을 관리하는 아웃박스
+import json
+import os
+import random
+import sqlite3
+import time
+from pathlib import Path
+
+# [SB] Mattermost 일시 장애로 전송이 실패해도 크롤링/LLM 분석을 다시 하지 않도록
+#      완성된 보고서(파일 바이트, 메시지)와 전송 대상을 그대로 저장해 두고 나중에 재전송
+OUTBOX_PATH = Path("logs") / "outbox.sqlite3"
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idem_key TEXT NOT NULL UNIQUE,
+    sender TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    file_name TEXT,
+    file_bytes BLOB,
+    message TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    locked_until REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, sender, next_attempt_at);
+"""
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+def outbox_enabled():
+    """[SB] 아웃박스 사용 여부 (OUTBOX_ENABLED, 기본 true)"""
+    return os.getenv("OUTBOX_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+def _connect():
+    OUTBOX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # [SB] main.py와 app.py 재전송 스레드가 동시에 접근하므로 WAL 모드 + 잠금 대기 시간 설정
+    conn = sqlite3.connect(str(OUTBOX_PATH), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+def backoff_delay(attempts):
+    """
+    [SB] 재시도 대기 시간(초) 계산 - 지수 백오프 + 지터
+
+    OUTBOX_BASE_DELAY(기본 30초)에서 시작해 시도마다 두 배로 늘리고 OUTBOX_MAX_DELAY(기본 1800초)에서 멈춥니다.
+    여러 항목이 같은 순간에 몰리지 않도록 계산된 값의 50~100% 사이에서 무작위로 고릅니다.
+
+    Args:
+        attempts (int): 지금까지 실패한 횟수 (1 이상)
+
+    Returns:
+        float: 다음 시도까지 대기할 시간(초)
+    """
+    base = _env_float("OUTBOX_BASE_DELAY", 30)
+    cap = _env_float("OUTBOX_MAX_DELAY", 1800)
+    delay = min(cap, base * (2 ** max(0, attempts - 1)))
+    return random.uniform(delay / 2, delay)
+
+def _max_attempts():
+    return int(_env_float("OUTBOX_MAX_ATTEMPTS", 8))
+
+def enqueue(sender, destination, idem_key, file_bytes=None, file_name=None, message=None, error=None):
+    """
+    [SB] 첫 전송에 실패한 보고서를 아웃박스에 저장하는 함수
+
+    Args:
+        sender (str): 보낸 Mattermost 계정 (재전송 시 같은 계정의 세션으로만 전송)
+        destination (dict): build_destinations()의 전송 대상
+        idem_key (str): 멱등성 키 (Mattermost pending_post_id로도 사용)
+        file_bytes (bytes, optional): 첨부할 Excel 파일 내용
+        file_name (str, optional): 첨부 파일 이름
+        message (str, optional): 게시할 메시지
+        error (str, optional): 첫 전송 실패 사유
+
+    Returns:
+        bool: 새로 저장되었으면 True (같은 키가 이미 있으면 False)
+    """
+    now = time.time()
+    conn = _connect()
+    try:
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO outbox (idem_key, sender, destination, file_name, file_bytes, message, "
+            "attempts, next_attempt_at, last_error, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?, ?, ?)",
+            (idem_key, sender.lower(), json.dumps(destination, ensure_ascii=False), file_name, file_bytes, message,
+             now + backoff_delay(1), error, now, now),
+        )
+        return cursor.rowcount == 1
+    finally:
+        conn.close()
+
+def claim_due(sender, limit=20, lease=300):
+    """
+    [SB] 재시도 시각이 된 항목을 가져오면서 lease초 동안 잠그는 함수
+
+    main.py와 app.py 재전송 스레드가 같은 항목을 동시에 보내지 않도록
+    BEGIN IMMEDIATE 트랜잭션 안에서 조회와 잠금을 함께 처리합니다.
+
+    Returns:
+        list: 항목 dict 리스트 (destination은 dict로 변환됨)
+    """
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            "SELECT * FROM outbox WHERE status = ? AND sender = ? AND next_attempt_at <= ? AND locked_until < ? "
+            "ORDER BY id LIMIT ?",
+            (STATUS_PENDING, sender.lower(), now, now, limit),
+        ).fetchall()
+        conn.executemany("UPDATE outbox SET locked_until = ? WHERE id = ?", [(now + lease, row["id"]) for row in rows])
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    entries = []
+    for row in rows:
+        entry = dict(row)
+        entry["destination"] = json.loads(entry["destination"])
+        entries.append(entry)
+    return entries
+
+def mark_sent(entry_id):
+    """[SB] 전송 완료 처리 (보관 공간을 줄이도록 파일 바이트는 바로 삭제)"""
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute(
+            "UPDATE outbox SET status = ?, file_bytes = NULL, locked_until = 0, last_error = NULL, updated_at = ? WHERE id = ?",
+            (STATUS_SENT, now, entry_id),
+        )
+    finally:
+        conn.close()
+
+def mark_failed(entry_id, attempts, error, file_sent=False, message_sent=False):
+    """
+    [SB] 재전송 실패 처리 - 다음 시도 일정을 잡거나 최대 횟수를 넘으면 dead로 전환
+
+    Args:
+        entry_id (int): 항목 ID
+        attempts (int): 이번 시도까지 포함한 실패 횟수
+        error (str): 실패 사유
+        file_sent (bool): 파일은 전송되었는지 (다음 시도에서 다시 보내지 않음)
+        message_sent (bool): 메시지는 전송되었는지 (다음 시도에서 다시 보내지 않음)
+
+    Returns:
+        str: 변경된 상태 (pending 또는 dead)
+    """
+    now = time.time()
+    status = STATUS_DEAD if attempts >= _max_attempts() else STATUS_PENDING
+    sets = ["status = ?", "attempts = ?", "next_attempt_at = ?", "locked_until = 0", "last_error = ?", "updated_at = ?"]
+    params = [status, attempts, now + backoff_delay(attempts), error, now]
+    if file_sent:
+        sets.extend(["file_bytes = NULL", "file_name = NULL"])
+    if message_sent:
+        sets.append("message = NULL")
+    conn = _connect()
+    try:
+        conn.execute(f"UPDATE outbox SET {', '.join(sets)} WHERE id = ?", (*params, entry_id))
+    finally:
+        conn.close()
+    return status
+
+def abandon_sender(sender, error):
+    """
+    [SB] 계정의 재전송 대기 항목을 모두 포기(dead) 처리 - 재전송할 자격 증명이 없을 때 사용
+
+    Returns:
+        int: dead로 바뀐 항목 수 (다른 프로세스가 전송 중인 항목은 제외)
+    """
+    now = time.time()
+    conn = _connect()
+    try:
+        cursor = conn.execute(
+            "UPDATE outbox SET status = ?, locked_until = 0, last_error = ?, updated_at = ? "
+            "WHERE status = ? AND sender = ? AND locked_until < ?",
+            (STATUS_DEAD, error, now, STATUS_PENDING, sender.lower(), now),
+        )
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+def pending_senders():
+    """[SB] 재전송 대기 항목이 있는 계정 목록"""
+    if not OUTBOX_PATH.exists():
+        return []
+    conn = _connect()
+    try:
+        rows = conn.execute("SELECT DISTINCT sender FROM outbox WHERE status = ?", (STATUS_PENDING,)).fetchall()
+        return [row["sender"] for row in rows]
+    finally:
+        conn.close()
+
+def outbox_stats():
+    """[SB] 상태별 항목 수 (예: {"pending": 1, "sent": 3})"""
+    if not OUTBOX_PATH.exists():
+        return {}
+    conn = _connect()
+    try:
+        rows = conn.execute("SELECT status, COUNT(*) AS count FROM outbox GROUP BY status").fetchall()
+        return {row["status"]: row["count"] for row in rows}
+    finally:
+        conn.close()
+
+def purge_outbox(max_age_days=7):
+    """[SB] 전송 완료/포기(dead) 후 max_age_days가 지난 항목 삭제"""
+    if not OUTBOX_PATH.exists():
+        return 0
+    cutoff = time.time() - max_age_days * 24 * 3600
+    conn = _connect()
+    try:
+        cursor = conn.execute(
+            "DELETE FROM outbox WHERE status IN (?, ?) AND updated_at < ?", (STATUS_SENT, STATUS_DEAD, cutoff)
+        )
+        return cursor.rowcount
+    finally:
+        conn.close()
@@ -0,0 +1,111 @@
+# [SB] utils/report_cache.py - 생성된 Excel 보고서 캐시 (내용 해시 기반)
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from utils.spool import spool_threshold
+
+# [SB] 로그인마다 main.py가 별도 프로세스로 실행되므로 메모리 캐시 + 디스크 캐시를 함께 사용
+REPORT_CACHE_DIR = Path("logs") / "report_cache"
+_memory_cache = {}
+_cache_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+def report_cache_enabled():
+    """[SB] REPORT_CACHE 환경 변수로 보고서 캐시 사용 여부 결정 (기본값: 사용)"""
+    return os.getenv("REPORT_CACHE", "true").strip().lower() in ("1", "true", "yes", "on")
+
+def screenshot_digest(dashboard_screenshot):
+    """[SB] 스크린샷 바이트의 해시 (BytesIO 버퍼를 복사하지 않고 계산, 읽기 위치 유지)"""
+    with dashboard_screenshot.getbuffer() as view:
+        return hashlib.blake2b(view, digest_size=16).hexdigest()
+
+def make_report_key(checklist, username, date_str, dashboard_screenshot=None, notes=None, images=None):
+    """
+    [SB] 보고서 내용을 결정하는 입력값으로 캐시 키를 생성하는 함수
+
+    스크린샷도 보고서 내용이므로 키에 넣습니다. 대시보드 스크린샷은 바이트 해시, 페이지 스크린샷 파일은
+    (경로, 수정 시각, 크기)를 사용하므로 새로 캡처한 스크린샷이 있으면 이전 보고서를 재사용하지 않습니다.
+
+    Args:
+        checklist (list): evaluate_checklist 결과
+        username (str): 담당자 이름
+        date_str (str): 보고서 날짜 (yyyymmdd)
+        dashboard_screenshot (BytesIO, optional): 대시보드 스크린샷
+        notes (list, optional): 표 아래에 표시하는 메모 (예치금 소진 예측 등)
+        images (list, optional): 보고서에 들어가는 페이지 스크린샷 파일의 (경로, 수정 시각, 크기) 목록
+
+    Returns:
+        str: SHA-256 hex 키 (날짜 접두어 포함)
+    """
+    content = {
+        "checklist": [
+            {"체크사항": row["체크사항"], "결과": row["결과"], "정상": row["정상"]}
+            for row in checklist
+        ],
+        "username": username or "",
+        "date": date_str,
+        "screenshot": screenshot_digest(dashboard_screenshot) if dashboard_screenshot is not None else None,
+        "images": [list(stamp) if stamp else None for stamp in images or []],
+    }
+    # [SB] 메모가 없는 보고서는 이전과 같은 키를 유지
+    if notes:
+        content["notes"] = list(notes)
+    payload = json.dumps(content, ensure_ascii=False, sort_keys=True)
+    return f"{date_str}_{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+def open_cached_report(key):
+    """
+    [SB] 캐시된 보고서를 읽기 스트림으로 반환 (없으면 None)
+
+    작은 보고서는 메모리 캐시에서, 큰 보고서는 디스크 캐시 파일에서 바로 읽으므로
+    캐시 적중 시에도 보고서 전체를 메모리에 올리지 않습니다.
+    """
+    with _cache_lock:
+        if key in _memory_cache:
+            return io.BytesIO(_memory_cache[key])
+
+    cache_path = REPORT_CACHE_DIR / f"{key}.xlsx"
+    try:
+        return open(cache_path, "rb")
+    except OSError:
+        return None
+
+def store_report(key, report):
+    """
+    [SB] 생성된 보고서를 캐시에 저장하고 이전 날짜 항목을 정리
+
+    Args:
+        key (str): make_report_key 결과
+        report (bytes or SpooledReport): 보고서 내용. 파일 객체는 디스크에 청크 단위로 복사하고,
+                                         REPORT_SPOOL_THRESHOLD 이하일 때만 메모리 캐시에 보관합니다.
+    """
+    small = len(report) <= spool_threshold() if isinstance(report, bytes) else not report.rolled_over
+    with _cache_lock:
+        _memory_cache.clear()
+        if small:
+            _memory_cache[key] = report if isinstance(report, bytes) else report.getvalue()
+
+    try:
+        REPORT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        date_prefix = key.split('_', 1)[0]
+        for old_path in REPORT_CACHE_DIR.glob("*.xlsx"):
+            if not old_path.name.startswith(f"{date_prefix}_"):
+                old_path.unlink(missing_ok=True)
+
+        # [SB] 동시에 실행 중인 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 임시 파일 후 교체
+        cache_path = REPORT_CACHE_DIR / f"{key}.xlsx"
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        if isinstance(report, bytes):
+            tmp_path.write_bytes(report)
+        else:
+            with report.open_reader() as reader, open(tmp_path, "wb") as tmp_file:
+                shutil.copyfileobj(reader, tmp_file, 1024 * 1024)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("보고서 캐시 저장 실패 (메모리 캐시만 사용): %s", e)
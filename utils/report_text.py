@@ -0,0 +1,96 @@
+# [SB] utils/report_text.py - 체크리스트 판정 결과를 Mattermost 메시지(Markdown 표)로 변환
+from datetime import datetime
+
+def _cell(text):
+    """[SB] 표 셀에 들어갈 수 있도록 줄바꿈/파이프 문자 정리"""
+    return " / ".join(line.strip() for line in str(text).split('\n') if line.strip()).replace('|', '\\|')
+
+def render_checklist_markdown(checklist, username=None, date=None, forecast_lines=None):
+    """
+    [SB] 체크리스트 판정 결과를 Mattermost Markdown 메시지로 렌더링하는 함수
+
+    Args:
+        checklist (list): evaluate_checklist 결과
+        username (str, optional): 담당자 이름
+        date (datetime, optional): 보고서 날짜. 기본값은 현재 시각
+        forecast_lines (list, optional): 표 아래에 붙일 예치금 소진 예측 문장
+
+    Returns:
+        str: Mattermost에 그대로 게시할 수 있는 Markdown 문자열
+    """
+    date = date or datetime.now()
+    problems = [row for row in checklist if not row["정상"]]
+
+    lines = [f"#### {date.strftime('%Y년 %m월 %d일')} 당직체크리스트"]
+    if username:
+        lines.append(f"담당자: {username}")
+    if problems:
+        lines.append(f"**확인 필요 {len(problems)}건** / 전체 {len(checklist)}건")
+    else:
+        lines.append(f"전체 {len(checklist)}건 모두 정상")
+    lines.append("")
+    lines.append("| 메뉴 | 체크사항 | 결과 | 판정 |")
+    lines.append("|:---|:---|:---|:---:|")
+    for row in checklist:
+        # [SB] 체크사항은 첫 줄만 사용해 모바일에서도 한 화면에 보이도록 축약
+        check_summary = row["체크사항"].split('\n', 1)[0]
+        verdict = ":white_check_mark:" if row["정상"] else ":x:"
+        lines.append(f"| {_cell(row['메뉴'])} | {_cell(check_summary)} | {_cell(row['결과'])} | {verdict} |")
+    if forecast_lines:
+        lines.append("")
+        lines.append("**예치금 소진 예측**")
+        lines.extend(f"- {line}" for line in forecast_lines)
+    return "\n".join(lines)
+
+def _change_value(value):
+    if value is None:
+        return "(없음)"
+    return _cell(value) or "(빈 값)"
+
+def render_changes_markdown(previous, changes):
+    """
+    [SB] 이전 점검 대비 변경 사항을 Mattermost Markdown으로 렌더링하는 함수
+
+    Args:
+        previous (dict): 이전 스냅샷 요약 (utils/history.py latest_snapshot 결과, checked_at은 epoch 초)
+        changes (list): diff_snapshots 결과
+
+    Returns:
+        str: Markdown 문자열 (이전 점검이 없으면 None)
+    """
+    if previous is None:
+        return None
+    since = datetime.fromtimestamp(previous["checked_at"]).strftime('%m/%d %H:%M')
+    shown = [change for change in changes if change["kind"] in ("verdict", "link")]
+    if not shown:
+        return f"이전 점검({since}) 대비 판정 변경 없음"
+
+    lines = [f"**이전 점검({since}) 대비 변경 {len(shown)}건**"]
+    for change in shown:
+        if change["kind"] == "verdict":
+            # [SB] 행 키는 "03 스케줄러" 형태 - 행 번호를 빼고 메뉴 이름만 표시
+            label = change["key"].split(' ', 1)[-1]
+            marks = {True: ":white_check_mark:", False: ":x:", None: ""}
+            lines.append(f"- {label}: {_change_value(change['before'])} {marks[change['ok_before']]} → "
+                         f"{_change_value(change['after'])} {marks[change['ok_after']]}")
+        else:
+            lines.append(f"- 링크 {change['key']}: {_change_value(change['before'])} → {_change_value(change['after'])}")
+    return "\n".join(lines)
+
+def render_no_change_message(checklist, last_full, date=None):
+    """
+    [SB] 판정이 바뀌지 않았을 때 전체 보고서 대신 게시할 한 줄 메시지
+
+    Args:
+        checklist (list): evaluate_checklist 결과
+        last_full (dict): 마지막 전체 보고서 스냅샷 요약 (checked_at은 epoch 초)
+        date (datetime, optional): 점검 시각. 기본값은 현재 시각
+
+    Returns:
+        str: Mattermost 메시지
+    """
+    date = date or datetime.now()
+    since = datetime.fromtimestamp(last_full["checked_at"]).strftime('%m/%d %H:%M')
+    problems = sum(1 for row in checklist if not row["정상"])
+    status = f"확인 필요 {problems}건" if problems else "모두 정상"
+    return f"{date.strftime('%m/%d %H:%M')} 당직 점검: {since} 보고 이후 변경 없음 ({status} / 전체 {len(checklist)}건)"
@@ -0,0 +1,145 @@
+# [SB] utils/scheduler.py - 정기 점검 시각을 정하는 cron 표현식(분 시 일 월 요일) 해석
+import logging
+import os
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# [SB] 필드별 (이름, 최소값, 최대값) - 요일은 0과 7 모두 일요일
+_FIELDS = (
+    ("분", 0, 59),
+    ("시", 0, 23),
+    ("일", 1, 31),
+    ("월", 1, 12),
+    ("요일", 0, 7),
+)
+
+# [SB] 다음 실행 시각을 찾을 때 확인할 최대 일수 (2월 29일 같은 표현식도 찾을 수 있도록 4년 + 1일)
+_MAX_LOOKAHEAD_DAYS = 366 * 4 + 1
+
+def _parse_field(text, name, low, high):
+    """
+    [SB] cron 필드 하나를 허용 값 집합으로 변환
+
+    지원 형식: *, 5, 1-5, */15, 8-18/2, 0/30, 쉼표 목록 (예: "0,30", "1-5,0")
+    """
+    values = set()
+    for item in text.split(','):
+        if not item:
+            raise ValueError(f"{name} 필드가 비어 있습니다: '{text}'")
+        range_text, _, step_text = item.partition('/')
+        step = 1
+        if step_text:
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"{name} 필드의 간격이 올바르지 않습니다: '{item}'")
+            step = int(step_text)
+
+        if range_text == '*':
+            start, end = low, high
+        elif '-' in range_text:
+            start_text, end_text = range_text.split('-', 1)
+            if not (start_text.isdigit() and end_text.isdigit()):
+                raise ValueError(f"{name} 필드의 범위가 올바르지 않습니다: '{item}'")
+            start, end = int(start_text), int(end_text)
+        elif range_text.isdigit():
+            start = int(range_text)
+            # [SB] "0/30"처럼 간격만 있으면 시작값부터 최대값까지
+            end = high if step_text else start
+        else:
+            raise ValueError(f"{name} 필드 값이 올바르지 않습니다: '{item}'")
+
+        if start < low or end > high or start > end:
+            raise ValueError(f"{name} 필드 값은 {low}-{high} 범위여야 합니다: '{item}'")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronSchedule:
+    """
+    [SB] 5필드 cron 표현식 (분 시 일 월 요일)
+
+    일과 요일이 모두 지정되면 표준 cron과 같이 둘 중 하나만 맞아도 실행합니다.
+    시각은 서버의 로컬 시간 기준입니다.
+
+    사용 예:
+        schedule = CronSchedule("50 8,17 * * 1-5")   # 평일 08:50, 17:50 (교대 10분 전)
+        schedule.next_after(datetime.now())
+    """
+
+    def __init__(self, expression):
+        self.expression = expression.strip()
+        fields = self.expression.split()
+        if len(fields) != len(_FIELDS):
+            raise ValueError(f"cron 표현식은 5개 필드(분 시 일 월 요일)여야 합니다: '{expression}'")
+
+        parsed = [_parse_field(text, *spec) for text, spec in zip(fields, _FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # [SB] cron 요일(0=일요일)을 datetime.weekday()(0=월요일) 기준으로 변환
+        self.weekdays = {(day - 1) % 7 for day in weekdays}
+        self._day_restricted = fields[2] != '*'
+        self._weekday_restricted = fields[4] != '*'
+        self._sorted_hours = sorted(self.hours)
+        self._sorted_minutes = sorted(self.minutes)
+
+    def __repr__(self):
+        return f"CronSchedule('{self.expression}')"
+
+    def matches_day(self, day):
+        """[SB] 해당 날짜(date 또는 datetime)가 일/월/요일 조건을 만족하는지"""
+        if day.month not in self.months:
+            return False
+        day_ok = day.day in self.days
+        weekday_ok = day.weekday() in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment):
+        """
+        [SB] moment 이후(moment 자신은 제외) 첫 실행 시각
+
+        Args:
+            moment (datetime): 기준 시각
+
+        Returns:
+            datetime: 다음 실행 시각 (초/마이크로초는 0)
+        """
+        start = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        for offset in range(_MAX_LOOKAHEAD_DAYS):
+            if self.matches_day(day):
+                first_day = offset == 0
+                for hour in self._sorted_hours:
+                    if first_day and hour < start.hour:
+                        continue
+                    for minute in self._sorted_minutes:
+                        if first_day and hour == start.hour and minute < start.minute:
+                            continue
+                        return day.replace(hour=hour, minute=minute)
+            day += timedelta(days=1)
+        raise ValueError(f"실행 시각을 찾을 수 없는 cron 표현식입니다: '{self.expression}'")
+
+def load_schedules():
+    """
+    [SB] SCHEDULE_CRON 환경 변수의 cron 표현식 목록 (세미콜론으로 구분, 잘못된 표현식은 건너뜀)
+
+    예: SCHEDULE_CRON="50 8 * * *; 50 17 * * 1-5"
+
+    Returns:
+        list: CronSchedule 목록 (설정이 없으면 빈 리스트)
+    """
+    schedules = []
+    for expression in os.getenv("SCHEDULE_CRON", "").split(';'):
+        if not expression.strip():
+            continue
+        try:
+            schedules.append(CronSchedule(expression))
+        except ValueError as e:
+            logger.warning("정기 점검 스케줄 무시: %s", e)
+    return schedules
+
+def next_run_time(schedules, moment=None):
+    """[SB] 여러 스케줄 중 가장 빠른 다음 실행 시각 (스케줄이 없으면 None)"""
+    if not schedules:
+        return None
+    moment = moment or datetime.now()
+    return min(schedule.next_after(moment) for schedule in schedules)
@@ -0,0 +1,132 @@
+# [SB] utils/spool.py - 크기가 커지면 메모리에서 임시 파일로 옮겨 가는 보고서 파일 버퍼
+import io
+import os
+import shutil
+import tempfile
+
+def spool_threshold():
+    """[SB] 메모리에 둘 최대 크기(바이트) - REPORT_SPOOL_THRESHOLD (기본 4 MiB)"""
+    try:
+        return int(os.getenv("REPORT_SPOOL_THRESHOLD", str(4 * 1024 * 1024)))
+    except ValueError:
+        return 4 * 1024 * 1024
+
+class SpooledReport(io.RawIOBase):
+    """
+    [SB] 생성된 보고서(xlsx)를 담는 파일 객체
+
+    threshold 바이트까지는 메모리(BytesIO)에 쓰고, 넘으면 내용을 임시 파일로 옮긴 뒤 계속 씁니다.
+    tempfile.SpooledTemporaryFile과 달리 임시 파일에 경로가 있으므로 open_reader()로
+    전송 대상마다 독립된 읽기 스트림을 열 수 있습니다 (전체 내용을 다시 메모리에 올리지 않음).
+
+    BytesIO를 받던 코드와 호환되도록 name, getvalue(), seek/read를 지원합니다.
+    """
+
+    def __init__(self, name, threshold=None, spool_dir=None):
+        super().__init__()
+        self.name = name
+        self.threshold = spool_threshold() if threshold is None else threshold
+        self.spool_dir = spool_dir
+        self.path = None
+        self._file = io.BytesIO()
+
+    @property
+    def rolled_over(self):
+        """[SB] 임시 파일로 옮겨졌는지 여부"""
+        return self.path is not None
+
+    @property
+    def size(self):
+        position = self._file.tell()
+        size = self._file.seek(0, io.SEEK_END)
+        self._file.seek(position)
+        return size
+
+    def _rollover(self):
+        fd, path = tempfile.mkstemp(prefix="report_", suffix=".xlsx", dir=self.spool_dir)
+        disk_file = os.fdopen(fd, "w+b")
+        position = self._file.tell()
+        disk_file.write(self._file.getbuffer())
+        disk_file.seek(position)
+        self._file.close()
+        self._file = disk_file
+        self.path = path
+
+    # ---- io.RawIOBase (zipfile/openpyxl 저장, load_workbook 읽기에 필요한 메서드) ----
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def write(self, data):
+        written = self._file.write(data)
+        if not self.rolled_over and self._file.tell() > self.threshold:
+            self._rollover()
+        return written
+
+    def readinto(self, buffer):
+        return self._file.readinto(buffer)
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def truncate(self, size=None):
+        return self._file.truncate(size)
+
+    def flush(self):
+        if not self._file.closed:
+            self._file.flush()
+
+    def close(self):
+        """[SB] 버퍼를 닫고 임시 파일이 있으면 삭제 (여러 번 호출해도 안전)"""
+        if self.closed:
+            return
+        try:
+            self._file.close()
+            if self.path:
+                try:
+                    os.unlink(self.path)
+                except OSError:
+                    pass
+        finally:
+            super().close()
+
+    # ---- 보고서 전송용 ----
+    def open_reader(self):
+        """
+        [SB] 독립된 읽기 전용 스트림 열기 (여러 전송이 동시에 읽어도 서로의 위치에 영향 없음)
+
+        Returns:
+            파일 객체: 메모리 상태면 내용을 복사한 BytesIO(전환 기준 이하 크기), 임시 파일이면 새로 연 파일 핸들
+        """
+        self.flush()
+        if self.rolled_over:
+            reader = open(self.path, "rb")
+        else:
+            reader = io.BytesIO(self._file.getvalue())
+        return reader
+
+    def getvalue(self):
+        """[SB] 전체 내용을 bytes로 반환 (작은 보고서, 아웃박스 저장 등 꼭 필요한 경우에만 사용)"""
+        if not self.rolled_over:
+            return self._file.getvalue()
+        with self.open_reader() as reader:
+            return reader.read()
+
+    @classmethod
+    def from_stream(cls, name, stream, threshold=None, spool_dir=None):
+        """[SB] 다른 스트림(캐시 파일 등)의 내용을 청크 단위로 복사해 만든 보고서"""
+        report = cls(name, threshold=threshold, spool_dir=spool_dir)
+        shutil.copyfileobj(stream, report, 1024 * 1024)
+        report.seek(0)
+        return report
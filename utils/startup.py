@@ -0,0 +1,125 @@
+# [SB] utils/startup.py - 시작 시간 프로파일 (웹 앱 첫 요청까지, 점검 파이프라인 브라우저 실행 직전까지) 및 예산 확인
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# [SB] 측정용 자식 프로세스 코드 - 마지막 줄에 결과(JSON)를 출력
+_PROBE_MARKER = "STARTUP_PROBE"
+_PROBES = {
+    # [SB] app.py import 후 첫 요청(GET /login) 처리까지
+    "app": (
+        "import json, time\n"
+        "started = time.perf_counter()\n"
+        "import app\n"
+        "imported = time.perf_counter()\n"
+        "response = app.app.test_client().get('/login')\n"
+        "print('" + _PROBE_MARKER + "', json.dumps({'import': imported - started, 'request': time.perf_counter() - imported, 'status': response.status_code}))\n"
+    ),
+    # [SB] main.py import 후 브라우저 실행 직전(crawl4ai 로드)까지
+    "pipeline": (
+        "import json, time\n"
+        "started = time.perf_counter()\n"
+        "import main\n"
+        "imported = time.perf_counter()\n"
+        "main._load_crawler()\n"
+        "print('" + _PROBE_MARKER + "', json.dumps({'import': imported - started, 'crawler': time.perf_counter() - imported}))\n"
+    ),
+}
+_PROBE_LABELS = {"app": "웹 앱 첫 요청까지", "pipeline": "점검 브라우저 실행 직전까지"}
+
+def startup_budgets():
+    """[SB] 시작 시간 예산(초) - STARTUP_BUDGET_APP(기본 1.0), STARTUP_BUDGET_PIPELINE(기본 3.0)"""
+    return {
+        "app": float(os.getenv("STARTUP_BUDGET_APP", "1.0")),
+        "pipeline": float(os.getenv("STARTUP_BUDGET_PIPELINE", "3.0")),
+    }
+
+def _run_probe(name, importtime=False):
+    """[SB] 새 인터프리터에서 측정 코드 실행 - (걸린 시간(초), 결과 dict, 오류 메시지, stderr)"""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", _PROBES[name]]
+    # [SB] 측정 중 로그 출력 비용이 섞이지 않도록 경고 이상만 출력
+    env = dict(os.environ, LOG_LEVEL="WARNING", PYTHONPATH=str(PROJECT_DIR))
+    started = time.perf_counter()
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=PROJECT_DIR, env=env)
+    elapsed = time.perf_counter() - started
+    details = None
+    for line in completed.stdout.splitlines():
+        if line.startswith(_PROBE_MARKER + " "):
+            details = json.loads(line[len(_PROBE_MARKER) + 1:])
+    if completed.returncode != 0 or details is None:
+        errors = [line for line in completed.stderr.splitlines() if line and not line.startswith("import time:")]
+        return elapsed, None, errors[-1] if errors else f"종료 코드 {completed.returncode}", completed.stderr
+    return elapsed, details, None, completed.stderr
+
+def parse_importtime(text, top=10):
+    """
+    [SB] -X importtime 출력 → 최상위 패키지별 import 시간 (자기 시간 합계, 긴 순)
+
+    Returns:
+        list: [(패키지 이름, 초), ...] 최대 top개
+    """
+    totals = {}
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        package = fields[2].strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(fields[0]) / 1_000_000
+    return sorted(totals.items(), key=lambda item: -item[1])[:top]
+
+def measure(name, runs=3, top=10):
+    """
+    [SB] 진입점 하나의 시작 시간 측정 (runs회 실행의 중앙값 + import 시간 상위 패키지)
+
+    Returns:
+        dict: {"name", "seconds", "runs", "details", "imports", "error"}
+    """
+    times = []
+    details = None
+    for _ in range(runs):
+        elapsed, details, error, _ = _run_probe(name)
+        if error:
+            return {"name": name, "seconds": None, "runs": times, "details": None, "imports": [], "error": error}
+        times.append(elapsed)
+    # [SB] import 시간 분석은 측정값에 영향을 주므로 별도 실행
+    _, _, _, stderr = _run_probe(name, importtime=True)
+    return {"name": name, "seconds": statistics.median(times), "runs": times, "details": details,
+            "imports": parse_importtime(stderr, top), "error": None}
+
+def check_budgets(results, budgets):
+    """[SB] 예산을 넘었거나 측정에 실패한 진입점 이름 목록"""
+    return [result["name"] for result in results
+            if result["error"] or result["seconds"] > budgets.get(result["name"], float("inf"))]
+
+def print_report(results, budgets, out=sys.stdout):
+    """[SB] 진입점별 시작 시간, 예산, import 시간 상위 패키지 출력"""
+    for result in results:
+        label = _PROBE_LABELS.get(result["name"], result["name"])
+        budget = budgets.get(result["name"])
+        if result["error"]:
+            print(f"{label}: 측정 실패 - {result['error']}", file=out)
+            continue
+        verdict = "초과" if budget is not None and result["seconds"] > budget else "통과"
+        breakdown = ", ".join(f"{key} {value:.3f}초" for key, value in result["details"].items() if isinstance(value, float))
+        print(f"{label}: {result['seconds']:.3f}초 (예산 {budget:.1f}초, {verdict}) - {breakdown}", file=out)
+        for package, seconds in result["imports"]:
+            print(f"    {package:<30} {seconds:>8.3f}초", file=out)
+
+def main(runs=None):
+    runs = runs or int(os.getenv("STARTUP_PROFILE_RUNS", "3"))
+    budgets = startup_budgets()
+    results = [measure(name, runs) for name in _PROBES]
+    print_report(results, budgets)
+    return 1 if check_budgets(results, budgets) else 0
+
+if __name__ == "__main__":
+    # [SB] python -m utils.startup: 시작 시간 측정 (예산 초과 또는 측정 실패 시 종료 코드 1)
+    sys.exit(main())
@@ -0,0 +1,481 @@
+# [SB] utils/tracing.py - 점검 실행의 단계별 소요 시간 추적 (JSON Lines/Chrome trace 파일, 단계별 히스토그램)
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+
+# [SB] 실행마다 logs/traces/에 구간(span) 기록을 남기고, 구간 이름별 소요 시간 분포는 실행 간에 누적
+TRACE_DIR = Path("logs") / "traces"
+HISTOGRAM_PATH = TRACE_DIR / "stage_histograms.sqlite3"
+
+# [SB] 히스토그램 버킷 상한(초) - 마지막 버킷(+Inf)은 별도
+HISTOGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+CATEGORY_STAGE = "stage"
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stage_histograms (
+    name TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    total REAL NOT NULL DEFAULT 0,
+    max REAL NOT NULL DEFAULT 0,
+    last REAL,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS stage_histogram_buckets (
+    name TEXT NOT NULL,
+    le REAL NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, le)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS run_counters (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, labels)
+) WITHOUT ROWID;
+"""
+
+# [SB] 현재 실행의 추적 객체와 현재 구간 ID (asyncio 태스크/스레드 풀 작업마다 따로 유지)
+_current_trace = ContextVar("run_trace", default=None)
+_current_span = ContextVar("trace_span", default=None)
+
+def _env_flag(name, default):
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+def tracing_enabled():
+    """[SB] 실행 추적 사용 여부 (TRACE_ENABLED, 기본 true)"""
+    return _env_flag("TRACE_ENABLED", "true")
+
+class RunTrace:
+    """
+    [SB] 점검 1회 실행의 구간 기록
+
+    구간은 중첩될 수 있으며(부모 구간 ID 기록), asyncio.gather로 동시에 실행되는 구간도
+    태스크별로 따로 추적합니다. 추적 객체가 활성화되지 않았으면 span()은 아무것도 기록하지 않습니다.
+
+    사용 예:
+        trace = RunTrace()
+        trace.activate()
+        with span("browser.launch", "browser"):
+            ...
+        trace.finish()    # logs/traces/에 파일 저장 + 히스토그램 누적
+    """
+
+    def __init__(self, run_id=None, trigger=None):
+        # [SB] app.py가 넘겨준 작업 ID(JOB_ID)를 사용해 로그와 추적 파일을 연결
+        self.run_id = run_id or os.getenv("JOB_ID") or uuid.uuid4().hex[:12]
+        self.trigger = trigger or os.getenv("CHECK_TRIGGER", "login")
+        self.started_at = time.time()
+        self.spans = []
+        self.counters = {}
+        self._origin = time.perf_counter()
+        self._ids = itertools.count(1)
+        self._lanes = {}
+        self._lock = threading.Lock()
+
+    def activate(self):
+        """[SB] 현재 컨텍스트(와 이후 생성되는 태스크)의 추적 객체로 설정"""
+        _current_trace.set(self)
+        return self
+
+    def _lane(self):
+        """[SB] Chrome trace의 tid - 스레드와 asyncio 태스크 조합마다 하나의 줄"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = (threading.get_ident(), id(task) if task is not None else None)
+        with self._lock:
+            return self._lanes.setdefault(key, len(self._lanes) + 1)
+
+    def add_span(self, name, start, end, category=CATEGORY_STAGE, parent_id=None, status="ok", attrs=None, span_id=None):
+        """
+        [SB] 완료된 구간 추가
+
+        Args:
+            name (str): 구간 이름
+            start, end (float): time.perf_counter() 기준 시작/종료 시각
+            category (str): 구간 분류 (stage, browser, link, mattermost 등)
+        """
+        span = {
+            "span_id": span_id or next(self._ids),
+            "parent_id": parent_id,
+            "name": name,
+            "cat": category,
+            "start": round(start - self._origin, 6),
+            "duration": round(end - start, 6),
+            "status": status,
+            "lane": self._lane(),
+            "attrs": attrs or {},
+        }
+        with self._lock:
+            # [SB] 단계 구간은 끝난 뒤에 추가되므로, 그 사이에 기록된 최상위 세부 구간을 이 단계의 하위로 연결
+            if category == CATEGORY_STAGE and parent_id is None:
+                for child in self.spans:
+                    if child["parent_id"] is None and child["cat"] != CATEGORY_STAGE and child["start"] >= span["start"]:
+                        child["parent_id"] = span["span_id"]
+            self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, name, category="step", **attrs):
+        """[SB] with 블록 구간 기록 - 블록에서 예외가 나면 status=error로 기록하고 예외는 그대로 전달"""
+        span_id = next(self._ids)
+        parent_id = _current_span.get()
+        token = _current_span.set(span_id)
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield attrs
+        except BaseException as e:
+            status = "cancelled" if isinstance(e, asyncio.CancelledError) else "error"
+            attrs["error"] = f"{type(e).__name__}: {e}"[:200]
+            raise
+        finally:
+            _current_span.reset(token)
+            self.add_span(name, start, time.perf_counter(), category, parent_id, status, attrs, span_id=span_id)
+
+    def count(self, name, value=1, **labels):
+        """[SB] 실행 중 발생한 사건 수 누적 (캐시 적중, LLM 불일치 등) - finish()에서 실행 간 누적 카운터에 더함"""
+        key = (name, json.dumps(labels, ensure_ascii=False, sort_keys=True))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def stage_spans(self):
+        """[SB] 최상위 단계 구간 목록 (점검 이력의 timings와 같은 단위)"""
+        return [span for span in self.spans if span["cat"] == CATEGORY_STAGE]
+
+    def write(self, chrome=None):
+        """
+        [SB] 구간 기록을 파일로 저장
+
+        - logs/traces/run_<시각>_<실행 ID>.jsonl: 첫 줄은 실행 정보, 이후 한 줄에 구간 하나 (시작 시각순)
+        - TRACE_CHROME=true이면 같은 이름의 .trace.json (chrome://tracing, Perfetto에서 열 수 있는 trace event 형식)
+
+        Returns:
+            list: 저장한 파일 경로
+        """
+        if chrome is None:
+            chrome = _env_flag("TRACE_CHROME", "false")
+        TRACE_DIR.mkdir(parents=True, exist_ok=True)
+        base = TRACE_DIR / f"run_{datetime.fromtimestamp(self.started_at):%Y%m%d-%H%M%S}_{self.run_id}"
+        spans = sorted(self.spans, key=lambda span: span["start"])
+        header = {
+            "type": "run",
+            "run_id": self.run_id,
+            "trigger": self.trigger,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="milliseconds"),
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "total": round(max((span["start"] + span["duration"] for span in spans), default=0), 6),
+        }
+        paths = [base.with_suffix(".jsonl")]
+        with open(paths[0], "w", encoding="utf-8") as trace_file:
+            trace_file.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for span in spans:
+                trace_file.write(json.dumps(dict(span, type="span"), ensure_ascii=False) + "\n")
+
+        if chrome:
+            events = [{"name": "process_name", "ph": "M", "pid": header["pid"], "args": {"name": f"점검 {self.run_id}"}}]
+            for span in spans:
+                events.append({
+                    "name": span["name"],
+                    "cat": span["cat"],
+                    "ph": "X",
+                    "ts": round(span["start"] * 1e6),
+                    "dur": round(span["duration"] * 1e6),
+                    "pid": header["pid"],
+                    "tid": span["lane"],
+                    "args": dict(span["attrs"], status=span["status"]),
+                })
+            paths.append(base.with_suffix(".trace.json"))
+            with open(paths[1], "w", encoding="utf-8") as trace_file:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": header}, trace_file, ensure_ascii=False)
+
+        _remove_old_traces()
+        return paths
+
+    def finish(self):
+        """
+        [SB] 실행 종료 - 파일 저장, 이전 실행 대비 느려진 단계 출력, 히스토그램 누적 (실패해도 점검 결과에는 영향 없음)
+
+        Returns:
+            list: 느려진 단계 목록 (find_regressions 결과)
+        """
+        regressions = []
+        try:
+            self.write()
+            regressions = find_regressions(self.stage_spans(), load_histograms())
+            for item in regressions:
+                logger.warning("단계 지연: %s %.1f초 (이전 %d회 p95 %.1f초)",
+                               item['name'], item['duration'], item['count'], item['p95'])
+            record_histograms(self.spans)
+            # [SB] 실패한 구간 수도 카운터로 누적 (Mattermost API 오류 등)
+            for span in self.spans:
+                if span["status"] != "ok":
+                    self.count("span_errors", span=span["name"], category=span["cat"])
+            record_counters(self.counters)
+        except Exception as e:
+            logger.warning("실행 추적 저장 실패: %s", e)
+        return regressions
+
+def current_trace():
+    """[SB] 현재 컨텍스트의 실행 추적 객체 (없으면 None)"""
+    return _current_trace.get()
+
+def count_event(name, value=1, **labels):
+    """[SB] 현재 실행 추적에 사건 수 누적 - 추적 중이 아니면 아무것도 하지 않음"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.count(name, value, **labels)
+
+@contextmanager
+def span(name, category="step", **attrs):
+    """[SB] 현재 실행 추적에 구간 기록 - 추적 중이 아니면 아무것도 하지 않음"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield attrs
+        return
+    with trace.span(name, category, **attrs) as span_attrs:
+        yield span_attrs
+
+def _remove_old_traces():
+    """[SB] 최근 TRACE_KEEP개(기본 200회) 실행의 파일만 보관"""
+    try:
+        keep = max(1, int(os.getenv("TRACE_KEEP", "200")))
+    except ValueError:
+        keep = 200
+    runs = sorted(TRACE_DIR.glob("run_*.jsonl"), reverse=True)
+    for old_run in runs[keep:]:
+        for path in (old_run, old_run.with_suffix(".trace.json")):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+def _connect():
+    HISTOGRAM_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # [SB] 정기 점검과 로그인 점검이 동시에 끝날 수 있으므로 WAL 모드 + 잠금 대기 시간 설정
+    conn = sqlite3.connect(str(HISTOGRAM_PATH), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+def _bucket_le(duration):
+    """[SB] 소요 시간이 들어갈 버킷 상한 (모든 상한보다 크면 +Inf)"""
+    for le in HISTOGRAM_BUCKETS:
+        if duration <= le:
+            return le
+    return float("inf")
+
+def record_histograms(spans, now=None):
+    """
+    [SB] 구간 이름별 히스토그램에 이번 실행의 소요 시간 누적 (같은 이름의 구간이 여러 번이면 각각 1회로 집계)
+
+    Args:
+        spans (list): RunTrace.spans
+    """
+    now = now or time.time()
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for span in spans:
+            duration = span["duration"]
+            conn.execute(
+                "INSERT INTO stage_histograms (name, category, count, total, max, last, updated_at) VALUES (?, ?, 1, ?, ?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET count = count + 1, total = total + excluded.total, "
+                "max = MAX(max, excluded.max), last = excluded.last, updated_at = excluded.updated_at, category = excluded.category",
+                (span["name"], span["cat"], duration, duration, duration, now),
+            )
+            # [SB] +Inf 버킷도 REAL 값(inf) 그대로 저장
+            conn.execute(
+                "INSERT INTO stage_histogram_buckets (name, le, count) VALUES (?, ?, 1) "
+                "ON CONFLICT (name, le) DO UPDATE SET count = count + 1",
+                (span["name"], _bucket_le(duration)),
+            )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def record_counters(counters):
+    """
+    [SB] 실행 간 누적 카운터에 이번 실행의 값 더하기
+
+    Args:
+        counters (dict): {(이름, 레이블 JSON): 값} - RunTrace.counters
+    """
+    if not counters:
+        return
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            "INSERT INTO run_counters (name, labels, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value",
+            [(name, labels, value) for (name, labels), value in counters.items()],
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def load_counters():
+    """
+    [SB] 실행 간 누적 카운터
+
+    Returns:
+        list: [(이름, 레이블 dict, 값), ...]
+    """
+    if not HISTOGRAM_PATH.exists():
+        return []
+    conn = _connect()
+    try:
+        rows = conn.execute("SELECT name, labels, value FROM run_counters ORDER BY name, labels").fetchall()
+    finally:
+        conn.close()
+    return [(row["name"], json.loads(row["labels"]), row["value"]) for row in rows]
+
+def load_histograms(category=None):
+    """
+    [SB] 누적된 구간 이름별 히스토그램
+
+    Returns:
+        dict: {이름: {"category", "count", "sum", "max", "last", "buckets": [(상한, 누적 횟수), ...]}}
+              buckets는 HISTOGRAM_BUCKETS 순서 + 마지막 +Inf (Prometheus 히스토그램과 같은 누적 형식)
+    """
+    if not HISTOGRAM_PATH.exists():
+        return {}
+    conn = _connect()
+    try:
+        query = "SELECT * FROM stage_histograms" + (" WHERE category = ?" if category else "")
+        rows = conn.execute(query, (category,) if category else ()).fetchall()
+        bucket_rows = conn.execute("SELECT name, le, count FROM stage_histogram_buckets").fetchall()
+    finally:
+        conn.close()
+
+    counts = {}
+    for row in bucket_rows:
+        counts.setdefault(row["name"], {})[row["le"]] = row["count"]
+    histograms = {}
+    for row in rows:
+        by_le = counts.get(row["name"], {})
+        cumulative = 0
+        buckets = []
+        for le in HISTOGRAM_BUCKETS + (float("inf"),):
+            cumulative += by_le.get(le, 0)
+            buckets.append((le, cumulative))
+        histograms[row["name"]] = {
+            "category": row["category"],
+            "count": row["count"],
+            "sum": row["total"],
+            "max": row["max"],
+            "last": row["last"],
+            "buckets": buckets,
+        }
+    return histograms
+
+def histogram_quantile(histogram, q):
+    """
+    [SB] 히스토그램에서 분위수 추정 (버킷 안에서는 선형 보간, Prometheus histogram_quantile과 같은 방식)
+
+    관측된 최대값을 넘지 않으며, +Inf 버킷에 해당하면 최대값을 반환합니다.
+    """
+    count = histogram["count"]
+    if not count:
+        return None
+    rank = q * count
+    lower, previous = 0.0, 0
+    for le, cumulative in histogram["buckets"]:
+        if cumulative >= rank:
+            if le == float("inf"):
+                return histogram["max"]
+            in_bucket = cumulative - previous
+            estimate = lower + (le - lower) * ((rank - previous) / in_bucket if in_bucket else 0)
+            return min(estimate, histogram["max"])
+        lower, previous = le, cumulative
+    return histogram["max"]
+
+def find_regressions(spans, histograms, min_count=None):
+    """
+    [SB] 이전 실행들의 p95보다 오래 걸린 구간 찾기
+
+    Args:
+        spans (list): 이번 실행의 구간 (보통 stage_spans())
+        histograms (dict): 이번 실행을 누적하기 전의 load_histograms() 결과
+        min_count (int, optional): 비교에 필요한 최소 이전 실행 횟수 (TRACE_REGRESSION_MIN_COUNT, 기본 10)
+
+    Returns:
+        list: [{"name", "duration", "p95", "count"}, ...]
+    """
+    if min_count is None:
+        try:
+            min_count = int(os.getenv("TRACE_REGRESSION_MIN_COUNT", "10"))
+        except ValueError:
+            min_count = 10
+    regressions = []
+    for span in spans:
+        histogram = histograms.get(span["name"])
+        if not histogram or histogram["count"] < min_count:
+            continue
+        p95 = histogram_quantile(histogram, 0.95)
+        if p95 is not None and span["duration"] > p95:
+            regressions.append({"name": span["name"], "duration": span["duration"], "p95": p95, "count": histogram["count"]})
+    return regressions
+
+def stage_estimates(names):
+    """
+    [SB] 단계별 예상 소요 시간(초) - 이전 실행들의 중앙값 (기록이 없는 단계는 제외)
+
+    Args:
+        names (iterable): 단계 이름 목록
+
+    Returns:
+        dict: {단계 이름: 예상 시간}
+    """
+    try:
+        histograms = load_histograms(category=CATEGORY_STAGE)
+    except sqlite3.Error:
+        return {}
+    estimates = {}
+    for name in names:
+        if name in histograms:
+            estimates[name] = histogram_quantile(histograms[name], 0.5)
+    return estimates
+
+def print_summary(out=sys.stdout):
+    """[SB] 구간 이름별 실행 횟수와 소요 시간 분포 표 출력 (누적 시간이 긴 순)"""
+    histograms = load_histograms()
+    if not histograms:
+        print("기록된 실행 추적이 없습니다.", file=out)
+        return
+    print(f"{'구간':<40} {'분류':<10} {'횟수':>6} {'평균':>8} {'p50':>8} {'p95':>8} {'최대':>8}", file=out)
+    for name, histogram in sorted(histograms.items(), key=lambda item: -item[1]["sum"]):
+        mean = histogram["sum"] / histogram["count"]
+        print(f"{name:<40} {histogram['category']:<10} {histogram['count']:>6} {mean:>8.2f} "
+              f"{histogram_quantile(histogram, 0.5):>8.2f} {histogram_quantile(histogram, 0.95):>8.2f} {histogram['max']:>8.2f}",
+              file=out)
+
+if __name__ == "__main__":
+    # [SB] python -m utils.tracing: 누적된 단계별 소요 시간 요약
+    print_summary()
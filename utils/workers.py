@@ -0,0 +1,46 @@
+# [SB] utils/workers.py - 동기(블로킹) 작업을 이벤트 루프 밖의 스레드 풀에서 실행
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# [SB] Excel 생성(openpyxl)과 Mattermost 드라이버 호출은 모두 동기 함수이므로
+#      크롤러 이벤트 루프를 막지 않도록 공용 스레드 풀에서 실행
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """[SB] 공용 스레드 풀 반환 (REPORT_WORKERS 환경 변수로 크기 조정, 기본 4)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                max_workers = int(os.getenv("REPORT_WORKERS", "4"))
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-worker")
+    return _executor
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    [SB] 블로킹 함수를 스레드 풀에서 실행하고 결과를 기다리는 코루틴
+
+    Args:
+        func (callable): 실행할 동기 함수
+        *args, **kwargs: func에 전달할 인자
+
+    Returns:
+        func의 반환값
+    """
+    loop = asyncio.get_running_loop()
+    # [SB] 호출한 코루틴의 컨텍스트(실행 추적 등 ContextVar)를 작업 스레드에서도 그대로 사용
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), functools.partial(context.run, func, *args, **kwargs))
+
+def shutdown_executor(wait=True):
+    """[SB] 공용 스레드 풀 종료 (프로세스 종료 전 호출)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
@@ -1,169 +1,35 @@
 # utils/xlsx.py
 import json
 import io
+import logging
+import os
+import threading
 from pathlib import Path
 from datetime import datetime
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Alignment, Border, Side, Font, PatternFill
 from openpyxl.drawing.image import Image
 from openpyxl.utils import get_column_letter
 from openpyxl.utils.units import points_to_pixels, pixels_to_EMU # Added pixels_to_EMU
 from openpyxl.drawing.spreadsheet_drawing import OneCellAnchor, AnchorMarker # Added OneCellAnchor, AnchorMarker
 from openpyxl.drawing.xdr import XDRPositiveSize2D
-# Excel 대시보드 생성 함수
-def create_dashboard_excel(llm_result, in_memory=False, username=None, dashboard_screenshot=None):
-    """
-    LLM 분석 결과를 기반으로 대시보드 Excel 파일을 생성합니다.
-    
-    Args:
-        llm_result (dict or str): LLM 분석 결과
-        in_memory (bool, optional): 메모리에 파일을 생성할지 여부. True면 파일을 디스크에 저장하지 않고 
-                                    메모리에서 바이트 객체로 반환합니다.
-        username (str, optional): 담당자 이름. 기본값은 None이며, 이 경우 ""으로 설정됩니다.
-        dashboard_screenshot (BytesIO, optional): 대시보드 스크린샷 메모리 데이터
-    
-    Returns:
-        Path 또는 BytesIO: in_memory가 False이면 생성된 Excel 파일 경로, True이면 메모리 상의 파일 객체
-    """
-    # [SB] 기본 설정 및 경로 생성
-    logs_dir = Path("logs")
-    
-    # [SB] 디스크에 저장할 때만 logs 폴더 생성 (xlsx_test.py용)
-    if not in_memory:
-        logs_dir.mkdir(exist_ok=True)
-    
-    # [SB] 날짜 형식을 yyyymmdd로 변경
-    formatted_date = datetime.now().strftime("%Y%m%d")
-    
-    # [SB] 파일명에 사용자 이름 포함
-    user_str = ""
-    if username:
-        # [SB] 공백 제거 및 특수문자 제거
-        clean_username = ''.join(c for c in username if c.isalnum() or c.isspace()).strip()
-        user_str = f"_{clean_username}"
-    
-    excel_filename = f"당직체크리스트v5_{formatted_date}{user_str}.xlsx"
-    excel_path = logs_dir / excel_filename
-    screenshot_dir = Path("screenshot")
-    
-    # [SB] 결과 데이터 변환
-    llm_data = json.loads(llm_result) if isinstance(llm_result, str) else llm_result
-    
-    # [SB] 담당자 이름 설정
-    current_user = username if username else ""
-    
-    # [SB] 체크리스트 데이터 정의 (데이터는 이전과 동일하므로 생략)
-    data = [
-        # 1. 로그인
-        {
-            "카테고리": "backOffice",
-            "메뉴": "로그인",
-            "체크사항": "https://hydra2.uxcloud.net 접속\nID: bomanager",
-            "페이지스크린샷": "1.jpg",
-            "결과": "정상" if llm_data.get("로그인상태") == "예" else "오류"
-        },
-        # 2. 예치금
-        {
-            "카테고리": "backOffice",
-            "메뉴": "예치금",
-            "체크사항": "Whois 200.00 USD 이상\nGabia 200,000 KRW 이상\n예치금이 남았는 지 확인",
-            "페이지스크린샷": "2.jpg",
-            "결과": f"{llm_data.get('whois_usd')}\n{llm_data.get('gabia_krw')}"
-        },
-        # 3. 스케줄러
-        {
-            "카테고리": "backOffice",
-            "메뉴": "스케줄러",
-            "체크사항": "스케쥴러 상태가 적용중 인지 확인",
-            "페이지스크린샷": "3.jpg",
-            "결과": "적용됨" if llm_data.get("스케줄러상태") == "예" else "미적용 상태"
-        },
-        # 4. 고객문의 - 1:1 문의
-        {
-            "카테고리": "backOffice",
-            "메뉴": "고객문의",
-            "체크사항": "1:1 문의 답변 준비중이 있는지 확인",
-            "페이지스크린샷": "4.jpg",
-            "결과": "0개 확인" if llm_data.get("1:1문의") == "예" else "1:1 답변준비중 있음"
-        },
-        # 5. 고객문의 - 이메일 문의
-        {
-            "카테고리": "backOffice",
-            "메뉴": "고객문의",
-            "체크사항": "이메일 문의 답변 준비중이 있는지 확인",
-            "페이지스크린샷": "5.jpg",
-            "결과": "0개 확인" if llm_data.get("이메일문의") == "예" else "이메일 답변준비중 있음"
-        },
-        # 6. 고객문의 - 에러리포트
-        {
-            "카테고리": "backOffice",
-            "메뉴": "고객문의",
-            "체크사항": "에러리포트 신규 등록 된 이슈가 있는지 확인",
-            "페이지스크린샷": "6.jpg",
-            "결과": "0개 확인" if llm_data.get("에러리포트") == "예" else "신규 에러 있음"
-        },
-        # 7. Region
-        {
-            "카테고리": "backOffice",
-            "메뉴": "Region",
-            "체크사항": "Region 상태가 2개 활성화 인지 확인",
-            "페이지스크린샷": "7.jpg",
-            "결과": "2개 확인" if llm_data.get("Region활성") == "예" else "활성화 개수 확인 필요"
-        },
-        # 8. 시스템 - 장비 미보고
-        {
-            "카테고리": "backOffice",
-            "메뉴": "시스템",
-            "체크사항": "장비의 미보고가 있는지 확인",
-            "페이지스크린샷": "8.jpg",
-            "결과": "미보고 0개 확인" if llm_data.get("장비미보고") == "예" else "미보고 장비 있음"
-        },
-        # 9. 시스템 - DBSync
-        {
-            "카테고리": "backOffice",
-            "메뉴": "시스템",
-            "체크사항": "DBSync 일시중지 및 오류가 있는지 확인",
-            "페이지스크린샷": "9.jpg",
-            "결과": "0개 확인" if (llm_data.get("DB_Sync", {}).get("일시중지") == "예" and 
-                         llm_data.get("DB_Sync", {}).get("오류") == "예") else "일시중지 또는 오류 있음"
-        },
-        # 10. 시스템 - FrontEnd
-        {
-            "카테고리": "backOffice",
-            "메뉴": "시스템",
-            "체크사항": "1. FrontEnd 서버 상태가 정상인지 확인\n※ 정상이 아닐경우 열기를 통해서 사이트 이동이 되는지 확인\n\n2. FrontEnd 도메인 검색이 정상적으로 가능한지 확인",
-            "페이지스크린샷": "10.jpg",
-            "결과": ("정상" if (llm_data.get("FrontEnd", {}).get("상태") == "예" and 
-                        llm_data.get("FrontEnd", {}).get("도메인 검색") == "예") else "비정상") + \
-                    ("" if "link" not in llm_data.get("FrontEnd", {}) else 
-                    f"\n더보기 링크 : {llm_data.get('FrontEnd', {}).get('link')}")
-        },
-        # 11. 운영중인 서비스
-        {
-            "카테고리": "backOffice",
-            "메뉴": "운영중인 서비스",
-            "체크사항": "Parking, URL, FURL 모두 정상인지 확인\n※ 정상이 아닐경우 해당 상태를 클릭하여 페이지 이동이 정상적으로 되는지 확인",
-            "페이지스크린샷": "11.jpg",
-            "결과": ("정상" if (llm_data.get("운영중인서비스", {}).get("parking") == "예" and 
-                            llm_data.get("운영중인서비스", {}).get("url") == "예" and
-                            llm_data.get("운영중인서비스", {}).get("furl") == "예") else "비정상") + \
-                    ("" if "parking_link" not in llm_data.get("운영중인서비스", {}) else 
-                    f"\nParking 링크 : {llm_data.get('운영중인서비스', {}).get('parking_link')}") + \
-                    ("" if "url_link" not in llm_data.get("운영중인서비스", {}) else 
-                    f"\nURL 링크 : {llm_data.get('운영중인서비스', {}).get('url_link')}") + \
-                    ("" if "furl_link" not in llm_data.get("운영중인서비스", {}) else 
-                    f"\nFURL 링크 : {llm_data.get('운영중인서비스', {}).get('furl_link')}")
-        }
-    ]
-    
-    # [SB] 워크북 초기화 및 시트 생성
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "대시보드 체크리스트"
-    img_ws = wb.create_sheet(title="원본 스크린샷")
-    
-    # [SB] 스타일 정의
-    styles = {
+from utils.checklist import evaluate_checklist
+from utils.report_cache import report_cache_enabled, make_report_key, open_cached_report, store_report
+from utils.tracing import count_event
+from utils.spool import SpooledReport
+
+logger = logging.getLogger(__name__)
+
+# [SB] 템플릿 모드 - 고정 레이아웃(열 너비, 병합, 헤더, 테두리)을 미리 만든 xlsx를 바이트로 캐시
+_TEMPLATE_SHEET_TITLE = "대시보드 체크리스트"
+_SCREENSHOT_SHEET_TITLE = "원본 스크린샷"
+_template_bytes = None
+_template_key = None  # [SB] 캐시한 템플릿 파일의 (경로, 수정 시각, 크기)
+_template_lock = threading.Lock()
+
+def _get_styles():
+    """[SB] 대시보드 시트 스타일 정의"""
+    return {
         'title': Font(size=14, bold=True),
         'header': Font(size=14, bold=True, color='FFFFFF'), # Header font color white
         'header_fill': PatternFill(start_color='003366', end_color='003366', fill_type='solid'),
@@ -178,7 +44,9 @@ def create_dashboard_excel(llm_result, in_memory=False, username=None, dashboard
             bottom=Side(style='thin')
         ),
     }
-    
+
+def _apply_static_layout(ws, data, styles):
+    """[SB] 매 실행마다 동일한 레이아웃(열 너비, 타이틀, 헤더, 고정 열, 병합, 테두리)을 적용하는 함수"""
     # [SB] 열 너비 설정
     column_widths = {'A': 12, 'B': 22, 'C': 50, 'D': 100, 'E': 20} # D 열 너비 100으로 유지
     for col, width in column_widths.items():
@@ -191,9 +59,7 @@ def create_dashboard_excel(llm_result, in_memory=False, username=None, dashboard
     ws['A1'].alignment = styles['center_align']
     
     ws.merge_cells('A2:C2')
-    ws['A2'] = f"일시: {datetime.now().strftime('%Y-%m-%d')}"
     ws.merge_cells('D2:E2')
-    ws['D2'] = f"담당자: {current_user}"
     
     # [SB] 헤더 행 설정
     headers = ['카테고리', '메뉴', '체크사항', '페이지스크린샷', '결과']
@@ -224,54 +90,6 @@ def create_dashboard_excel(llm_result, in_memory=False, username=None, dashboard
         ws[f'B{row_idx}'] = row_data['메뉴']
         ws[f'C{row_idx}'] = row_data['체크사항']
         
-        result_cell = ws[f'E{row_idx}']
-        result_cell.value = row_data['결과']
-        
-        menu = row_data['메뉴']
-        result_text = row_data['결과']
-
-        if menu == "로그인":
-            if "정상" in result_text: result_cell.fill = styles['good_result']
-            else: result_cell.fill = styles['bad_result']
-        elif menu == "예치금":
-            whois_ok, gabia_ok = False, False
-            lines = result_text.split('\n')
-            for line in lines:
-                if 'USD' in line:
-                    try:
-                        usd_value = float(line.replace('USD', '').replace(',', '').strip())
-                        whois_ok = usd_value >= 200.00
-                    except ValueError: whois_ok = False
-                elif 'KRW' in line:
-                    try:
-                        krw_value = float(line.replace('KRW', '').replace(',', '').strip())
-                        gabia_ok = krw_value >= 200000
-                    except ValueError: gabia_ok = False
-            if whois_ok and gabia_ok: result_cell.fill = styles['good_result']
-            else: result_cell.fill = styles['bad_result']
-        elif menu == "스케줄러":
-            if "적용됨" in result_text: result_cell.fill = styles['good_result']
-            else: result_cell.fill = styles['bad_result']
-        elif menu == "고객문의":
-            if "0개 확인" in result_text: result_cell.fill = styles['good_result']
-            else: result_cell.fill = styles['bad_result']
-        elif menu == "Region":
-            if "2개 확인" in result_text: result_cell.fill = styles['good_result']
-            else: result_cell.fill = styles['bad_result']
-        elif menu == "시스템":
-            if "FrontEnd" in row_data['체크사항']:
-                if (result_text.split('\n')[0] if result_text else "") == "정상":
-                    result_cell.fill = styles['good_result']
-                else: result_cell.fill = styles['bad_result']
-            else:
-                if "미보고 0개 확인" in result_text or "0개 확인" in result_text or "정상" in result_text:
-                    result_cell.fill = styles['good_result']
-                else: result_cell.fill = styles['bad_result']
-        elif menu == "운영중인 서비스":
-            if "정상" in result_text and "비정상" not in result_text:
-                result_cell.fill = styles['good_result']
-            else: result_cell.fill = styles['bad_result']
-        
         ws.row_dimensions[row_idx].height = 120 # 행 높이 고정
     
     def merge_consecutive_rows(rows, column):
@@ -298,47 +116,180 @@ def create_dashboard_excel(llm_result, in_memory=False, username=None, dashboard
             elif col == 4 and row > 3 : # D열 데이터 행에만 중앙 정렬 (이미지용)
                  cell.alignment = styles['center_align']
 
+def _create_layout_workbook(data, styles):
+    """[SB] 레이아웃만 적용된 워크북을 생성하는 함수 (빌더 모드 및 템플릿 생성에 공용)"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = _TEMPLATE_SHEET_TITLE
+    wb.create_sheet(title=_SCREENSHOT_SHEET_TITLE)
+    _apply_static_layout(ws, data, styles)
+    return wb
+
+def _file_stamp(path):
+    """[SB] 파일의 (경로, 수정 시각, 크기) - 파일이 없거나 경로가 없으면 None"""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+def _get_template_bytes():
+    """
+    [SB] 템플릿 xlsx 바이트를 반환하는 함수 (파일이 바뀌지 않으면 프로세스당 한 번만 로드/생성)
+    
+    EXCEL_TEMPLATE_PATH에 파일이 있으면 그 파일을 읽고, 없으면 레이아웃을 한 번 생성해서
+    메모리에 캐시합니다. 경로가 지정되어 있으면 생성한 템플릿을 해당 경로에 저장해 다음 실행부터 재사용합니다.
+    캐시한 바이트는 템플릿 파일의 수정 시각/크기와 함께 보관하며, 파일이 수정되면 다시 읽습니다.
+    """
+    global _template_bytes, _template_key
+    template_path = os.getenv("EXCEL_TEMPLATE_PATH", "")
+    stamp = _file_stamp(template_path)
+    if _template_bytes is not None and _template_key == stamp:
+        return _template_bytes
+    
+    with _template_lock:
+        stamp = _file_stamp(template_path)
+        if _template_bytes is not None and _template_key == stamp:
+            return _template_bytes
+        
+        if stamp is not None:
+            _template_bytes = Path(template_path).read_bytes()
+            _template_key = stamp
+            logger.info("Excel 템플릿을 로드했습니다: %s", template_path)
+            return _template_bytes
+        
+        template_wb = _create_layout_workbook(evaluate_checklist({}), _get_styles())
+        buffer = io.BytesIO()
+        template_wb.save(buffer)
+        _template_bytes = buffer.getvalue()
+        _template_key = None
+        
+        if template_path:
+            try:
+                Path(template_path).parent.mkdir(parents=True, exist_ok=True)
+                Path(template_path).write_bytes(_template_bytes)
+                _template_key = _file_stamp(template_path)
+                logger.info("Excel 템플릿을 생성했습니다: %s", template_path)
+            except OSError as e:
+                logger.warning("Excel 템플릿 저장 실패 (메모리 캐시만 사용): %s", e)
+        return _template_bytes
+
+def _load_template_workbook():
+    """[SB] 캐시된 템플릿 바이트로부터 매 실행용 워크북 사본을 만드는 함수"""
+    return load_workbook(io.BytesIO(_get_template_bytes()))
+
+def _fill_dynamic_cells(ws, data, styles, current_user):
+    """[SB] 실행마다 달라지는 셀(일시, 담당자, 체크사항, 결과 값 및 색상)만 채우는 함수"""
+    ws['A2'] = f"일시: {datetime.now().strftime('%Y-%m-%d')}"
+    ws['D2'] = f"담당자: {current_user}"
+    
+    for row_idx, row_data in enumerate(data, 4):
+        # [SB] 체크사항은 현재 기준 금액(WHOIS_USD_THRESHOLD 등)을 포함하므로 템플릿 생성 시점 값이 아닌 이번 판정의 문구 사용
+        ws[f'C{row_idx}'] = row_data['체크사항']
+        result_cell = ws[f'E{row_idx}']
+        result_cell.value = row_data['결과']
+        result_cell.fill = styles['good_result'] if row_data['정상'] else styles['bad_result']
+
+def _write_forecast_note(ws, data, forecast_lines):
+    """[SB] 체크리스트 표 아래에 예치금 소진 예측 메모 추가 (표와 한 줄 띄움)"""
+    row_idx = len(data) + 5
+    ws.merge_cells(f'A{row_idx}:E{row_idx}')
+    cell = ws[f'A{row_idx}']
+    cell.value = "예치금 소진 예측\n" + "\n".join(forecast_lines)
+    cell.font = Font(bold=True, color='C00000') if any("충전" in line for line in forecast_lines) else Font(bold=True)
+    cell.alignment = Alignment(wrapText=True, vertical='center', horizontal='left')
+    ws.row_dimensions[row_idx].height = 18 * (len(forecast_lines) + 1)
+
+# Excel 대시보드 생성 함수
+def create_dashboard_excel(llm_result, in_memory=False, username=None, dashboard_screenshot=None, use_template=None, checklist=None, use_cache=None, forecast_lines=None):
+    """
+    LLM 분석 결과를 기반으로 대시보드 Excel 파일을 생성합니다.
+    
+    Args:
+        llm_result (dict or str): LLM 분석 결과
+        in_memory (bool, optional): 메모리에 파일을 생성할지 여부. True면 logs 폴더에 저장하지 않고
+                                    SpooledReport로 반환합니다 (REPORT_SPOOL_THRESHOLD를 넘으면 임시 파일로 전환).
+        username (str, optional): 담당자 이름. 기본값은 None이며, 이 경우 ""으로 설정됩니다.
+        dashboard_screenshot (BytesIO, optional): 대시보드 스크린샷 메모리 데이터 (이 함수가 사용 후 닫음 - 캐시 적중 시 포함)
+        use_template (bool, optional): 캐시된 템플릿 사본에 값만 채울지 여부. None이면
+                                       EXCEL_TEMPLATE_MODE 환경 변수를 따릅니다 (기본값: 미사용).
+        checklist (list, optional): evaluate_checklist로 미리 계산한 판정 결과. None이면 여기서 계산합니다.
+        use_cache (bool, optional): in_memory일 때 내용 해시 기반 보고서 캐시 사용 여부. None이면
+                                    REPORT_CACHE 환경 변수를 따릅니다 (기본값: 사용).
+        forecast_lines (list, optional): 표 아래에 표시할 예치금 소진 예측 문장 (utils/forecast.py format_forecast_lines)
+    
+    Returns:
+        Path 또는 SpooledReport: in_memory가 False이면 생성된 Excel 파일 경로, True이면 파일 객체 (사용 후 close 필요)
+    """
+    # [SB] 기본 설정 및 경로 생성
+    logs_dir = Path("logs")
+    
+    # [SB] 디스크에 저장할 때만 logs 폴더 생성 (xlsx_test.py용)
+    if not in_memory:
+        logs_dir.mkdir(exist_ok=True)
+    
+    # [SB] 날짜 형식을 yyyymmdd로 변경
+    formatted_date = datetime.now().strftime("%Y%m%d")
+    
+    # [SB] 파일명에 사용자 이름 포함
+    user_str = ""
+    if username:
+        # [SB] 공백 제거 및 특수문자 제거
+        clean_username = ''.join(c for c in username if c.isalnum() or c.isspace()).strip()
+        user_str = f"_{clean_username}"
+    
+    excel_filename = f"당직체크리스트v5_{formatted_date}{user_str}.xlsx"
+    excel_path = logs_dir / excel_filename
+    screenshot_dir = Path("screenshot")
+
+    # [SB] 결과 데이터 변환
+    llm_data = json.loads(llm_result) if isinstance(llm_result, str) else llm_result
+    
+    # [SB] 담당자 이름 설정
+    current_user = username if username else ""
+    
+    # [SB] 체크리스트 판정은 행마다 한 번만 계산 (전달받은 판정 결과가 있으면 재사용)
+    data = checklist if checklist is not None else evaluate_checklist(llm_data)
+    styles = _get_styles()
+    
+    # [SB] 동일한 내용(판정, 담당자, 날짜, 스크린샷)의 보고서가 이미 있으면 Excel 작업 없이 재사용
+    cache_key = None
+    if in_memory and (use_cache if use_cache is not None else report_cache_enabled()):
+        # [SB] 정상 행에만 페이지 스크린샷이 들어가므로 그 파일들만 키에 포함
+        images = [_file_stamp(screenshot_dir / row['페이지스크린샷']) for row in data if row['정상']]
+        cache_key = make_report_key(data, current_user, formatted_date, dashboard_screenshot, notes=forecast_lines, images=images)
+        cached_report = open_cached_report(cache_key)
+        count_event("cache", cache="report", result="hit" if cached_report is not None else "miss")
+        if cached_report is not None:
+            with cached_report:
+                memory_file = SpooledReport.from_stream(excel_filename, cached_report)
+            # [SB] 캐시를 사용해도 생성한 경우와 같이 스크린샷 버퍼를 닫음
+            if dashboard_screenshot is not None:
+                dashboard_screenshot.close()
+            logger.info("캐시된 Excel 보고서를 재사용합니다: %s", excel_filename)
+            return memory_file
+    
+    # [SB] 워크북 초기화 - 템플릿 모드면 캐시된 템플릿 사본에 값만 채움
+    if use_template is None:
+        use_template = os.getenv("EXCEL_TEMPLATE_MODE", "false").strip().lower() in ("1", "true", "yes", "on")
+    if use_template:
+        wb = _load_template_workbook()
+    else:
+        wb = _create_layout_workbook(data, styles)
+    ws = wb[_TEMPLATE_SHEET_TITLE]
+    img_ws = wb[_SCREENSHOT_SHEET_TITLE]
+    
+    _fill_dynamic_cells(ws, data, styles, current_user)
+    if forecast_lines:
+        _write_forecast_note(ws, data, forecast_lines)
 
     # --- D셀에 이미지가 오버레이되어 D셀의 왼쪽, 위 테두리선이 보이지 않는 문제(구글 스프레드시트와 엑셀의 결과가 다르게 나타남) 해결을 위해 코드가 길어짐 ---
     for row_idx, row_data in enumerate(data, 4):
         try:
-            menu = row_data['메뉴']
-            result_text = row_data['결과']
-            has_problem = False
-            
-            # [SB] 문제 여부 판단 로직 (기존과 동일)
-            if menu == "로그인": 
-                has_problem = "정상" not in result_text
-            elif menu == "예치금":
-                whois_ok, gabia_ok = False, False
-                lines = result_text.split('\n')
-                for line in lines:
-                    if 'USD' in line:
-                        try: 
-                            usd_value = float(line.replace('USD', '').replace(',', '').strip())
-                            whois_ok = usd_value >= 200.00
-                        except ValueError: 
-                            whois_ok = False
-                    elif 'KRW' in line:
-                        try: 
-                            krw_value = float(line.replace('KRW', '').replace(',', '').strip())
-                            gabia_ok = krw_value >= 200000
-                        except ValueError: 
-                            gabia_ok = False
-                has_problem = not (whois_ok and gabia_ok)
-            elif menu == "스케줄러": 
-                has_problem = "적용됨" not in result_text
-            elif menu == "고객문의": 
-                has_problem = "0개 확인" not in result_text
-            elif menu == "Region": 
-                has_problem = "2개 확인" not in result_text
-            elif menu == "시스템":
-                if "FrontEnd" in row_data['체크사항']: 
-                    has_problem = (result_text.split('\n')[0] if result_text else "") != "정상"
-                else: 
-                    has_problem = not ("미보고 0개 확인" in result_text or "0개 확인" in result_text or "정상" in result_text)
-            elif menu == "운영중인 서비스": 
-                has_problem = not ("정상" in result_text and "비정상" not in result_text)
+            # [SB] 문제 여부는 체크리스트 판정 결과를 그대로 사용
+            has_problem = not row_data['정상']
             
             cell_D = ws[f'D{row_idx}']  # [SB] 대상 셀
 
@@ -416,10 +367,8 @@ def create_dashboard_excel(llm_result, in_memory=False, username=None, dashboard
                         x_offset_px = padding_left + (img_container_width_px - scaled_img_width_px) / 2
                         y_offset_px = padding_top + (img_container_height_px - scaled_img_height_px) / 2
 
-                    print(f"[SB] {img_file}: x_offset={x_offset_px:.1f}")
-
-                    # [SB] 디버깅용 로그
-                    print(f"[SB] {img_file}: left={padding_left}, x_offset={x_offset_px:.1f}")
+                    # [SB] 디버깅용 로그 (LOG_LEVELS=utils.xlsx=DEBUG일 때만 출력)
+                    logger.debug("%s: left=%s, x_offset=%.1f", img_file, padding_left, x_offset_px)
 
                     # [SB] OneCellAnchor 생성 
                     anchor = OneCellAnchor()
@@ -443,7 +392,7 @@ def create_dashboard_excel(llm_result, in_memory=False, username=None, dashboard
                     cell_D.font = Font(color='FF8C00') 
                 except Exception as img_error:
                     # [SB] 상세 오류 메시지를 콘솔에 출력
-                    print(f"[SB] Error processing image '{img_file}'. Path: '{img_path.resolve()}'. Error: {type(img_error).__name__} - {str(img_error)}")
+                    logger.error("Error processing image '%s'. Path: '%s'. Error: %s - %s", img_file, img_path.resolve(), type(img_error).__name__, img_error)
                     cell_D.value = f"이미지 오류: {img_file}"
                     cell_D.font = Font(color='FF0000')              
         except Exception as e:
@@ -457,22 +406,29 @@ def create_dashboard_excel(llm_result, in_memory=False, username=None, dashboard
             img_ws.add_image(dashboard_img, 'A1')
             img_ws.row_dimensions[1].height = min(600, dashboard_img.height * 0.75)
             img_ws.column_dimensions['A'].width = min(150, dashboard_img.width * 0.1)
-            print(f"[SB] 대시보드 스크린샷이 추가되었습니다")
+            logger.info("대시보드 스크린샷이 추가되었습니다")
         except Exception as e:
-            print(f"[SB] 대시보드 스크린샷 추가 실패: {e}")
+            logger.warning("대시보드 스크린샷 추가 실패: %s", e)
             img_ws['A1'] = f"스크린샷 오류: {e}"
     else:
         img_ws['A1'] = "대시보드 스크린샷이 제공되지 않았습니다."
     
     if in_memory:
-        memory_file = io.BytesIO()
+        # [SB] 큰 스크린샷이 들어가도 xlsx 사본을 메모리에 통째로 두지 않도록 임계값을 넘으면 임시 파일로 전환
+        memory_file = SpooledReport(excel_filename)
         wb.save(memory_file)
         memory_file.seek(0)
-        memory_file.name = excel_filename
-        print(f"[SB] Excel 파일이 메모리에 생성되었습니다: {excel_filename}")
+        # [SB] 워크북 객체 그래프와 스크린샷 이미지는 저장 후 바로 해제 (openpyxl도 저장하면서 이미지 스트림을 닫음)
+        del wb, ws, img_ws
+        if dashboard_screenshot is not None:
+            dashboard_screenshot.close()
+        if cache_key:
+            store_report(cache_key, memory_file)
+        location = "임시 파일" if memory_file.rolled_over else "메모리"
+        logger.info("Excel 파일이 %s에 생성되었습니다: %s (%s bytes)", location, excel_filename, f"{memory_file.size:,}")
         return memory_file
     else:
         wb.save(excel_path)
-        print(f"[SB] Excel 파일이 디스크에 저장되었습니다: {excel_path}")
+        logger.info("Excel 파일이 디스크에 저장되었습니다: %s", excel_path)
         return excel_path
 
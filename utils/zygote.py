@@ -0,0 +1,363 @@
+# [SB] utils/zygote.py - 무거운 모듈을 미리 로드한 zygote 프로세스에서 fork로 main.py 실행
+"""
+로그인/정기 점검마다 새 인터프리터로 main.py를 실행하면 인터프리터 시작과 crawl4ai, openpyxl, bs4,
+Mattermost 드라이버 등의 import 비용을 매번 냅니다. zygote는 이 모듈들을 한 번만 로드해 두고
+작업마다 fork하므로, 작업은 로드된 모듈로 바로 시작하면서도 별도 프로세스로 격리됩니다.
+
+구조:
+    app.py ──(제어 소켓: 작업 요청 + stdout/stderr/상태 fd 전달)──▶ zygote (python -m utils.zygote)
+                                                                   └─ fork ─▶ 작업 프로세스 (main.py)
+    작업 프로세스의 pid와 종료 코드는 작업마다 만든 상태 소켓으로 app.py에 전달됩니다.
+
+app.py는 ZygoteProcess를 subprocess.Popen과 같은 방식(stdout/stderr, poll, wait, terminate, kill)으로 사용합니다.
+"""
+import atexit
+import json
+import logging
+import os
+import random
+import runpy
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+# [SB] python -m utils.zygote로 실행해도 같은 로거 이름 사용
+logger = logging.getLogger("utils.zygote")
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# [SB] zygote가 미리 로드하는 모듈 (설치되지 않은 모듈은 건너뜀)
+PRELOAD_MODULES = (
+    "crawl4ai", "bs4", "openpyxl", "ollama", "pandas", "mattermostdriver", "aiohttp", "dotenv",
+    "utils.fields", "utils.llm", "utils.xlsx", "utils.mattermost", "utils.mattermost_async",
+    "utils.delivery", "utils.forecast", "utils.history", "utils.tracing", "utils.log", "utils.memory",
+)
+
+# [SB] 작업 요청 메시지 최대 크기 (환경 변수 전체 포함)
+_MAX_MESSAGE = 1 << 20
+
+class ZygoteError(OSError):
+    """[SB] zygote 프로세스를 시작하지 못했거나 작업 요청을 전달하지 못한 경우"""
+
+def zygote_enabled():
+    """[SB] zygote 사용 여부 (CHECK_ZYGOTE, 기본 true) - fork를 지원하지 않는 플랫폼에서는 항상 False"""
+    return hasattr(os, "fork") and os.getenv("CHECK_ZYGOTE", "true").strip().lower() in ("1", "true", "yes", "on")
+
+# ---------------------------------------------------------------- zygote 프로세스
+
+def _preload(modules):
+    loaded = []
+    for name in modules:
+        try:
+            __import__(name)
+            loaded.append(name)
+        except ImportError as e:
+            logger.warning("zygote 모듈 미리 로드 실패 (작업에서 import): %s - %s", name, e)
+    return loaded
+
+def _run_job(request, stdout_fd, stderr_fd):
+    """[SB] fork된 작업 프로세스에서 스크립트 실행 (반환하지 않음)"""
+    code = 1
+    try:
+        for signum in (signal.SIGCHLD, signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, signal.SIG_DFL)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        for fd in (devnull, stdout_fd, stderr_fd):
+            os.close(fd)
+        os.environ.clear()
+        os.environ.update(request["env"])
+        os.chdir(request["cwd"])
+        sys.argv = list(request["argv"])
+        sys.path.insert(0, os.path.dirname(os.path.abspath(sys.argv[0])))
+        # [SB] zygote와 같은 난수 상태를 쓰지 않도록 다시 초기화
+        random.seed()
+        try:
+            runpy.run_path(sys.argv[0], run_name="__main__")
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+            code = 1
+        # [SB] os._exit는 atexit를 실행하지 않으므로 직접 실행 (로그 큐 비우기 등)
+        atexit._run_exitfuncs()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+def serve(control):
+    """
+    [SB] zygote 요청 처리 루프 - 제어 소켓이 닫히면(app.py 종료) 종료
+
+    Args:
+        control (socket.socket): app.py와 연결된 AF_UNIX SOCK_SEQPACKET 소켓
+    """
+    sig_r, sig_w = os.pipe()
+    os.set_blocking(sig_r, False)
+    os.set_blocking(sig_w, False)
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.set_wakeup_fd(sig_w)
+    status_sockets = {}
+
+    with selectors.DefaultSelector() as selector:
+        selector.register(control, selectors.EVENT_READ)
+        selector.register(sig_r, selectors.EVENT_READ)
+        while True:
+            ready = [key.fileobj for key, _ in selector.select()]
+            if sig_r in ready:
+                os.read(sig_r, 65536)
+                _reap(status_sockets)
+            if control not in ready:
+                continue
+            try:
+                message, fds, _, _ = socket.recv_fds(control, _MAX_MESSAGE, 3)
+            except OSError:
+                break
+            if not message:
+                break
+            stdout_fd, stderr_fd, status_fd = fds
+            status = socket.socket(fileno=status_fd)
+            pid = os.fork()
+            if pid == 0:
+                signal.set_wakeup_fd(-1)
+                for inherited in [control, status] + list(status_sockets.values()):
+                    inherited.close()
+                os.close(sig_r)
+                os.close(sig_w)
+                _run_job(json.loads(message), stdout_fd, stderr_fd)
+            os.close(stdout_fd)
+            os.close(stderr_fd)
+            status_sockets[pid] = status
+            _send_status(status, {"pid": pid})
+            # [SB] 시작 직후 끝난 작업은 SIGCHLD를 이미 놓쳤을 수 있으므로 바로 확인
+            _reap(status_sockets)
+
+    for status in status_sockets.values():
+        status.close()
+
+def _send_status(status, payload):
+    try:
+        status.send(json.dumps(payload).encode())
+    except OSError:
+        pass
+
+def _reap(status_sockets):
+    while True:
+        try:
+            pid, wait_status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        status = status_sockets.pop(pid, None)
+        if status is not None:
+            _send_status(status, {"returncode": os.waitstatus_to_exitcode(wait_status)})
+            status.close()
+
+def _zygote_main():
+    control = socket.socket(fileno=int(sys.argv[1]))
+    # [SB] zygote 자신의 로그는 stderr로 바로 출력 (fork 전에 로그 스레드를 만들지 않음)
+    handler = logging.StreamHandler(sys.stderr)
+    from utils.log import JsonFormatter
+    handler.setFormatter(JsonFormatter())
+    logging.getLogger().addHandler(handler)
+    logging.getLogger().setLevel(logging.INFO)
+    preload = os.getenv("ZYGOTE_PRELOAD")
+    loaded = _preload(preload.split(",") if preload is not None else PRELOAD_MODULES)
+    logger.info("zygote 준비 완료 (pid %d, 모듈 %d개)", os.getpid(), len(loaded))
+    control.send(b"ready")
+    serve(control)
+
+# ---------------------------------------------------------------- app.py 쪽
+
+class ZygoteProcess:
+    """[SB] zygote에서 fork된 작업 프로세스 - subprocess.Popen(text=True)과 같은 방식으로 사용"""
+
+    def __init__(self, args, pid, stdout, stderr, status):
+        self.args = args
+        self.pid = pid
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode = None
+        self._status = status
+        self._lock = threading.Lock()
+
+    def _receive(self, timeout):
+        with self._lock:
+            if self.returncode is not None:
+                return self.returncode
+            self._status.settimeout(timeout)
+            try:
+                data = self._status.recv(4096)
+            except (BlockingIOError, socket.timeout):
+                return None
+            # [SB] zygote가 종료 코드를 보내지 못하고 끝난 경우 (zygote 비정상 종료)
+            self.returncode = json.loads(data)["returncode"] if data else -1
+            self._status.close()
+            return self.returncode
+
+    def poll(self):
+        return self._receive(0)
+
+    def wait(self, timeout=None):
+        if self._receive(timeout) is None:
+            raise subprocess.TimeoutExpired(self.args, timeout)
+        return self.returncode
+
+    def send_signal(self, signum):
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+class Zygote:
+    """
+    [SB] zygote 프로세스 핸들
+
+    사용 예:
+        zygote = Zygote().start()
+        process = zygote.spawn(["main.py"], env=env, cwd=PROJECT_DIR)
+        reader = ProcessLogReader(process, job_id)
+        process.wait()
+    """
+
+    def __init__(self, preload=None):
+        self.preload = preload
+        self._process = None
+        self._control = None
+        self._lock = threading.Lock()
+
+    def start(self, timeout=120):
+        control, remote = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        # [SB] zygote 자신은 자격 증명이 필요 없음 (작업 프로세스는 요청마다 받은 환경 변수 사용)
+        env = {name: value for name, value in os.environ.items()
+               if not any(secret in name for secret in ("PASSWORD", "TOKEN", "SECRET"))}
+        if self.preload is not None:
+            env["ZYGOTE_PRELOAD"] = ",".join(self.preload)
+        try:
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "utils.zygote", str(remote.fileno())],
+                cwd=PROJECT_DIR, env=env, pass_fds=(remote.fileno(),), stdin=subprocess.DEVNULL,
+            )
+        finally:
+            remote.close()
+        control.settimeout(timeout)
+        try:
+            ready = control.recv(16)
+        except OSError as e:
+            ready = b""
+            logger.warning("zygote 시작 응답 없음: %s", e)
+        if ready != b"ready":
+            self._process.kill()
+            control.close()
+            raise ZygoteError("zygote 프로세스를 시작하지 못했습니다")
+        control.settimeout(None)
+        self._control = control
+        return self
+
+    def alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def spawn(self, argv, env=None, cwd=None):
+        """
+        [SB] zygote에서 fork해 스크립트 실행
+
+        Args:
+            argv (list): [스크립트 경로, 인자...] (예: ["main.py"])
+            env (dict, optional): 작업 프로세스 환경 변수 (기본: 현재 환경)
+            cwd (str, optional): 작업 디렉터리 (기본: 프로젝트 루트)
+
+        Returns:
+            ZygoteProcess: stdout/stderr는 텍스트 파이프
+        """
+        request = json.dumps({"argv": list(argv), "env": dict(os.environ if env is None else env),
+                              "cwd": str(cwd or PROJECT_DIR)}).encode()
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        status, remote_status = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            with self._lock:
+                if not self.alive():
+                    raise ZygoteError("zygote 프로세스가 실행 중이 아닙니다")
+                socket.send_fds(self._control, [request], [stdout_w, stderr_w, remote_status.fileno()])
+            status.settimeout(30)
+            started = json.loads(status.recv(4096) or b"{}")
+            if "pid" not in started:
+                raise ZygoteError("zygote가 작업 프로세스를 시작하지 못했습니다")
+        except (OSError, ValueError) as e:
+            for fd in (stdout_r, stderr_r):
+                os.close(fd)
+            status.close()
+            raise e if isinstance(e, ZygoteError) else ZygoteError(f"zygote 작업 요청 실패: {e}")
+        finally:
+            for fd in (stdout_w, stderr_w):
+                os.close(fd)
+            remote_status.close()
+        stdout = open(stdout_r, "r", encoding="utf-8", errors="replace")
+        stderr = open(stderr_r, "r", encoding="utf-8", errors="replace")
+        return ZygoteProcess(list(argv), started["pid"], stdout, stderr, status)
+
+    def close(self):
+        """[SB] zygote 종료 (실행 중인 작업 프로세스는 계속 실행)"""
+        with self._lock:
+            if self._control is not None:
+                self._control.close()
+                self._control = None
+        if self._process is not None:
+            try:
+                self._process.wait(5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+
+# [SB] app.py 프로세스에서 공유하는 zygote (처음 사용할 때 시작, 종료되었으면 다시 시작)
+_shared = None
+_shared_lock = threading.Lock()
+
+def shared_zygote():
+    """[SB] 공용 zygote 반환 - 시작하지 못하면 ZygoteError"""
+    global _shared
+    with _shared_lock:
+        if _shared is None or not _shared.alive():
+            if _shared is not None:
+                logger.warning("zygote 프로세스가 종료되어 다시 시작합니다")
+            _shared = None
+            _shared = Zygote().start()
+        return _shared
+
+def spawn_script(argv, env=None, cwd=None):
+    """
+    [SB] 스크립트를 zygote에서 실행 (사용하지 않도록 설정했거나 zygote를 쓸 수 없으면 새 인터프리터로 실행)
+
+    Returns:
+        ZygoteProcess 또는 subprocess.Popen: 둘 다 stdout/stderr 텍스트 파이프, poll/wait/terminate/kill 지원
+    """
+    if zygote_enabled():
+        try:
+            return shared_zygote().spawn(argv, env=env, cwd=cwd)
+        except ZygoteError as e:
+            logger.warning("zygote를 사용할 수 없어 새 프로세스로 실행합니다: %s", e)
+    return subprocess.Popen([sys.executable] + list(argv), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, encoding="utf-8", errors="replace", cwd=cwd or PROJECT_DIR, env=env)
+
+if __name__ == "__main__":
+    _zygote_main()